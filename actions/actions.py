@@ -66,9 +66,9 @@ class BatchActions(AbstractAction):
         for action in reversed(self.actions):
             action.undo()
 
-    # Redo batch-operations:
+    # Redo batch-operations (in their original order):
     def redo(self)  -> None :
-        for action in reversed(self.actions):
+        for action in self.actions:
             action.redo()
 
 # Class CreateNodeAction: For node operations (create, undo/redo)
@@ -207,6 +207,10 @@ class RemoveNodeAction(AbstractAction):
         cref = self.cref()  # Dereference canvas pointer
         nref = self.nref()  # Dereference node pointer
 
+        # Abort if the node is already deactivated (e.g. when the action was executed ahead of its batch):
+        if  not cref.node_db.get(nref):
+            return
+
         # Note: The for-loop below removes connectors from the canvas' database. This is necessary to ensure 
         #       that the symbols for new connections are contiguous.
 
@@ -402,6 +406,10 @@ class RemoveStreamAction(AbstractAction):
         cref = self.cref()  # Dereference canvas pointer
         tref = self.tref()  # Dereference terminal pointer
 
+        # Abort if the terminal is already deactivated (e.g. when the action was executed ahead of its batch):
+        if  not cref.term_db.get(tref):
+            return
+
         # If terminal is connected, disconnect:
         if (
             tref.socket.connected and
@@ -411,6 +419,7 @@ class RemoveStreamAction(AbstractAction):
             tref.socket.conjugate().free()
             tref.socket.connector().setVisible(False)
             tref.socket.connector().blockSignals(True)
+            cref.conn_db[tref.socket.connector()] = False
 
         # Deactivate terminal:
         cref.term_db[tref] = False
@@ -437,6 +446,7 @@ class RemoveStreamAction(AbstractAction):
             tref.socket.conjugate().lock(tref.socket, tref.socket.connector())
             tref.socket.connector().blockSignals(False)
             tref.socket.connector().setVisible(True)
+            cref.conn_db[tref.socket.connector()] = True
 
         # Reactivate terminal:
         cref.term_db[tref] = True
@@ -463,6 +473,7 @@ class RemoveStreamAction(AbstractAction):
             tref.socket.conjugate().free()
             tref.socket.connector().setVisible(False)
             tref.socket.connector().blockSignals(True)
+            cref.conn_db[tref.socket.connector()] = False
 
         # Deactivate terminal:
         cref.term_db[tref] = False
@@ -1,6 +1,9 @@
 import logging
+import weakref
 from PyQt6.QtWidgets import QApplication
 
+from .actions import BatchActions
+
 # Class ActionsManager - Manages application-wide undo/redo stacks
 class ActionsManager:
 
@@ -74,4 +77,27 @@ class ActionsManager:
             to_be_purged = self.undo_stack.pop(0)   # Pop the oldest command:
             to_be_purged.cleanup()                  # Delete items
 
-        self.prune_redo()
\ No newline at end of file
+        self.prune_redo()
+
+    # Objects referenced by the undo and redo stacks:
+    def referents(self) -> set:
+        """
+        Returns the (live) objects that the actions on the undo- and redo-stacks hold references to. The scene-pager
+        (see tabs/schema/graph/pager.py) keeps these items in the scene, so that undoing or redoing never acts on an
+        item that was paged out or re-bound.
+        """
+
+        _found = set()
+        _stack = self.undo_stack + self.redo_stack
+        while _stack:
+
+            _action = _stack.pop()
+            if  isinstance(_action, BatchActions):
+                _stack.extend(_action.actions)
+                continue
+
+            for _value in vars(_action).values():
+                if  isinstance(_value, weakref.ref) and (_object := _value()) is not None:
+                    _found.add(_object)
+
+        return _found
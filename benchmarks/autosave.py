@@ -0,0 +1,84 @@
+#-----------------------------------------------------------------------------------------------------------------------
+# Benchmark : Time spent on the GUI-thread by autosaves of a large schematic (tabs/schema/autosave.py)
+# Usage     : QT_QPA_PLATFORM=offscreen python -m benchmarks.autosave [--nodes 20000] [--edits 10]
+#-----------------------------------------------------------------------------------------------------------------------
+import argparse
+import os
+import tempfile
+import time
+
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.pager import schematic, settle
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark the GUI-thread stalls of autosaving a large schematic")
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--edits", type=int, default=10, help="Nodes modified between autosaves")
+    args = parser.parse_args()
+
+    # The viewer's AI-assistant asks for an API-key in a modal dialog if there is none:
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+    app = QApplication([])
+
+    from tabs.schema.autosave import Autosaver
+    from tabs.schema.viewer   import Viewer
+
+    # Autosaves are started by hand:
+    Autosaver.DIRECTORY = tempfile.mkdtemp()
+    Autosaver.INTERVAL  = 1 << 30
+
+    _viewer = Viewer(None)
+    _viewer.show()
+    _canvas = _viewer.canvas
+    _canvas.page_model(schematic(args.nodes))
+    settle(app)
+
+    _autosaver = _canvas.autosaver
+    _nodes     = list(_canvas.model.nodes.values())
+
+    # Wraps the GUI-thread steps of an autosave to time them:
+    _stalls = list()
+    def timed(_method):
+        def wrapper(*args):
+            tic = time.perf_counter()
+            _method(*args)
+            _stalls.append(time.perf_counter() - tic)
+        return wrapper
+
+    _autosaver.collect  = timed(_autosaver.collect)
+    _autosaver.convert  = timed(_autosaver.convert)
+    _autosaver._convert_timer.timeout.disconnect()
+    _autosaver._convert_timer.timeout.connect(_autosaver.convert)
+
+    def autosave() -> tuple:
+
+        _stalls.clear()
+        tic = time.perf_counter()
+        _autosaver.autosave()
+        while _autosaver._convert_timer.isActive() or _autosaver._task is not None:
+            app.processEvents()
+
+        return time.perf_counter() - tic, max(_stalls), sum(_stalls)
+
+    # First autosave converts every record, later ones only the records that have changed:
+    _first = autosave()
+    _times = list()
+    for _round in range(10):
+
+        for _node in _nodes[_round * args.edits: (_round + 1) * args.edits]:
+            _node.title = f"Edit {_round}"
+            _canvas.model.touch(_node)
+
+        _times.append(autosave())
+
+    print(f"{args.nodes} nodes, {len(_canvas.model.connectors)} connectors, {args.edits} nodes edited per autosave")
+    print(f"  First autosave : {1000.0 * _first[0]:8.1f} ms in all, longest stall {1000.0 * _first[1]:6.2f} ms, "
+          f"{1000.0 * _first[2]:8.1f} ms on the GUI-thread, {os.path.getsize(_autosaver.file) / 2 ** 20:.2f} MB")
+    print(f"  Later autosaves: {1000.0 * sum(_t[0] for _t in _times) / len(_times):8.1f} ms in all, "
+          f"longest stall {1000.0 * max(_t[1] for _t in _times):6.2f} ms, "
+          f"{1000.0 * sum(_t[2] for _t in _times) / len(_times):8.2f} ms on the GUI-thread on average")
+
+    _autosaver.close()
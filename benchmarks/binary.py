@@ -0,0 +1,91 @@
+#-----------------------------------------------------------------------------------------------------------------------
+# Benchmark : Saving and loading schematics as JSON, version 1 and 2 (tabs/schema/jsonlib.py), and binary files
+#             (tabs/schema/binlib.py)
+# Usage     : QT_QPA_PLATFORM=offscreen python -m benchmarks.binary [--nodes 20000]
+#-----------------------------------------------------------------------------------------------------------------------
+import argparse
+import json
+import mmap
+import os
+import tempfile
+import time
+
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.pager import schematic
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark saving and loading schematics as JSON and binary files")
+    parser.add_argument("--nodes", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Graphics-items are not created, but terminals read their socket-offset from the graph-package:
+    app = QApplication([])
+
+    from tabs.schema.jsonlib import JsonLib
+    from tabs.schema.binlib  import BinLib
+
+    _model = schematic(args.nodes)
+    _dir   = tempfile.mkdtemp()
+
+    # Save:
+    _legacy = os.path.join(_dir, "legacy.json")
+    tic = time.perf_counter()
+    with open(_legacy, "w") as _stream:
+        _stream.write(json.dumps(JsonLib.legacy_to_json(_model), indent=4))
+    toc = time.perf_counter()
+    _legacy_save = toc - tic
+
+    _json = os.path.join(_dir, "schematic.json")
+    tic = time.perf_counter()
+    with open(_json, "w") as _stream:
+        _stream.write(json.dumps(JsonLib.model_to_json(_model), separators=(",", ":")))
+    toc = time.perf_counter()
+    _json_save = toc - tic
+
+    _bin = os.path.join(_dir, "schematic" + BinLib.SUFFIX)
+    tic = time.perf_counter()
+    with open(_bin, "wb") as _stream:
+        _stream.write(BinLib.model_to_bin(_model))
+    toc = time.perf_counter()
+    _bin_save = toc - tic
+
+    # Load (version 1 is upgraded while it is read):
+    tic = time.perf_counter()
+    with open(_legacy) as _stream:
+        _legacy_model = JsonLib.model_from_json(json.loads(_stream.read()))
+    toc = time.perf_counter()
+    _legacy_load = toc - tic
+
+    tic = time.perf_counter()
+    with open(_json) as _stream:
+        _json_model = JsonLib.model_from_json(json.loads(_stream.read()))
+    toc = time.perf_counter()
+    _json_load = toc - tic
+
+    tic = time.perf_counter()
+    with open(_bin, "rb") as _stream, mmap.mmap(_stream.fileno(), 0, access=mmap.ACCESS_READ) as _buffer:
+        _bin_model = BinLib.model_from_bin(_buffer)
+    toc = time.perf_counter()
+    _bin_load = toc - tic
+
+    # All files must hold the same schematic:
+    _reference = JsonLib.model_to_json(_json_model)
+    assert _reference == JsonLib.model_to_json(_legacy_model), "Upgrade is lossy"
+    assert _reference == JsonLib.model_to_json(_bin_model), "Round-trip is lossy"
+
+    _legacy_size = os.path.getsize(_legacy) / 2 ** 20
+    _json_size   = os.path.getsize(_json) / 2 ** 20
+    _bin_size  = os.path.getsize(_bin)  / 2 ** 20
+
+    print(f"{args.nodes} nodes, {len(_model.connectors)} connectors")
+    print(f"  JSON v1    : {_legacy_size:8.2f} MB, save {_legacy_save:6.3f} s, load {_legacy_load:6.3f} s")
+    print(f"  JSON v2    : {_json_size:8.2f} MB, save {_json_save:6.3f} s, load {_json_load:6.3f} s "
+          f"({_legacy_size / _json_size:.1f}x smaller)")
+    print(f"  Binary     : {_bin_size:8.2f} MB, save {_bin_save:6.3f} s, load {_bin_load:6.3f} s "
+          f"({_legacy_size / _bin_size:.1f}x smaller)")
+
+    os.remove(_legacy)
+    os.remove(_json)
+    os.remove(_bin)
@@ -0,0 +1,83 @@
+#-----------------------------------------------------------------------------------------------------------------------
+# Benchmark : Opening a large JSON-schematic, blocking (JsonLib.decode_json) or streamed (tabs/schema/loader.py)
+# Usage     : QT_QPA_PLATFORM=offscreen python -m benchmarks.loader [--nodes 20000] [--mode stream|block]
+#             (peak memory is per process, so run one mode per invocation)
+#-----------------------------------------------------------------------------------------------------------------------
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.pager import schematic
+
+def resident() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def write(_file: str, _count: int):
+    from tabs.schema.jsonlib import JsonLib
+    with open(_file, "w") as _stream:
+        json.dump(JsonLib.model_to_json(schematic(_count)), _stream, separators=(",", ":"))
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark opening a large JSON-schematic")
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--mode", choices=["stream", "block"], default="stream")
+    args = parser.parse_args()
+
+    # The viewer's AI-assistant asks for an API-key in a modal dialog if there is none:
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+    app = QApplication([])
+
+    from tabs.schema.jsonlib import JsonLib
+    from tabs.schema.viewer  import Viewer
+
+    # Write the schematic in another process, so that it does not count towards this one's peak memory:
+    _file = os.path.join(tempfile.mkdtemp(), "schematic.json")
+    _proc = multiprocessing.Process(target=write, args=(_file, args.nodes))
+    _proc.start()
+    _proc.join()
+
+    _viewer = Viewer(None)
+    _viewer.resize(1920, 1080)
+    _viewer.show()
+    app.processEvents()
+
+    _canvas = _viewer.canvas
+    _memory = resident()
+
+    # Longest interval without event-processing (i.e. the longest freeze of the user-interface):
+    tic  = time.perf_counter()
+    _gap = 0.0
+    if  args.mode == "block":
+        with open(_file) as _stream:
+            JsonLib.decode_json(_stream.read(), _canvas, True, _file)
+
+        _gap = time.perf_counter() - tic
+
+    else:
+        _done = list()
+        _canvas.import_schema(_file)
+        _canvas.loader.sig_finished.connect(_done.append)
+
+        _last = time.perf_counter()
+        while not _done:
+            app.processEvents()
+            _now  = time.perf_counter()
+            _gap  = max(_gap, _now - _last)
+            _last = _now
+
+    toc = time.perf_counter()
+
+    print(f"{args.mode.capitalize()} : {os.path.getsize(_file) / 2 ** 20:.1f} MB, {len(_canvas.model.nodes)} nodes, "
+          f"{len(_canvas.model.connectors)} connectors")
+    print(f"  Open       : {toc - tic:8.3f} s, longest freeze {1000.0 * _gap:.0f} ms, "
+          f"peak memory +{resident() - _memory:.1f} MB")
+
+    os.remove(_file)
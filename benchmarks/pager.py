@@ -0,0 +1,142 @@
+#-----------------------------------------------------------------------------------------------------------------------
+# Benchmark : Opening and panning large schematics with and without paging (tabs/schema/graph/pager.py)
+# Usage     : QT_QPA_PLATFORM=offscreen python -m benchmarks.pager [--nodes 50000] [--eager 2000]
+#-----------------------------------------------------------------------------------------------------------------------
+import argparse
+import os
+import resource
+import time
+
+from PyQt6.QtCore    import QPointF, QRectF
+from PyQt6.QtWidgets import QApplication
+
+def schematic(_count: int, _columns: int = 250):
+    """
+    Returns a headless model of `_count` nodes on a grid, each with an input, an output and a parameter, and each
+    connected to the next one (about 2 * `_count` elements).
+    """
+
+    from model import SchemaModel, NodeRecord, EntityRecord, ConnectorRecord, EntityClass
+
+    _model = SchemaModel()
+    _prior = None
+    for _index in range(_count):
+
+        _node = NodeRecord(uid=f"N{_index:04d}", title="Node", x=300.0 * (_index % _columns), y=250.0 * (_index // _columns))
+        for _eclass, _symbol, _x in [(EntityClass.INP, "R00", -95.0), (EntityClass.OUT, "P00", 95.0)]:
+            _var = EntityRecord(eclass=_eclass, symbol=_symbol, label=_symbol, x=_x, y=10.0)
+            _var.parent = _node
+            _node.variables.append(_var)
+
+        _par = EntityRecord(eclass=EntityClass.PAR, symbol="k", label="k")
+        _par.parent = _node
+        _node.parameters.append(_par)
+        _model.add_node(_node)
+
+        if  _prior is not None:
+            _model.add_connector(ConnectorRecord(f"X{_index - 1}", _prior.variables[1], _node.variables[0]))
+
+        _prior = _node
+
+    return _model
+
+def resident() -> float:
+    """
+    Returns the resident memory of the process (in MB).
+    """
+
+    try:
+        with open("/proc/self/statm") as _file:
+            return int(_file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def settle(_app, _seconds: float = 0.2):
+    _deadline = time.perf_counter() + _seconds
+    while time.perf_counter() < _deadline:
+        _app.processEvents()
+
+def bench_pager(_app, _count: int, _paged: bool):
+    """
+    Opens a schematic of `_count` nodes (paged, or eagerly through `Canvas.load_model`), then measures repaints of the
+    viewport and a pan across the schematic.
+    """
+
+    from tabs.schema.viewer import Viewer
+
+    _viewer = Viewer(None)
+    _viewer.resize(1920, 1080)
+    _viewer.show()
+    settle(_app)
+
+    _canvas = _viewer.canvas
+    _model  = schematic(_count)
+    _memory = resident()
+
+    # Open the schematic with the view in its middle, and wait until the view is filled:
+    _canvas.setSceneRect(QRectF(-2000, -2000, 300.0 * 250 + 4000, 250.0 * (_count // 250) + 4000))
+    _viewer.centerOn(QPointF(300.0 * 125, 250.0 * (_count // 500)))
+    _app.processEvents()
+
+    tic = time.perf_counter()
+    if _paged:  _canvas.page_model(_model)
+    else:       _canvas.load_model(_model)
+
+    while _canvas.pager.pending:
+        _app.processEvents()
+
+    toc = time.perf_counter()
+
+    print(f"{'Paged' if _paged else 'Eager'} : {_count} nodes, {len(_model.connectors)} connectors")
+    print(f"  Open       : {toc - tic:8.3f} s, {resident() - _memory:8.1f} MB, {len(_canvas.items())} graphics items")
+
+    # Repaints:
+    settle(_app)
+
+    tic = time.perf_counter()
+    for _ in range(20):
+        _viewer.viewport().repaint()
+    toc = time.perf_counter()
+    print(f"  Repaint    : {1000.0 * (toc - tic) / 20:8.2f} ms/frame")
+
+    # Pan (paging happens once per frame, as in interactive use):
+    _meter = _viewer.meter
+    _meter.start()
+    tic = time.perf_counter()
+    for _ in range(120):
+        _viewer.horizontalScrollBar().setValue(_viewer.horizontalScrollBar().value() + 60)
+        _app.processEvents()
+        time.sleep(0.004)
+
+    settle(_app, 0.1)
+    toc = time.perf_counter()
+    _frames, _busy = _meter.frames, _meter.busy
+    _meter.stop()
+
+    _pager = _canvas.pager
+    print(f"  Pan        : {1000.0 * (toc - tic) / 120:8.2f} ms/step, {1000.0 * _busy / max(_frames, 1):.2f} ms/frame "
+          f"painting, {len(_canvas.items())} graphics items")
+    if  _paged:
+        print(f"  Paging     : {_pager.paged_in} in, {_pager.paged_out} out, {_pager.recycled} recycled")
+
+    _canvas.blockSignals(True)
+    _viewer.hide()
+    _viewer.deleteLater()
+    settle(_app, 0.0)
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark opening and panning large schematics")
+    parser.add_argument("--nodes", type=int, default=50000, help="Nodes of the paged schematic (about 2x elements)")
+    parser.add_argument("--eager", type=int, default=2000, help="Nodes of the eagerly loaded schematic (0 to skip)")
+    args = parser.parse_args()
+
+    # The viewer's AI-assistant asks for an API-key in a modal dialog if there is none:
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+    app = QApplication([])
+    if args.eager:
+        bench_pager(app, args.eager, False)
+
+    bench_pager(app, args.nodes, True)
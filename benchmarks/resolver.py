@@ -0,0 +1,69 @@
+#-----------------------------------------------------------------------------------------------------------------------
+# Benchmark : Connector resolution on import (JsonLib.model_from_json)
+# Usage     : python -m benchmarks.resolver [--connectors 100000]
+#-----------------------------------------------------------------------------------------------------------------------
+import argparse
+import time
+
+from tabs.schema.jsonlib import JsonLib
+
+def schematic(_count: int, _fanout: int = 50):
+    """
+    Returns the JSON-object of a chain of nodes joined by `_count` connectors. Every handle of a node sits at the same
+    position, so connectors can only be resolved by handle-identity.
+    """
+
+    _nodes = [
+        {
+            "node-uid"      : f"N{_index:04d}",
+            "node-title"    : "Node",
+            "node-scenepos" : {"x": 300.0 * _index, "y": 0.0},
+            "variables"     : list()
+        }
+        for _index in range(_count // _fanout + 2)
+    ]
+
+    _conns = list()
+    for _index in range(_count):
+
+        _origin = _nodes[_index // _fanout]
+        _target = _nodes[_index // _fanout + 1]
+        _symbol = f"{_index % _fanout:02d}"
+
+        _origin["variables"].append({
+            "variable-eclass"   : "EntityClass.OUT",
+            "variable-symbol"   : f"P{_symbol}",
+            "variable-position" : {"x": 130.0, "y": 40.0}
+        })
+
+        _target["variables"].append({
+            "variable-eclass"   : "EntityClass.INP",
+            "variable-symbol"   : f"R{_symbol}",
+            "variable-position" : {"x": -130.0, "y": 40.0}
+        })
+
+        _conns.append({
+            "origin-parent-uid" : _origin["node-uid"],
+            "origin-symbol"     : f"P{_symbol}",
+            "target-parent-uid" : _target["node-uid"],
+            "target-symbol"     : f"R{_symbol}"
+        })
+
+    return {"NODES": _nodes, "TERMINALS": [], "CONNECTORS": _conns}
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark connector resolution on import")
+    parser.add_argument("--connectors", type=int, default=100000)
+    args = parser.parse_args()
+
+    for _count in [args.connectors // 10, args.connectors]:
+
+        _root = schematic(_count)
+
+        tic = time.perf_counter()
+        _model = JsonLib.model_from_json(_root)
+        toc = time.perf_counter()
+
+        assert len(_model.connectors) == _count, "Connectors were dropped"
+        print(f"{_count} connectors resolved in {toc - tic:.3f}s")
@@ -0,0 +1,51 @@
+#-----------------------------------------------------------------------------------------------------------------------
+# Benchmark : Orthogonal connector routing (model/routing.py)
+# Usage     : python -m benchmarks.router [--obstacles 100] [--routes 200]
+#-----------------------------------------------------------------------------------------------------------------------
+import argparse
+import random
+import time
+
+from model import OrthogonalRouter
+
+def obstacles(_count: int, _seed: int = 0):
+    """
+    Returns `_count` node-sized rectangles (left, top, right, bottom) on a jittered grid, roughly like a schematic.
+    """
+
+    _random = random.Random(_seed)
+    _rects  = list()
+    for _index in range(_count):
+        _x = 300 * (_index % 10) + _random.uniform(-40, 40)
+        _y = 250 * (_index // 10) + _random.uniform(-40, 40)
+        _rects.append((_x - 130, _y - 80, _x + 130, _y + 80))
+
+    return _rects
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark orthogonal connector routing")
+    parser.add_argument("--obstacles", type=int, default=100)
+    parser.add_argument("--routes", type=int, default=200)
+    args = parser.parse_args()
+
+    _router = OrthogonalRouter()
+    for _count in [args.obstacles // 10, args.obstacles]:
+
+        _rects  = obstacles(_count)
+        _random = random.Random(1)
+
+        # Route between the right edge of one obstacle and the left edge of another:
+        _pairs = list()
+        for _ in range(args.routes):
+            _o, _t = _random.sample(_rects, 2)
+            _pairs.append(((_o[2], (_o[1] + _o[3]) / 2), (_t[0], (_t[1] + _t[3]) / 2)))
+
+        _failed = 0
+        tic = time.perf_counter()
+        for _start, _end in _pairs:
+            if  _router.route(_start, _end, _rects) is None:
+                _failed += 1
+        toc = time.perf_counter()
+
+        print(f"{_count} obstacles: {1000 * (toc - tic) / args.routes:.2f} ms/route ({_failed} unroutable)")
@@ -0,0 +1,67 @@
+#-----------------------------------------------------------------------------------------------------------------------
+# Benchmark : Saving a large schematic in full (JsonLib.encode_json) and incrementally (tabs/schema/saver.py)
+# Usage     : QT_QPA_PLATFORM=offscreen python -m benchmarks.saver [--nodes 20000] [--edits 10]
+#-----------------------------------------------------------------------------------------------------------------------
+import argparse
+import os
+import tempfile
+import time
+
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.pager import schematic, settle
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark saving a large schematic in full and incrementally")
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--edits", type=int, default=10, help="Nodes modified between incremental saves")
+    args = parser.parse_args()
+
+    # The viewer's AI-assistant asks for an API-key in a modal dialog if there is none:
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+    app = QApplication([])
+
+    from tabs.schema.jsonlib import JsonLib
+    from tabs.schema.viewer  import Viewer
+
+    _viewer = Viewer(None)
+    _viewer.show()
+    _canvas = _viewer.canvas
+    _canvas.page_model(schematic(args.nodes))
+    settle(app)
+
+    _file  = os.path.join(tempfile.mkdtemp(), "schematic.json")
+    _nodes = list(_canvas.model.nodes.values())
+
+    # Full rewrite, as every save did before:
+    tic = time.perf_counter()
+    with open(_file, "w") as _stream:
+        _stream.write(JsonLib.encode_json(_canvas))
+    _full = time.perf_counter() - tic
+
+    # Snapshot (first save), then saves of a few edits each:
+    tic = time.perf_counter()
+    _canvas.saver.save(_file)
+    _snapshot = time.perf_counter() - tic
+
+    _times = list()
+    for _round in range(20):
+
+        for _node in _nodes[_round * args.edits: (_round + 1) * args.edits]:
+            _node.title = f"Edit {_round}"
+            _canvas.model.touch(_node)
+
+        tic = time.perf_counter()
+        _canvas.saver.save(_file)
+        _times.append(time.perf_counter() - tic)
+
+    print(f"{args.nodes} nodes, {len(_canvas.model.connectors)} connectors, {args.edits} nodes edited per save")
+    print(f"  Full save  : {1000.0 * _full:8.1f} ms, {os.path.getsize(_file) / 2 ** 20:.2f} MB")
+    print(f"  Snapshot   : {1000.0 * _snapshot:8.1f} ms")
+    print(f"  Delta save : {1000.0 * sum(_times) / len(_times):8.2f} ms on average, "
+          f"log {os.path.getsize(JsonLib.log_path(_file)) / 1024:.1f} kB after {len(_times)} saves")
+
+    os.remove(_file)
+    os.remove(JsonLib.log_path(_file))
@@ -0,0 +1,167 @@
+#-----------------------------------------------------------------------------------------------------------------------
+# Benchmark : Viewport repaints of the schematic viewer (tabs/schema/viewer.py)
+# Usage     : QT_QPA_PLATFORM=offscreen python -m benchmarks.viewport [--nodes 2000] [--mode smart|full|both]
+#             [--budget MB]
+#-----------------------------------------------------------------------------------------------------------------------
+import argparse
+import os
+import random
+import time
+
+from PyQt6.QtCore    import Qt, QEvent, QPoint, QPointF, QRectF
+from PyQt6.QtGui     import QMouseEvent, QWheelEvent
+from PyQt6.QtWidgets import QApplication, QGraphicsView
+
+def populate(_canvas, _count: int):
+    """
+    Fills the canvas with `_count` nodes on a grid, each connected to the next one. Returns the nodes and handles.
+    """
+
+    from tabs.schema.graph import Connector
+    from custom import EntityClass
+
+    _nodes   = list()
+    _handles = list()
+    with _canvas.bulk_create():
+
+        for _index in range(_count):
+            _nodes.append(_canvas.create_node("Node", QPointF(300 * (_index % 40), 250 * (_index // 40)), False))
+
+        for _index in range(_count - 1):
+            _origin = _nodes[_index].create_handle(QPointF(130, 10), EntityClass.OUT)
+            _target = _nodes[_index + 1].create_handle(QPointF(-130, 10), EntityClass.INP)
+
+            _connector = Connector(_canvas.create_cuid(), _origin, _target)
+            _canvas.conn_db[_connector] = True
+            _canvas.addItem(_connector)
+            _handles.extend((_origin, _target))
+
+    return _nodes, _handles
+
+def measure(_app, _viewer, _action, _repeat: int, _pause: float = 0.0):
+    """
+    Runs `_action` `_repeat` times, letting the event-loop run after each call, and returns the number of frames
+    painted and the time spent painting them (in milliseconds). The hit-rate of the item-caches is left in
+    `_viewer.canvas.caches`.
+    """
+
+    # The meter resets its counters once per interval, right after reporting them:
+    _total = [0, 0.0]
+    def collect(*_):
+        _total[0] += _meter.frames
+        _total[1] += _meter.busy
+
+    _meter = _viewer.meter
+    _meter.start()
+    _meter.sig_sampled.connect(collect)
+    _viewer.canvas.caches.reset()
+    for _index in range(_repeat):
+        _action(_index)
+        _app.processEvents()
+        if _pause:
+            time.sleep(_pause)
+
+    # Let pending zoom-steps and repaints through:
+    _deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < _deadline:
+        _app.processEvents()
+
+    collect()
+    _meter.sig_sampled.disconnect(collect)
+    _meter.stop()
+    return _total[0], 1000.0 * _total[1]
+
+def bench_viewport(_count: int, _mode: str, _budget: float | None = None, _seed: int = 0):
+    """
+    Measures five interactions on a populated viewer: highlighting single items (e.g. on hover), zooming with a burst
+    of wheel-events, panning, repainting the whole viewport, and dragging a node. In `full` mode, the viewer repaints
+    the whole viewport on every change, applies every wheel-event on its own, and paints every item while a node is
+    dragged (the previous behaviour). `_budget` is the pixmap-budget (in MB) of the item-caches, 0 disables them.
+    """
+
+    from tabs.schema.viewer import Viewer
+
+    _app    = QApplication.instance()
+    _viewer = Viewer(None, cache_budget=_budget)
+    _viewer.resize(1920, 1080)
+    _viewer.show()
+
+    if _mode == "full":
+        _viewer.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
+        _viewer._zoom_timer.setInterval(0)
+        _viewer.snapshot.enabled = False
+
+    _nodes, _handles = populate(_viewer.canvas, _count)
+
+    _random = random.Random(_seed)
+    _center = QPointF(_viewer.viewport().rect().center())
+
+    def highlight(_index):  _random.choice(_handles).update()
+
+    def wheel(_index):
+        _event = QWheelEvent(_center, _viewer.mapToGlobal(_center), QPoint(), QPoint(0, -120),
+                             Qt.MouseButton.NoButton, Qt.KeyboardModifier.NoModifier, Qt.ScrollPhase.NoScrollPhase, False)
+        _viewer.wheelEvent(_event)
+
+    def pan(_index):    _viewer.horizontalScrollBar().setValue(_viewer.horizontalScrollBar().value() + 20)
+
+    def repaint(_index):    _viewer.viewport().repaint()
+
+    _grab = QPoint()
+    def drag(_index):
+
+        # Press on the body of the middle node, move it, and release it after the last step:
+        nonlocal _grab
+        _steps = [QEvent.Type.MouseMove]
+        if _index == 0:
+            _steps.insert(0, QEvent.Type.MouseButtonPress)
+            _grab = _viewer.mapFromScene(_nodes[len(_nodes) // 2].scenePos() + QPointF(-30, 40))
+
+        if _index == 59:
+            _steps.append(QEvent.Type.MouseButtonRelease)
+
+        _point = _grab + QPoint(3 * _index, 2 * _index)
+        for _type in _steps:
+            _button  = Qt.MouseButton.NoButton if _type == QEvent.Type.MouseMove else Qt.MouseButton.LeftButton
+            _buttons = Qt.MouseButton.NoButton if _type == QEvent.Type.MouseButtonRelease else Qt.MouseButton.LeftButton
+            _event   = QMouseEvent(_type, QPointF(_point), QPointF(_viewer.viewport().mapToGlobal(_point)), _button,
+                                   _buttons, Qt.KeyboardModifier.NoModifier)
+            _app.sendEvent(_viewer.viewport(), _event)
+
+    print(f"Mode {_mode:5s} : {_count} nodes, {len(_handles) // 2} connectors, zoom {_viewer.transform().m11():.2f}")
+    for _label, _action, _repeat, _pause in (
+        ("Highlight",   highlight,  200, 0.0),
+        ("Wheel-zoom",  wheel,       12, 0.002),
+        ("Pan",         pan,         60, 0.002),
+        ("Repaint",     repaint,     60, 0.002),
+        ("Drag",        drag,        60, 0.002),
+    ):
+        # Every interaction starts from the same view:
+        _viewer.zoom(None)
+        _viewer.centerOn(_nodes[len(_nodes) // 2])
+        for _ in range(10):
+            _app.processEvents()
+
+        _frames, _busy = measure(_app, _viewer, _action, _repeat, _pause)
+        print(f"  {_label:11s}: {_repeat:4d} events -> {_frames:4d} frames, {_busy:8.1f} ms painting "
+              f"({_busy / max(_frames, 1):.2f} ms/frame, {_viewer.canvas.caches.hit_rate:.0%} cache-hits)")
+
+    _viewer.canvas.blockSignals(True)
+    _viewer.hide()
+    _viewer.deleteLater()
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark viewport repaints")
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--mode" , choices=["smart", "full", "both"], default="both")
+    parser.add_argument("--budget", type=float, default=None, help="Pixmap-budget of the item-caches (MB)")
+    args = parser.parse_args()
+
+    # The viewer's AI-assistant asks for an API-key in a modal dialog if there is none:
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+    # The application outlives the viewers (it owns the shared SVG-renderers, see util.py):
+    app = QApplication([])
+    for mode in (["full", "smart"] if args.mode == "both" else [args.mode]):
+        bench_viewport(args.nodes, mode, args.budget)
@@ -4,4 +4,4 @@ from .dialog import *
 from .stream import *
 from .entity import *
 
-__all__ = ["Button", "Entity", "EntityClass", "EntityState", "Label", "Dialog", "Stream", "StreamMenuAction"]
+__all__ = ["Button", "Entity", "EntityClass", "EntityState", "Label", "StaticLabel", "Dialog", "Stream", "StreamMenuAction"]
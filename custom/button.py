@@ -1,8 +1,9 @@
 from PyQt6.QtCore import pyqtSignal
-from PyQt6.QtSvgWidgets import QGraphicsSvgItem
 
+from util import SvgIcon
 
-class Button(QGraphicsSvgItem):
+
+class Button(SvgIcon):
 
     # Default values:
     _svg_width = 256
@@ -13,7 +14,7 @@ class Button(QGraphicsSvgItem):
 
     def __init__(self, path, parent_item = None):
 
-        # Base-class initialization:
+        # Base-class initialization (shares the icon's renderer, see `util.SvgIcon`):
         super().__init__(path, parent_item)
 
         # Resize SVG-icon:
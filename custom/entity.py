@@ -1,48 +1,54 @@
-from enum import Enum
-
 from PyQt6.QtCore   import Qt
 from PyQt6.QtGui    import QColor
 
+from model          import EntityClass, EntityState, EntityRecord
 from .stream        import Stream
 
-class EntityClass(Enum):
-    INP = 0
-    OUT = 1
-    VAR = 2
-    PAR = 3
-    EQN = 4
-
-class EntityState(Enum):
-    TOTAL  = 0
-    HIDDEN = 1
-    ACTIVE = 2
-
 # Class Entity: Data structure to represent real-world resource flows:
 class Entity(Stream):
 
     # Initializer:
-    def __init__(self):
-
-        # Initialize super-class:
-        super().__init__("Default", QColor(Qt.GlobalColor.darkGray))
-
-        # Define properties:
-        self._prop = dict({
-            "uid"       : str(),
-            "info"      : str(),
-            "label"     : str(),
-            "units"     : str(),
-            "eclass"    : str(),
-            "symbol"    : str(),
-            "value"     : str(),
-            "sigma"     : str(),
-            "minimum"   : str(),
-            "maximum"   : str()
-        })
+    def __init__(self, _record: EntityRecord | None = None):
+
+        # Note: `Stream.__init__` is not called, the stream-ID and color live in the record (default: "Default", gray).
+
+        # Define properties (the record is a view into the shared entity-store, see model/store.py):
+        self._prop = _record if isinstance(_record, EntityRecord) else EntityRecord()
+
+    # Record (datatype = EntityRecord): The entity's properties as plain data
+    @property
+    def record(self) -> EntityRecord: return self._prop
+
+    # Stream-ID and color are stored in the record, so that the schema model sees them:
+    @property
+    def strid(self) -> str: return self._prop.strid
+
+    @strid.setter
+    def strid(self, _strid: str):
+
+        # Validate input-type:
+        if not isinstance(_strid, str):
+            raise TypeError("Expected str")
+
+        # Set stream-ID:
+        self._prop.strid = _strid
+
+    @property
+    def color(self) -> QColor: return QColor(self._prop.color)
+
+    @color.setter
+    def color(self, _color: QColor | Qt.GlobalColor):
+
+        # Validate input-type:
+        if not isinstance(_color, QColor | Qt.GlobalColor):
+            raise TypeError("Expected QColor or Qt.GlobalColor")
+
+        # Set color:
+        self._prop.color = QColor(_color).name()
 
     # uid (datatype = str): Unique resource-identifier
     @property
-    def uid(self)   -> str : return self._prop["uid"]
+    def uid(self)   -> str : return self._prop.uid
 
     @uid.setter
     def uid(self, _uid: str):
@@ -52,11 +58,11 @@ class Entity(Stream):
             raise TypeError("Expected str")
 
         # Set UID:
-        self._prop["uid"] = _uid
+        self._prop.uid = _uid
 
     # Info (datatype = str): Description of the entity
     @property
-    def info(self)  -> str : return self._prop["info"]
+    def info(self)  -> str : return self._prop.info
 
     @info.setter
     def info(self, _info: str):
@@ -66,10 +72,10 @@ class Entity(Stream):
             raise TypeError("Expected str")
 
         # Set UID:
-        self._prop["info"] = _info
+        self._prop.info = _info
 
     @property
-    def label(self) -> str | None: return self._prop["label"]
+    def label(self) -> str | None: return self._prop.label
 
     @label.setter
     def label(self, _label: str):
@@ -79,10 +85,10 @@ class Entity(Stream):
             raise TypeError("Expected str")
 
         # Set label:
-        self._prop["label"] = _label
+        self._prop.label = _label
 
     @property
-    def units(self) -> str: return self._prop["units"]
+    def units(self) -> str: return self._prop.units
 
     @units.setter
     def units(self, _units: str):
@@ -92,10 +98,10 @@ class Entity(Stream):
             raise TypeError("Expected str")
 
         # Set units:
-        self._prop["units"] = _units
+        self._prop.units = _units
 
     @property
-    def eclass(self) -> str: return self._prop["eclass"]
+    def eclass(self) -> str: return self._prop.eclass
 
     @eclass.setter
     def eclass(self, _eclass: str):
@@ -105,10 +111,10 @@ class Entity(Stream):
             raise TypeError("Expected argument of type `EntityClass`")
 
         # Set eclass:
-        self._prop["eclass"] = _eclass
+        self._prop.eclass = _eclass
         
     @property
-    def symbol(self) -> str: return self._prop["symbol"]
+    def symbol(self) -> str: return self._prop.symbol
 
     @symbol.setter
     def symbol(self, _symbol: str):
@@ -118,10 +124,10 @@ class Entity(Stream):
             raise TypeError("Expected str")
 
         # Set symbol:
-        self._prop["symbol"] = _symbol
+        self._prop.symbol = _symbol
 
     @property
-    def value(self) -> str: return self._prop["value"]
+    def value(self) -> str: return self._prop.value
 
     @value.setter
     def value(self, _value: str):
@@ -131,10 +137,10 @@ class Entity(Stream):
             raise TypeError("Expected argument of type `str`")
 
         # Set value:
-        self._prop["value"] = _value
+        self._prop.value = _value
 
     @property
-    def sigma(self) -> str: return self._prop["sigma"]
+    def sigma(self) -> str: return self._prop.sigma
 
     @sigma.setter
     def sigma(self, _sigma: str):
@@ -144,10 +150,10 @@ class Entity(Stream):
             raise TypeError("Expected argument of type `str`")
 
         # Set sigma:
-        self._prop["sigma"] = _sigma
+        self._prop.sigma = _sigma
 
     @property
-    def minimum(self) -> str: return self._prop["minimum"]
+    def minimum(self) -> str: return self._prop.minimum
 
     @minimum.setter
     def minimum(self, _minimum: str):
@@ -157,10 +163,10 @@ class Entity(Stream):
             raise TypeError("Expected argument of type `str`")
 
         # Set minimum:
-        self._prop["minimum"] = _minimum
+        self._prop.minimum = _minimum
 
     @property
-    def maximum(self) -> str: return self._prop["maximum"]
+    def maximum(self) -> str: return self._prop.maximum
 
     @maximum.setter
     def maximum(self, _maximum: str):
@@ -170,4 +176,4 @@ class Entity(Stream):
             raise TypeError("Expected argument of type `str`")
 
         # Set maximum:
-        self._prop["maximum"] = _maximum
\ No newline at end of file
+        self._prop.maximum = _maximum
\ No newline at end of file
@@ -1,10 +1,29 @@
 import logging
 
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont, QColor, QTextCursor
-from PyQt6.QtWidgets import QGraphicsItem, QGraphicsTextItem, QStyle
+from PyQt6.QtCore import Qt, QPointF, QRectF, pyqtSignal
+from PyQt6.QtGui import QFont, QFontMetricsF, QColor, QStaticText, QTextCursor, QTextOption
+from PyQt6.QtWidgets import QGraphicsItem, QGraphicsObject, QGraphicsTextItem, QStyle
 from dataclasses import dataclass
 
+from util import LevelOfDetail, cache_miss, level_of_detail
+
+# Fonts and their metrics, shared by all labels (see `shared_font()`):
+_fonts = dict()
+
+# Returns a shared font and its metrics:
+def shared_font(_font: QFont | None = None) -> tuple[QFont, QFontMetricsF]:
+    """
+    Returns the shared instance of a font (the labels' default font if `_font` is None) along with its metrics, so that
+    labels do not each build their own.
+    """
+
+    _key = _font.key() if isinstance(_font, QFont) else None
+    if  _key not in _fonts:
+        _font = _font if isinstance(_font, QFont) else QFont("Trebuchet MS", 13)
+        _fonts[_key] = (_font, QFontMetricsF(_font))
+
+    return _fonts[_key]
+
 # Class Label: A custom-QGraphicsTextItem
 class Label(QGraphicsTextItem):
 
@@ -24,7 +43,7 @@ class Label(QGraphicsTextItem):
 
         # Retrieve keywords:
         editable = kwargs["editable"]   if "editable"   in kwargs.keys() else True
-        font     = kwargs["font"]       if "font"       in kwargs.keys() else QFont("Trebuchet MS", 13)
+        font     = kwargs["font"]       if "font"       in kwargs.keys() else shared_font()[0]
         align    = kwargs["align"]      if "align"      in kwargs.keys() else Qt.AlignmentFlag.AlignCenter
         color    = kwargs["color"]      if "color"      in kwargs.keys() else Qt.GlobalColor.black
         width    = kwargs["width"]      if "width"      in kwargs.keys() else 80
@@ -88,5 +107,126 @@ class Label(QGraphicsTextItem):
         super().focusOutEvent(event)
 
     def paint(self, painter, option, widget):
+
+        # Text is not legible at low levels-of-detail, skip it:
+        if level_of_detail(painter) < LevelOfDetail.DETAIL:
+            return
+
         option.state = QStyle.StateFlag.State_None
-        super().paint(painter, option, widget)
\ No newline at end of file
+        super().paint(painter, option, widget)
+
+# Class StaticLabel: A lightweight, read-mostly label:
+class StaticLabel(QGraphicsObject):
+    """
+    Label that paints its text from a cached `QStaticText` with a shared font, instead of owning a `QTextDocument` like
+    `Label`. When the text is edited (see `edit()`), a temporary `Label` is laid over it and discarded once editing
+    ends. Accepts the same keywords as `Label`; `editable` only controls whether a click starts editing.
+    """
+
+    # Signals:
+    sig_text_changed = pyqtSignal(str, name="StaticLabel.sig_text_changed")
+
+    # Margin around the text (same as `QTextDocument`'s, so that labels line up with `Label`):
+    MARGIN = 4.0
+
+    # Initializer:
+    def __init__(self, parent: QGraphicsItem | None, _text: str, **kwargs):
+
+        # Initialize base-class:
+        super().__init__(parent)
+
+        # Retrieve keywords:
+        self.editable = kwargs.get("editable", True)
+        self._font, self._metrics = shared_font(kwargs.get("font"))
+        self._align = kwargs.get("align", Qt.AlignmentFlag.AlignCenter)
+        self._color = QColor(kwargs.get("color", Qt.GlobalColor.black))
+        self._width = kwargs.get("width", 80)
+
+        # Temporary editor, see `edit()`:
+        self._editor = None
+
+        # Static text, wrapped like a `QTextDocument` of the same width:
+        _option = QTextOption(self._align)
+        _option.setWrapMode(QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
+
+        self._text = QStaticText()
+        self._text.setTextFormat(Qt.TextFormat.PlainText)
+        self._text.setTextOption(_option)
+        self._text.setTextWidth(self._width - 2.0 * self.MARGIN)
+        self._rect = QRectF()
+
+        # Only editable labels take mouse-clicks, others leave them to their parent:
+        if not self.editable:
+            self.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+
+        self.setPlainText(_text)
+
+    def toPlainText(self) -> str:   return self._text.text()
+
+    def textWidth(self) -> float:   return self._width
+
+    def font(self) -> QFont:        return self._font
+
+    def setPlainText(self, _text: str) -> None:
+
+        self.prepareGeometryChange()
+        self._text.setText(_text)
+
+        _height = max(self._text.size().height(), self._metrics.height())
+        self._rect = QRectF(0, 0, self._width, _height + 2.0 * self.MARGIN)
+        self.update()
+
+    def boundingRect(self) -> QRectF:   return self._rect
+
+    def paint(self, painter, option, widget = None):
+
+        cache_miss(self, widget)
+
+        # The editor paints the text while editing; text is not legible at low levels-of-detail:
+        if  self._editor is not None or level_of_detail(painter) < LevelOfDetail.DETAIL:
+            return
+
+        painter.setFont(self._font)
+        painter.setPen(self._color)
+        painter.drawStaticText(QPointF(self.MARGIN, self.MARGIN), self._text)
+
+    def edit(self) -> None:
+        """
+        Lays an editor over the label with its text selected. When the editor loses focus (or Return is pressed), the
+        edited text is applied and `sig_text_changed` is emitted.
+        """
+
+        if  self._editor is not None:
+            return
+
+        self._editor = Label(self, self.toPlainText(),
+                             font=self._font,
+                             align=self._align,
+                             color=self._color,
+                             width=self._width,
+                             editable=True)
+
+        self._editor.sig_text_changed.connect(self.on_edit_finished)
+        self._editor.edit()
+        self.update()
+
+    def on_edit_finished(self, _text: str) -> None:
+
+        # Discard the editor (deferred, as it is still handling its focus-out event):
+        _editor, self._editor = self._editor, None
+        if  _editor is not None:
+            _editor.hide()
+            _editor.deleteLater()
+
+        self.setPlainText(_text)
+        self.sig_text_changed.emit(_text)
+
+    def mousePressEvent(self, event):
+
+        # Start editing on left-click:
+        if  self.editable and event.button() == Qt.MouseButton.LeftButton:
+            self.edit()
+            event.accept()
+            return
+
+        super().mousePressEvent(event)
@@ -14,6 +14,7 @@ class StartupChoice(Enum):
     OPEN_BLANK_PROJECT = 1
     LOAD_SAVED_PROJECT = 2
     SHOW_RECENT        = 3
+    RECOVER_UNSAVED    = 4
 
 # Class StartupWindow: A QDialog subclass that is displayed on application startup:
 class StartupWindow(QDialog):
@@ -24,7 +25,7 @@ class StartupWindow(QDialog):
         WINDOW_HEIGHT = 300
 
     # Initializer:
-    def __init__(self):
+    def __init__(self, _recoverable: int = 0):
 
         # Initialize super-class:
         super().__init__()
@@ -56,15 +57,21 @@ class StartupWindow(QDialog):
         blank_project = QPushButton("Open Blank Project")
         saved_project = QPushButton("Load Saved Project")
         show_recents  = QPushButton("Recent Projects")
+        recover_work  = QPushButton(f"Recover Unsaved Work ({_recoverable})")
 
         # Connect buttons to handlers:
         blank_project.pressed.connect(lambda: self.done(StartupChoice.OPEN_BLANK_PROJECT.value))
         saved_project.pressed.connect(lambda: self.done(StartupChoice.LOAD_SAVED_PROJECT.value))
         show_recents.pressed .connect(lambda: self.done(StartupChoice.SHOW_RECENT.value))
+        recover_work.pressed .connect(lambda: self.done(StartupChoice.RECOVER_UNSAVED.value))
 
         # Arrange buttons in startup-window:
         layout = QVBoxLayout(self)
         layout.addLayout(top_layout)
         layout.addWidget(blank_project)
         layout.addWidget(saved_project)
-        layout.addWidget(show_recents)
\ No newline at end of file
+        layout.addWidget(show_recents)
+
+        # Offer to recover schematics that were autosaved before a crash (see tabs/schema/autosave.py):
+        if  _recoverable:
+            layout.addWidget(recover_work)
\ No newline at end of file
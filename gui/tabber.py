@@ -128,7 +128,8 @@ class Tabber(QTabWidget):
         _viewer.close()
 
         if _viewer.closed:
-            super().removeTab(_index)   # Call super-class implementation:
+            _viewer.canvas.autosaver.close()    # Discard the tab's recovery-file
+            super().removeTab(_index)           # Call super-class implementation:
 
     @pyqtSlot(int)
     def rename_tab(self, _index):
@@ -141,8 +142,8 @@ class Tabber(QTabWidget):
     # Import schematic:
     def import_schema(self):    self.currentWidget().canvas.import_schema()
 
-    # Export schematic:
-    def export_schema(self):
+    # Export schematic, returns True if it was saved:
+    def export_schema(self) -> bool:
 
         # Trigger save:
         if  self._cbox.isChecked():
@@ -151,21 +152,23 @@ class Tabber(QTabWidget):
 
             try:
                 _canvas = self.currentWidget().canvas       # Get canvas
-                _canvas.export_schema(f"{_save_name}.json") # Save schematic
-                self.set_indicator(SaveState.SAVED)         # Modify indicator
+                if  _canvas.export_schema(f"{_save_name}.json"):
+                    self.set_indicator(SaveState.SAVED)     # Modify indicator
+                    return True
 
             except Exception as exception:
                 logging.exception(f"An exception occurred: {exception}")
 
         else:
             # File-dialog:
-            _file, _code = QFileDialog.getSaveFileName(None, "Select JSON file", "./", "JSON files (*.json)")\
+            _file, _code = QFileDialog.getSaveFileName(None, "Select file", "./", "JSON files (*.json);;Binary files (*.clmb)")\
 
             if _code:
                 try:
                     _canvas = self.currentWidget().canvas   # Get canvas
-                    _canvas.export_schema(f"{_file}")       # Save schematic
-                    self.set_modified(False)                # Remove asterisk from tab label
+                    if  _canvas.export_schema(f"{_file}"):  # Save schematic
+                        self.set_indicator(SaveState.SAVED) # Remove asterisk from tab label
+                        return True
 
                 except Exception as exception:
                     
@@ -175,6 +178,28 @@ class Tabber(QTabWidget):
                                    QMessageBox.StandardButton.Ok)
                     logging.exception(f"An exception occurred: {exception}")
 
+        return False
+
+    # Save every modified tab, returns True if all of them were saved:
+    def save_all(self) -> bool:
+
+        _current = self.currentIndex()
+        _saved   = True
+
+        for _index in range(self.count()):
+            if  self.tabText(_index).endswith('*'):
+                self.setCurrentIndex(_index)        # `export_schema()` saves the current tab
+                _saved = self.export_schema() and _saved
+
+        self.setCurrentIndex(_current)
+        return _saved
+
+    # Stop autosaving and discard recovery-files, when the application quits:
+    def close_all(self):
+
+        for _index in range(self.count()):
+            self.widget(_index).canvas.autosaver.close()
+
     # Set/Unset the modified indicator:
     @pyqtSlot(SaveState)
     def set_indicator(self, _state: SaveState):
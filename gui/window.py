@@ -5,6 +5,8 @@
 #-----------------------------------------------------------------------------------------------------------------------
 import logging
 
+from pathlib import Path
+
 from PyQt6.QtGui import QKeySequence
 from PyQt6.QtCore import Qt, pyqtSignal, QtMsgType
 from PyQt6.QtWidgets import QMainWindow, QStackedWidget, QMessageBox, QApplication
@@ -15,6 +17,8 @@ from custom.dialog import Dialog
 from .tabber import Tabber
 from .navbar import NavBar
 
+from tabs.schema.viewer    import Viewer
+from tabs.schema.autosave  import Autosaver
 from tabs.optima.optimizer import Optimizer
 from tabs.database.manager import DataManager
 # from tabs.sheets.manager import Manager
@@ -93,6 +97,35 @@ class Gui(QMainWindow):
 
     def load_project(self): self._tabber.import_schema()
 
+    def recover_projects(self, _files: list):
+        """
+        Opens the recovery-files left by an earlier session (see `Autosaver.recoverable()`) in new tabs. A file is
+        removed once the recovered schematic has been autosaved, saved or closed.
+        """
+
+        for _file in _files:
+
+            try:
+                _saved = Autosaver.describe(_file).get("file")
+            except (OSError, ValueError) as exception:
+                logging.error(f"Unable to read recovery-file {_file}: {exception}")
+                continue
+
+            _count  = self._tabber.count()
+            _viewer = Viewer(self._tabber)
+            _label  = f"{Path(_saved).stem if _saved else f'Recovered_{_count + 1}'}*"
+
+            self._tabber.addTab(_viewer, _label)
+            if  self._tabber.count() == _count:     # Max tab-count reached
+                break
+
+            self._tabber.setCurrentWidget(_viewer)
+            _viewer.canvas.import_schema(_file)
+            if  _viewer.canvas.loader is not None:
+                _viewer.canvas.loader.sig_finished.connect(
+                    lambda _complete, _canvas=_viewer.canvas, _file=_file: _complete and _canvas.autosaver.adopt(_file)
+                )
+
     def show_widget(self, _label: str):
 
         if _label == "Data":
@@ -116,9 +149,13 @@ class Gui(QMainWindow):
         # Execute dialog and get result:
         _dialog_code = _dialog.exec()
 
-        # Handle close-event accordingly:
-        if _dialog_code == QMessageBox.StandardButton.Yes:
-            event.accept()
+        # Handle close-event accordingly, keep the window open if a tab could not be saved:
+        if  _dialog_code == QMessageBox.StandardButton.Cancel or (
+            _dialog_code == QMessageBox.StandardButton.Yes and not self._tabber.save_all()
+        ):
+            event.ignore()
+            return
 
-        if _dialog_code == QMessageBox.StandardButton.No:       event.accept()
-        if _dialog_code == QMessageBox.StandardButton.Cancel:   event.ignore()
\ No newline at end of file
+        # The application is quitting on purpose, recovery-files are not needed:
+        self._tabber.close_all()
+        event.accept()
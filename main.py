@@ -14,6 +14,7 @@ from PyQt6.QtWidgets import QApplication
 from gui.splash import StartupWindow, StartupChoice
 from util            import *
 from gui.window      import Gui
+from tabs.schema.autosave import Autosaver
 
 # Application Subclass:
 class Climact(QApplication):
@@ -36,6 +37,7 @@ class Climact(QApplication):
 
         # Initialize super-class:
         super().__init__(argv)
+        self.setApplicationName(self.Metadata.APP_NAME)    # Names the data-directory (e.g. of recovery-files)
 
         # Define logging-behaviour:
         logging.basicConfig(
@@ -55,12 +57,18 @@ class Climact(QApplication):
         logging.info(f"Stylesheet: {self.Constants.QSS_SHEET}")
 
         # Open splash-screen and show project options:
+        # Recovery-files are left behind by sessions that crashed:
+        _recoverable  = Autosaver.recoverable()
+
         self._window  = Gui()
-        self._startup = StartupWindow()
+        self._startup = StartupWindow(len(_recoverable))
         self._result  = self._startup.exec()
 
         if  self._result == StartupChoice.LOAD_SAVED_PROJECT.value:
             self._window.load_project()
+
+        if  self._result == StartupChoice.RECOVER_UNSAVED.value:
+            self._window.recover_projects(_recoverable)
             
 
 # Instantiate application and enter event-loop:
@@ -0,0 +1,32 @@
+from .allocator  import *
+from .entity     import *
+from .expression import *
+from .journal    import *
+from .routing    import *
+from .schema     import *
+from .spatial    import *
+from .store      import *
+from .tracked    import *
+
+__all__ = [
+    "IdAllocator",
+    "EntityClass",
+    "EntityState",
+    "EntityRecord",
+    "EntityStore",
+    "Expression",
+    "ExpressionError",
+    "ParameterGraph",
+    "Change",
+    "ChangeSet",
+    "ChangeJournal",
+    "JournalCursor",
+    "OrthogonalRouter",
+    "NodeRecord",
+    "TerminalRecord",
+    "ConnectorRecord",
+    "SchemaModel",
+    "SpatialIndex",
+    "TrackedDict",
+    "format_real",
+]
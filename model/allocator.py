@@ -0,0 +1,99 @@
+import heapq
+
+# Class IdAllocator: Hands out the smallest free integer-ID:
+class IdAllocator:
+    """
+    Allocates prefixed, integer-based identifiers (e.g. N0000, X12, P03) and always hands out the smallest free one.
+    Free IDs below the high-water mark are kept in a min-heap, so `peek` is amortized O(1) and `claim` and `release`
+    are O(log n).
+
+    IDs are claimed on behalf of an owner (a node, handle or connector). Claiming again for the same owner is a no-op,
+    which lets registry-callbacks claim on every activation without double-counting. An ID stays in use while at least
+    one owner holds it, so items that share an ID after an undo/redo sequence are accounted for correctly.
+
+    Attributes:
+        prefix (str): Prefix of every identifier.
+        width (int): Minimum number of digits (zero-padded).
+    """
+
+    # Initializer:
+    def __init__(self, _prefix: str, _width: int = 0):
+
+        # Formatting:
+        self.prefix = _prefix
+        self.width  = _width
+
+        # Allocation-state:
+        self._free = list()     # Min-heap of released IDs below `_next` (may contain stale entries, pruned lazily).
+        self._next = 0          # High-water mark: every ID >= `_next` is free.
+        self._used = dict()     # Maps each ID in use to the number of owners that hold it.
+        self._held = dict()     # Maps each owner to the ID that it holds.
+
+    def __len__(self):  return len(self._held)
+
+    def format(self, _id: int) -> str:
+        """
+        Returns the identifier for an integer-ID, e.g. 12 -> "N0012".
+        """
+        return self.prefix + str(_id).zfill(self.width)
+
+    def parse(self, _symbol: str) -> int | None:
+        """
+        Returns the integer-ID of an identifier, or None if the identifier was not issued by this allocator.
+        """
+
+        if not isinstance(_symbol, str) or not _symbol.startswith(self.prefix):
+            return None
+
+        _digits = _symbol[len(self.prefix):]
+        return int(_digits) if _digits.isdigit() else None
+
+    def peek(self) -> str:
+        """
+        Returns the smallest free identifier without claiming it.
+        """
+
+        # Prune IDs that were re-claimed after they were released:
+        while self._free and self._free[0] in self._used:
+            heapq.heappop(self._free)
+
+        return self.format(self._free[0] if self._free else self._next)
+
+    def claim(self, _owner, _symbol: str) -> None:
+        """
+        Marks an identifier as held by `_owner`. If the owner held a different identifier, that one is released first.
+
+        Parameters:
+            _owner (object): The item that holds the identifier.
+            _symbol (str): The identifier.
+        """
+
+        _id = self.parse(_symbol)
+        if self._held.get(_owner) == _id:
+            return
+
+        self.release(_owner)
+        if _id is None:
+            return
+
+        # IDs skipped by the high-water mark become free:
+        for _gap in range(self._next, _id):
+            heapq.heappush(self._free, _gap)
+
+        self._next = max(self._next, _id + 1)
+        self._used[_id] = self._used.get(_id, 0) + 1
+        self._held[_owner] = _id
+
+    def release(self, _owner) -> None:
+        """
+        Releases the identifier held by `_owner`, if any.
+        """
+
+        _id = self._held.pop(_owner, None)
+        if _id is None:
+            return
+
+        self._used[_id] -= 1
+        if not self._used[_id]:
+            self._used.pop(_id)
+            heapq.heappush(self._free, _id)
@@ -0,0 +1,99 @@
+from enum import Enum
+
+from .store import EntityStore, SHARED_STORE
+
+class EntityClass(Enum):
+    INP = 0
+    OUT = 1
+    VAR = 2
+    PAR = 3
+    EQN = 4
+
+class EntityState(Enum):
+    TOTAL  = 0
+    HIDDEN = 1
+    ACTIVE = 2
+
+# Class Column: Descriptor that maps a record's attribute to its column in the store:
+class Column:
+
+    def __set_name__(self, _owner, _name):  self.name = _name
+
+    def __get__(self, _record, _owner = None):
+        return self if _record is None else _record._store.get(self.name, _record._row)
+
+    def __set__(self, _record, _value):
+        _record._store.set(self.name, _record._row, _value)
+
+# Class EntityRecord: Plain data behind every variable, parameter and terminal-socket:
+class EntityRecord:
+    """
+    Pure-Python record holding an entity's properties. The record is a thin view into a row of an `EntityStore` (see
+    model/store.py), graphical entities (`custom.entity.Entity`, `Handle`) are in turn views over a record, so the schema
+    model always sees the current values without querying the scene.
+
+    Attributes:
+        uid, info, label, units, symbol, value, sigma, minimum, maximum (str): Same meaning as in `Entity`.
+        eclass (EntityClass | None): The entity's class (INP, OUT or PAR).
+        strid (str): Stream-identifier (e.g. "Mass", "Energy").
+        color (str): Stream-color in `#rrggbb` notation.
+        x, y (float): Position in the owner's coordinate-system (variables only).
+        parent (NodeRecord | TerminalRecord | None): The record that owns this entity.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    # Names of all fields, in constructor-order:
+    FIELDS = ("uid", "info", "label", "units", "eclass", "symbol", "value", "sigma", "minimum", "maximum",
+              "strid", "color", "x", "y", "parent")
+
+    uid     = Column()
+    info    = Column()
+    label   = Column()
+    units   = Column()
+    eclass  = Column()
+    symbol  = Column()
+    value   = Column()
+    sigma   = Column()
+    minimum = Column()
+    maximum = Column()
+    strid   = Column()
+    color   = Column()
+    x       = Column()
+    y       = Column()
+    parent  = Column()
+
+    # Initializer:
+    def __init__(self, _store: EntityStore | None = None, **_values):
+
+        # Allocate a row:
+        self._store = _store if isinstance(_store, EntityStore) else SHARED_STORE
+        self._row   = self._store.allocate()
+
+        # Assign values:
+        for _name, _value in _values.items():
+            if _name not in self.FIELDS:
+                raise TypeError(f"Unexpected field `{_name}`")
+
+            setattr(self, _name, _value)
+
+    def __del__(self):
+
+        # Return the row to the store:
+        self._store.release(self._row)
+
+    def __repr__(self):
+        return f"EntityRecord(symbol={self.symbol!r}, label={self.label!r}, eclass={self.eclass})"
+
+    @property
+    def row(self) -> int:   return self._row
+
+    def copy(self, **_changes) -> "EntityRecord":
+        """
+        Returns a new record (in the same store) with this record's values, updated by `_changes`.
+        """
+
+        _values = {_name: getattr(self, _name) for _name in self.FIELDS}
+        _values.update(_changes)
+
+        return EntityRecord(self._store, **_values)
@@ -0,0 +1,272 @@
+import ast
+import math
+import operator
+
+from collections import defaultdict
+
+# Class ExpressionError: Raised for invalid, circular or unresolved expressions:
+class ExpressionError(ValueError):
+    pass
+
+# Class Expression: A parsed numeric expression:
+class Expression:
+    """
+    A parameter-value: either a number or an arithmetic expression that references other parameters by symbol (e.g.
+    `2 * P0 + sqrt(P1)`). The text is parsed once; evaluation walks the parsed tree and only allows numbers, symbols,
+    arithmetic operators and the functions in `FUNCTIONS`. Invalid text is kept, its error is raised on evaluation.
+    Numbers are evaluated as floats, so that e.g. `9**9**9` overflows rather than computing a huge integer, and values
+    that are not finite (inf, nan) are errors.
+
+    Attributes:
+        text (str): The expression as entered.
+        number (float | None): The value, if the text is a plain number.
+        names (frozenset[str]): Symbols referenced by the expression.
+        error (str | None): Why the text could not be parsed, if it could not.
+    """
+
+    # Allowed functions and constants:
+    FUNCTIONS = {
+        "abs": abs, "min": min, "max": max, "pow": pow,
+        "sqrt": math.sqrt, "exp": math.exp, "log": math.log, "log10": math.log10,
+        "sin": math.sin, "cos": math.cos, "tan": math.tan
+    }
+
+    CONSTANTS = {"pi": math.pi, "e": math.e}
+
+    # Allowed operators:
+    BINARY = {
+        ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+        ast.Div: operator.truediv, ast.Pow: operator.pow, ast.Mod: operator.mod
+    }
+
+    UNARY = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+    __slots__ = ("text", "number", "names", "error", "_tree")
+
+    # Initializer:
+    def __init__(self, _text: str):
+
+        self.text   = str(_text).strip()
+        self.number = None
+        self.names  = frozenset()
+        self.error  = None
+        self._tree  = None
+
+        # Empty values are unset:
+        if not self.text:
+            return
+
+        # Plain numbers need no tree:
+        try:
+            self.number = float(self.text)
+
+        except ValueError:
+            pass
+
+        else:
+            if  not math.isfinite(self.number):
+                self.error  = f"Not a finite number `{self.text}`"
+                self.number = None
+
+            return
+
+        # Parse the expression (`^` is accepted as power, as in AMPL):
+        try:
+            self._tree = ast.parse(self.text.replace("^", "**"), mode="eval").body
+            self._validate(self._tree)
+
+        except SyntaxError as error:
+            self.error = f"Invalid expression `{self.text}`: {error.msg}"
+            self._tree = None
+            return
+
+        except ExpressionError as error:
+            self.error = str(error)
+            self._tree = None
+            return
+
+        self.names = frozenset(
+            _node.id for _node in ast.walk(self._tree)
+            if isinstance(_node, ast.Name) and _node.id not in self.FUNCTIONS and _node.id not in self.CONSTANTS
+        )
+
+    def __bool__(self):  return bool(self.text)
+
+    @property
+    def is_literal(self) -> bool:   return self._tree is None and self.error is None
+
+    def _validate(self, _node: ast.AST):
+
+        if isinstance(_node, ast.Constant) and isinstance(_node.value, int | float) and not isinstance(_node.value, bool):
+            return
+
+        if isinstance(_node, ast.Name):
+            return
+
+        if isinstance(_node, ast.BinOp) and type(_node.op) in self.BINARY:
+            self._validate(_node.left)
+            self._validate(_node.right)
+            return
+
+        if isinstance(_node, ast.UnaryOp) and type(_node.op) in self.UNARY:
+            self._validate(_node.operand)
+            return
+
+        if (
+            isinstance(_node, ast.Call) and
+            isinstance(_node.func, ast.Name) and
+            _node.func.id in self.FUNCTIONS and
+            not _node.keywords
+        ):
+            for _arg in _node.args:
+                self._validate(_arg)
+            return
+
+        raise ExpressionError(f"Unsupported syntax in `{self.text}`")
+
+    def evaluate(self, _lookup) -> float:
+        """
+        Evaluates the expression.
+
+        Parameters:
+            _lookup (Callable[[str], float]): Returns the value of a referenced symbol.
+
+        Returns:
+            float: The expression's value.
+        """
+
+        if self.number is not None:
+            return self.number
+
+        if self._tree is None:
+            raise ExpressionError(self.error or "No value")
+
+        try:
+            _value = float(self._evaluate(self._tree, _lookup))
+
+        except (ArithmeticError, ValueError, TypeError) as error:
+            if isinstance(error, ExpressionError):
+                raise
+
+            raise ExpressionError(f"Cannot evaluate `{self.text}`: {error}") from None
+
+        if not math.isfinite(_value):
+            raise ExpressionError(f"Cannot evaluate `{self.text}`: result is not finite")
+
+        return _value
+
+    def _evaluate(self, _node: ast.AST, _lookup):
+
+        if isinstance(_node, ast.Constant): return float(_node.value)
+        if isinstance(_node, ast.BinOp):    return self.BINARY[type(_node.op)](self._evaluate(_node.left, _lookup),
+                                                                               self._evaluate(_node.right, _lookup))
+        if isinstance(_node, ast.UnaryOp):  return self.UNARY[type(_node.op)](self._evaluate(_node.operand, _lookup))
+        if isinstance(_node, ast.Call):     return self.FUNCTIONS[_node.func.id](*[self._evaluate(_arg, _lookup)
+                                                                                   for _arg in _node.args])
+
+        # Names:
+        if _node.id in self.CONSTANTS:
+            return self.CONSTANTS[_node.id]
+
+        return _lookup(_node.id)
+
+# Class ParameterGraph: Lazily evaluated dependency-graph of parameter-expressions:
+class ParameterGraph:
+    """
+    Dependency-graph (DAG) of a node's parameters. Each parameter holds an `Expression`; values are computed on demand
+    and memoized. Changing a parameter only discards the memoized values of the parameter and of its (transitive)
+    dependents, nothing is re-parsed. Circular and unresolved references raise `ExpressionError` on evaluation.
+    """
+
+    # Initializer:
+    def __init__(self):
+
+        self._exprs = dict()                # Maps each symbol to its expression.
+        self._users = defaultdict(set)      # Maps each symbol to the symbols whose expressions reference it.
+        self._cache = dict()                # Memoized values.
+        self._stack = set()                 # Symbols being evaluated (for cycle-detection).
+
+    def __contains__(self, _symbol: str):   return _symbol in self._exprs
+
+    def __len__(self):                      return len(self._exprs)
+
+    def __iter__(self):                     return iter(self._exprs)
+
+    def expression(self, _symbol: str) -> Expression | None:   return self._exprs.get(_symbol)
+
+    def set(self, _symbol: str, _text: str) -> None:
+        """
+        Assigns a value or expression to a parameter, replacing the previous one. Unchanged text is not re-parsed.
+        """
+
+        _prev = self._exprs.get(_symbol)
+        if _prev is not None and _prev.text == str(_text).strip():
+            return
+
+        _expr = Expression(_text)
+        self.remove(_symbol)
+        self._exprs[_symbol] = _expr
+        for _name in _expr.names:
+            self._users[_name].add(_symbol)
+
+    def remove(self, _symbol: str) -> None:
+        """
+        Removes a parameter, its dependents become unresolved.
+        """
+
+        _prev = self._exprs.pop(_symbol, None)
+        if _prev is None:
+            return
+
+        for _name in _prev.names:
+            self._users[_name].discard(_symbol)
+
+        self.invalidate(_symbol)
+
+    def copy(self) -> "ParameterGraph":
+        """
+        Returns a copy of the graph that shares its parsed expressions (which are not modified once parsed) and its
+        memoized values, e.g. to try changes before applying them.
+        """
+
+        _copy = ParameterGraph()
+        _copy._exprs = dict(self._exprs)
+        _copy._users = defaultdict(set, {_name: set(_users) for _name, _users in self._users.items()})
+        _copy._cache = dict(self._cache)
+        return _copy
+
+    def invalidate(self, _symbol: str) -> None:
+        """
+        Discards the memoized values of `_symbol` and of every parameter that depends on it.
+        """
+
+        _stack = [_symbol]
+        while _stack:
+
+            _name = _stack.pop()
+            if self._cache.pop(_name, None) is not None or _name == _symbol:
+                _stack.extend(self._users.get(_name, ()))
+
+    def value(self, _symbol: str) -> float:
+        """
+        Returns the value of a parameter, evaluating (and memoizing) it and its dependencies if needed.
+        """
+
+        if _symbol in self._cache:
+            return self._cache[_symbol]
+
+        if _symbol not in self._exprs:
+            raise ExpressionError(f"Undefined symbol `{_symbol}`")
+
+        if _symbol in self._stack:
+            raise ExpressionError(f"Circular reference through `{_symbol}`")
+
+        self._stack.add(_symbol)
+        try:
+            _value = self._exprs[_symbol].evaluate(self.value)
+
+        finally:
+            self._stack.discard(_symbol)
+
+        self._cache[_symbol] = _value
+        return _value
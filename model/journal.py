@@ -0,0 +1,140 @@
+import bisect
+
+from dataclasses import dataclass, field
+from enum import Enum
+
+# Enum Change: Kinds of journaled changes:
+class Change(Enum):
+    ADDED    = 0
+    REMOVED  = 1
+    MODIFIED = 2
+
+# Class ChangeSet: Net changes between two revisions:
+@dataclass(slots=True)
+class ChangeSet:
+    """
+    Net effect of the changes between two revisions. Each record appears in at most one list: a record that was added
+    and removed in the range is omitted, one that was removed and re-added (e.g. by undo/redo) counts as modified.
+
+    Attributes:
+        revision (int): The revision that the changes lead up to.
+        added (list): Records that were added.
+        removed (list): Records that were removed.
+        modified (list): Records that were modified.
+    """
+
+    revision    : int
+    added       : list = field(default_factory=list)
+    removed     : list = field(default_factory=list)
+    modified    : list = field(default_factory=list)
+
+    def __bool__(self):  return bool(self.added or self.removed or self.modified)
+
+# Class ChangeJournal: Versioned log of model-changes:
+class ChangeJournal:
+    """
+    Versioned log of the records that were added to, removed from, or modified in a `SchemaModel`. Every change bumps
+    `revision`; consumers remember the revision they last saw and ask for the changes since then (see `since` and
+    `cursor`), so they can update in time proportional to the edit rather than to the model.
+
+    The journal keeps at most `limit` entries. When older entries are dropped, `since` returns None for revisions that
+    are no longer covered, and the consumer has to rebuild from the model.
+
+    Attributes:
+        revision (int): The current revision.
+        limit (int): Maximum number of retained entries.
+    """
+
+    # Initializer:
+    def __init__(self, _limit: int = 65536):
+
+        self.revision = 0
+        self.limit    = _limit
+
+        self._entries = list()  # (revision, change, record)-tuples in ascending revision-order.
+        self._oldest  = 0       # Oldest revision that `since` can answer.
+
+    def __len__(self):  return len(self._entries)
+
+    def log(self, _change: Change, _record) -> int:
+        """
+        Appends a change and returns the new revision.
+        """
+
+        self.revision += 1
+        self._entries.append((self.revision, _change, _record))
+
+        # Drop the older half once the limit is exceeded:
+        if len(self._entries) > self.limit:
+            _drop = len(self._entries) // 2
+            self._oldest = self._entries[_drop - 1][0]
+            del self._entries[:_drop]
+
+        return self.revision
+
+    def since(self, _revision: int) -> ChangeSet | None:
+        """
+        Returns the net changes after `_revision`.
+
+        Parameters:
+            _revision (int): A revision previously read from `revision`.
+
+        Returns:
+            ChangeSet | None: The changes, or None if the journal no longer covers `_revision`.
+        """
+
+        if _revision < self._oldest:
+            return None
+
+        # Per record: was it registered before the range, and is it registered after it?
+        _state = dict()
+        _start = bisect.bisect_right(self._entries, _revision, key=lambda _entry: _entry[0])
+        for _, _change, _record in self._entries[_start:]:
+
+            _before, _ = _state.get(_record, (_change != Change.ADDED, None))
+            _state[_record] = (_before, _change != Change.REMOVED)
+
+        _changes = ChangeSet(self.revision)
+        for _record, (_before, _after) in _state.items():
+            if   _before and _after:    _changes.modified.append(_record)
+            elif _after:                _changes.added.append(_record)
+            elif _before:               _changes.removed.append(_record)
+
+        return _changes
+
+    def cursor(self) -> "JournalCursor":
+        """
+        Returns a cursor positioned at the current revision.
+        """
+        return JournalCursor(self)
+
+# Class JournalCursor: A consumer's position in a journal:
+class JournalCursor:
+    """
+    Tracks the revision up to which a consumer has processed a journal.
+
+    Attributes:
+        revision (int): The last revision that was fetched.
+    """
+
+    # Initializer:
+    def __init__(self, _journal: ChangeJournal):
+
+        self.revision = _journal.revision
+        self._journal = _journal
+
+    def pending(self) -> bool:
+        """
+        Returns True if the journal has changes that were not fetched yet.
+        """
+        return self._journal.revision != self.revision
+
+    def fetch(self) -> ChangeSet | None:
+        """
+        Returns the changes since the last fetch and advances the cursor. Returns None if the journal no longer covers
+        the cursor's revision, in which case the consumer must rebuild from the model.
+        """
+
+        _changes = self._journal.since(self.revision)
+        self.revision = self._journal.revision
+        return _changes
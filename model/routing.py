@@ -0,0 +1,190 @@
+import bisect
+import heapq
+
+# Class OrthogonalRouter: Routes orthogonal paths around rectangles:
+class OrthogonalRouter:
+    """
+    Computes orthogonal (rectilinear) paths between two points that keep `margin` away from a set of rectangular
+    obstacles (e.g. the bounding-boxes of nodes and terminals). The router is headless and keeps no state between
+    calls, so routes can be computed off the GUI-thread.
+
+    Paths are found with A* over a sparse grid, whose lines run through the end-points and along the obstacles' borders
+    (inflated by `margin`), plus one line beyond the obstacles on every side. A path may run along a border but not
+    through an obstacle. Each bend costs `bend` on top of the path's length, so the router prefers few bends over a
+    slightly shorter path.
+
+    Both end-points leave their owner horizontally (handles sit on the left or right edge of their node): the path
+    starts with a stub from the start-point to the border of the obstacles that contain it, in the direction given by
+    `route()`'s `_exits`, and ends with such a stub into the end-point.
+
+    Attributes:
+        margin (float): Clearance between paths and obstacles.
+        bend (float): Cost of a bend, in units of length.
+    """
+
+    # Defaults:
+    MARGIN = 20.0
+    BEND   = 40.0
+
+    # Initializer:
+    def __init__(self, _margin: float = MARGIN, _bend: float = BEND):
+
+        self.margin = float(_margin)
+        self.bend   = float(_bend)
+
+    def route(self, _start: tuple, _end: tuple, _obstacles, _exits: tuple = (1, -1)) -> list | None:
+        """
+        Returns an orthogonal path from `_start` to `_end`.
+
+        Parameters:
+            _start (tuple): Start-point (x, y).
+            _end (tuple): End-point (x, y).
+            _obstacles (iterable): Rectangles (left, top, right, bottom) to route around, e.g. those in the corridor
+                between the end-points.
+            _exits (tuple): Horizontal directions (+1 right, -1 left) in which the path leaves `_start` and in which
+                it leaves `_end` (i.e. the side from which it enters `_end`).
+
+        Returns:
+            list | None: The path's corners as (x, y)-tuples, from `_start` to `_end`, or None if the end-points are
+            walled in.
+        """
+
+        _m = self.margin
+        _rects = [(_l - _m, _t - _m, _r + _m, _b + _m) for _l, _t, _r, _b in _obstacles]
+
+        # Stubs that lead out of the obstacles around the end-points:
+        _s = self.leave(_start, _exits[0], _rects)
+        _e = self.leave(_end,   _exits[1], _rects)
+
+        # Grid-lines, including a frame around everything:
+        _xs = {_s[0], _e[0]}
+        _ys = {_s[1], _e[1]}
+        for _l, _t, _r, _b in _rects:
+            _xs.update((_l, _r))
+            _ys.update((_t, _b))
+
+        _xs = sorted(_xs)
+        _ys = sorted(_ys)
+        _xs = [_xs[0] - _m] + _xs + [_xs[-1] + _m]
+        _ys = [_ys[0] - _m] + _ys + [_ys[-1] + _m]
+
+        # Grid-points strictly inside an obstacle, and grid-edges that cross one:
+        _nodes = set()
+        _horiz = set()      # (i, j) blocks the edge from (i, j) to (i + 1, j).
+        _verti = set()      # (i, j) blocks the edge from (i, j) to (i, j + 1).
+        for _l, _t, _r, _b in _rects:
+
+            _i0, _i1 = bisect.bisect_left(_xs, _l), bisect.bisect_left(_xs, _r)
+            _j0, _j1 = bisect.bisect_left(_ys, _t), bisect.bisect_left(_ys, _b)
+            for _i in range(_i0, _i1 + 1):
+                for _j in range(_j0, _j1 + 1):
+                    _inner_i = _i0 < _i < _i1
+                    _inner_j = _j0 < _j < _j1
+                    if _inner_i and _inner_j:   _nodes.add((_i, _j))
+                    if _inner_j and _i < _i1:   _horiz.add((_i, _j))
+                    if _inner_i and _j < _j1:   _verti.add((_i, _j))
+
+        _source = (_xs.index(_s[0]), _ys.index(_s[1]))
+        _target = (_xs.index(_e[0]), _ys.index(_e[1]))
+        _corners = self.search(_xs, _ys, _source, _target, _nodes, _horiz, _verti)
+        if  _corners is None:
+            return None
+
+        return self.simplify([_start] + _corners + [_end])
+
+    def search(self, _xs, _ys, _source, _target, _nodes, _horiz, _verti) -> list | None:
+        """
+        A* from `_source` to `_target` (grid-indices), returns the grid-points of the path or None. States are grid-
+        points paired with the direction of the last step (0 horizontal, 1 vertical), so that bends can be priced.
+        """
+
+        _tx, _ty = _xs[_target[0]], _ys[_target[1]]
+        def estimate(_i, _j):   return abs(_xs[_i] - _tx) + abs(_ys[_j] - _ty)
+
+        # Paths leave the start-stub, and enter the end-stub, horizontally:
+        _start = (_source[0], _source[1], 0)
+        _cost  = {_start: 0.0}
+        _prior = {_start: None}
+        _queue = [(estimate(*_source), 0.0, 0, _start)]
+        _count = 1
+
+        while _queue:
+
+            _, _g, _, _state = heapq.heappop(_queue)
+            if  _g > _cost.get(_state, float("inf")):
+                continue
+
+            _i, _j, _d = _state
+            if  (_i, _j) == _target:
+                break
+
+            for _di, _dj in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+
+                _ni, _nj = _i + _di, _j + _dj
+                if not (0 <= _ni < len(_xs) and 0 <= _nj < len(_ys)) or (_ni, _nj) in _nodes:
+                    continue
+
+                if  _di and (min(_i, _ni), _j) in _horiz:   continue
+                if  _dj and (_i, min(_j, _nj)) in _verti:   continue
+
+                _nd = 0 if _di else 1
+                _ng = _g + abs(_xs[_ni] - _xs[_i]) + abs(_ys[_nj] - _ys[_j]) + (self.bend if _nd != _d else 0.0)
+                if (_ni, _nj) == _target and _nd:
+                    _ng += self.bend
+
+                _next = (_ni, _nj, _nd)
+                if  _ng < _cost.get(_next, float("inf")):
+                    _cost[_next]  = _ng
+                    _prior[_next] = _state
+                    heapq.heappush(_queue, (_ng + estimate(_ni, _nj), _ng, _count, _next))
+                    _count += 1
+
+        else:
+            return None
+
+        _path = list()
+        while _state is not None:
+            _path.append((_xs[_state[0]], _ys[_state[1]]))
+            _state = _prior[_state]
+
+        return _path[::-1]
+
+    @staticmethod
+    def leave(_point: tuple, _side: int, _rects: list) -> tuple:
+        """
+        Returns the first point, going from `_point` in the horizontal direction `_side`, that is not strictly inside
+        any of the rectangles.
+        """
+
+        _x, _y = _point
+        _moved = True
+        while _moved:
+            _moved = False
+            for _l, _t, _r, _b in _rects:
+                if  _l < _x < _r and _t < _y < _b:
+                    _x = _r if _side > 0 else _l
+                    _moved = True
+
+        return _x, _y
+
+    @staticmethod
+    def simplify(_points: list) -> list:
+        """
+        Drops repeated points and the middle points of straight runs.
+        """
+
+        _kept = list()
+        for _point in _points:
+
+            if  _kept and _kept[-1] == _point:
+                continue
+
+            if  len(_kept) >= 2:
+                (_x0, _y0), (_x1, _y1) = _kept[-2], _kept[-1]
+                if (_x0 == _x1 == _point[0]) or (_y0 == _y1 == _point[1]):
+                    _kept[-1] = _point
+                    continue
+
+            _kept.append(_point)
+
+        return _kept
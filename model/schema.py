@@ -0,0 +1,316 @@
+from dataclasses import dataclass, field
+
+from .entity     import EntityClass, EntityRecord
+from .expression import ParameterGraph
+from .journal    import Change, ChangeJournal
+
+# Class NodeRecord: Plain data behind a node:
+@dataclass(slots=True, weakref_slot=True, eq=False)
+class NodeRecord:
+    """
+    Pure-Python record of a node: its title, geometry, variables (handles), parameters and equations.
+
+    Attributes:
+        uid (str): The node's unique identifier (e.g. N0000).
+        title (str): The node's title.
+        x, y (float): Scene-position of the node.
+        height (float): Height of the node's bounding-rectangle.
+        variables (list[EntityRecord]): Active input and output variables.
+        parameters (list[EntityRecord]): Active parameters.
+        equations (list[str]): Equations in residual form.
+        expressions (ParameterGraph): Values and expressions of the parameters, keyed by symbol.
+        children (SchemaModel | None): The grouped sub-system, if the node is a composite (see `Canvas.group_items`).
+        ports (dict[EntityRecord, EntityRecord]): Maps each boundary-handle's record (one of `variables`) to the
+            handle-record inside `children` that it stands for. Keyed by record, as symbols change (see `Table.commit`).
+    """
+
+    uid         : str = ""
+    title       : str = ""
+    x           : float = 0.0
+    y           : float = 0.0
+    height      : float = 150.0
+    variables   : list = field(default_factory=list)
+    parameters  : list = field(default_factory=list)
+    equations   : list = field(default_factory=list)
+    expressions : ParameterGraph = field(default_factory=ParameterGraph)
+    children    : "SchemaModel | None" = None
+    ports       : dict = field(default_factory=dict)
+
+# Class TerminalRecord: Plain data behind a source or sink terminal:
+@dataclass(slots=True, weakref_slot=True, eq=False)
+class TerminalRecord:
+    """
+    Pure-Python record of a stream-terminal.
+
+    Attributes:
+        uid (str): The terminal's unique identifier (e.g. T0123).
+        eclass (EntityClass): `EntityClass.OUT` for sources, `EntityClass.INP` for sinks.
+        x, y (float): Scene-position of the terminal.
+        socket (EntityRecord): The terminal's only handle.
+    """
+
+    uid     : str = ""
+    eclass  : EntityClass = EntityClass.OUT
+    x       : float = 0.0
+    y       : float = 0.0
+    socket  : EntityRecord = field(default_factory=EntityRecord)
+
+# Class ConnectorRecord: Plain data behind a connector:
+@dataclass(slots=True, eq=False)
+class ConnectorRecord:
+    """
+    Pure-Python record of a connection between an output-handle (origin) and an input-handle (target).
+
+    Attributes:
+        symbol (str): The connector's symbol (e.g. X0).
+        origin (EntityRecord): Record of the origin handle (EntityClass.OUT).
+        target (EntityRecord): Record of the target handle (EntityClass.INP).
+    """
+
+    symbol  : str
+    origin  : EntityRecord
+    target  : EntityRecord
+
+# Class SchemaModel: Headless graph-model of a schematic:
+class SchemaModel:
+    """
+    Pure-Python graph model of a schematic. It holds no graphics items, so schematics can be loaded, scripted and
+    exported without a scene. A `Canvas` mirrors its items into a model as they are created, deleted, undone and
+    redone (see `Canvas.model`), and can materialize graphics items from a model (see `Canvas.load_model`).
+
+    Attributes:
+        nodes (dict[str, NodeRecord]): Active nodes, keyed by UID.
+        terminals (dict[str, TerminalRecord]): Active terminals, keyed by UID.
+        connectors (dict[str, ConnectorRecord]): Active connectors, keyed by symbol.
+        journal (ChangeJournal): Records added, removed and modified per revision (see `touch`).
+    """
+
+    # Initializer:
+    def __init__(self):
+
+        self.nodes      = dict()
+        self.terminals  = dict()
+        self.connectors = dict()
+
+        # Maps each connected handle-record to its connector-record:
+        self._links = dict()
+
+        # Change-journal for incremental consumers:
+        self.journal = ChangeJournal()
+
+    def __len__(self):
+        return len(self.nodes) + len(self.terminals) + len(self.connectors)
+
+    # Registration ----------------------------------------------------------------------------------------------------
+    # Removal-methods only remove the record if it is the one registered under its key. This keeps the model consistent
+    # when an undo/redo sequence temporarily produces two items with the same UID.
+
+    # Additions and removals are journaled only if they change the model, so repeated registry-callbacks are harmless.
+
+    def add_node(self, _record: NodeRecord):
+        if self.nodes.get(_record.uid) is not _record:
+            self.nodes[_record.uid] = _record
+            self.journal.log(Change.ADDED, _record)
+
+    def add_terminal(self, _record: TerminalRecord):
+        if self.terminals.get(_record.uid) is not _record:
+            self.terminals[_record.uid] = _record
+            self.journal.log(Change.ADDED, _record)
+
+    def remove_node(self, _record: NodeRecord):
+        if self.nodes.get(_record.uid) is _record:
+            self.nodes.pop(_record.uid)
+            self.journal.log(Change.REMOVED, _record)
+
+    def remove_terminal(self, _record: TerminalRecord):
+        if self.terminals.get(_record.uid) is _record:
+            self.terminals.pop(_record.uid)
+            self.journal.log(Change.REMOVED, _record)
+
+    def add_connector(self, _record: ConnectorRecord):
+
+        if self.connectors.get(_record.symbol) is not _record:
+            self.connectors[_record.symbol] = _record
+            self.journal.log(Change.ADDED, _record)
+
+        self._links[_record.origin] = _record
+        self._links[_record.target] = _record
+
+    def remove_connector(self, _record: ConnectorRecord):
+
+        if self.connectors.get(_record.symbol) is _record:
+            self.connectors.pop(_record.symbol)
+            self.journal.log(Change.REMOVED, _record)
+
+        for _entity in (_record.origin, _record.target):
+            if self._links.get(_entity) is _record:
+                self._links.pop(_entity)
+
+    def touch(self, _record) -> None:
+        """
+        Journals a modification of a registered node-, terminal- or connector-record.
+        """
+        self.journal.log(Change.MODIFIED, _record)
+
+    # Queries ---------------------------------------------------------------------------------------------------------
+
+    def connector_of(self, _entity: EntityRecord) -> ConnectorRecord | None:
+        """
+        Returns the connector attached to a handle-record, or None if the handle is not connected.
+        """
+        return self._links.get(_entity)
+
+    def find_handle(self, _parent_uid: str, _symbol: str | int) -> EntityRecord | None:
+        """
+        Returns the handle-record identified by its owner's UID and its own symbol, or its index among the owner's
+        variables (the socket of a terminal has index 0).
+
+        Parameters:
+            _parent_uid (str): UID of the owning node or terminal.
+            _symbol (str | int): Symbol of the handle (e.g. R00, P01), or its index.
+
+        Returns:
+            EntityRecord | None: The handle's record, or None if there is no such handle.
+        """
+
+        if _parent_uid in self.terminals:
+            return self.terminals[_parent_uid].socket
+
+        _node = self.nodes.get(_parent_uid)
+        if _node is None:
+            return None
+
+        if  isinstance(_symbol, int):
+            return _node.variables[_symbol] if 0 <= _symbol < len(_node.variables) else None
+
+        return next((_var for _var in _node.variables if _var.symbol == _symbol), None)
+
+    def handle_index(self) -> dict:
+        """
+        Returns a hash-map from handle-identities to handle-records, used to resolve connectors in a single pass. Each
+        handle is keyed by (owner's UID, handle's index among the owner's variables), and by (owner's UID, handle's
+        class, handle's symbol) for connectors that were saved with symbols. Symbols are not unique on their own: an
+        input takes the symbol of the output it is connected to (see `Table.commit`), which may be the symbol of one of
+        its node's outputs, or of another of its inputs.
+
+        Returns:
+            dict[tuple, EntityRecord]: Handle-records keyed by their identity.
+        """
+
+        index = dict()
+        for _node in self.nodes.values():
+            for _index, _var in enumerate(_node.variables):
+                index[(_node.uid, _index)] = _var
+                index[(_node.uid, _var.eclass, _var.symbol)] = _var
+
+        for _term in self.terminals.values():
+            index[(_term.uid, 0)] = _term.socket
+            index[(_term.uid, _term.socket.eclass, _term.socket.symbol)] = _term.socket
+
+        return index
+
+    def position_index(self, _precision: int = 1) -> dict:
+        """
+        Returns a hash-map from rounded scene-coordinates to handle-records. Used to resolve connectors of schematics
+        that identify their endpoints by position only.
+
+        Parameters:
+            _precision (int): Number of decimals to which coordinates are rounded.
+
+        Returns:
+            dict[tuple[float, float], EntityRecord]: Handle-records keyed by their scene-position.
+        """
+
+        index = dict()
+        for _node in self.nodes.values():
+            for _var in _node.variables:
+                index[(round(_node.x + _var.x, _precision), round(_node.y + _var.y, _precision))] = _var
+
+        for _term in self.terminals.values():
+            _sock = _term.socket
+            index[(round(_term.x + _sock.x, _precision), round(_term.y + _sock.y, _precision))] = _sock
+
+        return index
+
+    def subset(self, _records: list) -> "SchemaModel":
+        """
+        Returns a new model that references the given records only. Connectors are kept if both endpoints belong to
+        the subset.
+
+        Parameters:
+            _records (list): Node- and terminal-records.
+
+        Returns:
+            SchemaModel: The sub-model.
+        """
+
+        _model = SchemaModel()
+        for _record in _records:
+            if isinstance(_record, NodeRecord)      : _model.add_node(_record)
+            if isinstance(_record, TerminalRecord)  : _model.add_terminal(_record)
+
+        _owned = {
+            id(_entity)
+            for _record in _model.nodes.values() for _entity in _record.variables
+        } | {
+            id(_record.socket) for _record in _model.terminals.values()
+        }
+
+        for _conn in self.connectors.values():
+            if id(_conn.origin) in _owned and id(_conn.target) in _owned:
+                _model.add_connector(_conn)
+
+        return _model
+
+    def clone(self) -> tuple["SchemaModel", dict]:
+        """
+        Returns a deep copy of the model, nested sub-systems included, whose records can be edited without affecting
+        this model's (e.g. the sub-system of a composite node, see `Canvas.group_items`).
+
+        Returns:
+            tuple[SchemaModel, dict[EntityRecord, EntityRecord]]: The copy, and a map from this model's handle-records
+            to their copies.
+        """
+
+        _model   = SchemaModel()
+        _handles = dict()
+
+        for _node in self.nodes.values():
+
+            _copy = NodeRecord(
+                uid       = _node.uid,
+                title     = _node.title,
+                x         = _node.x,
+                y         = _node.y,
+                height    = _node.height,
+                equations = list(_node.equations)
+            )
+
+            for _var in _node.variables:
+                _handles[_var] = _var.copy(parent=_copy)
+                _copy.variables.append(_handles[_var])
+
+            for _par in _node.parameters:
+                _copy.parameters.append(_par.copy(parent=_copy))
+                _copy.expressions.set(_par.symbol, _par.value)
+
+            if  _node.children is not None:
+                _copy.children, _inner = _node.children.clone()
+                _copy.ports = {
+                    _handles[_outer]: _inner[_handle] for _outer, _handle in _node.ports.items()
+                    if  _outer in _handles and _handle in _inner
+                }
+
+            _model.add_node(_copy)
+
+        for _term in self.terminals.values():
+
+            _copy = TerminalRecord(uid=_term.uid, eclass=_term.eclass, x=_term.x, y=_term.y)
+            _copy.socket = _handles[_term.socket] = _term.socket.copy(parent=_copy)
+            _model.add_terminal(_copy)
+
+        for _conn in self.connectors.values():
+            if _conn.origin in _handles and _conn.target in _handles:
+                _model.add_connector(ConnectorRecord(_conn.symbol, _handles[_conn.origin], _handles[_conn.target]))
+
+        return _model, _handles
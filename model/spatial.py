@@ -0,0 +1,131 @@
+import math
+
+# Class SpatialIndex: Uniform grid of rectangles:
+class SpatialIndex:
+    """
+    Uniform-grid index of axis-aligned rectangles, keyed by arbitrary hashable objects (e.g. node- and terminal-records,
+    see model/schema.py). Each key is filed under every grid-cell that its rectangle overlaps, so `query` visits only
+    the cells that overlap the queried rectangle and runs in time proportional to the number of keys found, not to the
+    number of keys indexed.
+
+    Rectangles are (left, top, right, bottom)-tuples. Cells should be about as large as the typical query (e.g. the
+    visible part of the canvas), and larger than the typical rectangle, so that most keys occupy a single cell.
+
+    Attributes:
+        cell (float): Width and height of each grid-cell.
+    """
+
+    # Default cell-size:
+    CELL = 1024.0
+
+    # Initializer:
+    def __init__(self, _cell: float = CELL):
+
+        if  _cell <= 0:
+            raise ValueError("Expected a positive cell-size")
+
+        self.cell   = float(_cell)
+        self._cells = dict()    # Maps each cell (column, row) to the set of keys that overlap it.
+        self._rects = dict()    # Maps each key to its rectangle.
+
+    def __len__(self):              return len(self._rects)
+
+    def __contains__(self, _key):   return _key in self._rects
+
+    def __iter__(self):             return iter(self._rects)
+
+    def rect(self, _key) -> tuple | None:
+        """
+        Returns the rectangle of `_key`, or None if the key is not indexed.
+        """
+        return self._rects.get(_key)
+
+    def insert(self, _key, _rect: tuple) -> None:
+        """
+        Files `_key` under `_rect`. If the key is already indexed, it is moved.
+        """
+
+        _old = self._rects.get(_key)
+        if  _old is not None:
+            if  self.span(_old) == self.span(_rect):
+                self._rects[_key] = _rect
+                return
+
+            self.remove(_key)
+
+        self._rects[_key] = _rect
+        for _cell in self.cells(_rect):
+            self._cells.setdefault(_cell, set()).add(_key)
+
+    def remove(self, _key) -> None:
+        """
+        Removes `_key` from the index, if it is indexed.
+        """
+
+        _rect = self._rects.pop(_key, None)
+        if  _rect is None:
+            return
+
+        for _cell in self.cells(_rect):
+            _keys = self._cells.get(_cell)
+            if  _keys is not None:
+                _keys.discard(_key)
+                if not _keys:   self._cells.pop(_cell)
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._rects.clear()
+
+    def query(self, _rect: tuple) -> set:
+        """
+        Returns the keys whose rectangles intersect `_rect`.
+        """
+
+        _left, _top, _right, _bottom = _rect
+        _found = set()
+
+        for _cell in self.cells(_rect):
+            for _key in self._cells.get(_cell, ()):
+                _x0, _y0, _x1, _y1 = self._rects[_key]
+                if  _x0 <= _right and _x1 >= _left and _y0 <= _bottom and _y1 >= _top:
+                    _found.add(_key)
+
+        return _found
+
+    def bounds(self) -> tuple | None:
+        """
+        Returns the bounding rectangle of all indexed rectangles, or None if the index is empty.
+        """
+
+        if not self._rects:
+            return None
+
+        _rects = self._rects.values()
+        return (
+            min(_rect[0] for _rect in _rects),
+            min(_rect[1] for _rect in _rects),
+            max(_rect[2] for _rect in _rects),
+            max(_rect[3] for _rect in _rects)
+        )
+
+    def span(self, _rect: tuple) -> tuple:
+        """
+        Returns the range of cells (first column, first row, last column, last row) that `_rect` overlaps.
+        """
+
+        return (
+            math.floor(_rect[0] / self.cell),
+            math.floor(_rect[1] / self.cell),
+            math.floor(_rect[2] / self.cell),
+            math.floor(_rect[3] / self.cell)
+        )
+
+    def cells(self, _rect: tuple):
+        """
+        Yields the cells (column, row) that `_rect` overlaps.
+        """
+
+        _c0, _r0, _c1, _r1 = self.span(_rect)
+        for _column in range(_c0, _c1 + 1):
+            for _row in range(_r0, _r1 + 1):
+                yield _column, _row
@@ -0,0 +1,169 @@
+import sys
+import threading
+import weakref
+
+from array       import array
+from collections import deque
+
+# Not-a-number marks an unset numeric field:
+NAN = float("nan")
+
+# Canonical text of a number, e.g. 100.0 -> "100", 0.1 -> "0.1":
+def format_real(_number: float) -> str:
+
+    if _number != _number:
+        return ""
+
+    _text = repr(_number)
+    return _text[:-2] if _text.endswith(".0") else _text
+
+# Class EntityStore: Struct-of-arrays storage for entity-records:
+class EntityStore:
+    """
+    Columnar (struct-of-arrays) storage behind every `EntityRecord`. Each record is a row in the store: text-fields
+    are kept as interned strings, numeric fields (value, sigma, minimum, maximum) and coordinates as packed doubles.
+    Numeric fields that hold text which is not a plain number (e.g. an expression) keep that text in a sparse
+    overflow-map, so reading a field always returns exactly what was written.
+
+    Whole-model scans can work on the packed columns directly (see `column()` and `live`), e.g. to find every entity
+    whose value is unset.
+
+    Rows are allocated and reset under a lock, so records can be created off the GUI-thread (e.g. by the schematic
+    loader, see tabs/schema/loader.py) while others are created or collected on it. Records release their rows when
+    they are collected, which may happen during any allocation, including one that holds the lock: released rows are
+    queued without locking, and reset by the next call that holds the lock (see `release()`).
+
+    Parents are held by weak reference: the parent holds its entity-records, and a strong reference from the
+    (process-wide) store would keep both alive, so the records would never release their rows.
+
+    Attributes:
+        live (bytearray): 1 for rows held by a record, 0 for released rows.
+    """
+
+    # Text-columns, numeric columns and coordinates:
+    TEXT = ("uid", "info", "label", "units", "symbol", "strid", "color")
+    REAL = ("value", "sigma", "minimum", "maximum")
+    XY   = ("x", "y")
+
+    # Defaults of text-columns:
+    DEFAULT = {"strid": "Default", "color": "#808080"}
+
+    # Initializer:
+    def __init__(self):
+
+        # Columns:
+        self._text = {_name: list() for _name in self.TEXT}
+        self._real = {_name: array("d") for _name in self.REAL + self.XY}
+        self._over = {_name: dict() for _name in self.REAL}
+
+        self._eclass = list()
+        self._parent = list()
+
+        # Row-management:
+        self.live     = bytearray()
+        self._free    = list()
+        self._pending = deque()     # Released rows that have not been reset yet.
+        self._lock    = threading.Lock()
+
+    def __len__(self):  return len(self.live) - len(self._free) - len(self._pending)
+
+    # Row-management ---------------------------------------------------------------------------------------------------
+
+    def allocate(self) -> int:
+        """
+        Returns a row with default values, re-using released rows first.
+        """
+
+        with self._lock:
+
+            self.reset()
+            if self._free:
+                _row = self._free.pop()
+                self.live[_row] = 1
+                return _row
+
+            for _name, _column in self._text.items():   _column.append(self.DEFAULT.get(_name, ""))
+            for _name, _column in self._real.items():   _column.append(NAN if _name in self.REAL else 0.0)
+
+            self._eclass.append(None)
+            self._parent.append(None)
+            self.live.append(1)
+
+            return len(self.live) - 1
+
+    def release(self, _row: int) -> None:
+        """
+        Marks a row for re-use. The row is reset now if the lock is free, else by the call that holds it (a record
+        collected by the garbage-collector during `allocate()` must not wait for the lock that `allocate()` holds).
+        """
+
+        self._pending.append(_row)
+        if  self._lock.acquire(blocking=False):
+            try:
+                self.reset()
+            finally:
+                self._lock.release()
+
+    def reset(self) -> None:
+        """
+        Resets the released rows to their default values. Must be called with the lock held.
+        """
+
+        while self._pending:
+
+            _row = self._pending.popleft()
+            for _name, _column in self._text.items():   _column[_row] = self.DEFAULT.get(_name, "")
+            for _name, _column in self._real.items():   _column[_row] = NAN if _name in self.REAL else 0.0
+            for _over in self._over.values():           _over.pop(_row, None)
+
+            self._eclass[_row] = None
+            self._parent[_row] = None
+            self.live[_row] = 0
+            self._free.append(_row)
+
+    # Field-access -----------------------------------------------------------------------------------------------------
+
+    def get(self, _name: str, _row: int):
+
+        if _name in self._text:     return self._text[_name][_row]
+        if _name in self._over:     return self._over[_name].get(_row) or format_real(self._real[_name][_row])
+        if _name in self._real:     return self._real[_name][_row]
+        if _name == "eclass":       return self._eclass[_row]
+        if _name == "parent":       return self._parent[_row]() if self._parent[_row] is not None else None
+
+        raise KeyError(_name)
+
+    def set(self, _name: str, _row: int, _value) -> None:
+
+        if _name in self._text:
+            self._text[_name][_row] = sys.intern(str(_value))
+
+        elif _name in self._over:
+
+            _text = str(_value)
+            try:
+                _number = float(_text) if _text else NAN
+            except ValueError:
+                _number = NAN
+
+            # Keep the text if the number does not reproduce it:
+            self._real[_name][_row] = _number
+            if format_real(_number) != _text:   self._over[_name][_row] = sys.intern(_text)
+            else:                               self._over[_name].pop(_row, None)
+
+        elif _name in self._real:   self._real[_name][_row] = float(_value)
+        elif _name == "eclass":     self._eclass[_row] = _value
+        elif _name == "parent":     self._parent[_row] = weakref.ref(_value) if _value is not None else None
+
+        else:
+            raise KeyError(_name)
+
+    def column(self, _name: str) -> array:
+        """
+        Returns a packed numeric column (value, sigma, minimum, maximum, x or y). Released rows hold NaN (or 0.0 for
+        coordinates), use `live` to skip them.
+        """
+        return self._real[_name]
+
+# Process-wide store, used by records that are not given one explicitly:
+SHARED_STORE = EntityStore()
@@ -0,0 +1,58 @@
+from typing import Any, Callable
+
+# Class TrackedDict: A dictionary that reports every change to a callback:
+class TrackedDict(dict):
+    """
+    Dictionary that invokes `callback(key, value)` after every insertion or update, and `callback(key, None)` after
+    every removal. The canvas uses it for its item-registries (`node_db`, `term_db`, `conn_db`) and nodes use it for
+    their entity-registries, so that the schema model is kept in sync no matter which module mutates the registry.
+    """
+
+    # Initializer:
+    def __init__(self, callback: Callable[[Any, Any], None]):
+
+        # Initialize base-class:
+        super().__init__()
+
+        # Store callback:
+        self._callback = callback
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._callback(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._callback(key, None)
+
+    def pop(self, key, *default):
+
+        # Fall back to the base-class' behaviour for missing keys:
+        if key not in self:
+            return super().pop(key, *default)
+
+        value = super().pop(key)
+        self._callback(key, None)
+        return value
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._callback(key, None)
+        return key, value
+
+    def setdefault(self, key, default = None):
+        if key not in self:
+            self[key] = default
+
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        keys = list(self.keys())
+        super().clear()
+
+        for key in keys:
+            self._callback(key, None)
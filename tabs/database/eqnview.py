@@ -2,11 +2,12 @@ import re
 import weakref
 
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QIcon, QShortcut, QKeySequence
+from PyQt6.QtGui import QShortcut, QKeySequence
 from PyQt6.QtWidgets import QListWidget, QWidget, QMenu, QTextEdit, QDialog, QVBoxLayout, QListWidgetItem, QAbstractItemView, QMessageBox
 
 from custom import EntityClass
 from tabs.schema import Canvas
+from util import load_icon
 
 # Class Equation-View:
 class EqnView(QListWidget):
@@ -152,11 +153,12 @@ class EqnView(QListWidget):
     def insert_item(self, equation):
 
         item = QListWidgetItem(equation)
-        item.setIcon(QIcon("rss/icons/trash.png"))
+        item.setIcon(load_icon("rss/icons/trash.png"))
         item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)
 
         self.addItem(item)
         self._node()[EntityClass.EQN].append(equation)
+        self._node().sig_item_updated.emit()
 
     # Fetch and display node's equations
     def fetch(self):
@@ -174,7 +176,7 @@ class EqnView(QListWidget):
 
             # Create a list-item for each equation:
             item = QListWidgetItem(equation)
-            item.setIcon(QIcon("rss/icons/trash.png"))
+            item.setIcon(load_icon("rss/icons/trash.png"))
             item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)
             self.addItem(item)
 
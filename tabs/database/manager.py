@@ -68,8 +68,11 @@ class DataManager(QWidget):
     # Tree-item selected:
     def on_tree_item_selected(self, nuid: str, huid: str):
 
-        # Find node using UID:
+        # Find node using UID, paging it in if it is paged out (selected items are not paged out again):
         node = self._canvas.find_node(nuid)
+        if  node is None and nuid in self._canvas.model.nodes:
+            node = self._canvas.pager.fetch(self._canvas.model.nodes[nuid])
+            node.setSelected(True)
 
         # Display data for node:
         self._sheets.setRowCount(0)
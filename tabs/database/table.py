@@ -1,12 +1,14 @@
 import weakref
 
 from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QtMsgType
-from PyQt6.QtGui import QShortcut, QKeySequence, QIcon, QAction
+from PyQt6.QtGui import QShortcut, QKeySequence, QAction
 from PyQt6.QtWidgets import QMenu, QTableWidget, QWidget, QHeaderView, QTableWidgetItem, QInputDialog, QMessageBox
 
 from custom.dialog import Dialog
 from custom.entity import Entity, EntityClass, EntityState
+from model import Expression, ExpressionError, ParameterGraph, format_real
 from tabs.schema.graph import Node, Handle
+from util import load_icon
 
 class Table(QTableWidget):
 
@@ -80,7 +82,7 @@ class Table(QTableWidget):
         super().insertRow(row)
 
         # Create QTableWidgetItems:
-        symb_item = QTableWidgetItem(QIcon("rss/icons/variable.png"), handle.symbol)
+        symb_item = QTableWidgetItem(load_icon("rss/icons/variable.png"), handle.symbol)
         symb_item.setFlags(symb_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
         symb_item.setData(Qt.ItemDataRole.UserRole, "Variable")
 
@@ -124,7 +126,7 @@ class Table(QTableWidget):
         super().insertRow(row)
 
         # Create QTableWidgetItems:
-        symb_item = QTableWidgetItem(QIcon("rss/icons/parameter.png"), entity.symbol)
+        symb_item = QTableWidgetItem(load_icon("rss/icons/parameter.png"), entity.symbol)
         symb_item.setData(Qt.ItemDataRole.UserRole, "Parameter")
 
         name_item = QTableWidgetItem(entity.info)
@@ -149,9 +151,13 @@ class Table(QTableWidget):
         inter_item = QTableWidgetItem()
         inter_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
 
+        # Auto: The value is an expression of other parameters, its evaluated value is displayed alongside:
         auto_item = QTableWidgetItem()
-        auto_item.setFlags(auto_item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+        auto_item.setFlags((auto_item.flags() | Qt.ItemFlag.ItemIsUserCheckable) & ~Qt.ItemFlag.ItemIsEditable)
         auto_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        auto_item.setCheckState(
+            Qt.CheckState.Unchecked if Expression(entity.value).is_literal else Qt.CheckState.Checked
+        )
 
         self.setItem(row, 0, symb_item)
         self.setItem(row, 1, name_item)
@@ -212,6 +218,9 @@ class Table(QTableWidget):
             if state == EntityState.ACTIVE:
                 self.add_params(parameter)
 
+        # Display the values of expression-parameters:
+        self.show_values(node.record.expressions)
+
         # Unblock signals:
         self.blockSignals(False)
 
@@ -266,13 +275,87 @@ class Table(QTableWidget):
 
         return fields
 
+    # Display the evaluated values of expression-parameters:
+    def show_values(self, graph: ParameterGraph):
+
+        _blocked = self.blockSignals(True)
+        for row in range(self.rowCount()):
+
+            item = self.item(row, 9)
+            if row in self._hmap or item is None:
+                continue
+
+            if item.checkState() != Qt.CheckState.Checked:
+                item.setText("")
+                continue
+
+            try:
+                item.setText(format_real(graph.value(self.cell_data(row, 0))))
+            except ExpressionError:
+                item.setText("?")
+
+        self.blockSignals(_blocked)
+
+    # Validate parameter-values before they are committed:
+    def validate(self) -> ParameterGraph | None:
+        """
+        Applies the table's parameters to a copy of the node's expression-graph and evaluates it. Only the values
+        that were changed are parsed, and only they and their dependents are evaluated again.
+
+        Returns:
+            ParameterGraph | None: The graph, or None if a value is invalid (the errors are shown to the user).
+        """
+
+        node   = self._node() if self._node else None
+        graph  = node.record.expressions.copy() if node is not None else ParameterGraph()
+        rows   = [row for row in range(self.rowCount()) if row not in self._hmap]
+        errors = list()
+
+        # Parameters whose rows were deleted (or renamed):
+        symbols = {self.cell_data(row, 0) for row in rows}
+        for symbol in [symbol for symbol in graph if symbol not in symbols]:
+            graph.remove(symbol)
+
+        for row in rows:
+            graph.set(self.cell_data(row, 0), self.cell_data(row, 4))
+
+        for row in rows:
+
+            symbol = self.cell_data(row, 0)
+            expr   = graph.expression(symbol)
+            auto   = self.item(row, 9) and self.item(row, 9).checkState() == Qt.CheckState.Checked
+
+            if not auto and not expr.is_literal:
+                errors.append(f"{symbol}: `{expr.text}` is not a number (check `Auto` to enter an expression)")
+
+            elif auto:
+                try:
+                    graph.value(symbol)
+                except ExpressionError as error:
+                    errors.append(f"{symbol}: {error}")
+
+        if errors:
+            _error = Dialog(QtMsgType.QtCriticalMsg, "\n".join(errors), QMessageBox.StandardButton.Ok)
+            _error.exec()
+            return None
+
+        return graph
+
     def commit(self):
 
         # Abort if no node has been set:
         if self._node() is None: return
 
-        # Clear the node's parameters and equations:
-        self._node()[EntityClass.PAR].clear()
+        # Abort if a parameter's value is invalid:
+        graph = self.validate()
+        if graph is None: return
+
+        # The node's parameters by symbol, those left over once the rows have been matched are removed:
+        parameters = dict()
+        for entity in self._node()[EntityClass.PAR]:
+            parameters.setdefault(entity.symbol, entity)
+
+        removed = set(self._node()[EntityClass.PAR]) - set(parameters.values())
 
         # Save defined parameters:
         for row in range(self.rowCount()):
@@ -302,11 +385,17 @@ class Table(QTableWidget):
                     conjugate.minimum = self.cell_data(row, 5)
                     conjugate.maximum = self.cell_data(row, 6)
 
-            # Update the node's parameters:
+            # Update the node's parameters, only changed values are re-assigned in the expression-graph:
             else:
-                entity = Entity()
-                entity.eclass  = EntityClass.PAR
-                entity.symbol  = self.cell_data(row, 0)
+                entity = parameters.pop(self.cell_data(row, 0), None)
+                if  entity is None:
+                    entity = Entity()
+                    entity.eclass = EntityClass.PAR
+                    entity.symbol = self.cell_data(row, 0)
+
+                elif entity.value != self.cell_data(row, 4):
+                    self._node().record.expressions.set(entity.symbol, self.cell_data(row, 4))
+
                 entity.info    = self.cell_data(row, 1)
                 entity.units   = self.cell_data(row, 2)
                 entity.strid   = self.cell_data(row, 3)
@@ -315,10 +404,19 @@ class Table(QTableWidget):
                 entity.maximum = self.cell_data(row, 6)
                 entity.sigma   = self.cell_data(row, 7)
 
-                # Add parameter to dictionary:
-                self._node()[EntityClass.PAR, entity] = EntityState.ACTIVE
+                # Add new (or re-activate disabled) parameters:
+                if  self._node()[EntityClass.PAR].get(entity) != EntityState.ACTIVE:
+                    self._node()[EntityClass.PAR, entity] = EntityState.ACTIVE
 
-        # Notify manager:
+        # Remove the parameters whose rows were deleted:
+        for entity in removed | set(parameters.values()):
+            self._node()[EntityClass.PAR].pop(entity)
+
+        # Display the values of expression-parameters:
+        self.show_values(self._node().record.expressions)
+
+        # Notify canvas and manager:
+        self._node().sig_item_updated.emit()
         self._unsaved = False
         self.sig_table_modified.emit(self._node(), self._unsaved)
 
@@ -1,13 +1,14 @@
 import logging
 
 from PyQt6.QtCore import pyqtSignal, Qt
-from PyQt6.QtGui import QIcon
 from PyQt6.QtWidgets import QTreeWidget, QWidget, QHeaderView, QTreeWidgetItem
 
-from custom import EntityClass, EntityState
+from custom import EntityClass
+from model import NodeRecord
 
 from tabs.schema.canvas import Canvas
 from tabs.schema.graph import Node
+from util import load_icon
 
 class Tree(QTreeWidget):
 
@@ -22,6 +23,8 @@ class Tree(QTreeWidget):
 
         # Save canvas reference:
         self._canvas = canvas
+        self._cursor = None     # Position in the canvas' change-journal, None until the first full reload.
+        self._items  = dict()   # Maps node-records to their top-level items.
 
         # Customize column-header:
         self.setHeaderLabels(["ID", "NAME", "ATTR"])
@@ -43,41 +46,77 @@ class Tree(QTreeWidget):
         if not isinstance(_canvas, Canvas):
             raise ValueError("Expected argument of type `Canvas`")
 
+        # Update incrementally if the canvas' journal covers the changes since the last reload:
+        if  _canvas is self._canvas and self._cursor is not None:
+            changes = self._cursor.fetch()
+            if  changes is not None:
+                self.update_items(changes)
+                return
+
         # Store canvas reference:
         self._canvas = _canvas
+        self._cursor = _canvas.model.journal.cursor()
 
         # Debugging:
         logging.info("Reloading graph-data")
 
         # Clear tree and dictionary:
         self.clear()
+        self._items.clear()
+
+        # Add top-level root (records of paged-out nodes included, see tabs/schema/graph/pager.py):
+        for record in self._canvas.model.nodes.values():
+            self.add_node_item(record)
+
+    # Apply journaled changes:
+    def update_items(self, changes):
+
+        # Remove the items of removed nodes:
+        for record in changes.removed:
+            item = self._items.pop(record, None)
+            if  item is not None:
+                self.takeTopLevelItem(self.indexOfTopLevelItem(item))
+
+        # Refresh the items of modified nodes, create items for added nodes:
+        for record in changes.modified + changes.added:
+
+            if  not isinstance(record, NodeRecord) or self._canvas.model.nodes.get(record.uid) is not record:
+                continue
 
-        # Add top-level root:
-        for node, state in self._canvas.node_db.items():
-            if  state:
-                self.add_node_item(node)
+            item = self._items.get(record)
+            if  item is None:   self.add_node_item(record)
+            else:               self.fill_node_item(item, record)
 
     # Add top-level root:
-    def add_node_item(self, node: Node):
+    def add_node_item(self, record: NodeRecord):
 
         # Create a top-level item:
-        item = QTreeWidgetItem(self, [node.uid, node.title, "None"])
-        item.setIcon(0, QIcon("rss/icons/checked.png"))
+        item = QTreeWidgetItem(self)
+        self._items[record] = item
+        self.fill_node_item(item, record)
+
+    # Display a node's attributes and entities:
+    def fill_node_item(self, item: QTreeWidgetItem, record: NodeRecord):
+
+        item.takeChildren()
+        item.setText(0, record.uid)
+        item.setText(1, record.title)
+        item.setText(2, "None")
+        item.setIcon(0, load_icon("rss/icons/checked.png"))
         item.setTextAlignment(1, Qt.AlignmentFlag.AlignCenter)
         item.setTextAlignment(2, Qt.AlignmentFlag.AlignCenter)
 
         # Fetch the node's variable(s) and parameter(s):
-        for variable, state in node[EntityClass.VAR].items():
-            if state == EntityState.ACTIVE:
-                _eclass = "Input" if variable.eclass == EntityClass.INP else "Output"
-                var_item = QTreeWidgetItem(item, [variable.symbol, variable.label, _eclass])
-                var_item.setIcon(0, QIcon("rss/icons/variable.png"))
-                var_item.setTextAlignment(1, Qt.AlignmentFlag.AlignCenter)
-                var_item.setTextAlignment(2, Qt.AlignmentFlag.AlignCenter)
-
-        for parameter in node[EntityClass.PAR]:
+        for variable in record.variables:
+            _eclass = "Input" if variable.eclass == EntityClass.INP else "Output"
+            var_item = QTreeWidgetItem(item, [variable.symbol, variable.label, _eclass])
+            var_item.setIcon(0, load_icon("rss/icons/variable.png"))
+            var_item.setTextAlignment(1, Qt.AlignmentFlag.AlignCenter)
+            var_item.setTextAlignment(2, Qt.AlignmentFlag.AlignCenter)
+
+        for parameter in record.parameters:
             par_item = QTreeWidgetItem(item, [parameter.symbol, "EntityClass.PAR"])
-            par_item.setIcon(0, QIcon("rss/icons/parameter.png"))
+            par_item.setIcon(0, load_icon("rss/icons/parameter.png"))
             par_item.setTextAlignment(1, Qt.AlignmentFlag.AlignCenter)
             par_item.setTextAlignment(2, Qt.AlignmentFlag.AlignCenter)
 
@@ -104,8 +143,8 @@ class Tree(QTreeWidget):
         if len(items) != 1:
             return
 
-        if unsaved  :   items[0].setIcon(0, QIcon("rss/icons/exclamation.png"))
-        else        :   items[0].setIcon(0, QIcon("rss/icons/checked.png"))
+        if unsaved  :   items[0].setIcon(0, load_icon("rss/icons/exclamation.png"))
+        else        :   items[0].setIcon(0, load_icon("rss/icons/checked.png"))
 
 
 
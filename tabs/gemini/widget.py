@@ -92,8 +92,8 @@ class Gui(QFrame):
         if not bool(self._prompt.toPlainText()):
             return
 
-        # First, try to encode the canvas as JSON:
-        _json = JsonLib.encode_json(self._canvas)
+        # First, try to encode the canvas as JSON (version 1, which the assistant's instructions describe):
+        _json = JsonLib.encode_json(self._canvas, _legacy=True)
 
         thread = Thread(self.gemini,
                         self._prompt.toPlainText(),
@@ -1,8 +1,8 @@
 from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtWidgets import QWidget, QGridLayout, QTextEdit, QLabel, QPushButton, QFrame, QStackedWidget, QTabWidget
 
-from custom.entity import EntityClass, EntityState
 from custom.separator import Separator
+from model import Expression, ExpressionError, NodeRecord, format_real
 
 from tabs.optima.ampl import AMPLEngine
 from tabs.optima.objective import ObjectiveSetup
@@ -103,6 +103,26 @@ class Optimizer(QWidget):
         # Clear editor:
         self._editor.clear()
 
+        # Abort with an error-message if a value is not a number or its expression cannot be evaluated:
+        try:
+            self._editor.setText(self.script())
+
+        except ExpressionError as error:
+            self._result.setText(f"Invalid value: {error}")
+            self._tabwid.setCurrentWidget(self._result)
+
+    # Returns a value or bound as a number (in AMPL-syntax):
+    @staticmethod
+    def number(_symbol: str, _text: str) -> str:
+
+        _expr = Expression(_text)
+        if not _expr.is_literal:
+            raise ExpressionError(f"{_symbol}: `{_expr.text}` is not a number")
+
+        return format_real(_expr.number)
+
+    def script(self) -> str:
+
         var_set = set()
         par_set = set()
 
@@ -121,14 +141,17 @@ class Optimizer(QWidget):
         obj_section = "# Objective(s):\n"
         par_section = "# Parameter(s):\n"
 
-        for terminal, state in self._canvas.term_db.items():
+        # The script is built from the canvas' model, which holds every record, including those whose items are paged
+        # out (see tabs/schema/graph/pager.py):
+        model = self._canvas.model
 
-            # Skip unconnected terminals or hidden terminals::
+        for terminal in model.terminals.values():
+
+            # Skip unconnected terminals:
             if (
-                not bool(terminal.socket.label) or 
-                not terminal.socket.connected or
-                not state
-            ):  
+                not bool(terminal.socket.label) or
+                model.connector_of(terminal.socket) is None
+            ):
                 continue
 
             # Define entity name:
@@ -142,7 +165,7 @@ class Optimizer(QWidget):
 
                 if bool(terminal.socket.value): # If value is provided, define entity as parameter
 
-                    par_section = f"param TOTAL_{terminal.socket.label} = {terminal.socket.value};\n"
+                    par_section += f"param {entity_name} = {self.number(entity_name, terminal.socket.value)};\n"
                     par_set.add(entity_name)
 
                     # Map variable name to entity:
@@ -160,30 +183,25 @@ class Optimizer(QWidget):
                     # eqn_section += f"{eqn_prfx}{ecount}: {equation}\n"
                     #ecount += 1
 
-        for node, state in self._canvas.node_db.items():
-
-            # Skip hidden nodes:
-            if not state: continue
+        for node in model.nodes.values():
 
             n_prefix = node.uid
-            var_list = [
-                variable for variable, state in node[EntityClass.VAR].items() 
-                if state == EntityState.ACTIVE
-            ]
-
-            par_list = [
-                parameter for parameter, state in node[EntityClass.PAR].items()
-                if state == EntityState.ACTIVE
-            ]
+            var_list = node.variables
+            par_list = node.parameters
 
             print(f"Node has {len(var_list)} variables and {len(par_list)} parameters")
 
+            # Variables are named after their connectors, parameters are prefixed with the node's UID:
+            replacements = dict()
+
             for variable in var_list:
 
                 # Null-check:
-                if variable.connector is None:  continue
+                connector = model.connector_of(variable)
+                replacements[variable.symbol] = connector.symbol if connector else None
+                if connector is None:  continue
 
-                symbol = variable.connector().symbol
+                symbol = connector.symbol
                 self.entity_map[symbol] = variable
 
                 # If the variable is already declared, skip processing:
@@ -193,7 +211,7 @@ class Optimizer(QWidget):
                 # Declare variable (as a parameter if its value is defined):
                 if  bool(variable.value):
                     par_set.add(symbol)
-                    par_section += f"param {symbol} = {variable.value};\n"
+                    par_section += f"param {symbol} = {self.number(symbol, variable.value)};\n"
 
                 else:
                     var_set.add(symbol)
@@ -201,27 +219,28 @@ class Optimizer(QWidget):
 
                     # If bounds are provided, add them as equations:
                     if  bool(variable.minimum):
-                        eqn_section += f"{eqn_prfx}{ecount}: {symbol} - {variable.minimum} >= 0.0;\n"
+                        eqn_section += f"{eqn_prfx}{ecount}: {symbol} - {self.number(symbol, variable.minimum)} >= 0.0;\n"
                         ecount += 1
 
                     if  bool(variable.maximum):
-                        eqn_section += f"{eqn_prfx}{ecount}: {symbol} - {variable.maximum} <= 0.0;\n"
+                        eqn_section += f"{eqn_prfx}{ecount}: {symbol} - {self.number(symbol, variable.maximum)} <= 0.0;\n"
                         ecount += 1
 
             for parameter in par_list:
 
                 # Convenience variable:
                 symbol = f"{n_prefix}_{parameter.symbol}"
+                replacements[parameter.symbol] = symbol
                 self.entity_map[symbol] = parameter
 
                 # If parameter has already been declared, skip processing:
                 if symbol in var_set | par_set:
                     continue
 
-                # If the parameter doesn't have a value, declare it as a variable
+                # If the parameter doesn't have a value, declare it as a variable (expressions are evaluated first):
                 if  bool(parameter.value):
                     par_set.add(symbol)
-                    par_section += f"param {symbol} = {parameter.value};\n"
+                    par_section += f"param {symbol} = {format_real(node.expressions.value(parameter.symbol))};\n"
 
                 else:
                     var_set.add(symbol)
@@ -229,16 +248,35 @@ class Optimizer(QWidget):
 
                     # If bounds are provided, add them as equations:
                     if  bool(parameter.minimum):
-                        eqn_section += f"{eqn_prfx}{ecount}: {symbol} - {parameter.minimum} >= 0.0;\n"
+                        eqn_section += f"{eqn_prfx}{ecount}: {symbol} - {self.number(symbol, parameter.minimum)} >= 0.0;\n"
                         ecount += 1
 
                     if  bool(parameter.maximum):
-                        eqn_section += f"{eqn_prfx}{ecount}: {symbol} - {parameter.maximum} <= 0.0;\n"
+                        eqn_section += f"{eqn_prfx}{ecount}: {symbol} - {self.number(symbol, parameter.maximum)} <= 0.0;\n"
                         ecount += 1
 
-            for equation in node.substituted():
-                eqn_section += f"{eqn_prfx}{ecount}: {equation};\n"
-                ecount += 1
+            # Composite nodes declare their sub-system (names inside it are prefixed with the composite's UID):
+            if  node.children is not None:
+
+                _symbols = {
+                    node.ports[variable]: connector.symbol if (connector := model.connector_of(variable)) else None
+                    for variable in var_list if variable in node.ports
+                }
+
+                _pars, _vars, _eqns = self.composite(node, _symbols, n_prefix, var_set, par_set)
+                par_section += _pars
+                var_section += _vars
+                for equation in _eqns:
+                    eqn_section += f"{eqn_prfx}{ecount}: {equation};\n"
+                    ecount += 1
+
+            # Equations of unconnected variables are left out:
+            for equation in node.equations:
+
+                tokens = [replacements.get(token, token) for token in equation.split(' ')]
+                if  None not in tokens:
+                    eqn_section += f"{eqn_prfx}{ecount}: {' '.join(tokens)};\n"
+                    ecount += 1
 
         dictionary = self._obj.get_objectives()
         objectives = dictionary.keys()
@@ -248,8 +286,103 @@ class Optimizer(QWidget):
                 obj_section += f"{dictionary[objective].lower()} obj_{ocount}: {objective};\n"
                 ocount    += 1
 
-        script = f"{scr_prfx}\n{par_section}\n{var_section}\n{obj_section}\n{eqn_section}"
-        self._editor.setText(script)
+        return f"{scr_prfx}\n{par_section}\n{var_section}\n{obj_section}\n{eqn_section}"
+
+    def composite(self, _record: NodeRecord, _symbols: dict, _prefix: str, var_set: set, par_set: set):
+        """
+        Declares the sub-system of a composite node (see `Canvas.group_items`), recursing into nested composites.
+
+        Parameters:
+            _record (NodeRecord): The composite node's record.
+            _symbols (dict): Maps each inner handle-record behind a boundary-handle to its symbol outside the composite
+                (None if the boundary-handle is not connected).
+            _prefix (str): Prefix of the names inside the sub-system.
+            var_set (set): Declared variables (updated).
+            par_set (set): Declared parameters (updated).
+
+        Returns:
+            tuple[str, str, list[str]]: Parameter-declarations, variable-declarations and equations.
+        """
+
+        _model = _record.children
+        par_section = str()
+        var_section = str()
+        equations   = list()
+
+        # Symbols of inner handles: boundary-handles resolve outside, others to their (prefixed) connector:
+        def symbol_of(_var):
+
+            if  _var in _symbols:
+                return _symbols[_var]
+
+            _conn = _model.connector_of(_var)
+            return f"{_prefix}_{_conn.symbol}" if _conn else None
+
+        for _node in _model.nodes.values():
+
+            # Nested composite:
+            if  _node.children is not None:
+
+                _inner = {
+                    _node.ports[_var]: symbol_of(_var)
+                    for _var in _node.variables if _var in _node.ports
+                }
+
+                _pars, _vars, _eqns = self.composite(_node, _inner, f"{_prefix}_{_node.uid}", var_set, par_set)
+                par_section += _pars
+                var_section += _vars
+                equations   += _eqns
+                continue
+
+            replacements = dict()
+            _entities = [(_var, False) for _var in _node.variables] + [(_par, True) for _par in _node.parameters]
+            for _entity, _is_par in _entities:
+
+                # Variables are named after their connector, parameters after their node:
+                symbol  = f"{_prefix}_{_node.uid}_{_entity.symbol}" if _is_par else symbol_of(_entity)
+                replacements[_entity.symbol] = symbol
+
+                if  symbol is None or symbol in var_set | par_set:
+                    continue
+
+                if  bool(_entity.value):
+                    par_set.add(symbol)
+                    _value = format_real(_node.expressions.value(_entity.symbol)) if _is_par else self.number(symbol, _entity.value)
+                    par_section += f"param {symbol} = {_value};\n"
+
+                else:
+                    var_set.add(symbol)
+                    var_section += f"var {symbol};\n"
+
+                    if  bool(_entity.minimum):  equations.append(f"{symbol} - {self.number(symbol, _entity.minimum)} >= 0.0")
+                    if  bool(_entity.maximum):  equations.append(f"{symbol} - {self.number(symbol, _entity.maximum)} <= 0.0")
+
+            for equation in _node.equations:
+                tokens = [replacements.get(token, token) for token in equation.split(' ')]
+                if  None not in tokens:
+                    equations.append(" ".join(tokens))
+
+        # Connected terminals declare the total flow of their stream, as they do outside composites:
+        for _term in _model.terminals.values():
+
+            _socket = _term.socket
+            symbol  = f"TOTAL_{_socket.label}"
+            if  (
+                not bool(_socket.label) or
+                symbol_of(_socket) is None or
+                symbol in var_set | par_set
+            ):
+                continue
+
+            if  bool(_socket.value):
+                par_set.add(symbol)
+                par_section += f"param {symbol} = {self.number(symbol, _socket.value)};\n"
+
+            else:
+                var_set.add(symbol)
+                var_section += f"var {symbol};\n"
+
+        return par_section, var_section, equations
 
     def run(self):
 
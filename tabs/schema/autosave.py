@@ -0,0 +1,393 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+from PyQt6.QtCore import QObject, QRunnable, QStandardPaths, QThreadPool, QTimer, pyqtSignal
+
+from model   import *
+from .jsonlib import JsonLib
+from .saver   import SchemaSaver
+
+# Class AutosaveTask: Writes a snapshot of a schematic to its recovery-file on a worker-thread:
+class AutosaveTask(QRunnable):
+    """
+    Writes a snapshot of a schematic (see `Autosaver.snapshot()`) to a recovery-file on a thread of the global
+    thread-pool. The snapshot's element-objects are not modified once they have been created, so the task reads them
+    without locks. The file is replaced atomically, a crash while writing leaves the previous recovery-file intact.
+    The file is replaced under the autosaver's lock, so that a task that is abandoned (see `Autosaver.close()`) cannot
+    put back a recovery-file that the autosaver has removed.
+    """
+
+    # Class Signals: QRunnable is not a QObject, signals are emitted by a helper:
+    class Signals(QObject):
+        sig_written = pyqtSignal(int)   # Emitted with the journal-revision of the snapshot once it has been written.
+        sig_failed  = pyqtSignal(str)   # Emitted with an error-message if the file cannot be written.
+
+    # Elements per write:
+    BATCH = 256
+
+    # Initializer:
+    def __init__(self, _file: str, _revision: int, _header: dict, _sections: dict, _lock: threading.Lock):
+
+        # Initialize base-class:
+        super().__init__()
+
+        self.signals   = self.Signals()
+        self.stopped   = False          # Set to abandon the task (see `Autosaver.close()`).
+        self.file      = _file
+        self.revision  = _revision
+        self._header   = _header        # Top-level values written before the arrays.
+        self._sections = _sections      # Element-objects per array.
+        self._lock     = _lock          # Held while the file is replaced, shared with the autosaver.
+
+    def run(self):
+
+        try:
+            os.makedirs(os.path.dirname(self.file), exist_ok=True)
+            with open(f"{self.file}.tmp", "w") as _stream:
+
+                _stream.write(json.dumps(self._header, separators=(",", ":"))[:-1])
+                for _section, _elements in self._sections.items():
+
+                    _stream.write(f',"{_section}":[')
+                    for _start in range(0, len(_elements), self.BATCH):
+                        _batch = _elements[_start: _start + self.BATCH]
+                        _stream.write(("," if _start else "") + ",".join(json.dumps(_element, separators=(",", ":")) for _element in _batch))
+
+                    _stream.write("]")
+
+                _stream.write("}")
+                _stream.flush()
+                os.fsync(_stream.fileno())
+
+            with self._lock:
+                if  self.stopped:
+                    os.remove(f"{self.file}.tmp")
+                    return
+
+                os.replace(f"{self.file}.tmp", self.file)
+
+            self.signals.sig_written.emit(self.revision)
+
+        except (OSError, ValueError) as exception:
+            self.signals.sig_failed.emit(str(exception))
+
+# Class Autosaver: Periodically writes a canvas' schematic to a recovery-file:
+class Autosaver(QObject):
+    """
+    Writes the canvas' schematic to a recovery-file in `directory()` every `INTERVAL` milliseconds, if it has changed
+    since it was last written or saved. Recovery-files are removed when the schematic is saved or closed, so the files
+    that remain after the application has ended were left by a crash, and are offered on the next start (see
+    `recoverable()` and `StartupWindow`). Recovery-files are named after the canvas and the process that writes them,
+    the files of instances that are still running are not offered.
+
+    The editor is not held up by autosaves:
+
+        - The JSON-object of each node, terminal and connector is cached. Records that were added or modified since
+          the last autosave (see model/journal.py) are converted again, for at most `BUDGET` milliseconds per frame.
+        - Converted element-objects are replaced rather than modified, so a snapshot of the cache is a copy of the
+          element-lists, not of the elements (see `snapshot()`).
+        - The snapshot is serialized and written on a worker-thread (see `AutosaveTask`), one at a time.
+    """
+
+    # Directory of recovery-files (the application's data-directory if None), and the age (s) after which unclaimed
+    # files are removed:
+    DIRECTORY = None
+    MAX_AGE   = 7 * 24 * 3600
+
+    # Recovery-files of this process' open canvases:
+    OPEN = set()
+
+    # Time (ms) between autosaves, and spent converting records per frame:
+    INTERVAL = 60000
+    BUDGET   = 8
+    FRAME    = 16
+
+    # Initializer:
+    def __init__(self, _canvas):
+
+        # Initialize base-class:
+        super().__init__(_canvas)
+
+        self._canvas   = _canvas
+        self.file      = os.path.join(self.directory(), f"{_canvas.uid}-{os.getpid()}.json")  # Unique across sessions
+        self._journal  = None       # The model's journal, and
+        self._cursor   = None       # its revision at the last autosave.
+        self._revision = 0          # Revision of the model that was last written or saved.
+        self._cache    = {"nodes": {}, "terminals": {}, "connectors": {}}  # Element-objects per section and record.
+        self._streams  = dict()     # Stream-table of the cached element-objects.
+        self._queue    = dict()     # Records to convert (an ordered set).
+        self._task     = None       # Task in flight, if any.
+        self._adopted  = list()     # Recovery-files whose contents this canvas holds (see `adopt()`).
+        self._lock     = threading.Lock()   # Held while the recovery-file is replaced or removed on close.
+        self._closed   = False
+        self.OPEN.add(self.file)
+
+        # Autosave-timer:
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.INTERVAL)
+        self._timer.timeout.connect(self.autosave)
+        self._timer.start()
+
+        # Single-shot timer for converting records:
+        self._convert_timer = QTimer(self)
+        self._convert_timer.setSingleShot(True)
+        self._convert_timer.timeout.connect(self.convert)
+
+    def autosave(self) -> None:
+        """
+        Starts an autosave if the schematic has changed since it was last written or saved. Records that have changed
+        are converted over the next frames, and the snapshot is written once they have been.
+        """
+
+        if  (
+            self._closed or self._task is not None or self._convert_timer.isActive() or
+            self._canvas.model.journal.revision == self._revision
+        ):
+            return
+
+        self.collect()
+        self._convert_timer.start(0)
+
+    def collect(self) -> None:
+        """
+        Queues the records that were added, modified or removed since the last autosave for conversion.
+        """
+
+        _model   = self._canvas.model
+        _changes = self._cursor.fetch() if self._journal is _model.journal else None
+
+        # Convert everything on the first autosave, or if the journal no longer covers the last one:
+        if  _changes is None:
+            self._journal = _model.journal
+            self._cursor  = _model.journal.cursor()
+            self._cache   = {"nodes": {}, "terminals": {}, "connectors": {}}
+            self._queue   = dict.fromkeys(
+                list(_model.nodes.values()) + list(_model.terminals.values()) + list(_model.connectors.values())
+            )
+            return
+
+        for _record in _changes.added + _changes.modified + _changes.removed:
+            self._queue[_record] = None
+
+            # Connectors are keyed by their endpoints' owners' UIDs and handle-indices:
+            if  isinstance(_record, NodeRecord | TerminalRecord):
+                for _handle in _record.variables if isinstance(_record, NodeRecord) else [_record.socket]:
+                    _conn = _model.connector_of(_handle)
+                    if  _conn is not None:
+                        self._queue[_conn] = None
+
+    def convert(self) -> None:
+        """
+        Converts queued records for at most `BUDGET` milliseconds, the rest are converted in the next frame. Writes a
+        snapshot once the queue has been drained.
+        """
+
+        if  self._closed:
+            return
+
+        _model    = self._canvas.model
+        _deadline = time.perf_counter() + self.BUDGET / 1000.0
+        while self._queue and time.perf_counter() < _deadline:
+
+            for _ in range(min(64, len(self._queue))):
+
+                _record, _ = self._queue.popitem()
+                _section   = SchemaSaver.section(_record)
+                if  not SchemaSaver.registered(_model, _record):
+                    self._cache[_section].pop(_record, None)
+                    continue
+
+                self._cache[_section][_record] = (
+                    JsonLib.node_to_json(_record, self._streams)     if _section == "nodes"     else
+                    JsonLib.terminal_to_json(_record, self._streams) if _section == "terminals" else
+                    JsonLib.connector_to_json(_record)
+                )
+
+        if  self._queue:
+            self._convert_timer.start(self.FRAME)
+            return
+
+        # Changes made while the records were converted are written with the next snapshot:
+        self.write(self._cursor.revision)
+
+    def snapshot(self) -> dict:
+        """
+        Returns the cached element-objects per section. Only the lists are copied: the cache replaces element-objects
+        when their records change, and never modifies them.
+        """
+        return {_section: list(_elements.values()) for _section, _elements in self._cache.items()}
+
+    def write(self, _revision: int) -> None:
+
+        _header = {
+            "version"  : JsonLib.VERSION,
+            "autosave" : {"time": time.time(), "file": self._canvas.saver.file},
+            "streams"  : dict(self._streams)
+        }
+
+        self._task = AutosaveTask(self.file, _revision, _header, self.snapshot(), self._lock)
+        self._task.signals.sig_written.connect(self.on_written)
+        self._task.signals.sig_failed.connect(self.on_failed)
+        QThreadPool.globalInstance().start(self._task)
+
+    def on_written(self, _revision: int) -> None:
+
+        self._task = None
+        if  self._closed:
+            return
+
+        # The schematic was saved while its snapshot was being written:
+        if  _revision <= self._revision:
+            self.remove(self.file)
+            return
+
+        self._revision = _revision
+
+        # Recovered files are superseded by this canvas' own:
+        for _file in self._adopted:
+            self.remove(_file)
+
+        self._adopted.clear()
+
+    def on_failed(self, _message: str) -> None:
+        self._task = None
+        logging.error(f"Unable to autosave {self.file}: {_message}")
+
+    def adopt(self, _file: str) -> None:
+        """
+        Marks a recovery-file whose contents have been loaded into the canvas. It is removed once the canvas has been
+        autosaved, saved or closed.
+        """
+
+        self._adopted.append(_file)
+
+    def saved(self) -> None:
+        """
+        Notes that the schematic has been saved: its recovery-files are removed, and the next autosave waits for new
+        changes.
+        """
+
+        self._revision = self._canvas.model.journal.revision
+        for _file in [self.file] + self._adopted:
+            self.remove(_file)
+
+        self._adopted.clear()
+
+    def close(self) -> None:
+        """
+        Stops autosaving, and removes the canvas' recovery-files (the canvas is being closed on purpose).
+        """
+
+        self._closed = True
+        self._timer.stop()
+        self._convert_timer.stop()
+        self.OPEN.discard(self.file)
+
+        # A task in flight either has replaced the file already, or will discard its snapshot:
+        with self._lock:
+            if  self._task is not None:
+                self._task.stopped = True
+
+            for _file in [self.file] + self._adopted:
+                self.remove(_file)
+
+        self._adopted.clear()
+
+    @staticmethod
+    def remove(_file: str) -> None:
+        try:
+            os.remove(_file)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def directory() -> str:
+        """
+        Returns the directory of recovery-files: `DIRECTORY` if it is set, else a folder in the application's
+        data-directory (e.g. ~/.local/share/Climact/recovery).
+        """
+
+        if  Autosaver.DIRECTORY is not None:
+            return Autosaver.DIRECTORY
+
+        _data = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+        return os.path.join(_data or os.path.expanduser("~"), "recovery")
+
+    @staticmethod
+    def running(_pid: int) -> bool:
+        """
+        Returns True if a process with the given ID is running.
+        """
+
+        # Windows (os.kill() would terminate the process):
+        if  sys.platform == "win32":
+            import ctypes
+            _kernel = ctypes.windll.kernel32
+            _handle = _kernel.OpenProcess(0x1000, False, _pid)     # PROCESS_QUERY_LIMITED_INFORMATION
+            if  not _handle:
+                return False
+
+            _code = ctypes.c_ulong()
+            _live = _kernel.GetExitCodeProcess(_handle, ctypes.byref(_code)) and _code.value == 259  # STILL_ACTIVE
+            _kernel.CloseHandle(_handle)
+            return bool(_live)
+
+        try:
+            os.kill(_pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+
+        return True
+
+    @staticmethod
+    def recoverable() -> list:
+        """
+        Returns the recovery-files left by earlier sessions, newest first. Files of instances that are still running
+        (and of this instance's open canvases) are skipped, files older than `MAX_AGE` are removed.
+        """
+
+        _directory = Autosaver.directory()
+        try:
+            _files = [
+                os.path.join(_directory, _name) for _name in os.listdir(_directory)
+                if  _name.endswith(".json")
+            ]
+
+        except FileNotFoundError:
+            return []
+
+        # Files are named <canvas>-<pid>.json, this instance's files are told apart by name (process IDs are reused):
+        for _file in list(_files):
+            _pid = os.path.basename(_file)[:-5].rpartition("-")[2]
+            if  _file in Autosaver.OPEN or (
+                _pid.isdigit() and int(_pid) != os.getpid() and Autosaver.running(int(_pid))
+            ):
+                _files.remove(_file)
+
+        _now = time.time()
+        for _file in list(_files):
+            if  _now - os.path.getmtime(_file) > Autosaver.MAX_AGE:
+                Autosaver.remove(_file)
+                _files.remove(_file)
+
+        return sorted(_files, key=os.path.getmtime, reverse=True)
+
+    @staticmethod
+    def describe(_file: str) -> dict:
+        """
+        Returns the autosave-header of a recovery-file: the time it was written and the file that the schematic was
+        last saved to (None if it never was).
+        """
+
+        with open(_file, "rb") as _stream:
+            for _key, _value, _ in JsonLib.stream_json(_stream, ()):
+                if  _key == "autosave":
+                    return _value
+
+        return {}
@@ -0,0 +1,420 @@
+import logging
+import mmap
+import struct
+
+from custom import *
+from model  import *
+from model.store import NAN, format_real
+from tabs.schema import graph
+
+from .jsonlib import JsonLib
+
+class BinLib:
+    """
+    Utility class for serializing and deserializing schematics to and from a compact binary format, the counterpart of
+    `JsonLib`. Like JSON-schematics, binary schematics convert to and from the headless schema model (see
+    model/schema.py), so a schematic converts between both formats without loss (see `json_to_bin` and `bin_to_json`).
+
+    Layout (little-endian):
+    -----------------------
+    - Header: magic `CLMB`, version (u16), reserved (u16), number of sections (u32), followed by one (tag, offset,
+      size)-entry (4s, u64, u64) per section. Sections start at 8-byte aligned offsets, so each can be mapped and
+      read in place.
+
+    - STRS: The string-table. Every string (UIDs, symbols, labels, colors, equations...) is stored once and referred
+      to by its index: the number of strings (u32), their end-offsets (u32 each) and their UTF-8 bytes. String 0 is
+      the empty string.
+
+    - NODE, TERM, CONN: The nodes, terminals and connectors of the model, each section holds the number of records
+      (u32) followed by the records, each prefixed by its size (u32) so that readers can skip records. Numeric fields
+      are packed doubles: the numeric fields of entities (value, sigma, minimum, maximum) keep their text in the
+      string-table only if the number does not reproduce it (e.g. expressions), like the entity-store does (see
+      model/store.py). Composite nodes embed their sub-system as NODE, TERM and CONN blocks.
+
+    Static Methods:
+    ---------------
+    - model_to_bin(model) / model_from_bin(buffer):
+        Converts a `SchemaModel` to and from bytes. `buffer` may be any bytes-like object, e.g. a memory-mapped file.
+
+    - json_to_bin(root, file) / bin_to_json(buffer):
+        Converts a schematic's JSON-object (read from `file`, if given, with its delta-log) to and from bytes.
+
+    - encode_bin(canvas) / decode_bin(file, canvas):
+        Counterparts of `JsonLib.encode_json` and `JsonLib.decode_json`.
+    """
+
+    # File-signature, format-version and file-suffix (version 1 identified handles by symbol, see `connectors_from_bin`):
+    MAGIC   = b"CLMB"
+    VERSION = 2
+    SUFFIX  = ".clmb"
+
+    # Header, section-entries and counts:
+    HEADER  = struct.Struct("<4sHHI")
+    SECTION = struct.Struct("<4sQQ")
+    COUNT   = struct.Struct("<I")
+
+    # Entities: class, six strings (symbol, label, units, strid, color, info), four numbers and their overflow-texts
+    # (value, sigma, minimum, maximum), and the position:
+    ENTITY  = struct.Struct("<B6I4d4I2d")
+
+    # Nodes: UID, title, position, height, number of variables, parameters and equations, and whether the node is a
+    # composite, and its boundary-handles: index, UID of the inner handle's owner, inner handle's index:
+    NODE    = struct.Struct("<2I3d3IB")
+    PORT    = struct.Struct("<3I")
+
+    # Terminals: UID, class, socket-label, -strid and -color, and the position:
+    TERMINAL = struct.Struct("<IB3I2d")
+
+    # Connectors: UID of the origin's owner, origin's index, UID of the target's owner, target's index (handles are
+    # numbered per owner, see `JsonLib.handle_to_json`):
+    CONNECTOR = struct.Struct("<4I")
+
+    # Entity-classes are stored by value (255 for none):
+    NONE = 255
+
+    @staticmethod
+    def model_to_bin(_model: SchemaModel) -> bytes:
+
+        strings = {"": 0}
+        def sid(_text: str) -> int:
+            return strings.setdefault(_text, len(strings))
+
+        _sections = [
+            (b"NODE", BinLib.nodes_to_bin(_model, sid)),
+            (b"TERM", BinLib.terminals_to_bin(_model, sid)),
+            (b"CONN", BinLib.connectors_to_bin(_model, sid))
+        ]
+
+        # String-table:
+        _blobs = [_text.encode("utf-8") for _text in strings]
+        _ends  = list()
+        _end   = 0
+        for _blob in _blobs:
+            _end += len(_blob)
+            _ends.append(_end)
+
+        _table = BinLib.COUNT.pack(len(_blobs)) + struct.pack(f"<{len(_ends)}I", *_ends) + b"".join(_blobs)
+        _sections.insert(0, (b"STRS", _table))
+
+        # Header and section-entries:
+        _data   = bytearray(BinLib.HEADER.pack(BinLib.MAGIC, BinLib.VERSION, 0, len(_sections)))
+        _offset = BinLib.HEADER.size + BinLib.SECTION.size * len(_sections)
+        _starts = list()
+        for _tag, _payload in _sections:
+            _offset = (_offset + 7) & ~7
+            _starts.append(_offset)
+            _data  += BinLib.SECTION.pack(_tag, _offset, len(_payload))
+            _offset += len(_payload)
+
+        # Sections, padded to their (aligned) offsets:
+        for _start, (_, _payload) in zip(_starts, _sections):
+            _data += bytes(_start - len(_data))
+            _data += _payload
+
+        return bytes(_data)
+
+    @staticmethod
+    def nodes_to_bin(_model: SchemaModel, _sid) -> bytes:
+
+        _data = bytearray(BinLib.COUNT.pack(len(_model.nodes)))
+        for _node in _model.nodes.values():
+
+            _record = bytearray(BinLib.NODE.pack(
+                _sid(_node.uid), _sid(_node.title), _node.x, _node.y, _node.height,
+                len(_node.variables), len(_node.parameters), len(_node.equations), _node.children is not None
+            ))
+
+            _record += struct.pack(f"<{len(_node.equations)}I", *[_sid(_equation) for _equation in _node.equations])
+            for _entity in _node.variables + _node.parameters:
+                _record += BinLib.entity_to_bin(_entity, _sid)
+
+            # Composite nodes, their boundary-handles and their sub-system:
+            if  _node.children is not None:
+                _record += BinLib.COUNT.pack(len(_node.ports))
+                for _outer, _inner in _node.ports.items():
+                    _record += BinLib.PORT.pack(
+                        JsonLib.handle_to_json(_outer), _sid(_inner.parent.uid), JsonLib.handle_to_json(_inner)
+                    )
+
+                for _block in (BinLib.nodes_to_bin, BinLib.terminals_to_bin, BinLib.connectors_to_bin):
+                    _payload = _block(_node.children, _sid)
+                    _record += BinLib.COUNT.pack(len(_payload)) + _payload
+
+            _data += BinLib.COUNT.pack(len(_record)) + _record
+
+        return bytes(_data)
+
+    @staticmethod
+    def terminals_to_bin(_model: SchemaModel, _sid) -> bytes:
+
+        _data = bytearray(BinLib.COUNT.pack(len(_model.terminals)))
+        for _term in _model.terminals.values():
+            _data += BinLib.COUNT.pack(BinLib.TERMINAL.size)
+            _data += BinLib.TERMINAL.pack(
+                _sid(_term.uid), _term.eclass.value,
+                _sid(_term.socket.label), _sid(_term.socket.strid), _sid(_term.socket.color),
+                _term.x, _term.y
+            )
+
+        return bytes(_data)
+
+    @staticmethod
+    def connectors_to_bin(_model: SchemaModel, _sid) -> bytes:
+
+        _data = bytearray(BinLib.COUNT.pack(len(_model.connectors)))
+        for _conn in _model.connectors.values():
+            _data += BinLib.COUNT.pack(BinLib.CONNECTOR.size)
+            _data += BinLib.CONNECTOR.pack(
+                _sid(_conn.origin.parent.uid), JsonLib.handle_to_json(_conn.origin),
+                _sid(_conn.target.parent.uid), JsonLib.handle_to_json(_conn.target)
+            )
+
+        return bytes(_data)
+
+    @staticmethod
+    def entity_to_bin(_entity: EntityRecord, _sid) -> bytes:
+
+        # Numbers, and the texts that they do not reproduce:
+        _numbers = list()
+        _texts   = list()
+        for _text in (_entity.value, _entity.sigma, _entity.minimum, _entity.maximum):
+            try:
+                _number = float(_text) if _text else NAN
+            except ValueError:
+                _number = NAN
+
+            _numbers.append(_number)
+            _texts.append(_sid(_text) if format_real(_number) != _text else 0)
+
+        return BinLib.ENTITY.pack(
+            _entity.eclass.value if _entity.eclass is not None else BinLib.NONE,
+            _sid(_entity.symbol), _sid(_entity.label), _sid(_entity.units),
+            _sid(_entity.strid), _sid(_entity.color), _sid(_entity.info),
+            *_numbers, *_texts, _entity.x, _entity.y
+        )
+
+    @staticmethod
+    def model_from_bin(_buffer) -> SchemaModel:
+
+        _magic, _version, _, _count = BinLib.HEADER.unpack_from(_buffer, 0)
+        if  _magic != BinLib.MAGIC:         raise ValueError("Not a binary schematic")
+        if  _version > BinLib.VERSION:      raise ValueError(f"Unsupported format-version {_version}")
+
+        _sections = dict()
+        for _index in range(_count):
+            _tag, _offset, _size = BinLib.SECTION.unpack_from(_buffer, BinLib.HEADER.size + BinLib.SECTION.size * _index)
+            _sections[_tag] = _offset
+
+        # String-table, decoded on first use:
+        _base  = _sections[b"STRS"]
+        _total = BinLib.COUNT.unpack_from(_buffer, _base)[0]
+        _ends  = struct.unpack_from(f"<{_total}I", _buffer, _base + 4)
+        _data  = _base + 4 + 4 * _total
+        _cache = [None] * _total
+
+        def string(_sid: int) -> str:
+            _text = _cache[_sid]
+            if  _text is None:
+                _start = _ends[_sid - 1] if _sid else 0
+                _text  = _cache[_sid] = str(_buffer[_data + _start:_data + _ends[_sid]], "utf-8")
+            return _text
+
+        _model = SchemaModel()
+        BinLib.nodes_from_bin(_buffer, _sections[b"NODE"], string, _model, _version)
+        BinLib.terminals_from_bin(_buffer, _sections[b"TERM"], string, _model, _version)
+        BinLib.connectors_from_bin(_buffer, _sections[b"CONN"], string, _model, _version)
+        return _model
+
+    @staticmethod
+    def nodes_from_bin(_buffer, _offset: int, _string, _model: SchemaModel, _version: int) -> int:
+        """
+        Reads a NODE-block at `_offset` into `_model`, returns the offset past the block.
+        """
+
+        _count, = BinLib.COUNT.unpack_from(_buffer, _offset)
+        _offset += 4
+        for _ in range(_count):
+
+            _size, = BinLib.COUNT.unpack_from(_buffer, _offset)
+            _end = _offset = _offset + 4
+            _end += _size
+
+            _uid, _title, _x, _y, _height, _nvar, _npar, _neqn, _composite = BinLib.NODE.unpack_from(_buffer, _offset)
+            _offset += BinLib.NODE.size
+
+            _node = NodeRecord(
+                uid    = _string(_uid),
+                title  = _string(_title),
+                x      = _x,
+                y      = _y,
+                height = _height,
+                equations = [_string(_sid) for _sid in struct.unpack_from(f"<{_neqn}I", _buffer, _offset)]
+            )
+            _offset += 4 * _neqn
+
+            for _index in range(_nvar + _npar):
+                _entity = BinLib.entity_from_bin(_buffer, _offset, _string)
+                _entity.parent = _node
+                _offset += BinLib.ENTITY.size
+
+                if  _index < _nvar:
+                    _node.variables.append(_entity)
+
+                else:
+                    _node.parameters.append(_entity)
+                    _node.expressions.set(_entity.symbol, _entity.value)
+
+            # Composite nodes:
+            if  _composite:
+
+                _nport, = BinLib.COUNT.unpack_from(_buffer, _offset)
+                _ports  = [BinLib.PORT.unpack_from(_buffer, _offset + 4 + BinLib.PORT.size * _index) for _index in range(_nport)]
+                _offset += 4 + BinLib.PORT.size * _nport
+
+                _node.children = SchemaModel()
+                for _block in (BinLib.nodes_from_bin, BinLib.terminals_from_bin, BinLib.connectors_from_bin):
+                    _block(_buffer, _offset + 4, _string, _node.children, _version)
+                    _offset += 4 + BinLib.COUNT.unpack_from(_buffer, _offset)[0]
+
+                for _outer, _inner_uid, _inner in _ports:
+                    if  _version < 2:
+                        _outer, _inner = _string(_outer), _string(_inner)
+
+                    _port   = JsonLib.port_from_json(_node, _outer)
+                    _handle = _node.children.find_handle(_string(_inner_uid), _inner)
+                    if  _port is not None and _handle is not None:
+                        _node.ports[_port] = _handle
+
+            _model.add_node(_node)
+            _offset = _end
+
+        return _offset
+
+    @staticmethod
+    def terminals_from_bin(_buffer, _offset: int, _string, _model: SchemaModel, _version: int) -> int:
+        """
+        Reads a TERM-block at `_offset` into `_model`, returns the offset past the block.
+        """
+
+        _count, = BinLib.COUNT.unpack_from(_buffer, _offset)
+        _offset += 4
+        for _ in range(_count):
+
+            _size, = BinLib.COUNT.unpack_from(_buffer, _offset)
+            _uid, _eclass, _label, _strid, _color, _x, _y = BinLib.TERMINAL.unpack_from(_buffer, _offset + 4)
+            _offset += 4 + _size
+
+            _eclass = EntityClass(_eclass)
+            _term = TerminalRecord(
+                uid    = _string(_uid),
+                eclass = _eclass,
+                x      = _x,
+                y      = _y,
+                socket = EntityRecord(
+                    eclass = _eclass,
+                    symbol = "Resource",
+                    label  = _string(_label),
+                    strid  = _string(_strid),
+                    color  = _string(_color),
+                    x      = graph.StreamTerminal.Constants.SOCKET_OFFSET * (1 if _eclass == EntityClass.OUT else -1)
+                )
+            )
+
+            _term.socket.parent = _term
+            _model.add_terminal(_term)
+
+        return _offset
+
+    @staticmethod
+    def connectors_from_bin(_buffer, _offset: int, _string, _model: SchemaModel, _version: int) -> int:
+        """
+        Reads a CONN-block at `_offset` into `_model` (whose nodes and terminals must have been read), returns the
+        offset past the block. Version 1 files identify the endpoints by symbol rather than by index.
+        """
+
+        _handles = _model.handle_index()
+        _count, = BinLib.COUNT.unpack_from(_buffer, _offset)
+        _offset += 4
+        for _ in range(_count):
+
+            _size, = BinLib.COUNT.unpack_from(_buffer, _offset)
+            _ouid, _origin, _tuid, _target = BinLib.CONNECTOR.unpack_from(_buffer, _offset + 4)
+            _offset += 4 + _size
+
+            if  _version < 2:
+                _origin, _target = _string(_origin), _string(_target)
+
+            _endpoints = JsonLib.endpoints_from_json([_string(_ouid), _origin, _string(_tuid), _target], _handles, dict)
+
+            if  _endpoints is not None:
+                _model.add_connector(ConnectorRecord(f"X{len(_model.connectors)}", *_endpoints))
+
+        return _offset
+
+    @staticmethod
+    def entity_from_bin(_buffer, _offset: int, _string) -> EntityRecord:
+
+        _fields = BinLib.ENTITY.unpack_from(_buffer, _offset)
+        _eclass, _symbol, _label, _units, _strid, _color, _info = _fields[:7]
+        _numbers = [
+            _string(_text) if _text else format_real(_number)
+            for _number, _text in zip(_fields[7:11], _fields[11:15])
+        ]
+
+        return EntityRecord(
+            eclass  = EntityClass(_eclass) if _eclass != BinLib.NONE else None,
+            symbol  = _string(_symbol),
+            label   = _string(_label),
+            units   = _string(_units),
+            strid   = _string(_strid),
+            color   = _string(_color),
+            info    = _string(_info),
+            value   = _numbers[0],
+            sigma   = _numbers[1],
+            minimum = _numbers[2],
+            maximum = _numbers[3],
+            x       = _fields[15],
+            y       = _fields[16]
+        )
+
+    @staticmethod
+    def json_to_bin(_root: dict, _file: str | None = None) -> bytes:
+        return BinLib.model_to_bin(JsonLib.model_from_json(_root, _file))
+
+    @staticmethod
+    def bin_to_json(_buffer) -> dict:
+        return JsonLib.model_to_json(BinLib.model_from_bin(_buffer))
+
+    @staticmethod
+    def encode_bin(_canvas) -> bytes:
+
+        # Serialize the selected nodes and terminals, or all of them if none are selected (see `JsonLib.encode_json`):
+        records = [
+            _item.record for _item in _canvas.selectedItems()
+            if  isinstance(_item, graph.Node | graph.StreamTerminal)
+        ] \
+        if  _canvas.selectedItems() \
+        else \
+        list(_canvas.model.nodes.values()) + list(_canvas.model.terminals.values())
+
+        return BinLib.model_to_bin(_canvas.model.subset(records))
+
+    @staticmethod
+    def decode_bin(_file: str,
+                   _canvas,
+                   _group_actions: bool = False
+                   ):
+
+        # Import canvas module:
+        from tabs.schema.canvas import Canvas
+
+        # Validate argument(s):
+        if not isinstance(_canvas, Canvas): raise ValueError("Invalid `Canvas` object")
+
+        # Read the records straight from the mapped file:
+        with open(_file, "rb") as _stream, mmap.mmap(_stream.fileno(), 0, access=mmap.ACCESS_READ) as _buffer:
+            _model = BinLib.model_from_bin(_buffer)
+
+        # Large schematics are paged in and out of the scene as the view changes (see tabs/schema/graph/pager.py):
+        if  _canvas.pager.suits(_model):    _canvas.page_model(_model)
+        else:                               _canvas.load_model(_model, _group_actions)
@@ -5,6 +5,7 @@
 #-----------------------------------------------------------------------------------------------------------------------
 import logging
 import weakref
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 
 from PyQt6.QtGui  import QColor, QTransform
@@ -28,13 +29,19 @@ from PyQt6.QtWidgets import (
     )
 
 from dataclasses import dataclass
-from .graph   import *
-from .jsonlib import JsonLib
+from .graph    import *
+from .jsonlib  import JsonLib
+from .binlib   import BinLib
+from .loader   import SchemaLoader
+from .saver    import SchemaSaver
+from .autosave import Autosaver
+from .notifier import Notifier
 
 from util    import random_id
 from enum    import Enum
 from custom  import *
 from actions import *
+from model   import *
 
 class SaveState(Enum):
     SAVED = 0
@@ -47,7 +54,7 @@ class Canvas(QGraphicsScene):
     sig_item_created = pyqtSignal()             # Emitted when a new item is created.
     sig_item_removed = pyqtSignal()             # Emitted when an item is removed.
     sig_canvas_reset = pyqtSignal()             # Emitted when the canvas is reset.
-    sig_canvas_state = pyqtSignal(SaveState)    # Emitted when the canvas's state changes.
+    sig_canvas_state = pyqtSignal(SaveState)    # Emitted when the canvas's state changes (at most once per event-loop iteration).
     sig_schema_setup  = pyqtSignal(str)          # Emitted when a JSON-schematic is loaded.
 
     # Placeholder-connector:
@@ -81,11 +88,40 @@ class Canvas(QGraphicsScene):
         self.actions = BatchActions([])
         self.manager = ActionsManager()
 
+        # Batch of the open bulk-transaction, see `bulk_create()`:
+        self._bulk = None
+        self._size = 0      # Number of registered items when the BSP-index was last sized, see `bulk_create()`.
+
+        # Save-state notifications are coalesced to one `sig_canvas_state` per event-loop iteration (see `notify()`):
+        self.notifier = Notifier(self)
+        self.notifier.sig_dispatch.connect(self.sig_canvas_state.emit)
+
+        # Connector-paths are rebuilt once per frame, however often their handles move (see `Connector.redraw()`):
+        self.redraws = RedrawQueue(self)
+
+        # Orthogonal connectors are routed around nodes and terminals off the GUI-thread (see `set_geometry()`):
+        self.router   = ConnectorRouter(self)
+        self.geometry = PathGeometry.BEZIER
+
+        # Cache-modes of nodes and terminals follow the zoom-level (see `Viewer.zoom()`):
+        self.caches = CachePolicy(self)
+
+        # Items of large schematics are paged in and out of the scene as the view changes (see `page_model()`):
+        self.pager   = ScenePager(self)
+        self._paging = False    # Set while the pager adds or removes items, see the registry-callbacks.
+
+        # Loader of the schematic that is being imported, if any (see `import_schema()`):
+        self.loader = None
+
+        # Saves to the same JSON-file append the changes since the previous save (see `export_schema()`):
+        self.saver  = SchemaSaver(self)
+
         # Convenience variables:
         self._ntot = 0
         self._rect = bounds
         self._cpos = QPointF()
         self._conn = Canvas.Transient()
+        self._drag = dict()     # Positions of the selected nodes and terminals when a mouse-button was pressed.
 
         # Add transient-connector to scene:
         self.addItem(self._conn.connector)
@@ -95,17 +131,31 @@ class Canvas(QGraphicsScene):
         self.setBackgroundBrush(QColor(0xefefef))
         self.setObjectName(random_id(length=4, prefix='S'))
 
+        # Headless model of the schematic, kept in sync with the registries below (see model/schema.py):
+        self.model = SchemaModel()
+
+        # Unsaved changes are written to a recovery-file in the background (see tabs/schema/autosave.py):
+        self.autosaver = Autosaver(self)
+
+        # Allocators for node-UIDs and connector-symbols, updated by the registry-callbacks below:
+        self._node_ids = IdAllocator("N", 4)
+        self._conn_ids = IdAllocator("X")
+
         # Initialize registries:
-        self.term_db = dict()  # Maps each terminal to a bool indicating whether it's currently visible/enabled.
-        self.node_db = dict()  # Maps each node to a bool indicating whether it's currently visible/enabled.
-        self.conn_db = dict()  # Maps each connector to a bool indicating whether it's currently visible/enabled.
-        self.type_db = set()   # List of defined stream-types (e.g. Mass, Energy, Electricity, etc.)
+        self.term_db = TrackedDict(self.on_terminal_toggled)    # Maps each terminal to a bool indicating whether it's currently visible/enabled.
+        self.node_db = TrackedDict(self.on_node_toggled)        # Maps each node to a bool indicating whether it's currently visible/enabled.
+        self.conn_db = TrackedDict(self.on_connector_toggled)   # Maps each connector to a bool indicating whether it's currently visible/enabled.
+        self.type_db = dict()  # Maps each stream-ID to its stream-type (e.g. Mass, Energy, Electricity, etc.)
+
+        # Indexes of the active items, maintained by the registry-callbacks:
+        self._node_index = dict()   # Maps each UID to its node.
+        self._conn_index = dict()   # Maps each symbol to its connector.
 
         # Add default streams:
-        self.type_db.add(Stream("Default", Qt.GlobalColor.darkGray))   # Default
-        self.type_db.add(Stream("Energy", QColor("#F6AE2D")))          # Energy
-        self.type_db.add(Stream("Power", QColor("#474973")))           # Power
-        self.type_db.add(Stream("Mass", QColor("#028CB6")))            # Mass
+        self.type_db["Default"] = Stream("Default", Qt.GlobalColor.darkGray)   # Default
+        self.type_db["Energy"]  = Stream("Energy", QColor("#F6AE2D"))          # Energy
+        self.type_db["Power"]   = Stream("Power", QColor("#474973"))           # Power
+        self.type_db["Mass"]    = Stream("Mass", QColor("#028CB6"))            # Mass
 
         # Initialize menu:
         self._init_menu()
@@ -138,6 +188,11 @@ class Canvas(QGraphicsScene):
         _group = self._menu.addAction("Group Items")
         _clear = self._menu.addAction("Clear Scene")
 
+        # Connector-geometry:
+        self._menu.addSeparator()
+        _ortho = self._menu.addAction("Orthogonal Connectors")
+        _ortho.setCheckable(True)
+
         self._menu.addSeparator()
         _exit = self._menu.addAction("Quit Application")
 
@@ -150,16 +205,19 @@ class Canvas(QGraphicsScene):
         _exit.triggered.connect(QApplication.quit)
 
         # Additional actions:
+        _group.triggered.connect(lambda: self.group_items(self.selectedItems()))
         _clear.triggered.connect(self.clear)
+        _ortho.toggled.connect(lambda _state: self.set_geometry(PathGeometry.RECT if _state else PathGeometry.BEZIER))
 
     # Event-Handlers ---------------------------------------------------------------------------------------------------
     # Name                      Description
     # ------------------------------------------------------------------------------------------------------------------
     # 1. contextMenuEvent       Handles context-menu events (triggered when the user right-clicks on the canvas).
-    # 2. mouseMoveEvent         If a connection is active, this event will continuously update the connector's path.
-    # 3. mouseReleaseEvent      If a connection is active and the mouse-button was released at a target node's anchor, 
+    # 2. mousePressEvent        Records the positions of the selected nodes and terminals, see `mouseReleaseEvent`.
+    # 3. mouseMoveEvent         If a connection is active, this event will continuously update the connector's path.
+    # 4. mouseReleaseEvent      If a connection is active and the mouse-button was released at a target node's anchor, 
     #                           this event will create a new handle and establish a connection between the origin and 
-    #                           target.
+    #                           target. Otherwise, journals the nodes and terminals that were moved.
     # ------------------------------------------------------------------------------------------------------------------
 
     # Context-menu event handler:
@@ -183,6 +241,23 @@ class Canvas(QGraphicsScene):
         self._menu.exec(event.screenPos())
         event.accept()
 
+    def mousePressEvent(self, event):
+        """
+        Handle mouse-press events. Records the positions of the selected nodes and terminals (after the press has
+        updated the selection), so that `mouseReleaseEvent` can journal the ones that were dragged.
+
+        Parameters:
+            event (QGraphicsSceneMouseEvent): Event instance, internally propagated by Qt.
+
+        Returns: None
+        """
+
+        super().mousePressEvent(event)
+        self._drag = {
+            _item: _item.pos() for _item in self.selectedItems()
+            if isinstance(_item, (Node, StreamTerminal))
+        }
+
     def mouseMoveEvent(self, event):
         """
         Handle mouse-move events. When a connection is active, this handler will continuously update the connector's path
@@ -219,8 +294,9 @@ class Canvas(QGraphicsScene):
             not self._conn.active or 
             event.button() != Qt.MouseButton.LeftButton
         ):
-            # Forward event to super-class and return:
+            # Forward event to super-class, journal the moved items and return:
             super().mouseReleaseEvent(event)
+            self.journal_moves()
             return
 
         # Define convenience variables:
@@ -263,16 +339,8 @@ class Canvas(QGraphicsScene):
             super().mouseReleaseEvent(event)
             return
 
-        # Create new connection between origin and target, and add it to the canvas:
-        _connector = Connector(self.create_cuid(), _origin, _target)
-        self.conn_db[_connector] = True
-        self.addItem(_connector)
-
-        # Push action to undo-stack:
-        self.manager.do(ConnectHandleAction(self, _connector))
-
-        # Notify application of state-change:
-        self.sig_canvas_state.emit(SaveState.UNSAVED)
+        # Create new connection between origin and target, and push it to the undo-stack:
+        self.create_connector(_origin, _target)
 
         # Reset transient-connector:
         self.reset_transient()
@@ -283,17 +351,111 @@ class Canvas(QGraphicsScene):
     # Custom Methods ---------------------------------------------------------------------------------------------------
     # Name                      Description
     # ------------------------------------------------------------------------------------------------------------------
-    # 1. create_terminal        Creates a new source or sink terminal with a single connection point.
-    # 2. create_node            Creates a new node with a single connection point.
-    # 3. create_cuid            Creates a unique ID for a new connector.
-    # 4. import_schema          Reads a JSON-schematic and populates the canvas with the schematic's contents.
-    # 5. export_schema          Saves the canvas's contents as a JSON-schematic.
+    # 1. bulk_create            Context-manager that groups many creations into a single undoable transaction.
+    # 2. push_action            Forwards an action to the open bulk-transaction, or to the actions-manager.
+    # 3. create_terminal        Creates a new source or sink terminal with a single connection point.
+    # 4. create_node            Creates a new node with a single connection point.
+    # 5. create_connector       Connects two handles.
+    # 6. create_cuid            Creates a unique ID for a new connector.
+    # 7. load_model             Creates nodes, terminals and connectors from a headless schema model.
+    # 8. page_model             Adopts a large headless schema model, whose items are created as they come into view.
+    # 9. import_schema          Reads a JSON-schematic in the background and populates the canvas with its contents.
+    # 10. export_schema         Saves the canvas's contents as a JSON-schematic.
     # ------------------------------------------------------------------------------------------------------------------
 
+    @contextmanager
+    def bulk_create(self, _batch: BatchActions | None = None):
+        """
+        Context-manager for creating many items at once. Inside the `with`-block, the canvas' signals are blocked and
+        actions forwarded through `push_action()` are collected into a single batch. On exit, the batch is pushed to
+        the undo-stack as a single entry, and a single state-notification is emitted. Nested transactions join the
+        outermost one.
+
+        A transaction that spans several `with`-blocks (e.g. one per frame, see tabs/schema/loader.py) passes its own
+        batch, which is collected into but neither pushed nor accounted for in the item-caches' budget: the caller
+        completes it in a final transaction.
+
+        Note: The scene-index is left as is. The BSP-index already defers insertions to the event-loop, and switching
+        it off and on again leaves it scanning every item on each lookup (and thus on every repaint). However, Qt sizes
+        the BSP-tree once, for the items in the scene when it is first used (usually none), so the tree is re-sized on
+        exit if the number of items has doubled (or halved) since it was last sized.
+
+        Usage:
+            with canvas.bulk_create():
+                node = canvas.create_node("Node", QPointF(0, 0))
+                ...
+
+        Yields:
+            BatchActions: The transaction's batch.
+        """
+
+        # Join the open transaction:
+        if self._bulk is not None:
+            yield self._bulk
+            return
+
+        # Suspend notifications:
+        self._bulk = _batch if _batch is not None else BatchActions([])
+        _block = self.blockSignals(True)
+
+        try:
+            yield self._bulk
+
+        finally:
+
+            # Restore notifications:
+            batch, self._bulk = self._bulk, None
+            self.blockSignals(_block)
+
+            # Push transaction to undo-stack:
+            if batch.size() and _batch is None:
+                self.manager.do(batch)
+
+            # Re-size the BSP-tree (a depth of 0 lets Qt choose the depth for the current number of items):
+            _size = len(self.node_db) + len(self.term_db) + len(self.conn_db)
+            if  not self._size / 2 <= _size <= self._size * 2:
+                self._size = _size
+                self.setBspTreeDepth(0)
+
+            # Re-evaluate the item-caches' budget:
+            if _batch is None:
+                self.caches.rescale()
+
+            # Notify application of state-change:
+            self.notify(SaveState.UNSAVED)
+            self.update()
+
+    def push_action(self, _action: AbstractAction):
+        """
+        Forward an action to the open bulk-transaction, or to the actions-manager if there is none.
+
+        Parameters:
+            _action (AbstractAction): The action to forward.
+
+        Returns: None
+        """
+
+        if self._bulk is not None:  self._bulk.add_to_batch(_action)
+        else:                       self.manager.do(_action)
+
+    def notify(self, _state: SaveState):
+        """
+        Post a save-state notification. Notifications posted within the same event-loop iteration are folded into one
+        emission of `sig_canvas_state` with the most recent state (see `notifier` for counters).
+
+        Parameters:
+            _state (SaveState): The canvas' new state.
+
+        Returns: None
+        """
+
+        self.notifier.post(_state)
+
     def create_terminal(self,
                       _eclass : EntityClass,  # EntityClass (INP or OUT), see custom/entity.py.
                       _coords : QPointF,       # Position of the terminal (in scene-coordinates).
-                      _flag   : bool = True    # Should the action be pushed to the undo-stack?
+                      _flag   : bool = True,   # Should the action be pushed to the undo-stack?
+                      _socket : EntityRecord | None = None  # Existing record for the terminal's socket.
                       ):             
 
 
@@ -304,6 +466,7 @@ class Canvas(QGraphicsScene):
             _eclass (EntityClass): EntityClass (INP or OUT), see custom/entity.py.
             _coords (QPointF): Scene-position of the terminal.
             _flag (bool, optional): Whether to push this action to the undo-stack (default: True).
+            _socket (EntityRecord, optional): Existing record for the terminal's socket (default: None).
 
         Returns: None
         """
@@ -319,25 +482,32 @@ class Canvas(QGraphicsScene):
         logging.info(f"Creating new terminal at {_coords}")
 
         # Create new terminal and position it:
-        _terminal = StreamTerminal(_eclass, None)
+        _terminal = StreamTerminal(_eclass, None, _socket)
         _terminal.setPos(_coords)
-        _terminal.socket.sig_item_clicked.connect(self.begin_transient, Qt.ConnectionType.UniqueConnection)
-        _terminal.socket.sig_item_updated.connect(lambda: self.sig_canvas_state.emit(SaveState.UNSAVED), Qt.ConnectionType.UniqueConnection)
-        _terminal.sig_item_removed.connect(self.on_item_removed)
+        self.connect_terminal(_terminal)
 
         # Add item to canvas:
         self.term_db[_terminal] = True
         self.addItem(_terminal)
 
         # If flag is set, create and forward action to stack-manager:
-        if _flag: self.manager.do(CreateStreamAction(self, _terminal))
+        if _flag: self.push_action(CreateStreamAction(self, _terminal))
 
         # Set state-variable:
-        self.sig_canvas_state.emit(SaveState.UNSAVED)
+        self.notify(SaveState.UNSAVED)
 
         # Return terminal:
         return _terminal
 
+    def connect_terminal(self, _terminal: StreamTerminal):
+        """
+        Connect a terminal's signals to the canvas' slots.
+        """
+
+        _terminal.socket.sig_item_clicked.connect(self.begin_transient, Qt.ConnectionType.UniqueConnection)
+        _terminal.socket.sig_item_updated.connect(self.on_state_changed, Qt.ConnectionType.UniqueConnection)
+        _terminal.sig_item_removed.connect(self.on_item_removed)
+
     def create_node(self, 
                    _name: str = "Node", 
                    _cpos: QPointF | None = None,
@@ -361,27 +531,67 @@ class Canvas(QGraphicsScene):
         # Create new node and position it:
         _node = Node(_name, _cpos, None)
         _node.uid = self.create_nuid()
-
-        # Connect node's signal(s) to appropriate slots:
-        _node.sig_item_updated.connect(lambda: self.sig_canvas_state.emit(SaveState.UNSAVED))
-        _node.sig_exec_actions.connect(lambda: self.sig_canvas_state.emit(SaveState.UNSAVED))
-        _node.sig_exec_actions.connect(self.manager.do)
-        _node.sig_item_removed.connect(self.on_item_removed)
-        _node.sig_handle_clicked.connect(self.begin_transient)
+        self.connect_node(_node)
 
         # Add node to database and canvas:
         self.node_db[_node] = True
         self.addItem(_node)
 
         # Push action to undo-stack:
-        if _push:   self.manager.do(CreateNodeAction(self, _node))
+        if _push:   self.push_action(CreateNodeAction(self, _node))
 
         # Notify application of state-change:
-        self.sig_canvas_state.emit(SaveState.UNSAVED)
+        self.notify(SaveState.UNSAVED)
 
         # Return reference to newly created node:
         return _node
 
+    def connect_node(self, _node: Node):
+        """
+        Connect a node's signals to the canvas' slots.
+        """
+
+        _node.sig_item_updated.connect(self.on_state_changed)
+        _node.sig_exec_actions.connect(self.on_state_changed)
+        _node.sig_exec_actions.connect(self.manager.do)
+        _node.sig_handle_updated.connect(self.on_state_changed)
+        _node.sig_group_opened.connect(self.on_group_opened)
+        _node.sig_item_removed.connect(self.on_item_removed)
+        _node.sig_handle_clicked.connect(self.begin_transient)
+
+    def create_connector(self,
+                         _origin: Handle,           # Origin handle.
+                         _target: Handle,           # Target handle.
+                         _push  : bool = True       # Should the action be pushed to the undo-stack?
+                         ):
+        """
+        Connect two handles with a new connector.
+
+        Parameters:
+            _origin (Handle): The origin handle.
+            _target (Handle): The target handle.
+            _push (bool, optional): Whether to push this action to the undo-stack (default: True).
+
+        Returns:
+            Connector: The new connector.
+        """
+
+        # Create connector and add it to the canvas:
+        _connector = Connector(self.create_cuid(), _origin, _target)
+        _connector.sig_item_removed.connect(self.on_item_removed)
+
+        self.conn_db[_connector] = True
+        self.addItem(_connector)
+
+        # Push action to undo-stack:
+        if _push:   self.push_action(ConnectHandleAction(self, _connector))
+
+        # Notify application of state-change:
+        self.notify(SaveState.UNSAVED)
+
+        # Return reference to the new connector:
+        return _connector
+
     def create_cuid(self):
         """
         Create a unique ID for a new connector.
@@ -391,43 +601,291 @@ class Canvas(QGraphicsScene):
             str: Unique ID for a new connector.
         """
 
-        # Get existing connector UIDs:
-        id_set = {
-            int(connector.symbol.split('X')[1])
-            for connector in self.conn_db
-            if self.conn_db[connector]
-        }
+        # Smallest symbol not held by an active connector (see model/allocator.py):
+        return self._conn_ids.peek()
 
-        # If `id_set` is empty, return "X0":
-        if not id_set:  return "X0"
-        
-        # Get sequence of integers from 0 to `max(id_set) + 1`, not in `id_set`:
-        sequence = set(range(0, max(id_set) + 2))
-        reusable = sequence - id_set
+    def load_model(self, 
+                   _model: SchemaModel,         # Headless model of the schematic (see model/schema.py).
+                   _group_actions: bool = True, # Should all actions be grouped into a single undoable batch?
+                   _offset: QPointF = QPointF() # Offset added to every item's position.
+                   ):
+        """
+        Create nodes, terminals and connectors from a headless schema model. The model's records are copied, so the
+        same model can be loaded more than once.
 
-        # Return UID (prefix + smallest integer not in `id_set`):
-        return "X" + str(min(reusable))
+        Parameters:
+            _model (SchemaModel): The model to materialize.
+            _group_actions (bool, optional): Whether to group all actions into a single batch (default: True).
+            _offset (QPointF, optional): Offset added to the position of every node and terminal.
 
-    def create_nuid(self):
+        Returns:
+            dict[EntityRecord, Handle]: Maps each handle-record in `_model` to the handle created for it.
         """
-        Create a unique ID for a new node.
+
+        # Maps each handle-record in `_model` to the handle created for it:
+        handles = dict()
+
+        # Group all creations into a single undoable transaction (see `bulk_create()`):
+        with self.bulk_create() if _group_actions else nullcontext():
+            for _ in self.build_model(_model, handles, _offset):
+                pass
+
+        return handles
+
+    def build_model(self, _model: SchemaModel, _handles: dict, _offset: QPointF = QPointF()):
         """
+        Generator that creates the items of a headless schema model one record at a time, and yields after each (see
+        `load_model()`). Callers that spread the work over several frames resume it within a bulk-transaction each
+        time (see tabs/schema/loader.py).
 
-        id_set = {
-            int(_node.uid.split('N')[1])
-            for _node, state in self.node_db.items()
-            if state
-        }
+        Parameters:
+            _model (SchemaModel): The model to materialize.
+            _handles (dict): Filled with the handle created for each handle-record in `_model`.
+            _offset (QPointF, optional): Offset added to the position of every node and terminal.
 
-        # If `id_set` is empty, return "N0":
-        if not id_set:  return "N0000"
-        
-        # Get sequence of integers from 0 to `max(id_set) + 1`, not in `id_set`:
-        sequence = set(range(0, max(id_set) + 2))
-        reusable = sequence - id_set
+        Yields:
+            NodeRecord | TerminalRecord | ConnectorRecord: The record whose items have been created.
+        """
+
+        # Create nodes:
+        for _record in _model.nodes.values():
+
+            _node = self.create_node(_record.title, QPointF(_record.x, _record.y) + _offset)
+            _node.resize(int(_record.height - _node.boundingRect().height()))
+            _node[EntityClass.EQN, None] = list(_record.equations)
+
+            # Create variables:
+            for _var in _record.variables:
+
+                _handle = _node.create_handle(QPointF(_var.x, _var.y), _var.eclass, _var.copy(parent=None))
+                _handle.sig_item_updated.emit(_handle)
+                _handles[_var] = _handle
+
+                self.push_action(CreateHandleAction(_node, _handle))
 
-        # Return UID (prefix + smallest integer not in `id_set`):
-        return "N" + str(min(reusable)).zfill(4)
+            # Create parameters:
+            for _par in _record.parameters:
+                _node[EntityClass.PAR, Entity(_par.copy(parent=None))] = EntityState.ACTIVE
+
+            # Composite nodes get a copy of their sub-system, and map their new boundary-handles into it:
+            if  _record.children is not None:
+                _node.record.children, _inner = _record.children.clone()
+                _node.record.ports = {
+                    _handles[_outer].record: _inner[_handle] for _outer, _handle in _record.ports.items()
+                    if  _outer in _handles and _handle in _inner
+                }
+
+            yield _record
+
+        # Create terminals:
+        for _record in _model.terminals.values():
+
+            _terminal = self.create_terminal(_record.eclass, QPointF(_record.x, _record.y) + _offset, True, _record.socket.copy(parent=None))
+            _terminal.socket.sig_item_updated.emit(_terminal.socket)
+            _handles[_record.socket] = _terminal.socket
+
+            yield _record
+
+        # Create connectors:
+        for _record in _model.connectors.values():
+
+            _origin = _handles.get(_record.origin)
+            _target = _handles.get(_record.target)
+            if _origin is None or _target is None:
+                logging.warning(f"Connector {_record.symbol} has unresolved endpoints, skipping")
+                continue
+
+            try:
+                self.create_connector(_origin, _target)
+
+            except ValueError as exception:
+                logging.warning(f"Connector {_record.symbol} is invalid, skipping: {exception}")
+
+            yield _record
+
+    def page_model(self, _model: SchemaModel):
+        """
+        Adopt the records of a large headless schema model without creating any items: the pager creates the items of
+        the records in (or near) the view, and removes them again once they are out of reach (see `pager`). Unlike
+        `load_model()`, the records are not copied and the operation cannot be undone. The canvas must be empty, or
+        hold only the parts of the same model adopted before (see tabs/schema/loader.py).
+
+        Parameters:
+            _model (SchemaModel): The model to adopt.
+
+        Returns: None
+        """
+
+        # Records hold their UIDs and symbols while their items are paged out (see the registry-callbacks):
+        for _record in _model.nodes.values():
+            self.model.add_node(_record)
+            self._node_ids.claim(_record, _record.uid)
+
+        for _record in _model.terminals.values():
+            self.model.add_terminal(_record)
+
+        for _record in _model.connectors.values():
+            self.model.add_connector(_record)
+            self._conn_ids.claim(_record, _record.symbol)
+
+        self.pager.attach(_model)
+        self.notify(SaveState.UNSAVED)
+
+    def group_items(self, _items) -> Node | None:
+        """
+        Fold nodes and terminals, and the connectors between them, into a single composite node. The composite keeps
+        a copy of the folded records as a sub-system (`NodeRecord.children`) without any graphics items; each connector
+        that crosses the selection's boundary is re-routed to a boundary-handle of the composite. The whole operation is
+        one undoable transaction.
+
+        Parameters:
+            _items (Iterable[QGraphicsItem]): The items to group (other item-types are ignored).
+
+        Returns:
+            Node | None: The composite node, or None if there was nothing to group.
+        """
+
+        _inner = [
+            _item for _item in _items
+            if  isinstance(_item, Node) and self.node_db.get(_item) or
+                isinstance(_item, StreamTerminal) and self.term_db.get(_item)
+        ]
+
+        if not _inner:  return None
+
+        # Sub-system of the grouped records (includes the connectors between them). The records are copied, undoing the
+        # grouping restores the originals, which can then be edited without affecting the composite:
+        _children, _copies = self.model.subset([_item.record for _item in _inner]).clone()
+
+        # Connectors that cross the boundary, as (inner handle, outer handle)-pairs:
+        _crossing = list()
+        for _conn, _state in self.conn_db.items():
+
+            if  not _state or _conn.record is None:
+                continue
+
+            _origin_in = _conn.origin.parentItem() in _inner
+            _target_in = _conn.target.parentItem() in _inner
+            if  _origin_in != _target_in:
+                _crossing.append((_conn.origin, _conn.target) if _origin_in else (_conn.target, _conn.origin))
+
+        # The composite is placed at the centroid of the grouped items:
+        _center = sum((_item.scenePos() for _item in _inner), QPointF()) / len(_inner)
+
+        with self.bulk_create():
+
+            # Remove the grouped items first, this frees the outer handles of crossing connectors:
+            for _item in _inner:
+
+                _action = RemoveNodeAction(self, _item) if isinstance(_item, Node) else RemoveStreamAction(self, _item)
+                _action.execute()
+                self.push_action(_action)
+
+            # Create the composite and its boundary-handles:
+            _group = self.create_node("Group", _center)
+            _group.record.children = _children
+
+            _count = {EntityClass.INP: 0, EntityClass.OUT: 0}
+            _rows  = max(
+                sum(1 for _handle, _ in _crossing if _handle.eclass == EntityClass.INP),
+                sum(1 for _handle, _ in _crossing if _handle.eclass == EntityClass.OUT)
+            )
+
+            # Make room for the boundary-handles (four fit the default height):
+            if  _rows > 4:
+                _group.resize(25 * (_rows - 4))
+
+            for _handle, _outer in _crossing:
+
+                _eclass = _handle.eclass
+                _coords = QPointF(-95 if _eclass == EntityClass.INP else 95, -25 + 25 * _count[_eclass])
+                _count[_eclass] += 1
+
+                _port = _group.create_handle(_coords, _eclass)
+                _port.rename(_handle.label)
+                _port.strid = _handle.strid
+                _port.color = _handle.color
+                _port.units = _handle.units
+                _port.info  = _handle.info
+                _port.sig_item_updated.emit(_port)
+
+                _group.record.ports[_port.record] = _copies[_handle.record]
+                self.push_action(CreateHandleAction(_group, _port))
+
+                # Re-route the crossing connector:
+                if  _eclass == EntityClass.INP: self.create_connector(_outer, _port)
+                else:                           self.create_connector(_port, _outer)
+
+        return _group
+
+    def expand_group(self, _group: Node):
+        """
+        Materialize the sub-system of a composite node in its place, re-connecting the boundary-connectors to the
+        handles they stand for, and remove the composite. The whole operation is one undoable transaction.
+
+        Parameters:
+            _group (Node): The composite node.
+
+        Returns: None
+        """
+
+        _children = _group.record.children
+        if  _children is None or not self.node_db.get(_group):
+            return
+
+        # Boundary-connectors, as (outer handle, inner handle-record)-pairs:
+        _links = [
+            (_port.conjugate(), _group.record.ports.get(_port.record), _port)
+            for _port in _group[EntityClass.INP] | _group[EntityClass.OUT]
+            if  _port.connected and _port.conjugate()
+        ]
+
+        # Validate the re-connections before touching the scene (the inner handle is of the boundary-handle's class):
+        _known = {_handle for _node in _children.nodes.values() for _handle in _node.variables}
+        _known.update(_term.socket for _term in _children.terminals.values())
+        for _outer, _record, _port in _links:
+            if  _record not in _known or _record.eclass != _port.eclass or _outer.eclass == _port.eclass:
+                logging.warning(f"Unable to expand {_group.uid}: boundary-handle {_port.symbol} has no valid inner handle")
+                return
+
+        # The children keep their layout relative to the composite, wherever it was moved to:
+        _records = list(_children.nodes.values()) + list(_children.terminals.values())
+        _offset  = _group.scenePos() - sum((QPointF(_record.x, _record.y) for _record in _records), QPointF()) / max(len(_records), 1)
+
+        with self.bulk_create():
+
+            # Remove the composite first, this frees the outer handles:
+            _action = RemoveNodeAction(self, _group)
+            _action.execute()
+            self.push_action(_action)
+
+            # Create the children, then re-connect the boundary-connectors:
+            _handles = self.load_model(_children, True, _offset)
+            for _outer, _record, _ in _links:
+
+                _inner = _handles.get(_record)
+                if  _inner is None:
+                    continue
+
+                if  _outer.eclass == EntityClass.OUT:   self.create_connector(_outer, _inner)
+                else:                                   self.create_connector(_inner, _outer)
+
+    @pyqtSlot()
+    def on_group_opened(self):
+        """
+        Slot triggered when the user opens a composite node.
+        """
+
+        if  isinstance(self.sender(), Node):
+            self.expand_group(self.sender())
+
+    def create_nuid(self):
+        """
+        Create a unique ID for a new node.
+        """
+
+        # Smallest UID not held by an active node (see model/allocator.py):
+        return self._node_ids.peek()
 
     def copy_selection(self):
         """
@@ -450,56 +908,45 @@ class Canvas(QGraphicsScene):
         Parameters: None
         Returns: None
         """
-        # Create batch-commands:
-        batch = BatchActions([])
+        # Group all creations into a single undoable transaction (see `bulk_create()`):
+        with self.bulk_create():
 
-        # Duplicate items:
-        for item in Canvas.Registry.clipboard:
-            
-            # Duplicate item (node or terminal):
-            _copy = item.duplicate(self)
+            # Duplicate items:
+            for item in Canvas.Registry.clipboard:
 
-            # Add to batch-action:
-            if      isinstance(item, Node)          : batch.add_to_batch(CreateNodeAction(self, _copy))
-            elif    isinstance(item, StreamTerminal): batch.add_to_batch(CreateStreamAction(self, _copy))
+                # Duplicate item (node or terminal):
+                _copy = item.duplicate(self)
 
-            # Add copy to node-database so that `create_nuid()` returns a unique ID:
-            if   isinstance(item, Node)          : self.node_db[_copy] = True
-            elif isinstance(item, StreamTerminal): self.term_db[_copy] = True
+                # Add to batch-action:
+                if      isinstance(item, Node)          : self.push_action(CreateNodeAction(self, _copy))
+                elif    isinstance(item, StreamTerminal): self.push_action(CreateStreamAction(self, _copy))
 
-        # Re-establish connections:
-        while Handle.cmap:
+                # Add copy to node-database so that `create_nuid()` returns a unique ID:
+                if   isinstance(item, Node)          : self.node_db[_copy] = True
+                elif isinstance(item, StreamTerminal): self.term_db[_copy] = True
 
-            try:
-                # `handle` and `conjugate` belong to the copied nodes. `origin` and `target` are their mirrors in the
-                # copied nodes that must now be connected:
-                handle   , origin = Handle.cmap.popitem()
-                conjugate, target = handle.conjugate(), Handle.cmap[handle.conjugate()]     # Throws exception if `handle` is not connected
+            # Re-establish connections:
+            while Handle.cmap:
 
-                # If exception is not thrown, both origin and target are valid, connected handles:
-                Handle.cmap.pop(conjugate)  # Remove the key corresponding to handle's conjugate
+                try:
+                    # `handle` and `conjugate` belong to the copied nodes. `origin` and `target` are their mirrors in the
+                    # copied nodes that must now be connected:
+                    handle   , origin = Handle.cmap.popitem()
+                    conjugate, target = handle.conjugate(), Handle.cmap[handle.conjugate()]     # Throws exception if `handle` is not connected
 
-                # Create connector and add it to batch:
-                connector = Connector(self.create_cuid(), origin, target)
-                connector.sig_item_removed.connect(self.on_item_removed)
+                    # If exception is not thrown, both origin and target are valid, connected handles:
+                    Handle.cmap.pop(conjugate)  # Remove the key corresponding to handle's conjugate
 
-                # Add connector to canvas:
-                self.conn_db[connector] = True
-                self.addItem(connector)
+                    # Create connector and add it to batch:
+                    self.create_connector(origin, target)
 
-                # Add connector-creation to batch:
-                batch.add_to_batch(ConnectHandleAction(self, connector))
+                except KeyError as key_error:       # Thrown by `Handle.cmap`
+                    logging.error(f"KeyError: {key_error}")
+                    pass
 
-            except KeyError as key_error:       # Thrown by `Handle.cmap`
-                logging.error(f"KeyError: {key_error}")
-                pass
-
-            except TypeError as type_error:     # Thrown by `handle`
-                logging.error(f"TypeError: {type_error}")
-                pass
-
-        # Execute:
-        if batch.size():    self.manager.do(batch)
+                except TypeError as type_error:     # Thrown by `handle`
+                    logging.error(f"TypeError: {type_error}")
+                    pass
 
     def paste_item(self, 
                   _item: QGraphicsObject,   # Item to be pasted.
@@ -515,9 +962,11 @@ class Canvas(QGraphicsScene):
 
         # Find type of item:
         if isinstance(_item, Node):
-            _item.sig_item_updated.connect(lambda: self.sig_canvas_state.emit(SaveState.UNSAVED), Qt.ConnectionType.UniqueConnection)
-            _item.sig_exec_actions.connect(lambda: self.sig_canvas_state.emit(SaveState.UNSAVED), Qt.ConnectionType.UniqueConnection)
+            _item.sig_item_updated.connect(self.on_state_changed, Qt.ConnectionType.UniqueConnection)
+            _item.sig_exec_actions.connect(self.on_state_changed, Qt.ConnectionType.UniqueConnection)
             _item.sig_exec_actions.connect(self.manager.do, Qt.ConnectionType.UniqueConnection)
+            _item.sig_handle_updated.connect(self.on_state_changed, Qt.ConnectionType.UniqueConnection)
+            _item.sig_group_opened.connect(self.on_group_opened, Qt.ConnectionType.UniqueConnection)
             _item.sig_item_removed.connect(self.on_item_removed, Qt.ConnectionType.UniqueConnection)
             _item.sig_handle_clicked.connect(self.begin_transient, Qt.ConnectionType.UniqueConnection)
             _item.uid = self.create_nuid()
@@ -525,7 +974,7 @@ class Canvas(QGraphicsScene):
         elif isinstance(_item, StreamTerminal):
             self.term_db[_item] = True
             _item.socket.sig_item_clicked.connect(self.begin_transient)
-            _item.socket.sig_item_updated.connect(lambda: self.sig_canvas_state.emit(SaveState.UNSAVED))
+            _item.socket.sig_item_updated.connect(self.on_state_changed)
             _item.sig_item_removed.connect(self.on_item_removed)
 
         # Add item to canvas:
@@ -537,7 +986,7 @@ class Canvas(QGraphicsScene):
             pass
 
         # Notify application of state-change:
-        self.sig_canvas_state.emit(SaveState.UNSAVED)
+        self.notify(SaveState.UNSAVED)
 
     def select_items(self, _items_dict: dict):
         """
@@ -591,10 +1040,11 @@ class Canvas(QGraphicsScene):
     @pyqtSlot(str)  # Method to import a JSON-schematic
     def import_schema(self, _file: str | None = None):
         """
-        Import a JSON-schematic from a file.
+        Import a JSON- or binary schematic (see `BinLib`) from a file. JSON-files are read in the background, and the
+        schematic appears as it is read (see `SchemaLoader`). Binary files are read in place from a memory-map.
 
         Parameters:
-            _file (str, optional): The path to the JSON-file to be imported.
+            _file (str, optional): The path to the file to be imported.
 
         Returns: None
         """
@@ -605,43 +1055,69 @@ class Canvas(QGraphicsScene):
         # Get file-path if it hasn't been provided:
         if not isinstance(_file, str):
             
-            _file, _code = QFileDialog.getOpenFileName(None, "Select JSON file", "./", "JSON files (*.json)")
+            _file, _code = QFileDialog.getOpenFileName(None, "Select schematic", "./", f"Schematics (*.json *{BinLib.SUFFIX})")
             if not _code: 
                 logging.info("Open operation cancelled!")
                 return
 
-        # Open file:
-        with open(_file, "r+") as _json_str:
-            _code = _json_str.read()
-            
-        # Decode JSON-string:
-        _json = JsonLib.decode_json(_code, self, _group_actions=True)
+        # Binary schematics:
+        if  Path(_file).suffix == BinLib.SUFFIX:
+            BinLib.decode_bin(_file, self, _group_actions=True)
+            return
+
+        # One schematic is loaded at a time:
+        if  self.loader is not None:
+            logging.warning(f"Already opening a schematic, ignoring {_file}")
+            return
+
+        # Read the file on a worker-thread, its contents are added in batches (see tabs/schema/loader.py):
+        self.loader = SchemaLoader(self, _file)
+        self.loader.sig_finished.connect(self.on_schema_loaded)
+        self.loader.start()
 
-        # Notify application of state-change:
         # self.sig_json_loaded.emit (Path(_file).name )
-        self.sig_canvas_state.emit(SaveState.UNSAVED)
+
+    def on_schema_loaded(self, _complete: bool):
+        """
+        Slot triggered when the loader of `import_schema()` is done.
+        """
+        self.loader = None
 
     @pyqtSlot(str)  # Method to export a JSON-schematic 
     def export_schema(self, _export_name: str | None = None):
         """
-        Export the canvas's contents (schematic) as a JSON-file.
+        Export the canvas's contents (schematic) as a JSON-file, or as a binary file (see `BinLib`) if the file's
+        suffix is `BinLib.SUFFIX`. Once the whole schematic has been saved to a JSON-file, later saves to the same file
+        only append the changes since the previous save (see `SchemaSaver`).
 
         Args:
             _export_name (str): The name of the file to export the schematic to.
 
-        Returns: None
+        Returns: bool: True if the schematic was saved, False otherwise.
         """
 
         # Try-block:
         try:
             
-            # Encode canvas' contents to JSON-string, then write to file:
-            _json_str = JsonLib.encode_json(self)
-            with open(_export_name, "w+") as _file:
-                _file.write(_json_str)
+            # Encode canvas' contents to bytes or to a JSON-string, then write to file:
+            if  Path(_export_name).suffix == BinLib.SUFFIX:
+                with open(_export_name, "wb") as _file:
+                    _file.write(BinLib.encode_bin(self))
+
+                self.autosaver.saved()
+
+            # Saves of the whole schematic are incremental:
+            elif not self.selectedItems():
+                self.saver.save(_export_name)
+                self.autosaver.saved()
+
+            else:
+                _json_str = JsonLib.encode_json(self)
+                with open(_export_name, "w+") as _file:
+                    _file.write(_json_str)
 
             # Notify application of state-change:
-            self.sig_canvas_state.emit(SaveState.SAVED)
+            self.notify(SaveState.SAVED)
 
         # Exception chain:
         except Exception as exception:
@@ -651,7 +1127,9 @@ class Canvas(QGraphicsScene):
             _error_dialog.exec()
             
             logging.error(f"Error encoding JSON: {exception}")
-            return
+            return False
+
+        return True
 
     @pyqtSlot(Handle)
     def begin_transient(self, _handle: Handle):
@@ -691,6 +1169,80 @@ class Canvas(QGraphicsScene):
         self._conn.target = None
         self._conn.connector.clear()
 
+    def dragged(self) -> list:
+        """
+        Returns the nodes and terminals that the user is dragging, together with the connectors attached to them, or
+        an empty list if nothing has moved since the last mouse-press (see `mousePressEvent`).
+        """
+
+        if not any(_item.pos() != _pos for _item, _pos in self._drag.items()):
+            return []
+
+        _items = list(self._drag)
+        for _item in self._drag:
+
+            _handles = list(_item[EntityClass.VAR]) if isinstance(_item, Node) else [_item.socket]
+            for _handle in _handles:
+                _connector = _handle.connector() if _handle.connected and _handle.connector else None
+                if  _connector is not None and _connector not in _items:
+                    _items.append(_connector)
+
+        return _items
+
+    def journal_moves(self):
+        """
+        Journals the modification of the nodes and terminals that were moved since the last mouse-press (see
+        `mousePressEvent`), and notifies the application that the canvas has unsaved changes.
+        """
+
+        _moved, self._drag = [(_item, _pos) for _item, _pos in self._drag.items() if _item.pos() != _pos], dict()
+        for _item, _pos in _moved:
+            if  self.node_db.get(_item) or self.term_db.get(_item):
+                self.model.touch(_item.record)
+
+            # Reroute the orthogonal connectors that the item has cleared or now blocks:
+            _rect = _item.sceneBoundingRect()
+            self.router.invalidate(_rect)
+            self.router.invalidate(_rect.translated(_pos - _item.pos()))
+
+        if  _moved:
+            self.notify(SaveState.UNSAVED)
+
+    def set_geometry(self, _geometry: PathGeometry):
+        """
+        Sets the geometry of all connectors, present and future. Orthogonal connectors (`PathGeometry.RECT`) are routed
+        around the nodes and terminals in their way by the canvas' router.
+        """
+
+        self.geometry = _geometry
+        for _connector, _state in self.conn_db.items():
+            if  _state:
+                _connector.geometry = _geometry
+
+    @pyqtSlot()
+    def on_state_changed(self):
+        """
+        Slot triggered when an item is modified. Journals the modification of the item's record (see
+        `SchemaModel.journal`) and notifies the application that the canvas has unsaved changes.
+        """
+
+        # Items that are being paged in report their contents, which have not changed:
+        if  self._paging:
+            return
+
+        # Handles are journaled as a modification of their node or terminal:
+        _item = self.sender()
+        if  isinstance(_item, Handle):
+            _item = _item.parentItem()
+
+        if  (
+            isinstance(_item, Node) and self.node_db.get(_item) or
+            isinstance(_item, StreamTerminal) and self.term_db.get(_item)
+        ):
+            self.model.touch(_item.record)
+
+        self.notify(SaveState.UNSAVED)
+
     def on_item_removed(self):
         """
         Slot triggered when an emits a 'sig_item_removed' signal. Deletes the node.
@@ -706,6 +1258,81 @@ class Canvas(QGraphicsScene):
         ):
             self.delete_items({item: True})  # Delete item
     
+    def on_node_toggled(self, _node: Node, _state: bool | None):
+        """
+        Registry-callback for `node_db`. Adds the node to the schema model, the UID-allocator, the UID-index and the
+        cache-policy when it is activated, and removes it when the node is deactivated or dropped. Nodes that are paged
+        out leave their record in the model, and the record holds on to the UID.
+        """
+
+        if _state:
+            self.model.add_node(_node.record)
+            self._node_ids.release(_node.record)
+            self._node_ids.claim(_node, _node.uid)
+            self._node_index[_node.uid] = _node
+            self.caches.manage(_node)
+            if not self._paging:    self.router.invalidate(_node.sceneBoundingRect())
+
+        else:
+            if self._paging:    self._node_ids.claim(_node.record, _node.uid)
+            else:               self.model.remove_node(_node.record)
+
+            self._node_ids.release(_node)
+            self.caches.release(_node)
+            if not self._paging:    self.router.invalidate(_node.sceneBoundingRect())
+            if self._node_index.get(_node.uid) is _node:
+                self._node_index.pop(_node.uid)
+
+    def on_terminal_toggled(self, _terminal: StreamTerminal, _state: bool | None):
+        """
+        Registry-callback for `term_db`. Adds the terminal's record to the schema model (and the terminal to the
+        cache-policy) when the terminal is activated, and removes it when the terminal is deactivated or dropped (but
+        not when it is paged out).
+        """
+
+        if not self._paging:
+            self.router.invalidate(_terminal.sceneBoundingRect())
+
+        if not _state:
+            if not self._paging:    self.model.remove_terminal(_terminal.record)
+            self.caches.release(_terminal)
+            return
+
+        # Terminal-UIDs are random, re-roll on collision:
+        while self.model.terminals.get(_terminal.uid, _terminal.record) is not _terminal.record:
+            _terminal.uid = random_id(length=4, prefix='T')
+
+        self.model.add_terminal(_terminal.record)
+        self.caches.manage(_terminal)
+
+    def on_connector_toggled(self, _connector: Connector, _state: bool | None):
+        """
+        Registry-callback for `conn_db`. Adds the connector to the schema model, the symbol-allocator and the
+        symbol-index when it is activated, and removes it when the connector is deactivated or dropped. Connectors that
+        are paged out leave their record in the model, and the record holds on to the symbol.
+        """
+
+        if _connector.record is None:   return
+        if _state:
+            self.model.add_connector(_connector.record)
+            self._conn_ids.release(_connector.record)
+            self._conn_ids.claim(_connector, _connector.symbol)
+            self._conn_index[_connector.symbol] = _connector
+
+            # Connectors take the canvas' geometry, orthogonal ones are routed once they are on the canvas:
+            _connector.geometry = self.geometry
+            if  self.geometry == PathGeometry.RECT:
+                self.router.post(_connector)
+
+        else:
+            if self._paging:    self._conn_ids.claim(_connector.record, _connector.symbol)
+            else:               self.model.remove_connector(_connector.record)
+
+            self._conn_ids.release(_connector)
+            self.router.discard(_connector)
+            if self._conn_index.get(_connector.symbol) is _connector:
+                self._conn_index.pop(_connector.symbol)
+
     def find_stream(self, _stream: str):
         """
         Find a stream by its name.
@@ -717,15 +1344,33 @@ class Canvas(QGraphicsScene):
             Stream: The stream with the given name (see custom/stream.py).
         """
 
-        return next((stream for stream in self.type_db if stream.strid == _stream), None) 
+        return self.type_db.get(_stream)
 
     def find_node(self, _uid: str):
+        """
+        Find an active node by its UID.
+
+        Args:
+            _uid (str): The node's UID (e.g. N0001).
+
+        Returns:
+            Node: The node with the given UID, or None if there is no such node.
+        """
+
+        return self._node_index.get(_uid)
 
-        for _node in self.node_db.keys():
-            if self.node_db[_node] and _uid == _node.uid:
-                return _node
+    def find_connector(self, _symbol: str):
+        """
+        Find an active connector by its symbol.
+
+        Args:
+            _symbol (str): The connector's symbol (e.g. X12).
 
-        return None
+        Returns:
+            Connector: The connector with the given symbol, or None if there is no such connector.
+        """
+
+        return self._conn_index.get(_symbol)
 
     def clear(self):
         """
@@ -749,15 +1394,41 @@ class Canvas(QGraphicsScene):
 
         # If user confirms, delete nodes and streams:
         if dialog.exec() == QMessageBox.StandardButton.Yes:
+            self.wipe()
 
-            # Delete nodes and terminals:
-            self.delete_items(self.node_db)
-            self.delete_items(self.term_db)
+        # Note: Do not forward the event to super-class, this will delete the transient-connector and cause a crash!
 
-            # Safe-delete undo and redo stacks:
-            self.manager.wipe_stack()
+    def wipe(self):
+        """
+        Deletes all nodes, terminals and connectors (including the records of paged-out items) without confirmation,
+        and wipes the undo- and redo-stacks.
 
-        # Note: Do not forward the event to super-class, this will delete the transient-connector and cause a crash!
+        Parameters: None
+        Returns: None
+        """
+
+        # Delete nodes and terminals:
+        self.delete_items(self.node_db)
+        self.delete_items(self.term_db)
+
+        # Drop the records of paged-out items, and their connectors:
+        for _record in self.pager.detach():
+
+            for _entity in _record.variables if isinstance(_record, NodeRecord) else [_record.socket]:
+                _conn = self.model.connector_of(_entity)
+                if  _conn is not None:
+                    self.model.remove_connector(_conn)
+                    self._conn_ids.release(_conn)
+
+            if  isinstance(_record, NodeRecord):
+                self.model.remove_node(_record)
+                self._node_ids.release(_record)
+
+            else:
+                self.model.remove_terminal(_record)
+
+        # Safe-delete undo and redo stacks:
+        self.manager.wipe_stack()
 
     # ------------------------------------------------------------------------------------------------------------------
     # PROPERTIES
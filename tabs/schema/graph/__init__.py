@@ -3,3 +3,7 @@ from .anchor import Anchor
 from .handle import Handle
 from .terminal import StreamTerminal
 from .connector import Connector, PathGeometry
+from .redraw import RedrawQueue
+from .cache import CachePolicy
+from .pager import ScenePager
+from .router import ConnectorRouter
@@ -8,6 +8,7 @@ from PyQt6.QtGui import QPen, QColor
 from PyQt6.QtWidgets import QGraphicsItem, QGraphicsObject, QGraphicsEllipseItem
 
 from custom import EntityClass
+from util   import LevelOfDetail, level_of_detail
 
 class Anchor(QGraphicsObject):
 
@@ -65,6 +66,9 @@ class Anchor(QGraphicsObject):
 
     # Event-handler for paint-event:
     def paint(self, painter, option, widget = ...):
+        if level_of_detail(painter) < LevelOfDetail.DETAIL:
+            return
+
         painter.setPen(self._style.pen_default)
         painter.drawLine(self._attr.dims)
 
@@ -72,9 +76,10 @@ class Anchor(QGraphicsObject):
     def stream(self):
         return self._stream
 
-    # Returns bounding-rectangle:
+    # Returns bounding-rectangle (includes the line's round caps, which extend beyond its end-points):
     def boundingRect(self):
-        return self._attr.rect
+        _cap = self._style.pen_default.widthF() / 2.0
+        return self._attr.rect.adjusted(0, -_cap, 0, _cap)
 
     # Displays a handle-hint on mouse-over:
     def hoverEnterEvent(self, event):
@@ -109,6 +114,7 @@ class Anchor(QGraphicsObject):
 
     # Adjust size:
     def resize(self, delta: int):
+        self.prepareGeometryChange()
         self._attr.dims.setP2(self._attr.dims.p2() + QPointF(0, delta))  # Adjust the end point of the line
         self._attr.rect.setBottom(self._attr.rect.bottom() + delta)
         self.update()
\ No newline at end of file
@@ -0,0 +1,235 @@
+from PyQt6         import sip
+from PyQt6.QtCore    import Qt, QObject, QRectF, QTimer
+from PyQt6.QtGui     import QPixmapCache
+from PyQt6.QtWidgets import QGraphicsItem
+
+from custom import StaticLabel
+from util   import LevelOfDetail
+
+# Class CachePolicy: Assigns cache-modes to nodes and terminals:
+class CachePolicy(QObject):
+    """
+    Cache-mode manager for the canvas' nodes and terminals. Each managed item is cached along with its labels (its
+    "parts"), the cache-mode depending on the zoom-level:
+
+        zoom < LevelOfDetail.DETAIL     NoCache (the low-detail paths of `paint()` are cheaper than a pixmap-blit).
+        zoom >= LevelOfDetail.DETAIL    DeviceCoordinateCache.
+
+    Device-coordinate caches are re-rasterized whenever the zoom-level changes, so caching is suspended while the user
+    zooms, and resumed once the zoom-level has not changed for `SETTLE` milliseconds.
+
+    Item-coordinate caches are not used: they are rasterized at 100% and scaled on every blit, which costs more than
+    painting the items when zoomed out, and blurs them when zoomed in.
+
+    The pixmaps of the items that are in view must fit in `budget` bytes. If they do not, only the most complex items
+    (those with the most parts) keep their caches. Qt keeps the pixmaps in `QPixmapCache`, whose limit is raised to
+    make room for the budget if necessary.
+
+    Attributes:
+        requests (int): Number of cached parts exposed by the viewer (see `expose()`).
+        misses (int): Number of cached parts painted into their pixmaps (see `util.cache_miss()`).
+        usage (int): Estimated size (in bytes) of the pixmaps of the items in view.
+    """
+
+    # Default budget (bytes), and the room left in `QPixmapCache` for other pixmaps (e.g. icons, see util.py):
+    BUDGET  = 32 * 1024 * 1024
+    RESERVE = 10 * 1024 * 1024
+
+    # Items are looked up by their bounding-rectangles (their shapes are not needed):
+    MODE = Qt.ItemSelectionMode.IntersectsItemBoundingRect
+
+    # Time (ms) after the last zoom-step at which caching resumes:
+    SETTLE = 150
+
+    # Initializer:
+    def __init__(self, parent: QObject | None = None, _budget: int = BUDGET):
+
+        # Initialize base-class:
+        super().__init__(parent)
+
+        # Managed items, each mapped to its parts:
+        self._items = dict()
+
+        # Current policy:
+        self._mode   = QGraphicsItem.CacheMode.DeviceCoordinateCache
+        self._cutoff = 0        # Items with fewer parts than this are not cached.
+        self._zoom   = 1.0      # Zoom-level of the viewer.
+        self._view   = QRectF() # Visible part of the scene.
+
+        # Counters:
+        self.requests = 0
+        self.misses   = 0
+        self.usage    = 0
+
+        # Single-shot timer, restarted by every zoom-step:
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.SETTLE)
+        self._timer.timeout.connect(self.rescale)
+
+        self._budget = 0
+        self.budget  = _budget
+
+    def __len__(self):  return len(self._items)
+
+    @property
+    def budget(self) -> int:    return self._budget
+
+    @budget.setter
+    def budget(self, _budget: int):
+
+        self._budget = max(0, int(_budget))
+
+        # Make room for the budget in the pixmap-cache (the limit is in KB):
+        _limit = (self._budget + self.RESERVE) // 1024
+        if  QPixmapCache.cacheLimit() < _limit:
+            QPixmapCache.setCacheLimit(_limit)
+
+        self.rescale()
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of the exposed parts that were painted from their caches.
+        """
+        return max(0.0, 1.0 - self.misses / self.requests) if self.requests else 0.0
+
+    def reset(self) -> None:
+        """
+        Resets the hit-rate counters.
+        """
+        self.requests = 0
+        self.misses   = 0
+
+    def manage(self, _item: QGraphicsItem) -> None:
+        """
+        Starts managing `_item`'s cache-mode.
+        """
+        self._items[_item] = self.parts(_item)
+        self.assign(_item)
+
+    def release(self, _item: QGraphicsItem) -> None:
+        """
+        Stops managing `_item`'s cache-mode and drops its pixmaps.
+        """
+
+        _parts = self._items.pop(_item, None)
+        for _part in _parts or []:
+            if not sip.isdeleted(_part):    _part.setCacheMode(QGraphicsItem.CacheMode.NoCache)
+
+    def invalidate(self, _item: QGraphicsItem) -> None:
+        """
+        Re-collects the parts of `_item`'s top-level item and re-assigns their caches, after its contents changed
+        (resize, rename, new or removed handles). The pixmaps of the parts themselves are discarded by Qt whenever a
+        part calls `update()`, e.g. when it is selected.
+        """
+
+        _item = _item.topLevelItem()
+        if  _item in self._items:
+            self._items[_item] = self.parts(_item)
+            self.assign(_item)
+
+    def rescale(self, _zoom: float | None = None, _view: QRectF | None = None) -> None:
+        """
+        Updates the policy for a new zoom-level and/or view (the visible part of the scene), or for the current ones if
+        neither is given (e.g. after items were added). Cache-modes are only re-assigned if the policy changes.
+        """
+
+        _view = self._view if _view is None else _view
+        _zoom = self._zoom if _zoom is None else _zoom
+        self._view = _view
+
+        # Suspend caching while the zoom-level changes:
+        if  _zoom != self._zoom or self._timer.isActive():
+            self._zoom = _zoom
+            self._timer.start()
+            self.apply(QGraphicsItem.CacheMode.NoCache, 0)
+            return
+
+        # Cache-mode:
+        _mode = QGraphicsItem.CacheMode.NoCache if _zoom < LevelOfDetail.DETAIL or not self._budget else \
+                QGraphicsItem.CacheMode.DeviceCoordinateCache
+
+        # Grant caches to the items in view, most complex first, until the budget is spent:
+        _cutoff = 0
+        self.usage = 0
+        if  _mode != QGraphicsItem.CacheMode.NoCache:
+
+            _scene = self.parent()
+            _shown = {_found.topLevelItem() for _found in _scene.items(_view, self.MODE)} if _scene else set()
+            _shown = sorted([_item for _item in _shown if _item in self._items],
+                            key=lambda _item: len(self._items[_item]), reverse=True)
+
+            for _item in _shown:
+                _bytes = self.footprint(_item, _zoom)
+                if  self.usage + _bytes > self._budget:
+                    _cutoff = len(self._items[_item]) + 1
+                    break
+
+                self.usage += _bytes
+
+        self.apply(_mode, _cutoff)
+
+    def apply(self, _mode: QGraphicsItem.CacheMode, _cutoff: int) -> None:
+        """
+        Assigns `_mode` to the items with at least `_cutoff` parts (if the policy changed).
+        """
+
+        if (_mode, _cutoff) == (self._mode, self._cutoff):
+            return
+
+        self._mode   = _mode
+        self._cutoff = _cutoff
+
+        for _item in self._items:
+            self.assign(_item)
+
+    def assign(self, _item: QGraphicsItem) -> None:
+        """
+        Applies the current policy to `_item`'s parts.
+        """
+
+        # Skip parts that were deleted since they were collected (e.g. the labels of removed handles):
+        _parts = self._items[_item] = [_part for _part in self._items[_item] if not sip.isdeleted(_part)]
+        _mode  = self._mode if len(_parts) >= self._cutoff else QGraphicsItem.CacheMode.NoCache
+
+        for _part in _parts:
+            _part.setCacheMode(_mode)
+
+    def footprint(self, _item: QGraphicsItem, _zoom: float) -> int:
+        """
+        Returns the estimated size (in bytes) of the pixmaps of `_item`'s parts at zoom-level `_zoom`.
+        """
+
+        _rects = [_part.boundingRect() for _part in self._items[_item] if not sip.isdeleted(_part)]
+        _area  = sum(_rect.width() * _rect.height() for _rect in _rects)
+        return int(4 * _area * _zoom * _zoom)
+
+    def expose(self, _rect: QRectF) -> None:
+        """
+        Counts the cached parts in `_rect` (a region that the viewer is about to repaint) as cache-requests.
+        """
+
+        _scene = self.parent()
+        if  _scene is None or self._mode == QGraphicsItem.CacheMode.NoCache:
+            return
+
+        for _part in _scene.items(_rect, self.MODE):
+            if  _part.cacheMode() != QGraphicsItem.CacheMode.NoCache and _part.topLevelItem() in self._items:
+                self.requests += 1
+
+    @staticmethod
+    def parts(_item: QGraphicsItem) -> list:
+        """
+        Returns the parts of `_item` that are cached: the item itself and its labels.
+        """
+
+        _parts = [_item]
+        _stack = list(_item.childItems())
+        while _stack:
+            _child = _stack.pop()
+            _stack.extend(_child.childItems())
+            if  isinstance(_child, StaticLabel):
+                _parts.append(_child)
+
+        return _parts
@@ -2,11 +2,12 @@ import logging
 import weakref
 
 from PyQt6.QtCore import Qt, QPointF, QRectF, pyqtSlot, pyqtSignal
-from PyQt6.QtGui import QPainterPath, QPen, QColor
+from PyQt6.QtGui import QPainterPath, QPainterPathStroker, QPolygonF, QPen, QColor
 from PyQt6.QtWidgets import QGraphicsObject, QGraphicsItem, QGraphicsSceneMouseEvent
 
-from custom import Label, EntityClass
-from util import random_id
+from custom import StaticLabel, EntityClass
+from model import ConnectorRecord
+from util import random_id, level_of_detail, LevelOfDetail
 from enum import Enum
 
 from tabs.schema.graph.handle import Handle
@@ -27,7 +28,7 @@ class BubbleLabel(QGraphicsObject):
 
         # Text attributes:
         self._rect  = QRectF(-18, -10, 36, 20)
-        self._label = Label(self, _text,
+        self._label = StaticLabel(self, _text,
                             align=Qt.AlignmentFlag.AlignCenter,
                             width=30,
                             editable=False)
@@ -43,12 +44,15 @@ class BubbleLabel(QGraphicsObject):
         self._label.setPlainText(value)
 
     def paint(self, painter, option, widget = ...):
+        if level_of_detail(painter) < LevelOfDetail.DETAIL:
+            return
+
         painter.setPen(QColor(0x000000))
         painter.setBrush(QColor(0xffffff))
         painter.drawRoundedRect(self._rect, 8, 8)
 
     def boundingRect(self):
-        return self._rect
+        return self._rect.adjusted(-0.5, -0.5, 0.5, 0.5)     # Half of the 1px border is drawn outside `_rect`
 
 class Connector(QGraphicsObject):
 
@@ -60,13 +64,18 @@ class Connector(QGraphicsObject):
         def __init__(self):
             self.rect = QRectF(-10, -10, 20, 20)
             self.path = QPainterPath()
+            self.poly = QPolygonF()     # Polyline drawn instead of the path at low levels-of-detail.
             self.geom = PathGeometry.BEZIER
+            self.ends = None            # End-points and geometry the path was built for.
+            self.hull = None            # Cached outline of the path, see `shape()`.
+            self.grip = 10.0            # Width of the outline (i.e. of the clickable area).
 
     # Style:
     class Style:
         def __init__(self):
             self.pen_border = QPen(Qt.GlobalColor.darkGray, 4.0, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap)
             self.pen_select = QPen(Qt.GlobalColor.darkGray, 4.0, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap)
+            self.pen_coarse = QPen(Qt.GlobalColor.darkGray, 0.0)     # Cosmetic (1px) pen for low levels-of-detail.
 
     # Initializer:
     def __init__(self, 
@@ -74,7 +83,8 @@ class Connector(QGraphicsObject):
                 _origin: Handle | None = None, 
                 _target: Handle | None = None, 
                 _overwrite: bool = True, 
-                _parent: QGraphicsObject | None = None):
+                _parent: QGraphicsObject | None = None,
+                _record: ConnectorRecord | None = None):
 
         """
         Initialize a new connector.
@@ -85,6 +95,7 @@ class Connector(QGraphicsObject):
             _target (Handle): Target handle (default: None).
             _overwrite (bool): Overwrite the target handle's data with the origin handle's data (default: True).
             _parent (QGraphicsObject, optional): Parent object of the connector (default: None).
+            _record (ConnectorRecord, optional): Existing record to adopt, it must join the handles' records.
         """
 
         # Validate arguments:
@@ -102,6 +113,7 @@ class Connector(QGraphicsObject):
         self._styl = self.Style()
         self._text = None
         self._is_obsolete = False
+        self._record = None
 
         # Customize behavior:   
         self.setZValue(-1)
@@ -127,6 +139,10 @@ class Connector(QGraphicsObject):
         self.origin = _origin if _origin.eclass == EntityClass.OUT else _target
         self.target = _target if _target.eclass == EntityClass.INP else _origin
 
+        # Plain-data record of the connection, mirrored into the canvas' schema model (see model/schema.py):
+        self._record = _record if isinstance(_record, ConnectorRecord) else \
+                       ConnectorRecord(_symbol, self.origin.record, self.target.record)
+
         # Setup references in handles:
         self.origin.lock(self.target, self)
         self.target.lock(self.origin, self)
@@ -171,9 +187,39 @@ class Connector(QGraphicsObject):
     @property
     def geometry(self): return self._attr.geom
 
+    @geometry.setter
+    def geometry(self, _geom: PathGeometry):
+        if  _geom != self._attr.geom:
+            self._attr.geom = _geom
+            self.rebuild()
+
+    @property
+    def record(self):   return self._record
+
     def boundingRect(self): return self._attr.path.boundingRect().adjusted(-10, -10, 10, 10)
 
+    def shape(self):
+        """
+        Returns the outline of the connector's path (instead of its bounding-rectangle), so that only clicks near the
+        curve hit the connector. The outline is cached until the path changes.
+        """
+
+        if  self._attr.hull is None:
+            _stroker = QPainterPathStroker()
+            _stroker.setWidth(self._attr.grip)
+            _stroker.setCapStyle(Qt.PenCapStyle.RoundCap)
+            self._attr.hull = _stroker.createStroke(self._attr.path)
+
+        return self._attr.hull
+
     def paint(self, painter, option, widget=None):
+
+        # At low levels-of-detail, draw a thin polyline instead of the path:
+        if level_of_detail(painter) < LevelOfDetail.SHAPES:
+            painter.setPen(self._styl.pen_coarse)
+            painter.drawPolyline(self._attr.poly)
+            return
+
         painter.setPen(self._styl.pen_border)
         painter.drawPath(self._attr.path)
 
@@ -184,13 +230,20 @@ class Connector(QGraphicsObject):
 
         return super().mouseDoubleClickEvent(event)
 
-    def clear(self):    self._attr.path.clear()
+    def clear(self):
+        self.prepareGeometryChange()
+        self._attr.path.clear()
+        self._attr.poly.clear()
+        self._attr.ends = None
+        self._attr.hull = None
 
     def on_origin_updated(self):
         if self._is_obsolete:
             return
 
         self._styl.pen_border = QPen(self.origin.color, 4.0, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap)
+        self._styl.pen_coarse.setColor(self.origin.color)
+        self.update()
         if  self.origin.connected:
             self.target.strid = self.origin.strid
             self.target.color = self.origin.color
@@ -205,9 +258,35 @@ class Connector(QGraphicsObject):
             print(f"Connector.draw(): [ERROR] Expected arguments of type QPointF")
             return
 
+        # If the end-points did not move, the path is up-to-date:
+        _ends = self._attr.ends
+        if  _ends is not None and _ends[2] == geometry:
+
+            if  _ends[0] == opos and _ends[1] == tpos:
+                return
+
+            # If both end-points moved by the same offset (e.g. when dragging both nodes), translate the path:
+            if  _ends[1] - _ends[0] == tpos - opos:
+                self.prepareGeometryChange()
+                self._attr.path.translate(opos - _ends[0])
+                self._attr.poly.translate(opos - _ends[0])
+                self._attr.ends = (QPointF(opos), QPointF(tpos), geometry)
+                self._attr.hull = None
+
+                if self._text:
+                    self._text.setPos(self._attr.path.boundingRect().center())
+
+                # The translated route may now cross other nodes:
+                if  geometry == PathGeometry.RECT:
+                    self.reroute()
+
+                return
+
         # Reset path:
         self.prepareGeometryChange()        # Required to trigger repainting when the path changes
         self._attr.path.clear()             # Clear the path
+        self._attr.ends = (QPointF(opos), QPointF(tpos), geometry)
+        self._attr.hull = None
 
         # Construct curve:
         if  geometry == PathGeometry.LINE:
@@ -219,18 +298,91 @@ class Connector(QGraphicsObject):
         elif geometry == PathGeometry.RECT:
             self.construct_manhattan(opos, tpos)
 
+        # Polyline for low levels-of-detail (straight for line-segments, elbowed otherwise):
+        if  geometry == PathGeometry.LINE:
+            self._attr.poly = QPolygonF([opos, tpos])
+
+        else:
+            xm = (opos.x() + tpos.x()) / 2.0
+            self._attr.poly = QPolygonF([opos, QPointF(xm, opos.y()), QPointF(xm, tpos.y()), tpos])
+
         if self._text:
             self._text.setPos(self._attr.path.boundingRect().center())
 
+        # Orthogonal paths keep the dog-leg until the canvas' router has routed them around the nodes in their way:
+        if  geometry == PathGeometry.RECT:
+            self.reroute()
+
+    def reroute(self):
+        """
+        Posts the connector to the canvas' router (see `ConnectorRouter`), if any.
+        """
+
+        _router = getattr(self.scene(), "router", None)
+        if  _router is not None and not self._is_obsolete:
+            _router.post(self)
+
+    def set_route(self, opos: QPointF, tpos: QPointF, points: list) -> bool:
+        """
+        Replaces the path with the orthogonal polyline `points` (a list of (x, y)-tuples), routed between the
+        end-points `opos` and `tpos`. Returns False, and leaves the path as it is, if the handles have moved since (or
+        the geometry changed), i.e. if the route is stale.
+        """
+
+        if  (
+            self._is_obsolete or
+            self._attr.geom != PathGeometry.RECT or
+            self.origin.scenePos() != opos or
+            self.target.scenePos() != tpos
+        ):
+            return False
+
+        _poly = QPolygonF([QPointF(_x, _y) for _x, _y in points])
+
+        self.prepareGeometryChange()
+        self._attr.path = QPainterPath()
+        self._attr.path.addPolygon(_poly)
+        self._attr.poly = _poly
+        self._attr.ends = (QPointF(opos), QPointF(tpos), PathGeometry.RECT)
+        self._attr.hull = None
+
+        # Place the label on the middle segment of the route:
+        if self._text:
+            _mid = len(points) // 2
+            (_x0, _y0), (_x1, _y1) = points[max(_mid - 1, 0)], points[_mid]
+            self._text.setPos(QPointF((_x0 + _x1) / 2.0, (_y0 + _y1) / 2.0))
+
+        self.update()
+        return True
+
     @pyqtSlot()
     @pyqtSlot(Handle)
     def redraw(self, handle: Handle | None = None):
+        """
+        Marks the connector's path as out of date. On a canvas, the path is rebuilt by the canvas' redraw-queue (at
+        most once per frame, however often the handles move), otherwise it is rebuilt immediately.
+        """
 
         # Null-check:
         if self._is_obsolete:
             print("Connector.redraw(): Reference(s) obsolete. Aborting!")
             return
 
+        _queue = getattr(self.scene(), "redraws", None)
+        if  _queue is None:
+            self.rebuild()
+
+        else:
+            _queue.post(self)
+
+    def rebuild(self):
+        """
+        Rebuilds the connector's path from the current positions of its handles.
+        """
+
+        if self._is_obsolete:
+            return
+
         opos = self.origin.scenePos()
         tpos = self.target.scenePos()
 
@@ -248,6 +400,8 @@ class Connector(QGraphicsObject):
 
         # Change pen-color:
         self._styl.pen_border.setColor(_color)
+        self._styl.pen_coarse.setColor(_color)
+        self.update()
 
     # Line-segment:
     def construct_segment(self, opos: QPointF, tpos: QPointF):
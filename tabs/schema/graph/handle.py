@@ -9,7 +9,6 @@ from PyQt6.QtCore import (
     )
 
 from PyQt6.QtGui import (
-    QTextCursor,
     QAction,
     QCursor,
     QBrush,
@@ -28,8 +27,9 @@ from PyQt6.QtWidgets import (
     )
 
 from dataclasses    import dataclass
-from util           import random_id, load_svg
+from util           import random_id, load_svg, level_of_detail, LevelOfDetail
 from custom         import *
+from model          import EntityRecord
 
 class Handle(QGraphicsObject, Entity):
 
@@ -62,7 +62,8 @@ class Handle(QGraphicsObject, Entity):
                  _symbol: str,
                  _coords: QPointF,
                  _eclass: EntityClass,
-                 _parent: QGraphicsObject | None = None):
+                 _parent: QGraphicsObject | None = None,
+                 _record: EntityRecord | None = None):
 
         """
         Initialize a new handle with given entity-class, coordinates, and symbol.
@@ -72,6 +73,7 @@ class Handle(QGraphicsObject, Entity):
             _coords (QPointF): Coordinates of the handle.
             _eclass (EntityClass): Entity class of the handle (see `custom/entity.py`).
             _parent (QGraphicsObject, optional): Parent object of the handle (default: None).
+            _record (EntityRecord, optional): Existing record to adopt, e.g. when loading a schematic (default: None).
         """
 
         # Validate coordinate and symbol:
@@ -82,8 +84,12 @@ class Handle(QGraphicsObject, Entity):
         # Initialize base-class:
         super().__init__(_parent)
 
-        # Display handle's symbol and customize:
-        self._label = Label(self, _symbol,
+        # Adopt the given record (see model/entity.py), otherwise label the handle with its symbol:
+        if isinstance(_record, EntityRecord):   self._prop = _record
+        else:                                   self.label = _symbol
+
+        # Display handle's label and customize:
+        self._label = StaticLabel(self, self.label,
                             align=Qt.AlignmentFlag.AlignRight if _eclass == EntityClass.OUT else Qt.AlignmentFlag.AlignLeft,
                             editable=False)
         self._label.setPos(7.5 if _eclass == EntityClass.INP else -self._label.textWidth() - 7.5, -12.5)
@@ -97,7 +103,6 @@ class Handle(QGraphicsObject, Entity):
         self.offset = _coords.toPoint().x()
         self.eclass = _eclass
         self.symbol = _symbol
-        self.label  = _symbol
 
         # Connection status:
         self.connected = False
@@ -119,9 +124,10 @@ class Handle(QGraphicsObject, Entity):
         self._hint.hide()
 
         # Behaviour:
-        self.setPos(_coords)
         self.setAcceptHoverEvents(True)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsScenePositionChanges)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges)
+        self.setPos(_coords)
 
         # Initialize menu:
         self._init_menu()
@@ -173,7 +179,7 @@ class Handle(QGraphicsObject, Entity):
     # 1. boundingRect           Returns an artifically enlarged bounding rectangle.
     # 2. paint                  Handles the painting of the handle.
     # 3. itemChange             Emits the `sig_item_shifted` signal when the handle's scene-position changes, which is
-    #                           captured by the connector.
+    #                           captured by the connector. Mirrors the handle's position into its record.
     # ------------------------------------------------------------------------------------------------------------------
 
     def boundingRect(self):
@@ -188,6 +194,11 @@ class Handle(QGraphicsObject, Entity):
         return QRectF(-2.0 * self.Attr.size, -2.0 * self.Attr.size, 4.0 * self.Attr.size, 4.0 * self.Attr.size)
 
     def paint(self, painter, option, widget = ...):
+
+        # Handles are smaller than a pixel at low levels-of-detail:
+        if level_of_detail(painter) < LevelOfDetail.DETAIL:
+            return
+
         painter.setPen(self._styl.pen_border)
         painter.setBrush(self._styl.bg_active)
         painter.drawEllipse(self._attr.rect)
@@ -197,6 +208,10 @@ class Handle(QGraphicsObject, Entity):
         if change == QGraphicsItem.GraphicsItemChange.ItemScenePositionHasChanged:
             self.sig_item_shifted.emit(self)
 
+        if change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
+            self._prop.x = value.x()
+            self._prop.y = value.y()
+
         return value
     
     # Event-handlers ---------------------------------------------------------------------------------------------------
@@ -218,8 +233,8 @@ class Handle(QGraphicsObject, Entity):
 
         # Initialize menu-actions:
         menu_actions = [
-            StreamMenuAction(stream, self._strid == stream.strid)
-            for stream in self.scene().type_db
+            StreamMenuAction(stream, self.strid == stream.strid)
+            for stream in self.scene().type_db.values()
         ]
 
         # Sort menu-actions by label:
@@ -319,7 +334,7 @@ class Handle(QGraphicsObject, Entity):
         Returns: None
         """
 
-        self._prop["label"] = _label
+        self._prop.label = _label
         self._label.setPlainText(self.label)
 
     def lock(self, conjugate, connector):
@@ -331,6 +346,7 @@ class Handle(QGraphicsObject, Entity):
 
         # Change background color to red:
         self._styl.bg_active = self._styl.bg_paired
+        self.update()
 
     def free(self, delete_connector = False):
 
@@ -349,6 +365,7 @@ class Handle(QGraphicsObject, Entity):
 
         # Change background color to normal:
         self._styl.bg_active = self._styl.bg_normal
+        self.update()
 
         # Make item immovable again:
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
@@ -395,15 +412,8 @@ class Handle(QGraphicsObject, Entity):
 
     def set_editable(self):
 
-        # Make the label temporarily editable:
-        self._label.setTextInteractionFlags(Qt.TextInteractionFlag.TextEditorInteraction)
-        self._label.setFocus(Qt.FocusReason.OtherFocusReason)
-
-        # Highlight the entire word:
-        cursor = self._label.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.Start)
-        cursor.movePosition(QTextCursor.MoveOperation.End, QTextCursor.MoveMode.KeepAnchor)
-        self._label.setTextCursor(cursor)
+        # Make the label temporarily editable (the edited text is applied through `rename`):
+        self._label.edit()
 
     def set_decision(self, _flag: bool):    
         self._tags.setVisible(_flag)
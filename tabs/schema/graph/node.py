@@ -14,12 +14,14 @@ from PyQt6.QtCore import (
 from PyQt6.QtWidgets import (
     QMenu, 
     QGraphicsItem, 
-    QGraphicsObject, 
-    QGraphicsLineItem
+    QGraphicsObject
 )
 
+from functools import partial
+
 from actions import *
 from custom  import *
+from model   import EntityRecord, IdAllocator, NodeRecord, TrackedDict
 from util    import *
 
 from .anchor import Anchor
@@ -31,6 +33,7 @@ class Node(QGraphicsObject):
     sig_item_updated = pyqtSignal()
     sig_item_removed = pyqtSignal()
     sig_exec_actions = pyqtSignal(AbstractAction)
+    sig_group_opened = pyqtSignal()     # Emitted when the user opens a composite node (see `Canvas.expand_group`).
 
     sig_handle_clicked = pyqtSignal(Handle)
     sig_handle_updated = pyqtSignal(Handle)
@@ -55,6 +58,8 @@ class Node(QGraphicsObject):
         def __init__(self):
             self.pen_border = QPen(Qt.GlobalColor.black, 2.0)
             self.pen_select = QPen(QColor(0xf99c39), 2.0)
+            self.pen_hline  = QPen(Qt.GlobalColor.black, 1.0)
+            self.pen_divide = QPen(Qt.GlobalColor.gray, 0.5)
             self.background = Qt.GlobalColor.white
 
     # Initializer:
@@ -84,31 +89,44 @@ class Node(QGraphicsObject):
         self._spos = _spos
         self._styl = self.Style()
         self._attr = self.Attr()
+
+        # Plain-data record of the node, mirrored into the canvas' schema model (see model/schema.py):
+        self._record = NodeRecord(title=_name, x=_spos.x(), y=_spos.y(), height=self._attr.rect.height())
+
+        # The entity-registries report every change, so that the record's lists always hold the active entities:
         self._data = dict({
-            EntityClass.INP:    dict(), # Dictionary for input variable(s)
-            EntityClass.OUT:    dict(), # Dictionary for output variable(s)
-            EntityClass.PAR:    dict(), # Dictionary for parameters
-            EntityClass.EQN:    list()  # List of equations
+            EntityClass.INP:    TrackedDict(partial(self.on_entity_toggled, self._record.variables)),   # Input variable(s)
+            EntityClass.OUT:    TrackedDict(partial(self.on_entity_toggled, self._record.variables)),   # Output variable(s)
+            EntityClass.PAR:    TrackedDict(partial(self.on_entity_toggled, self._record.parameters)),  # Parameters
+            EntityClass.EQN:    self._record.equations                                                  # Equations
+        })
+
+        # Allocators for handle-symbols, updated by `on_entity_toggled`:
+        self._huid = dict({
+            EntityClass.INP:    IdAllocator("R", 2),
+            EntityClass.OUT:    IdAllocator("P", 2)
         })
 
         # Adjust behaviour:
-        self.setPos(_spos)
         self.setAcceptHoverEvents(True)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges)
+        self.setPos(_spos)
 
         # Label to display the node's unique identifier:
-        self._label = Label(self, self._nuid, 
+        self._label = StaticLabel(self, self._nuid, 
                             width=60,
                             color=QColor(0xadadad), 
                             align=Qt.AlignmentFlag.AlignLeft,
                             editable=False)
 
         # Label to display the node's name:
-        self._title = Label(self, _name,
+        self._title = StaticLabel(self, _name,
                             width=120,
                             align=Qt.AlignmentFlag.AlignCenter,
                             editable=True)
+        self._title.sig_text_changed.connect(self.on_title_changed)
 
         # Position labels:
         self._label.setPos(-98, -72)
@@ -127,13 +145,6 @@ class Node(QGraphicsObject):
         _shrink.sig_button_clicked.connect(lambda: self.resize(-self._attr.delta))
         _remove.sig_button_clicked.connect(self.sig_item_removed.emit)
 
-        # Instantiate separator:
-        _hline = QGraphicsLineItem(QLineF(-96, 0, 96, 0), self)
-        _hline.moveBy(0, -48)
-
-        self._divider = QGraphicsLineItem(QLineF(0, -40, 0, 68), self)
-        self._divider.setPen(QPen(Qt.GlobalColor.gray, 0.5))
-
         # Instantiate anchors:
         self._anchor_inp = Anchor(EntityClass.INP, self)
         self._anchor_out = Anchor(EntityClass.OUT, self)
@@ -180,6 +191,7 @@ class Node(QGraphicsObject):
 
         if  _eclass == EntityClass.EQN:
             self._data[_eclass] = _value
+            self._record.equations = _value
 
     def _init_menu(self):
         """
@@ -202,6 +214,10 @@ class Node(QGraphicsObject):
         _n_copy = self._menu.addAction("Duplicate")
         _remove    = self._menu.addAction("Delete")
 
+        # Composite nodes only:
+        self._open = self._menu.addAction("Open Group")
+        self._open.triggered.connect(self.sig_group_opened.emit)
+
         # Connect actions to slots:
         _expand.triggered.connect(lambda: self.resize( self._attr.delta))
         _shrink.triggered.connect(lambda: self.resize(-self._attr.delta))
@@ -215,6 +231,7 @@ class Node(QGraphicsObject):
     # ------------------------------------------------------------------------------------------------------------------
     # 1. boundingRect           Implementation of QGraphicsObject.boundingRect() (see Qt documentation).
     # 2. paint                  Implementation of QGraphicsObject.paint() (see Qt documentation).
+    # 3. itemChange             Mirrors the node's position into its record.
     # ------------------------------------------------------------------------------------------------------------------
 
     def boundingRect(self):
@@ -225,8 +242,9 @@ class Node(QGraphicsObject):
             QRectF: The bounding rectangle of the node.
         """
 
-        # Return bounding-rectangle:
-        return self._attr.rect
+        # Return bounding-rectangle (half of the border is drawn outside the node's rectangle):
+        _half = max(self._styl.pen_border.widthF(), self._styl.pen_select.widthF()) / 2.0
+        return self._attr.rect.adjusted(-_half, -_half, _half, _half)
 
     def paint(self, painter, option, widget = ...):
         """
@@ -240,12 +258,41 @@ class Node(QGraphicsObject):
 
         # Select different pens for selected and unselected states:
         _pen = self._styl.pen_select if self.isSelected() else self._styl.pen_border
-                 
+        _lod = level_of_detail(painter)
+        cache_miss(self, widget)
+
+        # At low levels-of-detail, draw a plain filled rectangle:
+        if _lod < LevelOfDetail.SHAPES:
+            painter.fillRect(self._attr.rect, _pen.color() if self.isSelected() else self._styl.background)
+            return
+
         # Draw border:
         painter.setPen(_pen)
         painter.setBrush(self._styl.background)
         painter.drawRoundedRect(self._attr.rect, 12, 6)
 
+        # Draw the header-separator and the divider between inputs and outputs:
+        if _lod >= LevelOfDetail.DETAIL:
+            painter.setPen(self._styl.pen_hline)
+            painter.drawLine(QLineF(-96, -48, 96, -48))
+            painter.setPen(self._styl.pen_divide)
+            painter.drawLine(self._anchor_inp.line)
+
+    def itemChange(self, change, value):
+        """
+        Mirrors the node's position into its record.
+
+        Parameters:
+            change (QGraphicsItem.GraphicsItemChange) : The type of change.
+            value (QVariant) : The new value.
+        """
+
+        if change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
+            self._record.x = value.x()
+            self._record.y = value.y()
+
+        return super().itemChange(change, value)
+
     # Event-handlers ---------------------------------------------------------------------------------------------------
     # Name                      Description
     # ------------------------------------------------------------------------------------------------------------------
@@ -267,6 +314,7 @@ class Node(QGraphicsObject):
 
         # Display context menu:
         self.setSelected(True)
+        self._open.setVisible(self._record.children is not None)
         self._menu.exec(event.screenPos())
         event.accept()
 
@@ -316,6 +364,10 @@ class Node(QGraphicsObject):
     # 6. on_handle_clicked      Triggered when a handle is clicked.
     # 7. on_handle_updated      Triggered when a handle is updated.
     # 8. on_handle_removed      Triggered when a handle is removed.
+    # 9. on_entity_toggled      Triggered when an entity is added to, or removed from, the node's registries.
+    # 10. on_title_changed      Triggered when the user renames the node.
+    # 11. bind                  Binds the node to an existing record.
+    # 12. unbind                Releases the node's entities, leaving its record as is.
     # ------------------------------------------------------------------------------------------------------------------
 
     # Return transformed equations:
@@ -376,8 +428,8 @@ class Node(QGraphicsObject):
         # Copy the contents of the current node:
         for _entity in self[EntityClass.INP] | self[EntityClass.OUT] | self[EntityClass.PAR]:
             
-            # Ignore hidden handles:
-            if not _entity.isVisible(): continue
+            # Ignore hidden handles (parameters are not graphics-items and have no visibility):
+            if isinstance(_entity, Handle) and not _entity.isVisible(): continue
 
             # Create a copied entity (parameter or handle):
             copied = _node.create_handle(
@@ -389,8 +441,9 @@ class Node(QGraphicsObject):
             # Add entity and its copy to the handle-map:
             if _entity.eclass in [EntityClass.INP, EntityClass.OUT]:    Handle.cmap[_entity] = copied
 
-            # Rename copied handle:
-            copied.rename(_entity.label)
+            # Rename copied handle (parameters have no label to re-render):
+            if  isinstance(copied, Handle): copied.rename(_entity.label)
+            else:                           copied.label = _entity.label
         
             # Copy entity's attributes:
             copied.info    = _entity.info
@@ -403,11 +456,20 @@ class Node(QGraphicsObject):
             copied.maximum = _entity.maximum
 
             # Add copied variable to the node's registry:
-            _node[_entity.eclass][copied] = True
+            _node[copied.eclass if isinstance(copied, Handle) else EntityClass.PAR][copied] = EntityState.ACTIVE
         
         # Copy equations:
         # [_node.equations.add(equation) for equation in self.equations]
 
+        # Composite nodes get a copy of their sub-system, boundary-handles are re-mapped:
+        if  self._record.children is not None:
+            _node.record.children, _copies = self._record.children.clone()
+            _node.record.ports = {
+                Handle.cmap[_handle].record: _copies[_inner]
+                for _handle in self[EntityClass.INP] | self[EntityClass.OUT]
+                if (_inner := self._record.ports.get(_handle.record)) in _copies and _handle in Handle.cmap
+            }
+
         # Import Canvas:
         from tabs.schema.canvas import Canvas
         if isinstance(_canvas, Canvas):
@@ -431,13 +493,16 @@ class Node(QGraphicsObject):
         if delta < 0 and self._attr.rect.height() < 200: return
 
         # Resize node, adjust contents:
+        self.prepareGeometryChange()
         self._attr.rect.adjust(0, 0, 0, delta)
         self._anchor_inp.resize(delta)
         self._anchor_out.resize(delta)
 
-        self._divider.setLine(self._anchor_inp.line)
-        self._divider.setX(0)
         self.update()
+        self.recache()
+
+        # Mirror the new height into the record:
+        self._record.height = self._attr.rect.height()
 
         # Notify application of state-change:
         self.sig_item_updated.emit()
@@ -457,7 +522,8 @@ class Node(QGraphicsObject):
 
     def create_handle(self, 
                       _coords: QPointF, 
-                      _eclass: EntityClass
+                      _eclass: EntityClass,
+                      _record: EntityRecord | None = None
                       ):
         """
         Creates a new handle at the given coordinate, returns reference to the handle.
@@ -465,13 +531,17 @@ class Node(QGraphicsObject):
         Parameters:
             _coords (QPointF) : The coordinates of the new handle (must be in the node's coordinate-system).
             _eclass (EntityClass) : The stream-direction of the new handle (INP or OUT).
+            _record (EntityRecord, optional) : Existing record for the handle to adopt, its symbol is kept.
 
         Returns:
             Handle: Reference to the new handle.
         """
 
+        # Use the record's symbol if one is provided, otherwise create a new one:
+        _symbol = _record.symbol if isinstance(_record, EntityRecord) else self.create_huid(_eclass)
+
         # Create handle, connect signals to appropriate slots:
-        _handle = Handle(self.create_huid(_eclass), _coords, _eclass, self)
+        _handle = Handle(_symbol, _coords, _eclass, self, _record)
         _handle.sig_item_clicked.connect(self.sig_handle_clicked.emit)
         _handle.sig_item_updated.connect(self.sig_handle_updated.emit)
         _handle.sig_item_cleared.connect(self.on_handle_cleared)
@@ -494,22 +564,8 @@ class Node(QGraphicsObject):
         # Validate argument(s):
         if _eclass not in [EntityClass.INP, EntityClass.OUT]: raise ValueError("Expected argument: `EntityClass.INP` or `EntityClass.OUT`")
 
-        # Create a unique handle-identifier:
-        prefix = "P" if _eclass == EntityClass.OUT else "R"
-        id_set = {
-            int(handle.symbol.split(prefix)[1])     # Fetch existing handle-IDs
-            for handle in self[_eclass]             
-        }
-
-        # If `id_set` is empty, return prefix + "00":
-        if not id_set:  return prefix + "00"
-
-        # Get sequence of integers from 0 to `max(id_set) + 1`, not in `id_set`:
-        sequence = set(range(0, max(id_set) + 2))
-        reusable = sequence - id_set
-
-        # Return UID (prefix + smallest integer not in `id_set`):
-        return prefix + str(min(reusable)).zfill(2)
+        # Smallest symbol not held by a handle of the same class (see model/allocator.py):
+        return self._huid[_eclass].peek()
 
     # Triggered when an anchor is clicked:
     def on_anchor_clicked(self, _coords: QPointF):
@@ -555,11 +611,123 @@ class Node(QGraphicsObject):
         # Emit signal to disconnect handle:
         self.sig_exec_actions.emit(_action)
 
+    # Triggered when an entity-registry changes:
+    def on_entity_toggled(self, _records: list, _entity: Entity, _state: EntityState | None):
+        """
+        Keeps the record's variable- and parameter-lists in sync with the node's active entities.
+
+        Parameters:
+            _records (list): The record-list that mirrors the registry (variables or parameters).
+            _entity (Entity): The entity that was added, modified, or removed.
+            _state (EntityState | None): The entity's new state, None if it was removed.
+        """
+
+        _record = _entity.record
+        _active = _state == EntityState.ACTIVE
+
+        # Handles hold their symbol for as long as they are registered, irrespective of their state:
+        if  _entity.eclass in self._huid:
+            if _state is None:  self._huid[_entity.eclass].release(_entity)
+            else:               self._huid[_entity.eclass].claim(_entity, _entity.symbol)
+
+        if  _active and _record not in _records:
+            _record.parent = self._record
+            _records.append(_record)
+
+        elif not _active and _record in _records:
+            _records.remove(_record)
+
+        # Parameters are mirrored in the node's expression-graph:
+        if  _records is self._record.parameters:
+            if _active: self._record.expressions.set(_record.symbol, _record.value)
+            else:       self._record.expressions.remove(_record.symbol)
+
+        # Handles (and their labels) were added, toggled, or removed:
+        else:
+            self.recache()
+
+    # Re-assigns the node's cache after its contents changed (see tabs/schema/graph/cache.py):
+    def recache(self):
+
+        _policy = getattr(self.scene(), "caches", None)
+        if  _policy is not None:
+            _policy.invalidate(self)
+
+    # Triggered when the user renames the node:
+    def on_title_changed(self, _title: str):
+        self._record.title = _title
+        self.sig_item_updated.emit()
+
+    def bind(self, _record: NodeRecord):
+        """
+        Binds the node to an existing record without modifying it (e.g. when the record is paged in, see
+        tabs/schema/graph/pager.py): the node takes the record's UID, title, geometry, parameters and equations, and
+        creates a handle for each of its variables. The node must not hold any entities (see `unbind()`).
+
+        Parameters:
+            _record (NodeRecord): The record to bind to.
+        """
+
+        # Registries of the new record:
+        self._record = _record
+        self._data = dict({
+            EntityClass.INP:    TrackedDict(partial(self.on_entity_toggled, _record.variables)),
+            EntityClass.OUT:    TrackedDict(partial(self.on_entity_toggled, _record.variables)),
+            EntityClass.PAR:    TrackedDict(partial(self.on_entity_toggled, _record.parameters)),
+            EntityClass.EQN:    _record.equations
+        })
+
+        self._huid = dict({
+            EntityClass.INP:    IdAllocator("R", 2),
+            EntityClass.OUT:    IdAllocator("P", 2)
+        })
+
+        # Labels:
+        self._nuid = _record.uid
+        self._label.setPlainText(_record.uid)
+        self._title.setPlainText(_record.title)
+
+        # Geometry:
+        _delta = _record.height - self._attr.rect.height()
+        if  _delta:
+            self.prepareGeometryChange()
+            self._attr.rect.adjust(0, 0, 0, _delta)
+            self._anchor_inp.resize(_delta)
+            self._anchor_out.resize(_delta)
+
+        self._spos = QPointF(_record.x, _record.y)
+        self.setPos(self._spos)
+
+        # Parameters are registered without notifying `on_entity_toggled`, the record already lists them:
+        for _par in _record.parameters:
+            dict.__setitem__(self._data[EntityClass.PAR], Entity(_par), EntityState.ACTIVE)
+
+        # Handles adopt the variables' records:
+        for _var in list(_record.variables):
+            self.create_handle(QPointF(_var.x, _var.y), _var.eclass, _var)
+
+    def unbind(self):
+        """
+        Releases the node's entities without modifying its record, so that the node can be bound to another record
+        (see `bind()`). Handles are removed from the scene and deleted, so their connectors must be removed first.
+        """
+
+        for _eclass in [EntityClass.INP, EntityClass.OUT]:
+            for _handle in list(self._data[_eclass]):
+                _handle.setParentItem(None)
+                if _handle.scene(): _handle.scene().removeItem(_handle)
+                _handle.deleteLater()
+
+            dict.clear(self._data[_eclass])
+
+        dict.clear(self._data[EntityClass.PAR])
+
     # Properties -------------------------------------------------------------------------------------------------------
     # Name                      Description
     # ------------------------------------------------------------------------------------------------------------------
     # 1. uid                   The node's unique identifier.
     # 2. name                  The node's name.
+    # 3. record                The node's plain-data record (see model/schema.py).
     # ------------------------------------------------------------------------------------------------------------------
     
     @property
@@ -568,11 +736,16 @@ class Node(QGraphicsObject):
     @property
     def title(self): return self._title.toPlainText()
 
+    @property
+    def record(self) -> NodeRecord: return self._record
+
     @uid.setter
     def uid(self, value: str):
         self._nuid = value
         self._label.setPlainText(value)
+        self._record.uid = value
 
     @title.setter
     def title(self, value: str):
         self._title.setPlainText(value)
+        self._record.title = value
@@ -0,0 +1,450 @@
+import time
+
+from PyQt6         import sip
+from PyQt6.QtCore    import QObject, QPointF, QRectF, QTimer
+from PyQt6.QtWidgets import QGraphicsItem
+
+from custom import EntityClass
+from model  import NodeRecord, TerminalRecord, SchemaModel, SpatialIndex
+
+from .node      import Node
+from .terminal  import StreamTerminal
+from .connector import Connector
+
+# Class ScenePager: Keeps graphics items only for the part of the schematic in view:
+class ScenePager(QObject):
+    """
+    Pages the canvas' nodes and terminals in and out of the scene as the visible part of the canvas changes, so that a
+    large schematic costs memory and paint-time in proportion to what is on screen. The canvas' schema model holds
+    every record, a spatial index (see model/spatial.py) files them by position, and graphics items exist only for the
+    records in or near the view:
+
+        - Records within `MARGIN` view-sizes of the view are paged in, together with their neighbours (the owners of
+          the handles that they are connected to), so that every connector that crosses the view is drawn.
+        - Items beyond twice that distance are paged out: they leave the scene, their records stay in the model. Nodes
+          are kept in a pool of up to `POOL` shells, which are re-bound to the next records that are paged in.
+        - Items that are selected, or that the undo- and redo-stacks refer to (and their neighbours), are kept.
+
+    Items are paged in nearest to the view's center first, for at most `BUDGET` milliseconds per frame, so that zooming
+    out over a large schematic fills the view progressively instead of stalling. Panning by less than half the reach
+    does not page anything. The registry-callbacks of the canvas neither remove records from the model, nor report
+    changes, while the pager is at work (see `Canvas.on_node_toggled`).
+
+    Attributes:
+        active (bool): Whether a model is attached (see `Canvas.page_model`).
+        pending (bool): Whether records within reach are waiting to be paged in.
+        paged_in (int): Number of items paged in.
+        paged_out (int): Number of items paged out.
+        recycled (int): Number of nodes bound from the pool.
+    """
+
+    # Reach of the view (in view-sizes) within which records are paged in:
+    MARGIN = 0.25
+
+    # Pool-size, time (ms) spent paging in per frame, and the minimum interval between refreshes (ms):
+    POOL   = 256
+    BUDGET = 30
+    FRAME  = 16
+
+    # Minimum number of nodes and terminals of a model that is paged, see `suits()`:
+    THRESHOLD = 5000
+
+    # Initializer:
+    def __init__(self, parent: QObject | None = None):
+
+        # Initialize base-class:
+        super().__init__(parent)
+
+        # Records filed by position, and the shells of paged-out nodes:
+        self._index = SpatialIndex()
+        self._pool  = list()
+
+        self._view    = None    # Visible part of the scene.
+        self._span    = None    # Views within this rectangle (and of the same size) need no paging, see `refresh()`.
+        self._size    = None    # Size of the view when `_span` was set.
+        self._refresh = 0.0     # Time of the last refresh.
+
+        # State and counters:
+        self.active    = False
+        self.pending   = False
+        self.paged_in  = 0
+        self.paged_out = 0
+        self.recycled  = 0
+
+        # Single-shot timer, started by the first post after a refresh:
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.refresh)
+
+    def __len__(self):  return len(self._index)
+
+    def suits(self, _model: SchemaModel) -> bool:
+        """
+        Returns whether `_model` should be paged: the canvas is empty and the model has at least `THRESHOLD` nodes and
+        terminals.
+        """
+
+        _canvas = self.parent()
+        return (
+            not len(_canvas.model) and
+            not _canvas.node_db and
+            not _canvas.term_db and
+            len(_model.nodes) + len(_model.terminals) >= self.THRESHOLD
+        )
+
+    def attach(self, _model: SchemaModel) -> None:
+        """
+        Files the nodes and terminals of `_model` (whose records the canvas has adopted) in the spatial index, grows
+        the scene to cover them, and pages in the records in view on the next refresh. A large model may be attached
+        in parts (see tabs/schema/loader.py): connectors of a part are drawn between items that are already paged in.
+        """
+
+        _rects = list()
+        for _record in list(_model.nodes.values()) + list(_model.terminals.values()):
+            _rects.append(self.extent(_record))
+            self._index.insert(_record, _rects[-1])
+
+        # Make room for the model (with some slack for panning):
+        _canvas = self.parent()
+        if  _rects:
+            _rect = QRectF(QPointF(min(_r[0] for _r in _rects), min(_r[1] for _r in _rects)),
+                           QPointF(max(_r[2] for _r in _rects), max(_r[3] for _r in _rects)))
+            _canvas.setSceneRect(_canvas.sceneRect().united(_rect.adjusted(-2000, -2000, 2000, 2000)))
+
+        # Connect the items that are already paged in:
+        if  self.active and _model.connectors:
+            _live = self.live()
+
+            _canvas._paging = True
+            try:
+                for _item in _live.values():
+                    self.connect(_item, _live)
+
+            finally:
+                _canvas._paging = False
+
+        self.active = True
+        self._span  = None
+        if  self._view is not None:
+            self.post(self._view)
+
+    def detach(self) -> list:
+        """
+        Stops paging, and returns the records of the paged-out nodes and terminals (which the caller may remove from
+        the model). Pooled shells are deleted.
+        """
+
+        _canvas = self.parent()
+        _live   = {_item.record for _item in list(_canvas.node_db) + list(_canvas.term_db)}
+        _parked = [_record for _record in self._index if _record not in _live]
+
+        self._index.clear()
+        for _node in self._pool:
+            _node.deleteLater()
+
+        self._pool.clear()
+        self._timer.stop()
+        self.active  = False
+        self.pending = False
+
+        return _parked
+
+    def post(self, _view: QRectF) -> None:
+        """
+        Records the visible part of the scene, the items are paged on the next refresh (at most once per frame).
+        """
+
+        self._view = QRectF(_view)
+        if  self.active and not self._timer.isActive():
+            self.pending = True
+            _elapsed = 1000.0 * (time.perf_counter() - self._refresh)
+            self._timer.start(max(0, int(self.FRAME - _elapsed)))
+
+    def refresh(self) -> None:
+        """
+        Pages out the items that are out of reach, and pages in records that are within reach (for up to `BUDGET`
+        milliseconds).
+        """
+
+        self._timer.stop()
+        self._refresh = time.perf_counter()
+        self.pending  = False
+
+        _canvas = self.parent()
+        _view   = self._view
+        if  not self.active or _view is None:
+            return
+
+        # The records within half the reach of the view were paged in last time:
+        if  self._span is not None and self._span.contains(_view) and self._size == _view.size():
+            return
+
+        _reach = self.MARGIN * max(_view.width(), _view.height())
+        _load  = _view.adjusted(-_reach, -_reach, _reach, _reach)
+        _keep  = _view.adjusted(-2 * _reach, -2 * _reach, 2 * _reach, 2 * _reach)
+
+        # Records of the active items:
+        _live = self.live()
+
+        # Records within reach (records that left the model are dropped from the index), and their neighbours:
+        _wanted = set()
+        for _record in self._index.query((_load.left(), _load.top(), _load.right(), _load.bottom())):
+            if  self.valid(_record):    _wanted.add(_record)
+            elif _record not in _live:  self._index.remove(_record)
+
+        _wanted.update([_other for _record in list(_wanted) for _other in self.neighbours(_record)])
+
+        _canvas._paging = True
+        try:
+
+            # Page out:
+            _pinned = None
+            for _record, _item in list(_live.items()):
+
+                if _record in _wanted or _item.sceneBoundingRect().intersects(_keep):
+                    continue
+
+                _pinned = self.pinned() if _pinned is None else _pinned
+                if _item in _pinned:
+                    continue
+
+                self.page_out(_item)
+                _live.pop(_record)
+
+            # Page in, nearest first:
+            _center  = _view.center()
+            _missing = sorted([_record for _record in _wanted if _record not in _live],
+                              key=lambda _record: (_record.x - _center.x()) ** 2 + (_record.y - _center.y()) ** 2)
+
+            _items = list()
+            for _record in _missing:
+
+                if  _items and 1000.0 * (time.perf_counter() - self._refresh) > self.BUDGET:
+                    break
+
+                _live[_record] = self.page_in(_record)
+                _items.append(_live[_record])
+
+            for _item in _items:
+                self.connect(_item, _live)
+
+        finally:
+            _canvas._paging = False
+
+        # Page in the rest on the next frame:
+        if  len(_items) < len(_missing):
+            self.pending = True
+            self._span   = None
+            self._timer.start(self.FRAME)
+
+        else:
+            self._span = _view.adjusted(-_reach / 2, -_reach / 2, _reach / 2, _reach / 2)
+            self._size = _view.size()
+
+    def page_in(self, _record: NodeRecord | TerminalRecord) -> QGraphicsItem:
+        """
+        Creates (or re-binds) the item of a record and adds it to the canvas. Returns the item.
+        """
+
+        _canvas = self.parent()
+        if  isinstance(_record, NodeRecord):
+
+            if  self._pool:
+                _item = self._pool.pop()
+                self.recycled += 1
+
+            else:
+                _item = Node(_record.title, QPointF(_record.x, _record.y))
+                _canvas.connect_node(_item)
+
+            _item.bind(_record)
+            _canvas.node_db[_item] = True
+
+        else:
+            _item = StreamTerminal(_record.eclass, None, None, _record)
+            _item.setPos(QPointF(_record.x, _record.y))
+            _item.on_socket_updated(_item.socket)
+            _canvas.connect_terminal(_item)
+            _canvas.term_db[_item] = True
+
+        _canvas.addItem(_item)
+        self.paged_in += 1
+        return _item
+
+    def fetch(self, _record: NodeRecord | TerminalRecord) -> QGraphicsItem:
+        """
+        Returns the item of a record, paging it in (and connecting it to the active items) if it is paged out, e.g. to
+        edit it in the Data tab. The caller pins the item (see `pinned()`) for as long as it needs it.
+        """
+
+        _live = self.live()
+        if  _record in _live:
+            return _live[_record]
+
+        _canvas = self.parent()
+        _canvas._paging = True
+        try:
+            _item = _live[_record] = self.page_in(_record)
+            self.connect(_item, _live)
+
+        finally:
+            _canvas._paging = False
+
+        return _item
+
+    def page_out(self, _item: QGraphicsItem) -> None:
+        """
+        Removes an item (and its connectors) from the canvas, leaving its record in the model. Nodes are returned to
+        the pool if there is room.
+        """
+
+        _canvas = self.parent()
+
+        # Connectors go first, their other ends are freed:
+        for _handle in self.handles(_item):
+            _connector = _handle.connector() if _handle.connected and _handle.connector else None
+            if  _connector is not None and not sip.isdeleted(_connector):
+                _canvas.conn_db.pop(_connector, None)
+                _canvas.redraws.discard(_connector)
+                _connector.origin.free()
+                _connector.target.free()
+                _canvas.removeItem(_connector)
+                _connector.deleteLater()
+
+        # File the record under the item's current position:
+        _record = _item.record
+        self._index.insert(_record, self.extent(_record))
+
+        if  isinstance(_item, Node):    _canvas.node_db.pop(_item)
+        else:                           _canvas.term_db.pop(_item)
+
+        _canvas.removeItem(_item)
+        self.paged_out += 1
+
+        if  isinstance(_item, Node):
+            _item.unbind()
+            if  len(self._pool) < self.POOL:
+                self._pool.append(_item)
+                return
+
+        _item.deleteLater()
+
+    def connect(self, _item: QGraphicsItem, _live: dict) -> None:
+        """
+        Creates the connectors between a paged-in item and the items in `_live` (which maps records to items).
+        """
+
+        _canvas = self.parent()
+        for _handle in self.handles(_item):
+
+            _record = _canvas.model.connector_of(_handle.record)
+            if  _handle.connected or _record is None or _canvas.find_connector(_record.symbol) is not None:
+                continue
+
+            _other = _record.target if _record.origin is _handle.record else _record.origin
+            _owner = _live.get(_other.parent)
+            _match = next((_found for _found in self.handles(_owner) if _found.record is _other), None) if _owner else None
+            if  _match is None:
+                continue
+
+            _origin, _target = (_handle, _match) if _record.origin is _handle.record else (_match, _handle)
+            _connector = Connector(_record.symbol, _origin, _target, False, None, _record)
+            _connector.sig_item_removed.connect(_canvas.on_item_removed)
+
+            _canvas.conn_db[_connector] = True
+            _canvas.addItem(_connector)
+
+    def live(self) -> dict:
+        """
+        Returns a dictionary that maps the records of the active nodes and terminals to their items.
+        """
+
+        _canvas = self.parent()
+        return {
+            _item.record: _item
+            for _registry in (_canvas.node_db, _canvas.term_db)
+            for _item, _state in _registry.items() if _state
+        }
+
+    def pinned(self) -> set:
+        """
+        Returns the items that must not be paged out: the selected items, the items that the undo- and redo-stacks
+        refer to, and the neighbours of both.
+        """
+
+        _canvas = self.parent()
+        _roots  = [_object for _object in _canvas.manager.referents() if isinstance(_object, QGraphicsItem)]
+        _roots += _canvas.selectedItems()
+
+        _pinned = set()
+        for _object in _roots:
+
+            if  sip.isdeleted(_object):
+                continue
+
+            # Connectors pin both of their ends:
+            if  isinstance(_object, Connector):
+                _ends = [getattr(_object, "origin", None), getattr(_object, "target", None)]
+                _pinned.update([_end.topLevelItem() for _end in _ends if _end is not None and not sip.isdeleted(_end)])
+
+            else:
+                _pinned.add(_object.topLevelItem())
+
+        # Neighbours, so that undoing and redoing reconnects live handles:
+        for _item in list(_pinned):
+            for _handle in self.handles(_item):
+                _other = _handle.conjugate() if _handle.connected and _handle.conjugate else None
+                if  _other is not None and not sip.isdeleted(_other):
+                    _pinned.add(_other.topLevelItem())
+
+        return _pinned
+
+    def valid(self, _record) -> bool:
+        """
+        Returns whether `_record` is (still) in the canvas' model.
+        """
+
+        _model = self.parent().model
+        if isinstance(_record, NodeRecord):     return _model.nodes.get(_record.uid) is _record
+        if isinstance(_record, TerminalRecord): return _model.terminals.get(_record.uid) is _record
+        return False
+
+    def neighbours(self, _record: NodeRecord | TerminalRecord) -> list:
+        """
+        Returns the records of the nodes and terminals that `_record` is connected to.
+        """
+
+        _model  = self.parent().model
+        _found  = list()
+        for _entity in _record.variables if isinstance(_record, NodeRecord) else [_record.socket]:
+
+            _connector = _model.connector_of(_entity)
+            if  _connector is None:
+                continue
+
+            _other = _connector.target if _connector.origin is _entity else _connector.origin
+            if  _other.parent is not None and self.valid(_other.parent):
+                _found.append(_other.parent)
+
+        return _found
+
+    @staticmethod
+    def handles(_item: QGraphicsItem | None) -> list:
+        """
+        Returns the handles of a node or terminal.
+        """
+
+        if isinstance(_item, Node):             return list(_item[EntityClass.VAR])
+        if isinstance(_item, StreamTerminal):   return [_item.socket]
+        return []
+
+    @staticmethod
+    def extent(_record: NodeRecord | TerminalRecord) -> tuple:
+        """
+        Returns the scene-rectangle (left, top, right, bottom) of a node's or terminal's record.
+        """
+
+        if  isinstance(_record, NodeRecord):
+            return _record.x - 100.0, _record.y - 75.0, _record.x + 100.0, _record.y - 75.0 + _record.height
+
+        return _record.x - 60.0, _record.y - 10.0, _record.x + 60.0, _record.y + 10.0
@@ -0,0 +1,77 @@
+import time
+
+from PyQt6      import sip
+from PyQt6.QtCore import QObject, QTimer
+
+# Class RedrawQueue: Rebuilds dirty items at most once per frame:
+class RedrawQueue(QObject):
+    """
+    Queue of items (connectors) whose geometry is out of date. Items are posted when they become dirty, e.g. each time
+    one of a connector's handles moves, and are rebuilt together (each one once) when the queue is flushed. Flushes
+    happen once control returns to the event-loop, but no more often than once per frame, so that dragging a node
+    rebuilds each of its connectors once per frame instead of once per mouse-move.
+
+    Attributes:
+        posted (int): Number of posts.
+        rebuilt (int): Number of rebuilds.
+    """
+
+    # Minimum interval between flushes (ms):
+    FRAME = 16
+
+    # Initializer:
+    def __init__(self, parent: QObject | None = None):
+
+        # Initialize base-class:
+        super().__init__(parent)
+
+        # Dirty items (insertion-ordered, each item once):
+        self._items = dict()
+        self._flush = 0.0       # Time of the last flush.
+
+        # Counters:
+        self.posted  = 0
+        self.rebuilt = 0
+
+        # Single-shot timer, started by the first post after a flush:
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def __len__(self):  return len(self._items)
+
+    def post(self, _item) -> None:
+        """
+        Marks `_item` dirty, it is rebuilt (by calling its `rebuild()`-method) on the next flush.
+        """
+
+        self.posted += 1
+        self._items[_item] = None
+
+        if not self._timer.isActive():
+            _elapsed = 1000.0 * (time.perf_counter() - self._flush)
+            self._timer.start(max(0, int(self.FRAME - _elapsed)))
+
+    def discard(self, _item) -> None:
+        """
+        Removes `_item` from the queue, if it is queued.
+        """
+        self._items.pop(_item, None)
+
+    def flush(self) -> None:
+        """
+        Rebuilds every dirty item immediately.
+        """
+
+        self._timer.stop()
+        self._flush = time.perf_counter()
+
+        _items, self._items = self._items, dict()
+        for _item in _items:
+
+            # Skip items that were deleted since they were posted:
+            if sip.isdeleted(_item):
+                continue
+
+            _item.rebuild()
+            self.rebuilt += 1
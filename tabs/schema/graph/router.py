@@ -0,0 +1,247 @@
+import time
+
+from PyQt6         import sip
+from PyQt6.QtCore    import Qt, QObject, QRectF, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from model import OrthogonalRouter, SpatialIndex
+
+from .node      import Node
+from .terminal  import StreamTerminal
+from .connector import PathGeometry
+
+# Class RouteTask: Routes a batch of connectors on a worker-thread:
+class RouteTask(QRunnable):
+    """
+    Runs an `OrthogonalRouter` over a batch of jobs on a thread of the global thread-pool. Jobs and results are plain
+    tuples, no Qt-objects cross the thread-boundary. The results are emitted by `signals` and delivered on the thread
+    that created the task.
+    """
+
+    # Class Signals: QRunnable is not a QObject, signals are emitted by a helper:
+    class Signals(QObject):
+        sig_routed = pyqtSignal(int, list)     # Emitted with the batch-number and the results of the batch.
+
+    # Initializer:
+    def __init__(self, _router: OrthogonalRouter, _batch: int, _jobs: list):
+
+        # Initialize base-class:
+        super().__init__()
+
+        self.signals = self.Signals()
+        self._router = _router
+        self._batch  = _batch
+        self._jobs   = _jobs    # (start, end, exits, obstacles)-tuples.
+
+    def run(self):
+        _results = [self._router.route(_start, _end, _obstacles, _exits) for _start, _end, _exits, _obstacles in self._jobs]
+        self.signals.sig_routed.emit(self._batch, _results)
+
+# Class ConnectorRouter: Routes orthogonal connectors around nodes and terminals:
+class ConnectorRouter(QObject):
+    """
+    Routes the canvas' orthogonal connectors (`PathGeometry.RECT`) around the nodes and terminals in their way (see
+    model/routing.py). Connectors are posted whenever their end-points move (see `Connector.draw()`) and keep a plain
+    dog-leg until their route arrives:
+
+        - Posts are collected for a frame and dispatched as one batch. For each connector, the obstacles in its
+          corridor (the rectangle spanned by its end-points, widened by `PADDING`) are looked up in the scene's index.
+        - The batch is routed on a worker-thread. One batch is in flight at a time, connectors that are posted in the
+          meantime go with the next batch.
+        - Results are applied for at most `BUDGET` milliseconds per frame. Results for end-points that have moved
+          since the batch was dispatched are dropped, the move has posted the connector again.
+
+    The corridors of routed connectors are kept in a spatial index, so that when an obstacle appears, disappears or
+    moves (see `invalidate()`), only the connectors whose corridors it overlaps are routed again.
+
+    Attributes:
+        posted (int): Number of posts.
+        routed (int): Number of routes computed.
+        applied (int): Number of routes applied.
+        stale (int): Number of routes dropped because their connector changed in the meantime.
+    """
+
+    # Corridor-padding (scene-units), time (ms) spent applying routes per frame, and the minimum interval between
+    # dispatches (ms):
+    PADDING = 300.0
+    BUDGET  = 8
+    FRAME   = 16
+
+    # Obstacles are looked up by their bounding-rectangles:
+    MODE = Qt.ItemSelectionMode.IntersectsItemBoundingRect
+
+    # Initializer:
+    def __init__(self, parent: QObject | None = None):
+
+        # Initialize base-class:
+        super().__init__(parent)
+
+        self._router    = OrthogonalRouter()
+        self._pending   = dict()            # Connectors to route with the next batch (insertion-ordered).
+        self._flight    = None              # (batch-number, [(connector, end-points)]) of the batch being routed.
+        self._batches   = 0
+        self._results   = list()            # (connector, end-points, path)-tuples waiting to be applied.
+        self._corridors = SpatialIndex()    # Corridors of the routed connectors.
+
+        # Counters:
+        self.posted  = 0
+        self.routed  = 0
+        self.applied = 0
+        self.stale   = 0
+
+        # Single-shot timers for dispatching batches and applying results:
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.FRAME)
+        self._timer.timeout.connect(self.dispatch)
+
+        self._apply_timer = QTimer(self)
+        self._apply_timer.setSingleShot(True)
+        self._apply_timer.timeout.connect(self.apply)
+
+    def __len__(self):  return len(self._pending)
+
+    @property
+    def busy(self) -> bool:
+        """
+        Returns whether connectors are waiting to be routed, or routes to be applied.
+        """
+        return bool(self._pending or self._flight or self._results)
+
+    def post(self, _connector) -> None:
+        """
+        Schedules `_connector` for routing.
+        """
+
+        self.posted += 1
+        self._pending[_connector] = None
+
+        if not self._timer.isActive() and self._flight is None:
+            self._timer.start()
+
+    def discard(self, _connector) -> None:
+        """
+        Forgets `_connector` (e.g. when it is removed from the canvas).
+        """
+
+        self._pending.pop(_connector, None)
+        self._corridors.remove(_connector)
+
+    def invalidate(self, _rect: QRectF) -> None:
+        """
+        Schedules the connectors whose corridors overlap `_rect` (e.g. the old or new bounding-rectangle of a node) for
+        routing.
+        """
+
+        for _connector in self._corridors.query((_rect.left(), _rect.top(), _rect.right(), _rect.bottom())):
+            self.post(_connector)
+
+    def dispatch(self) -> None:
+        """
+        Sends the pending connectors to a worker-thread as one batch.
+        """
+
+        if  self._flight is not None or not self._pending:
+            return
+
+        _canvas = self.parent()
+        _pending, self._pending = self._pending, dict()
+
+        _connectors = list()
+        _jobs = list()
+        for _connector in _pending:
+
+            if  (
+                sip.isdeleted(_connector) or
+                _connector.scene() is not _canvas or
+                _connector.geometry != PathGeometry.RECT or
+                _connector.origin is None
+            ):
+                self._corridors.remove(_connector)
+                continue
+
+            _start = _connector.origin.scenePos()
+            _end   = _connector.target.scenePos()
+            _exits = (self.side(_connector.origin), self.side(_connector.target))
+
+            _corridor = QRectF(_start, _end).normalized().adjusted(-self.PADDING, -self.PADDING,
+                                                                    self.PADDING,  self.PADDING)
+            _obstacles = list()
+            for _item in _canvas.items(_corridor, self.MODE):
+                if  isinstance(_item, (Node, StreamTerminal)):
+                    _rect = _item.sceneBoundingRect()
+                    _obstacles.append((_rect.left(), _rect.top(), _rect.right(), _rect.bottom()))
+
+            _connectors.append((_connector, (_start, _end)))
+            _jobs.append(((_start.x(), _start.y()), (_end.x(), _end.y()), _exits, _obstacles))
+
+        if not _jobs:
+            return
+
+        self._batches += 1
+        self._flight = (self._batches, _connectors)
+
+        _task = RouteTask(self._router, self._batches, _jobs)
+        _task.signals.sig_routed.connect(self.on_routed)
+        QThreadPool.globalInstance().start(_task)
+
+    def on_routed(self, _batch: int, _paths: list) -> None:
+        """
+        Queues the results of a batch for `apply()`, and dispatches the connectors that were posted in the meantime.
+        """
+
+        if  self._flight is None or self._flight[0] != _batch:
+            return
+
+        _, _connectors = self._flight
+        self._flight = None
+        self.routed += len(_paths)
+
+        for (_connector, _ends), _path in zip(_connectors, _paths):
+            if  _path is not None:
+                self._results.append((_connector, _ends, _path))
+
+        if not self._apply_timer.isActive():
+            self._apply_timer.start(0)
+
+        if  self._pending and not self._timer.isActive():
+            self._timer.start()
+
+    def apply(self) -> None:
+        """
+        Applies queued routes for at most `BUDGET` milliseconds, the rest are applied in the next frame.
+        """
+
+        _deadline = time.perf_counter() + self.BUDGET / 1000.0
+        while self._results and time.perf_counter() < _deadline:
+
+            _connector, (_start, _end), _path = self._results.pop(0)
+            if  sip.isdeleted(_connector) or not _connector.set_route(_start, _end, _path):
+                self.stale += 1
+                continue
+
+            _xs = [_point[0] for _point in _path]
+            _ys = [_point[1] for _point in _path]
+            self._corridors.insert(_connector, (min(_xs), min(_ys), max(_xs), max(_ys)))
+            self.applied += 1
+
+        if  self._results:
+            self._apply_timer.start(self.FRAME)
+
+    def wait(self) -> None:
+        """
+        Blocks until the batch in flight (if any) has been routed. Its results are delivered by the event-loop.
+        """
+        QThreadPool.globalInstance().waitForDone()
+
+    @staticmethod
+    def side(_handle) -> int:
+        """
+        Returns the horizontal direction (+1 right, -1 left) in which a path leaves `_handle`: away from the center of
+        the handle's node or terminal.
+        """
+
+        _owner = _handle.parentItem()
+        if  _owner is None:
+            return 1
+
+        return 1 if _handle.scenePos().x() >= _owner.sceneBoundingRect().center().x() else -1
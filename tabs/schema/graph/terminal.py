@@ -20,6 +20,7 @@ from PyQt6.QtWidgets import (
 )
 
 from custom  import EntityClass
+from model   import EntityRecord, TerminalRecord
 from util    import *
 from .handle import Handle
 
@@ -34,6 +35,7 @@ class StreamTerminal(QGraphicsObject):
     class Constants:
         ICON_WIDTH  = 16 # Width of the icon
         ICON_OFFSET = 1  # Offset of the icon from the terminal's left/right edge
+        SOCKET_OFFSET = 55 # Horizontal offset of the socket from the terminal's center
 
     # Default style:
     class Style:
@@ -50,7 +52,9 @@ class StreamTerminal(QGraphicsObject):
     # Initializer:
     def __init__(self, 
                 _eclass : EntityClass, 
-                _parent : QGraphicsObject | None
+                _parent : QGraphicsObject | None,
+                _socket : EntityRecord | None = None,
+                _record : TerminalRecord | None = None
                 ):
         """
         Initialize a new stream terminal.
@@ -58,6 +62,8 @@ class StreamTerminal(QGraphicsObject):
         Parameters:
             _eclass (EntityClass): EntityClass (INP or OUT), see custom/entity.py.
             _parent (QGraphicsObject): Parent QGraphicsObject.
+            _socket (EntityRecord, optional): Existing record for the terminal's socket to adopt.
+            _record (TerminalRecord, optional): Existing record to adopt, its UID and socket are kept.
 
         Returns: None
         """
@@ -70,7 +76,7 @@ class StreamTerminal(QGraphicsObject):
         super().__init__(_parent)
 
         # Initialize attribute(s):
-        self._tuid  = random_id(length=4, prefix='T')
+        self._tuid  = _record.uid if isinstance(_record, TerminalRecord) else random_id(length=4, prefix='T')
         self._attr  = self.Attr()
         self._style = self.Style()
 
@@ -94,16 +100,25 @@ class StreamTerminal(QGraphicsObject):
         # Initialize entity-class:
         self._eclass = _eclass
 
+        # Plain-data record of the terminal, mirrored into the canvas' schema model (see model/schema.py):
+        self._record = _record if isinstance(_record, TerminalRecord) else TerminalRecord(uid=self._tuid, eclass=_eclass)
+        _socket = _record.socket if isinstance(_record, TerminalRecord) else _socket
+
         # Customize behavior:
         self.setAcceptHoverEvents(True)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges)
 
         # Create handle and position it:
-        self.offset = QPointF(self._attr.rect.right() - 5 if _eclass == EntityClass.OUT else self._attr.rect.left() + 5, 0)
-        self.socket = Handle("Resource", self.offset, _eclass, self)
+        self.offset = QPointF(self.Constants.SOCKET_OFFSET * (1 if _eclass == EntityClass.OUT else -1), 0)
+        self.socket = Handle("Resource", self.offset, _eclass, self, _socket)
         self.socket.sig_item_updated.connect(self.on_socket_updated)
 
+        # Attach the socket's record:
+        self._record.socket = self.socket.record
+        self._record.socket.parent = self._record
+
         # Initialize context-menu:
         self._menu = QMenu()
         _delete = self._menu.addAction("Delete")
@@ -115,6 +130,7 @@ class StreamTerminal(QGraphicsObject):
     # ------------------------------------------------------------------------------------------------------------------
     # 1. boundingRect           Returns the bounding rectangle of the terminal.
     # 2. paint                  Paints the terminal.
+    # 3. itemChange             Mirrors the terminal's position into its record.
     # ------------------------------------------------------------------------------------------------------------------
 
     def boundingRect(self) -> QRectF:
@@ -124,7 +140,10 @@ class StreamTerminal(QGraphicsObject):
         Returns:
             QRectF: The bounding rectangle of the terminal.
         """
-        return self._attr.rect
+
+        # Half of the border is drawn outside the terminal's rectangle:
+        _half = max(self._style.pen_border.widthF(), self._style.pen_select.widthF()) / 2.0
+        return self._attr.rect.adjusted(-_half, -_half, _half, _half)
 
     # Paint:
     def paint(self, painter, option, widget = ...):
@@ -138,10 +157,28 @@ class StreamTerminal(QGraphicsObject):
 
         Returns: None
         """
+        cache_miss(self, widget)
+
+        # At low levels-of-detail, draw a plain filled rectangle:
+        if level_of_detail(painter) < LevelOfDetail.SHAPES:
+            painter.fillRect(self._attr.rect, self._style.background)
+            return
+
         painter.setPen  (self._style.pen_select if self.isSelected() else self._style.pen_border)
         painter.setBrush(self._style.background)
         painter.drawRoundedRect(self._attr.rect, 12, 10)
 
+    def itemChange(self, change, value):
+        """
+        Re-implementation of the `QGraphicsObject.itemChange()` method. Mirrors the terminal's position into its record.
+        """
+
+        if change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
+            self._record.x = value.x()
+            self._record.y = value.y()
+
+        return super().itemChange(change, value)
+
     # Event-handlers ---------------------------------------------------------------------------------------------------
     # Name                      Description
     # ------------------------------------------------------------------------------------------------------------------
@@ -233,16 +270,26 @@ class StreamTerminal(QGraphicsObject):
         """
 
         self._style.background = self.socket.color
+        self.update()
 
     # Properties -------------------------------------------------------------------------------------------------------
     # Name                      Description
     # ------------------------------------------------------------------------------------------------------------------
     # 1. uid                    The terminal's unique identifier.
     # 2. eclass                 The terminal's entity class.
+    # 3. record                 The terminal's plain-data record (see model/schema.py).
     # ------------------------------------------------------------------------------------------------------------------
 
     @property
     def uid(self) -> str: return self._tuid
 
+    @uid.setter
+    def uid(self, _tuid: str):
+        self._tuid = _tuid
+        self._record.uid = _tuid
+
+    @property
+    def eclass(self): return self._eclass
+
     @property
-    def eclass(self): return self._eclass
\ No newline at end of file
+    def record(self) -> TerminalRecord: return self._record
@@ -1,343 +1,870 @@
+import codecs
 import json
 import logging
 
-from PyQt6.QtCore import QPointF
-from PyQt6.QtGui import QTransform
-
-from tabs.schema import graph
 from custom import *
-from actions import *
-
-from PyQt6.QtWidgets import QGraphicsObject
+from model  import *
+from tabs.schema import graph
 
 class JsonLib:
     """
-    Utility class for serializing and deserializing schematics (nodes and connectors)
-    to and from JSON format for the canvas-based process modeling application.
+    Utility class for serializing and deserializing schematics (nodes, terminals and connectors) to and from JSON. The
+    conversion runs between JSON and the headless schema model (see model/schema.py), so schematics can be parsed and
+    written without building any graphics items.
+
+    Schematics are written in schema version 2 (see `VERSION`): a version-header, a table of stream-colors, and the
+    `nodes`, `terminals` and `connectors` arrays with short keys, written without indentation. Fields at their default
+    value are left out, and an entity's color is only written if it differs from its stream's color in the table.
+    Schematics of version 1 (upper-case sections, long keys, e.g. Untitled_1.json) are upgraded when they are read (see
+    `migrate`), and written as version 2 when they are saved again.
 
     Static Methods:
     ---------------
-    - serialize(item):
-        Serializes a single `Node` or `Connector` object to a JSON-compatible dictionary.
-        Includes node position, size, equations, and variables; or connector endpoints.
+    - entity_to_json(entity, streams) / entity_from_json(json_obj, streams):
+        Converts a variable or parameter record to and from its JSON-object.
+
+    - model_to_json(model) / model_from_json(root, file):
+        Converts a `SchemaModel` to and from the schematic's JSON-object. `node_from_json`, `terminal_from_json` and
+        `endpoints_from_json` convert single elements of the schematic's arrays. A JSON-object that was read from a file
+        is read together with the file's delta-log (see `apply_log`).
+
+    - migrate(root) / upgrade_element(section, element):
+        Upgrades a schematic's JSON-object, or a single element of a version 1 schematic, to the current version.
+
+    - legacy_to_json(model):
+        Converts a `SchemaModel` to a version 1 JSON-object, which the AI-assistant's instructions describe.
+
+    - stream_json(file):
+        Parses a schematic's JSON-file element by element, for loading large schematics incrementally (see
+        tabs/schema/loader.py).
+
+    - read_log(file) / apply_log(root, file):
+        Reads the net changes from the delta-log that incremental saves append next to a JSON-file (see
+        tabs/schema/saver.py), and merges them into the file's JSON-object.
 
     - encode_json(canvas):
-        Serializes all selected items from the canvas (or all nodes and connectors if none are selected)
+        Serializes all selected items from the canvas (or all nodes, terminals and connectors if none are selected)
         into a JSON string. Used for exporting schematics or dragging between scenes.
 
-    - decode_json(code: str, canvas):
-        Parses a schematic JSON string and reconstructs the corresponding nodes, variables, and connectors
-        on the given `Canvas`. All actions are grouped into a single undoable `BatchAction`.
+    - decode_json(code: str, canvas, file):
+        Parses a schematic JSON string (read from `file`, if given, with its delta-log) and materializes it on the given
+        `Canvas`. All actions are grouped into a single undoable `BatchAction`.
     """
 
+    # Current schema-version, schematics without a version-header are version 1:
+    VERSION = 2
+
+    # Maps the version 1 representation of an entity-class (e.g. "EntityClass.INP") to its enum:
+    ECLASS = {str(_eclass): _eclass for _eclass in EntityClass}
+
+    # Suffix of a JSON-file's delta-log (see `read_log`):
+    LOG_SUFFIX = ".journal"
+
+    # Maps the version 1 sections to their version 2 counterparts:
+    LEGACY = {"NODES": "nodes", "TERMINALS": "terminals", "CONNECTORS": "connectors"}
+
+    # Short keys of an entity's text-fields, and the defaults that are not written:
+    KEYS    = {
+        "symbol" : "s",
+        "label"  : "l",
+        "units"  : "u",
+        "strid"  : "st",
+        "info"   : "i",
+        "value"  : "v",
+        "sigma"  : "sg",
+        "minimum": "lo",
+        "maximum": "hi"
+    }
+    DEFAULT = {"strid": "Default", "color": "#808080"}
+
     @staticmethod
-    def create_json(_entity: Entity, _eclass: EntityClass):
+    def entity_to_json(_entity: EntityRecord, _streams: dict):
+        """
+        Returns an entity's JSON-object. The entity's color is added to the stream-table `_streams` if its stream is
+        not in it yet, and only written with the entity if it differs from the table's color.
+        """
 
-        # Determine prefix:
-        prefix = "variable" \
-                    if _eclass in [EntityClass.INP, EntityClass.OUT, EntityClass.VAR] \
-                    else "parameter"
+        entity_obj = {"c": _entity.eclass.name} if _entity.eclass else {}
+        for _field, _key in JsonLib.KEYS.items():
+            _value = getattr(_entity, _field)
+            if  _value != JsonLib.DEFAULT.get(_field, ""):
+                entity_obj[_key] = _value
 
-        # Create JSON-object:
-        entity_obj = {
-                    f"{prefix}-eclass"   : str(_entity.eclass),
-                    f"{prefix}-symbol"   : _entity.symbol,
-                    f"{prefix}-label"    : _entity.label,
-                    f"{prefix}-units"    : _entity.units, 
-                    f"{prefix}-strid"    : _entity.strid,
-                    f"{prefix}-color"    : _entity.color.name(),
-                    f"{prefix}-info"     : _entity.info,
-                    f"{prefix}-value"    : _entity.value,
-                    f"{prefix}-sigma"    : _entity.sigma,
-                    f"{prefix}-minimum"  : _entity.minimum,
-                    f"{prefix}-maximum"  : _entity.maximum,
-                }
-        
-        # If entity is a variable, add node- and scene-position:
-        if _eclass in [EntityClass.INP, EntityClass.OUT, EntityClass.VAR]:
-            
-            entity_obj.update({
-                f"{prefix}-position" : {
-                    "x": _entity.pos().x(),
-                    "y": _entity.pos().y()
-                },
-                f"{prefix}-scenepos" : {
-                    "x": _entity.scenePos().x(),
-                    "y": _entity.scenePos().y()
-                }
-            })
+        if  _streams.setdefault(_entity.strid, _entity.color) != _entity.color:
+            entity_obj["col"] = _entity.color
+
+        if  _entity.x or _entity.y:
+            entity_obj["p"] = [_entity.x, _entity.y]
 
         return entity_obj
 
     @staticmethod
-    def serialize(_item: QGraphicsObject):
+    def entity_from_json(_json_obj: dict, _streams: dict):
+
+        _strid = _json_obj.get("st", JsonLib.DEFAULT["strid"])
+        _x, _y = _json_obj.get("p", (0.0, 0.0))
+
+        return EntityRecord(
+            eclass  = EntityClass.__members__.get(_json_obj.get("c")),
+            symbol  = _json_obj.get("s", ""),
+            label   = _json_obj.get("l", ""),
+            units   = _json_obj.get("u", ""),
+            strid   = _strid,
+            color   = _json_obj.get("col", _streams.get(_strid, JsonLib.DEFAULT["color"])),
+            info    = _json_obj.get("i", ""),
+            value   = str(_json_obj.get("v", "")),
+            sigma   = str(_json_obj.get("sg", "")),
+            minimum = str(_json_obj.get("lo", "")),
+            maximum = str(_json_obj.get("hi", "")),
+            x       = _x,
+            y       = _y
+        )
 
-        if isinstance(_item, graph.Node):
+    @staticmethod
+    def model_to_json(_model: SchemaModel, _snapshot: str | None = None):
+        """
+        Returns the schematic's JSON-object. `_snapshot` identifies the file that the object is written to, for its
+        delta-log (see tabs/schema/saver.py).
+        """
 
-            variables   = list()
-            equations   = list()
-            parameters  = list()
+        # The stream-table is filled while the elements are converted, but is written before them:
+        _streams = dict()
+        _root    = {"version": JsonLib.VERSION}
+        if  _snapshot is not None:
+            _root["snapshot"] = _snapshot
 
-            variables = [
-                JsonLib.create_json(_entity, EntityClass.VAR) 
-                for _entity in _item[EntityClass.INP] | _item[EntityClass.OUT]
-                if  _entity.isVisible()
-            ]
+        _root["streams"] = _streams
+        _root.update(JsonLib.body_to_json(_model, _streams))
 
-            parameters = [
-                JsonLib.create_json(_entity, EntityClass.PAR) 
-                for _entity in _item[EntityClass.PAR]
+        return _root
+
+    @staticmethod
+    def body_to_json(_model: SchemaModel, _streams: dict):
+        """
+        Returns the `nodes`, `terminals` and `connectors` arrays of a model (or of a composite node's sub-system).
+        """
+
+        return {
+            "nodes"      : [JsonLib.node_to_json(_node, _streams)     for _node in _model.nodes.values()],
+            "terminals"  : [JsonLib.terminal_to_json(_term, _streams) for _term in _model.terminals.values()],
+            "connectors" : [JsonLib.connector_to_json(_conn)          for _conn in _model.connectors.values()]
+        }
+
+    @staticmethod
+    def node_to_json(_node: NodeRecord, _streams: dict):
+
+        node_obj = {"id": _node.uid, "t": _node.title, "p": [_node.x, _node.y], "h": _node.height}
+        if _node.variables:     node_obj["v"] = [JsonLib.entity_to_json(_var, _streams) for _var in _node.variables]
+        if _node.parameters:    node_obj["k"] = [JsonLib.entity_to_json(_par, _streams) for _par in _node.parameters]
+        if _node.equations:     node_obj["e"] = list(_node.equations)
+
+        # Composite nodes carry their sub-system, and the inner handle that each boundary-handle stands for:
+        if  _node.children is not None:
+            node_obj["sub"]   = JsonLib.body_to_json(_node.children, _streams)
+            node_obj["ports"] = [
+                [JsonLib.handle_to_json(_outer), _inner.parent.uid, JsonLib.handle_to_json(_inner)]
+                for _outer, _inner in _node.ports.items()
             ]
 
-            # JSON-composite:
-            node_object = {
-                "node-title"    : _item.title,
-                "node-height"   : _item.boundingRect().height(),
-                "node-scenepos" : {
-                    "x": _item.scenePos().x(),
-                    "y": _item.scenePos().y()
-                },
-                "parameters" : parameters,
-                "variables"  : variables
-            }
+        return node_obj
 
-            return node_object
+    @staticmethod
+    def terminal_to_json(_term: TerminalRecord, _streams: dict):
 
-        if isinstance(_item, graph.StreamTerminal):
+        _socket  = _term.socket
+        term_obj = {"id": _term.uid, "c": _term.eclass.name, "l": _socket.label, "p": [_term.x, _term.y]}
+        if  _socket.strid != JsonLib.DEFAULT["strid"]:
+            term_obj["st"] = _socket.strid
 
-            stream_obj = {
-                "terminal-class"    : str(_item.socket.eclass),
-                "terminal-label"    : _item.socket.label,
-                "terminal-strid"    : _item.socket.strid,
-                "terminal-color"    : _item.socket.color.name(),
-                "terminal-scenepos" : {
-                    "x": _item.scenePos().x(),
-                    "y": _item.scenePos().y()
-                }
+        if  _streams.setdefault(_socket.strid, _socket.color) != _socket.color:
+            term_obj["col"] = _socket.color
+
+        return term_obj
+
+    @staticmethod
+    def handle_to_json(_handle: EntityRecord) -> int:
+        """
+        Returns a handle's index among its owner's variables (0 for the socket of a terminal). Unlike symbols, indices
+        are unique per owner (see `SchemaModel.handle_index`).
+        """
+
+        _owner = _handle.parent
+        if  isinstance(_owner, NodeRecord):
+            return next(_index for _index, _var in enumerate(_owner.variables) if _var is _handle)
+
+        return 0
+
+    @staticmethod
+    def connector_to_json(_conn: ConnectorRecord):
+
+        # Connectors are identified by their endpoints' handle-identities (owner's UID + handle's index):
+        return [
+            _conn.origin.parent.uid, JsonLib.handle_to_json(_conn.origin),
+            _conn.target.parent.uid, JsonLib.handle_to_json(_conn.target)
+        ]
+
+    @staticmethod
+    def element_key(_section: str, _json_obj):
+        """
+        Returns the identity of an element of the `nodes`, `terminals` or `connectors` array: the UID of nodes and
+        terminals, the endpoints' handle-identities of connectors.
+        """
+        return tuple(_json_obj[:4]) if _section == "connectors" else _json_obj.get("id")
+
+    @staticmethod
+    def node_from_json(_json_obj: dict, _index: int = 0, _streams: dict | None = None):
+
+        _streams = _streams if _streams is not None else dict()
+        _x, _y   = _json_obj.get("p", (0.0, 0.0))
+
+        _node = NodeRecord(
+            uid    = _json_obj.get("id", f"N{_index:04d}"),
+            title  = _json_obj.get("t", ""),
+            x      = _x,
+            y      = _y,
+            height = _json_obj.get("h", 150.0),
+            equations = list(_json_obj.get("e", []))
+        )
+
+        for variable_obj in _json_obj.get("v", []):
+            _var = JsonLib.entity_from_json(variable_obj, _streams)
+            _var.parent = _node
+            _node.variables.append(_var)
+
+        for parameter_obj in _json_obj.get("k", []):
+            _par = JsonLib.entity_from_json(parameter_obj, _streams)
+            _par.parent = _node
+            _node.parameters.append(_par)
+            _node.expressions.set(_par.symbol, _par.value)
+
+        # Composite nodes:
+        if  "sub" in _json_obj:
+            _node.children = JsonLib.body_from_json(_json_obj["sub"], _streams)
+            for _outer, _inner_uid, _inner in _json_obj.get("ports", []):
+                _port   = JsonLib.port_from_json(_node, _outer)
+                _handle = _node.children.find_handle(_inner_uid, _inner)
+                if  _port is not None and _handle is not None:
+                    _node.ports[_port] = _handle
+
+        return _node
+
+    @staticmethod
+    def port_from_json(_node: NodeRecord, _outer: int | str) -> EntityRecord | None:
+        """
+        Returns a composite node's boundary-handle by its index among the node's variables, or by its symbol (ports of
+        version 1 schematics).
+        """
+
+        if  isinstance(_outer, int):
+            return _node.variables[_outer] if 0 <= _outer < len(_node.variables) else None
+
+        return next((_var for _var in _node.variables if _var.symbol == _outer), None)
+
+    @staticmethod
+    def terminal_from_json(_json_obj: dict, _index: int = 0, _streams: dict | None = None):
+
+        _eclass = EntityClass.__members__.get(_json_obj.get("c"))
+        if _eclass not in [EntityClass.INP, EntityClass.OUT]:
+            return None
+
+        _streams = _streams if _streams is not None else dict()
+        _strid   = _json_obj.get("st", JsonLib.DEFAULT["strid"])
+        _x, _y   = _json_obj.get("p", (0.0, 0.0))
+
+        _term = TerminalRecord(
+            uid    = _json_obj.get("id", f"T{_index:04d}"),
+            eclass = _eclass,
+            x      = _x,
+            y      = _y,
+            socket = EntityRecord(
+                eclass = _eclass,
+                symbol = "Resource",
+                label  = _json_obj.get("l", ""),
+                strid  = _strid,
+                color  = _json_obj.get("col", _streams.get(_strid, JsonLib.DEFAULT["color"])),
+                x      = graph.StreamTerminal.Constants.SOCKET_OFFSET * (1 if _eclass == EntityClass.OUT else -1)
+            )
+        )
+
+        _term.socket.parent = _term
+        return _term
+
+    @staticmethod
+    def endpoints_from_json(_json_obj: list, _handles: dict, _positions):
+        """
+        Resolves the endpoints of a connector, [origin-uid, origin-index, target-uid, target-index], by handle-identity
+        (owner's UID + handle's index, see `SchemaModel.handle_index`): the origin is an output-handle, the target an
+        input-handle. Connectors of version 1 schematics identify their handles by symbol instead, which is resolved
+        along with the handle's class. They may have been saved input-first, and those that were saved without
+        handle-symbols carry the endpoints' scene-positions as well,
+        [..., origin-x, origin-y, target-x, target-y], and fall back to the hash-map of handle scene-positions returned
+        by `_positions()` (see `SchemaModel.position_index`), which is only called when needed. Returns the (origin,
+        target) handle-records, origin first, or None if an endpoint is unresolved or the connector is invalid.
+        """
+
+        def resolve(_uid: str, _symbol: str | int | None, _scenepos: list, _eclass: EntityClass):
+            if  _symbol is None and _scenepos:
+                return _positions().get((round(_scenepos[0], 1), round(_scenepos[1], 1)))
+
+            if  isinstance(_symbol, int):
+                return _handles.get((_uid, _symbol))
+
+            return _handles.get((_uid, _eclass, _symbol))
+
+        _origin = (_json_obj[0], _json_obj[1], _json_obj[4:6])
+        _target = (_json_obj[2], _json_obj[3], _json_obj[6:8])
+
+        origin = resolve(*_origin, EntityClass.OUT)
+        target = resolve(*_target, EntityClass.INP)
+
+        # Connectors saved input-first:
+        if  origin is None or target is None:
+            _reversed = resolve(*_target, EntityClass.OUT), resolve(*_origin, EntityClass.INP)
+            if  None not in _reversed:
+                origin, target = _reversed
+
+        if  origin is None or target is None:
+            logging.warning(f"Unresolved connector: {_json_obj}")
+            return None
+
+        # Handles resolved by position may be of either class (origin is the output-handle):
+        if  origin.eclass == EntityClass.INP:
+            origin, target = target, origin
+
+        if  (
+            origin.eclass != EntityClass.OUT or
+            target.eclass != EntityClass.INP or
+            origin.parent is target.parent
+        ):
+            logging.warning(f"Invalid connector: {_json_obj}")
+            return None
+
+        return origin, target
+
+    @staticmethod
+    def model_from_json(_root: dict, _file: str | None = None):
+
+        # Upgrade older schematics:
+        _root = JsonLib.migrate(_root)
+
+        # Changes saved incrementally since the file's snapshot:
+        if  _file is not None:
+            _root = JsonLib.apply_log(_root, _file)
+
+        return JsonLib.body_from_json(_root, _root.get("streams", {}))
+
+    @staticmethod
+    def body_from_json(_body: dict, _streams: dict):
+
+        # Instantiate model:
+        _model = SchemaModel()
+
+        # Read node-data:
+        for _index, element in enumerate(_body.get("nodes", [])):
+            _model.add_node(JsonLib.node_from_json(element, _index, _streams))
+
+        # Read in / outflows:
+        for _index, element in enumerate(_body.get("terminals", [])):
+            _term = JsonLib.terminal_from_json(element, _index, _streams)
+            if _term is not None:
+                _model.add_terminal(_term)
+
+        # Resolve connections by handle-identity, the position-index is only built for schematics that need it:
+        handles   = _model.handle_index()
+        positions = None
+
+        def position_index():
+            nonlocal positions
+            positions = _model.position_index() if positions is None else positions
+            return positions
+
+        for json_obj in _body.get("connectors", []):
+
+            endpoints = JsonLib.endpoints_from_json(json_obj, handles, position_index)
+            if endpoints is not None:
+                _model.add_connector(ConnectorRecord(f"X{len(_model.connectors)}", *endpoints))
+
+        return _model
+
+    # Migration --------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def migrate(_root: dict):
+        """
+        Returns a schematic's JSON-object in the current schema-version.
+
+        Raises:
+            ValueError: If the schematic was written by a newer version of the application.
+        """
+
+        _version = _root.get("version", 1)
+        if  not isinstance(_version, int) or _version > JsonLib.VERSION:
+            raise ValueError(f"Unsupported schematic version: {_version}")
+
+        if  _version == 1:
+            _root = {"version": JsonLib.VERSION, "streams": {}, **JsonLib.upgrade_body(_root)}
+
+        return _root
+
+    @staticmethod
+    def upgrade_body(_root: dict):
+        """
+        Upgrades the `NODES`, `TERMINALS` and `CONNECTORS` arrays of a version 1 schematic (or of a composite node's
+        sub-system).
+        """
+
+        _body = dict()
+        for _section, _name in JsonLib.LEGACY.items():
+            _body[_name] = [JsonLib.upgrade_element(_section, _element)[1] for _element in _root.get(_section, [])]
+
+        return _body
+
+    @staticmethod
+    def upgrade_element(_section: str, _json_obj: dict):
+        """
+        Upgrades an element of a version 1 schematic's section, e.g. "NODES", to version 2. Returns the version 2
+        section and element. Version 1 stored every entity's color, so upgraded entities keep theirs.
+        """
+
+        if  _section == "NODES":
+
+            _pos     = _json_obj.get("node-scenepos", {})
+            node_obj = {
+                "t": _json_obj.get("node-title", ""),
+                "p": [_pos.get("x", 0.0), _pos.get("y", 0.0)],
+                "h": _json_obj.get("node-height", 150.0),
+                "v": [JsonLib.upgrade_entity(_var, "variable")  for _var in _json_obj.get("variables", [])],
+                "k": [JsonLib.upgrade_entity(_par, "parameter") for _par in _json_obj.get("parameters", [])],
+                "e": list(_json_obj.get("equations", []))
             }
 
-            return stream_obj
+            if  "node-uid" in _json_obj:
+                node_obj["id"] = _json_obj["node-uid"]
 
-        if isinstance(_item, graph.Connector):
+            if  "children" in _json_obj:
+                node_obj["sub"]   = JsonLib.upgrade_body(_json_obj["children"])
+                node_obj["ports"] = [
+                    [_port.get("port-symbol"), _port.get("inner-uid"), _port.get("inner-symbol")]
+                    for _port in _json_obj.get("ports", [])
+                ]
 
-            connection_obj = {
-                "origin-parent-uid" : _item.origin.parentItem().uid,
-                "origin-label"      : _item.origin.label,
-                "origin-scenepos"   : {
-                    "x": _item.origin.scenePos().x(),
-                    "y": _item.origin.scenePos().y()
-                },
-                "target-parent-uid" : _item.target.parentItem().uid,
-                "target-label"      : _item.target.label,
-                "target-scenepos": {
-                    "x": _item.target.scenePos().x(),
-                    "y": _item.target.scenePos().y()
-                }
+            return "nodes", node_obj
+
+        if  _section == "TERMINALS":
+
+            _eclass  = JsonLib.ECLASS.get(_json_obj.get("terminal-class", ""))
+            _pos     = _json_obj.get("terminal-scenepos", {})
+            term_obj = {
+                "c"  : _eclass.name if _eclass else "",
+                "l"  : _json_obj.get("terminal-label", ""),
+                "st" : _json_obj.get("terminal-strid", JsonLib.DEFAULT["strid"]),
+                "col": _json_obj.get("terminal-color", JsonLib.DEFAULT["color"]),
+                "p"  : [_pos.get("x", 0.0), _pos.get("y", 0.0)]
             }
 
-            return connection_obj
+            if  "terminal-uid" in _json_obj:
+                term_obj["id"] = _json_obj["terminal-uid"]
 
-        return None
+            return "terminals", term_obj
 
-    @staticmethod
-    def encode_json(_canvas):
+        if  _section == "CONNECTORS":
 
-        # Debugging:
-        print(f"- Encoding JSON for canvas: {_canvas.uid}")
+            conn_obj = [
+                _json_obj.get("origin-parent-uid"), _json_obj.get("origin-symbol"),
+                _json_obj.get("target-parent-uid"), _json_obj.get("target-symbol")
+            ]
 
-        # Serialize selected items. If no items are selected, serialize all active (visible) items:
-        items =      _canvas.selectedItems()    \
-                if   _canvas.selectedItems()    \
-                else \
-                [_item for _item in _canvas.node_db if _canvas.node_db[_item]] + \
-                [_item for _item in _canvas.term_db if _canvas.term_db[_item]] + \
-                [_item for _item in _canvas.conn_db if _canvas.conn_db[_item]]
-
-        # Serialize items and generate JSON-objects:
-        node_array = [JsonLib.serialize(item) for item in items if isinstance(item, graph.Node)]
-        conn_array = [JsonLib.serialize(item) for item in items if isinstance(item, graph.Connector)]
-        term_array = [JsonLib.serialize(item) for item in items if isinstance(item, graph.StreamTerminal)]
-
-        # Initialize JSON-objects:
-        schematic = {
-            "NODES"      : node_array,
-            "TERMINALS"  : term_array,
-            "CONNECTORS" : conn_array
-        }
+            # Connectors saved without handle-symbols are resolved by their endpoints' scene-positions:
+            if  conn_obj[1] is None or conn_obj[3] is None:
+                for _prefix in ["origin", "target"]:
+                    _pos = _json_obj.get(f"{_prefix}-scenepos", {})
+                    conn_obj += [_pos.get("x", 0.0), _pos.get("y", 0.0)]
 
-        # Return JSON-string:
-        return json.dumps(schematic, indent=4)
+            return "connectors", conn_obj
+
+        raise ValueError(f"Unknown section: {_section}")
 
     @staticmethod
-    def decode_json(_code: str, 
-                    _canvas, 
-                    _group_actions: bool = False
-                    ):
+    def upgrade_entity(_json_obj: dict, _prefix: str):
 
-        # Import canvas module:
-        from tabs.schema.canvas import Canvas
+        # Older schematics stored the entity-class under `-stream`, variables default to outputs:
+        _eclass = JsonLib.ECLASS.get(
+            _json_obj.get(f"{_prefix}-eclass", _json_obj.get(f"{_prefix}-stream", "")),
+            EntityClass.OUT if _prefix == "variable" else None
+        )
 
-        # Convert file contents to JSON-parsable:
-        root = json.loads(_code)
+        entity_obj = {"c": _eclass.name} if _eclass else {}
+        for _field, _key in JsonLib.KEYS.items():
+            entity_obj[_key] = _json_obj.get(f"{_prefix}-{_field}", JsonLib.DEFAULT.get(_field, ""))
 
-        # Validate argument(s):
-        if not isinstance(_code, str):      raise ValueError("Invalid JSON-code")
-        if not isinstance(_canvas, Canvas): raise ValueError("Invalid `Canvas` object")
+        entity_obj["col"] = _json_obj.get(f"{_prefix}-color", JsonLib.DEFAULT["color"])
 
-        # Initialize batch-actions:
-        batch = BatchActions([])
+        _pos = _json_obj.get(f"{_prefix}-position", {})
+        entity_obj["p"] = [_pos.get("x", 0.0), _pos.get("y", 0.0)]
 
-        # Read node-data, create nodes:
-        for element in root.get("NODES", []):
+        return entity_obj
 
-            xp   = element.get("node-scenepos", {}).get("x", 0.0)
-            yp   = element.get("node-scenepos", {}).get("y", 0.0)
-            spos = QPointF(xp, yp)
-            name = element.get("node-title", "")
+    # Version 1 --------------------------------------------------------------------------------------------------------
 
-            print(f"- Creating node: {name}")
+    @staticmethod
+    def entity_to_legacy(_entity: EntityRecord, _prefix: str):
 
-            # Create node with given size:
-            height = int(element.get("node-height", {}))
-            node   = _canvas.create_node(name, spos, False)
+        # Create JSON-object:
+        entity_obj = {
+                    f"{_prefix}-eclass"   : str(_entity.eclass) if _entity.eclass else "",
+                    f"{_prefix}-symbol"   : _entity.symbol,
+                    f"{_prefix}-label"    : _entity.label,
+                    f"{_prefix}-units"    : _entity.units, 
+                    f"{_prefix}-strid"    : _entity.strid,
+                    f"{_prefix}-color"    : _entity.color,
+                    f"{_prefix}-info"     : _entity.info,
+                    f"{_prefix}-value"    : _entity.value,
+                    f"{_prefix}-sigma"    : _entity.sigma,
+                    f"{_prefix}-minimum"  : _entity.minimum,
+                    f"{_prefix}-maximum"  : _entity.maximum,
+                }
 
-            node.title = name
-            node.resize(height - 200)
+        # If entity is a variable, add node- and scene-position:
+        if _prefix == "variable":
 
-            # Create corresponding action:
-            action = CreateNodeAction(_canvas, node)
+            _parent = _entity.parent
+            entity_obj.update({
+                f"{_prefix}-position" : {
+                    "x": _entity.x,
+                    "y": _entity.y
+                },
+                f"{_prefix}-scenepos" : {
+                    "x": _parent.x + _entity.x,
+                    "y": _parent.y + _entity.y
+                }
+            })
 
-            if _group_actions:  batch.add_to_batch(action)  # Queue action
-            else:               _canvas.manager.do(action)  # Execute it immediately
+        return entity_obj
 
-            # Load variable(s):
-            for variable_obj in element.get("variables", []):
+    @staticmethod
+    def legacy_to_json(_model: SchemaModel):
 
-                eclass = variable_obj.get("variable-stream", 0)
-                eclass = EntityClass.INP if eclass == "EntityClass.INP" else EntityClass.OUT
+        node_array = [
+            {
+                "node-uid"      : _node.uid,
+                "node-title"    : _node.title,
+                "node-height"   : _node.height,
+                "node-scenepos" : {
+                    "x": _node.x,
+                    "y": _node.y
+                },
+                "parameters" : [JsonLib.entity_to_legacy(_par, "parameter") for _par in _node.parameters],
+                "variables"  : [JsonLib.entity_to_legacy(_var, "variable")  for _var in _node.variables],
+                "equations"  : list(_node.equations)
+            }
+            for _node in _model.nodes.values()
+        ]
+
+        # Composite nodes carry their sub-system, and the inner handle that each boundary-handle stands for:
+        for _node, node_obj in zip(_model.nodes.values(), node_array):
+            if  _node.children is not None:
+                node_obj["children"] = JsonLib.legacy_to_json(_node.children)
+                node_obj["ports"]    = [
+                    {
+                        "port-symbol"   : _outer.symbol,
+                        "inner-uid"     : _inner.parent.uid,
+                        "inner-symbol"  : _inner.symbol
+                    }
+                    for _outer, _inner in _node.ports.items()
+                ]
+
+        term_array = [
+            {
+                "terminal-uid"      : _term.uid,
+                "terminal-class"    : str(_term.eclass),
+                "terminal-label"    : _term.socket.label,
+                "terminal-strid"    : _term.socket.strid,
+                "terminal-color"    : _term.socket.color,
+                "terminal-scenepos" : {
+                    "x": _term.x,
+                    "y": _term.y
+                }
+            }
+            for _term in _model.terminals.values()
+        ]
+
+        conn_array = [
+            {
+                "origin-parent-uid" : _conn.origin.parent.uid,
+                "origin-symbol"     : _conn.origin.symbol,
+                "origin-label"      : _conn.origin.label,
+                "origin-scenepos"   : {
+                    "x": _conn.origin.parent.x + _conn.origin.x,
+                    "y": _conn.origin.parent.y + _conn.origin.y
+                },
+                "target-parent-uid" : _conn.target.parent.uid,
+                "target-symbol"     : _conn.target.symbol,
+                "target-label"      : _conn.target.label,
+                "target-scenepos": {
+                    "x": _conn.target.parent.x + _conn.target.x,
+                    "y": _conn.target.parent.y + _conn.target.y
+                }
+            }
+            for _conn in _model.connectors.values()
+        ]
+
+        return {
+            "NODES"      : node_array,
+            "TERMINALS"  : term_array,
+            "CONNECTORS" : conn_array
+        }
+
+    @staticmethod
+    def stream_json(_file,
+                    _sections: tuple = ("nodes", "terminals", "connectors", "NODES", "TERMINALS", "CONNECTORS"),
+                    _chunk: int = 1 << 20
+                    ):
+        """
+        Parses a schematic's JSON-file incrementally: yields a (section, element, offset)-tuple for each element of the
+        top-level arrays named in `_sections`, where `offset` is the number of bytes read so far. Other top-level
+        values (e.g. the version-header and the stream-table) are yielded whole, as a (key, value, offset)-tuple. At
+        most a few `_chunk`-sized blocks of the file, and a single element, are held in memory at a time, instead of
+        the whole file and its decoded tree (see `json.JSONDecoder.raw_decode`).
+
+        Parameters:
+            _file (BinaryIO): The file, opened in binary mode.
+            _sections (tuple): Names of the arrays whose elements are yielded.
+            _chunk (int): Number of bytes read at a time.
+
+        Raises:
+            ValueError: If the file is not a JSON-object (json.JSONDecodeError is a ValueError).
+        """
+
+        decoder = json.JSONDecoder()
+        utf8    = codecs.getincrementaldecoder("utf-8")()
+        state   = {"text": "", "pos": 0, "read": 0, "eof": False}
+
+        def fill() -> bool:
+            if  state["eof"]:
+                return False
+
+            _block = _file.read(_chunk)
+            state["read"] += len(_block)
+            state["eof"]   = not _block
+            state["text"]  = state["text"][state["pos"]:] + utf8.decode(_block, final=state["eof"])
+            state["pos"]   = 0
+            return True
+
+        def peek() -> str:
+            while True:
+                _text, _pos = state["text"], state["pos"]
+                while _pos < len(_text) and _text[_pos] in " \t\r\n":
+                    _pos += 1
+
+                state["pos"] = _pos
+                if  _pos < len(_text):
+                    return _text[_pos]
+
+                if not fill():
+                    raise json.JSONDecodeError("Unexpected end of file", _text, _pos)
+
+        def expect(_char: str) -> None:
+            if  peek() != _char:
+                raise json.JSONDecodeError(f"Expected '{_char}'", state["text"], state["pos"])
+            state["pos"] += 1
+
+        def decode():
+            peek()
+            while True:
+                try:
+                    _value, _end = decoder.raw_decode(state["text"], state["pos"])
+
+                    # A value at the end of the text may be cut short (e.g. a number), unless the file has ended:
+                    if  _end < len(state["text"]) or state["eof"]:
+                        state["pos"] = _end
+                        return _value
+
+                except json.JSONDecodeError:
+                    if  state["eof"]:
+                        raise
+
+                fill()
+
+        expect("{")
+        if  peek() == "}":
+            return
+
+        while True:
+
+            _key = decode()
+            expect(":")
+
+            if  _key in _sections and peek() == "[":
+                state["pos"] += 1
+                if  peek() != "]":
+                    while True:
+                        yield _key, decode(), state["read"]
+                        if  peek() == ",":
+                            state["pos"] += 1
+                            continue
+                        break
+
+                expect("]")
+
+            else:
+                yield _key, decode(), state["read"]
+
+            if  peek() == ",":
+                state["pos"] += 1
+                continue
+
+            expect("}")
+            return
+
+    # Delta-log ---------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def log_path(_file: str) -> str:
+        return f"{_file}{JsonLib.LOG_SUFFIX}"
 
-                xpos   = variable_obj.get("variable-position", {}).get("x", 0.0)
-                ypos   = variable_obj.get("variable-position", {}).get("y", 0.0)
+    @staticmethod
+    def read_log(_file: str, _limit: int | None = None):
+        """
+        Reads the delta-log of a schematic's JSON-file (see tabs/schema/saver.py): a header-line with the snapshot that
+        the log applies to, followed by one line per save with the stream-colors, elements and removed elements' keys
+        (see `element_key`) that changed since the previous save, e.g.
+
+            {"snapshot": "3f2a..."}
+            {"streams": {...}, "nodes": [...], "connectors": [...], "removed": {"nodes": ["N0012"]}}
+
+        Returns the log's net effect as a (snapshot, changes, offset)-tuple: `changes` holds the new stream-colors
+        under "streams", and maps each changed element's key to its latest JSON-object (or to None if it was removed)
+        under "nodes", "terminals" and "connectors". `offset` is the number of bytes that were read. Returns None if
+        the file has no log. A line that was cut short (e.g. by a crash while saving) ends the log.
 
-                # Create variable, don't push the action to the undo-stack yet:
-                variable = node.create_handle(
-                    QPointF(xpos, ypos),
-                    eclass
-                )
+        Parameters:
+            _file (str): Path of the schematic's JSON-file.
+            _limit (int, optional): Number of bytes to read, the whole log by default.
+        """
 
-                variable.symbol  = variable_obj.get("variable-symbol", "")
-                variable.info    = variable_obj.get("variable-info")
-                variable.label   = variable_obj.get("variable-label")
-                variable.units   = variable_obj.get("variable-units")
-                variable.value   = str(variable_obj.get("variable-value", ""))
-                variable.sigma   = str(variable_obj.get("variable-sigma", ""))
-                variable.minimum = str(variable_obj.get("variable-minimum", ""))
-                variable.maximum = str(variable_obj.get("variable-maximum", ""))
+        try:
+            _log = open(JsonLib.log_path(_file), "rb")
 
-                stream = _canvas.find_stream(variable_obj.get("variable-strid", ""))
-                variable.strid = stream.strid
-                variable.color = stream.color
-                variable.sig_item_updated.emit(variable)
+        except FileNotFoundError:
+            return None
 
-                variable.rename(variable.label)
-                variable_action = CreateHandleAction(node, variable)
+        _changes = {"streams": {}, "nodes": {}, "terminals": {}, "connectors": {}}
+        _offset  = 0
 
-                # Add action to batch:
-                if _group_actions:  batch.add_to_batch(variable_action)
-                else:               _canvas.manager.do(variable_action)
+        with _log:
 
-            # Load parameter(s):
-            for parameter_obj in element.get("parameters", []):
+            _header = _log.readline()
+            if  not _header.endswith(b"\n"):
+                return None
 
-                parameter = Entity()
-                parameter.symbol  = parameter_obj.get("parameter-symbol", "")
-                parameter.info    = parameter_obj.get("parameter-info")
-                parameter.label   = parameter_obj.get("parameter-label")
-                parameter.units   = parameter_obj.get("parameter-units")
-                parameter.value   = str(parameter_obj.get("parameter-value", ""))
-                parameter.sigma   = str(parameter_obj.get("parameter-sigma", ""))
-                parameter.minimum = str(parameter_obj.get("parameter-minimum", ""))
-                parameter.maximum = str(parameter_obj.get("parameter-maximum", ""))
+            _snapshot = json.loads(_header).get("snapshot")
+            _offset  += len(_header)
 
-                stream = _canvas.find_stream(parameter_obj.get("parameter-strid", ""))
-                parameter.strid = stream.strid
-                parameter.color = stream.color
+            for _line in _log:
 
-                # Add parameter to dictionary:
-                node[EntityClass.PAR][parameter] = EntityState.ACTIVE
+                if  not _line.endswith(b"\n") or (_limit is not None and _offset + len(_line) > _limit):
+                    break
 
-        # Load in / outflows:
-        for element in root.get("TERMINALS", []):
+                try:
+                    _delta = json.loads(_line)
+                except ValueError:
+                    break
 
-            # Get name and position:
-            xp   = element.get("terminal-scenepos", {}).get("x", 0.0)
-            yp   = element.get("terminal-scenepos", {}).get("y", 0.0)
-            spos = QPointF(xp, yp)
-            name = element.get("terminal-label", "")
+                for _strid, _color in _delta.get("streams", {}).items():
+                    _changes["streams"].setdefault(_strid, _color)
 
-            # Create source or sink:
-            if  element.get("terminal-class", "") == "EntityClass.OUT":
+                for _section, _keys in _delta.get("removed", {}).items():
+                    for _key in _keys:
+                        _changes[_section][tuple(_key) if _section == "connectors" else _key] = None
 
-                terminal = _canvas.create_terminal(EntityClass.OUT, spos)
-                action   = CreateStreamAction(_canvas, terminal)
+                for _section in ("nodes", "terminals", "connectors"):
+                    for _element in _delta.get(_section, []):
+                        _key = JsonLib.element_key(_section, _element)
+                        _changes[_section].pop(_key, None)
+                        _changes[_section][_key] = _element
 
-                stream = _canvas.find_stream(element.get("terminal-strid", ""))
-                terminal.socket.strid = stream.strid
-                terminal.socket.color = stream.color
-                terminal.socket.sig_item_updated.emit(terminal.socket)
+                _offset += len(_line)
 
-                if _group_actions:   batch.add_to_batch(action)      # Queue action
-                else:               _canvas.manager.do(action)       # Execute it immediately
+        return _snapshot, _changes, _offset
+
+    @staticmethod
+    def apply_log(_root: dict, _file: str) -> dict:
+        """
+        Returns the JSON-object of a schematic's file with the changes of the file's delta-log (see `read_log`) merged
+        in, like the schematic-reader does while streaming the file (see tabs/schema/loader.py): elements that were
+        changed or removed since the snapshot are dropped, and the changed ones are appended to their arrays. The
+        object is returned as is if the file has no log, or if the log belongs to another snapshot.
+
+        Parameters:
+            _root (dict): The file's JSON-object (in the current schema-version, see `migrate`).
+            _file (str): Path of the schematic's JSON-file.
+        """
+
+        _log = JsonLib.read_log(_file)
+        if  _log is None:
+            return _root
+
+        _snapshot, _changes, _ = _log
+        if  _root.get("snapshot") != _snapshot:
+            logging.warning(f"Ignoring stale delta-log of {_file}")
+            return _root
+
+        _merged = {**_root, "streams": {**_root.get("streams", {}), **_changes["streams"]}}
+        for _section in ("nodes", "terminals", "connectors"):
+            _merged[_section] = [
+                _element for _element in _root.get(_section, [])
+                if  JsonLib.element_key(_section, _element) not in _changes[_section]
+            ] + [
+                _element for _element in _changes[_section].values() if _element is not None
+            ]
 
-            elif element.get("terminal-class", "") == "EntityClass.INP":
+        return _merged
 
-                terminal = _canvas.create_terminal(EntityClass.INP, spos)
-                action   = CreateStreamAction(_canvas, terminal)
+    @staticmethod
+    def encode_json(_canvas, _legacy: bool = False):
+        """
+        Serializes the canvas' selected items (or all of them) in the current schema-version, without indentation. With
+        `_legacy`, the items are serialized as an indented version 1 schematic instead.
+        """
 
-                stream = _canvas.find_stream(element.get("terminal-strid", ""))
-                terminal.socket.label = element.get("terminal-label", "")
-                terminal.socket.strid = stream.strid
-                terminal.socket.color = stream.color
-                terminal.socket.sig_item_updated.emit(terminal.socket)
+        # Debugging:
+        print(f"- Encoding JSON for canvas: {_canvas.uid}")
 
-                if _group_actions:   batch.add_to_batch(action)      # Queue action
-                else:               _canvas.manager.do(action)       # Execute it immediately
+        # Serialize selected items. If no items are selected, serialize all active (visible) items:
+        records = [
+            _item.record for _item in _canvas.selectedItems()
+            if  isinstance(_item, graph.Node | graph.StreamTerminal)
+        ] \
+        if  _canvas.selectedItems() \
+        else \
+        list(_canvas.model.nodes.values()) + list(_canvas.model.terminals.values())
 
-        # Execute batch-actions. This will insert nodes and flows into the scene:
-        batch.execute()
+        # Connectors are kept if both their endpoints are serialized:
+        _model = _canvas.model.subset(records)
 
-        # Now setup connections:
-        for json_obj in root.get("CONNECTORS", []):
+        # Return JSON-string:
+        if  _legacy:
+            return json.dumps(JsonLib.legacy_to_json(_model), indent=4)
 
-            sxpos = json_obj.get("origin-scenepos", {}).get("x", 0.0)
-            sypos = json_obj.get("origin-scenepos", {}).get("y", 0.0)
-            txpos = json_obj.get("target-scenepos", {}).get("x", 0.0)
-            typos = json_obj.get("target-scenepos", {}).get("y", 0.0)
-
-            origin = _canvas.itemAt(QPointF(sxpos, sypos), QTransform())
-            target = _canvas.itemAt(QPointF(txpos, typos), QTransform())
-
-            if (
-                    isinstance(origin, graph.Handle) and
-                    isinstance(target, graph.Handle)
-            ):
-
-                connector = graph.Connector(_canvas.create_cuid(), 
-                                            origin, 
-                                            target, 
-                                            True
-                                            )
-                connector.sig_item_removed.connect(_canvas.on_item_removed)
+        return json.dumps(JsonLib.model_to_json(_model), separators=(",", ":"))
 
-                # Add connector to database:
-                _canvas.conn_db[connector] = True
-                _canvas.addItem(connector)
+    @staticmethod
+    def decode_json(_code: str, 
+                    _canvas, 
+                    _group_actions: bool = False,
+                    _file: str | None = None
+                    ):
 
-                # Add action to batch:
-                batch.add_to_batch(ConnectHandleAction(_canvas, connector))
+        # Import canvas module:
+        from tabs.schema.canvas import Canvas
 
-        # Log and execute:
-        logging.info(f"{len(batch.actions)} actions grouped")
-        _canvas.manager.do(batch)
+        # Validate argument(s):
+        if not isinstance(_code, str):      raise ValueError("Invalid JSON-code")
+        if not isinstance(_canvas, Canvas): raise ValueError("Invalid `Canvas` object")
 
+        # Convert file contents (and the file's delta-log) to a schema model, then materialize it on the canvas:
+        _model = JsonLib.model_from_json(json.loads(_code), _file)
 
+        # Large schematics are paged in and out of the scene as the view changes (see tabs/schema/graph/pager.py):
+        if  _canvas.pager.suits(_model):    _canvas.page_model(_model)
+        else:                               _canvas.load_model(_model, _group_actions)
@@ -0,0 +1,410 @@
+import gc
+import logging
+import os
+import time
+from collections import deque
+from pathlib     import Path
+
+from PyQt6.QtCore    import Qt, QObject, QSemaphore, QThread, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QProgressDialog
+
+from actions import BatchActions
+from model   import *
+from .jsonlib import JsonLib
+
+# Class SchemaReader: Parses a schematic's JSON-file on a worker-thread:
+class SchemaReader(QThread):
+    """
+    Reads a schematic's JSON-file element by element (see `JsonLib.stream_json`), converts the elements to records,
+    and emits them in chunks of `CHUNK` records: nodes and terminals as they are read, connectors as soon as both of
+    their endpoints have been read. The records are not touched by the reader once they have been emitted. Changes
+    that were saved incrementally since the file's snapshot are read from its delta-log (see `JsonLib.read_log`) and
+    replace the elements they supersede.
+
+    At most `WINDOW` chunks are handed over but not yet added (see `slots`): when the canvas falls behind, the reader
+    waits instead of piling up records and competing with the GUI-thread for the interpreter.
+    """
+
+    # Signals:
+    sig_chunk    = pyqtSignal(list)     # Emitted with a list of node-, terminal- and connector-records.
+    sig_progress = pyqtSignal(int)      # Emitted with the number of bytes read.
+    sig_failed   = pyqtSignal(str)      # Emitted with an error-message if the file cannot be read.
+
+    # Records per chunk, and chunks in flight:
+    CHUNK  = 500
+    WINDOW = 4
+
+    # Initializer:
+    def __init__(self, _file: str, parent: QObject | None = None):
+
+        # Initialize base-class:
+        super().__init__(parent)
+
+        self.file  = _file
+        self.size  = os.path.getsize(_file)
+        self.count = 0                          # Number of records read.
+        self.slots = QSemaphore(self.WINDOW)  # Released by the receiver of `sig_chunk` for each chunk it has added.
+
+    def run(self):
+        """
+        Reads the file until it ends, or until an interruption is requested (see `SchemaLoader.cancel()`).
+
+        Parameters: None
+        Returns: None
+        """
+
+        try:
+            with open(self.file, "rb") as _stream:
+                self.read(_stream)
+
+        except (OSError, ValueError) as exception:  self.sig_failed.emit(str(exception))
+
+    def read(self, _stream):
+
+        _chunk    = list()  # Records waiting to be emitted.
+        _owners   = list()  # Node- and terminal-records read so far.
+        _uids     = set()   # Their UIDs.
+        _handles  = dict()  # Handle-records keyed by their identity (see `SchemaModel.handle_index`).
+        _deferred = list()  # Connectors whose endpoints have not been read (yet).
+        _indices  = dict()  # Number of elements read per section (default UIDs are numbered per section).
+        _streams  = dict()  # Stream-table (colors of the streams, written before the elements).
+        _links    = 0       # Number of connectors read.
+
+        # Changes saved after the file's snapshot, applied once the snapshot has been matched (see tabs/schema/saver.py):
+        _log     = JsonLib.read_log(self.file)
+        _changes = None
+
+        def emit(_offset: int) -> bool:
+
+            # Wait for a free slot:
+            while not self.slots.tryAcquire(1, 50):
+                if  self.isInterruptionRequested():
+                    return False
+
+            self.count += len(_chunk)
+            self.sig_chunk.emit(_chunk.copy())
+            self.sig_progress.emit(_offset)
+            _chunk.clear()
+            return True
+
+        def convert(_section: str, _element):
+            nonlocal _links
+
+            _index = _indices[_section] = _indices.get(_section, -1) + 1
+
+            if  _section == "nodes":
+                _record = JsonLib.node_from_json(_element, _index, _streams)
+                for _handle, _var in enumerate(_record.variables):
+                    _handles[(_record.uid, _handle)] = _var
+                    _handles[(_record.uid, _var.eclass, _var.symbol)] = _var
+
+                _uids.add(_record.uid)
+                return _record
+
+            if  _section == "terminals":
+                _record = JsonLib.terminal_from_json(_element, _index, _streams)
+                if _record is not None:
+                    _handles[(_record.uid, 0)] = _record.socket
+                    _handles[(_record.uid, _record.socket.eclass, _record.socket.symbol)] = _record.socket
+                    _uids.add(_record.uid)
+
+                return _record
+
+            # Connectors whose endpoints' owners have not been read, or that identify their endpoints by position, wait
+            # until the end of the file:
+            if  (
+                _element[1] is None or _element[0] not in _uids or
+                _element[3] is None or _element[2] not in _uids
+            ):
+                _deferred.append(_element)
+                return None
+
+            # Both owners are known, the position-index is not needed:
+            _endpoints = JsonLib.endpoints_from_json(_element, _handles, dict)
+            if  _endpoints is None:
+                return None
+
+            _links += 1
+            return ConnectorRecord(f"X{_links - 1}", *_endpoints)
+
+        def append(_record, _offset: int) -> bool:
+
+            if  not isinstance(_record, ConnectorRecord):
+                _owners.append(_record)
+
+            _chunk.append(_record)
+            return len(_chunk) < self.CHUNK or emit(_offset)
+
+        _offset = 0
+        for _section, _element, _offset in JsonLib.stream_json(_stream):
+
+            if  self.isInterruptionRequested():
+                return
+
+            # Elements of version 1 schematics are upgraded one by one (see `JsonLib.migrate`):
+            if  _section in JsonLib.LEGACY:
+                _section, _element = JsonLib.upgrade_element(_section, _element)
+
+            if  _section == "version":
+                JsonLib.migrate({"version": _element})
+
+            elif _section == "snapshot":
+                if  _log is not None and _log[0] == _element:   _changes = _log[1]
+                elif _log is not None:                          logging.warning(f"Ignoring stale delta-log of {self.file}")
+
+            elif _section == "streams":
+                _streams = dict(_element)
+                if _changes is not None:
+                    _streams.update(_changes["streams"])
+
+            elif _section in ("nodes", "terminals", "connectors"):
+
+                # Elements that were changed or removed since the snapshot are superseded by the log:
+                if  _changes is not None and JsonLib.element_key(_section, _element) in _changes[_section]:
+                    continue
+
+                _record = convert(_section, _element)
+                if  _record is not None and not append(_record, _offset):
+                    return
+
+        # Elements that were added or changed since the snapshot:
+        if  _changes is not None:
+            for _section in ("nodes", "terminals", "connectors"):
+                for _element in _changes[_section].values():
+
+                    if  self.isInterruptionRequested():
+                        return
+
+                    _record = convert(_section, _element) if _element is not None else None
+                    if  _record is not None and not append(_record, _offset):
+                        return
+
+        # Resolve the deferred connectors, by position if need be:
+        _model = None
+        def position_index():
+            nonlocal _model
+            if  _model is None:
+                _model = SchemaModel()
+                for _owner in _owners:
+                    if isinstance(_owner, NodeRecord):  _model.nodes[_owner.uid] = _owner
+                    else:                               _model.terminals[_owner.uid] = _owner
+
+            return _model.position_index()
+
+        for _element in _deferred:
+
+            if  self.isInterruptionRequested():
+                return
+
+            _endpoints = JsonLib.endpoints_from_json(_element, _handles, position_index)
+            if  _endpoints is not None:
+                _chunk.append(ConnectorRecord(f"X{_links}", *_endpoints))
+                _links += 1
+
+        emit(self.size)
+
+# Class SchemaLoader: Loads a schematic into a canvas without blocking it:
+class SchemaLoader(QObject):
+    """
+    Loads a schematic's JSON-file into a canvas without freezing the user-interface. A `SchemaReader` parses the file
+    on a worker-thread and hands over chunks of records, which are added to the canvas for at most `BUDGET`
+    milliseconds per frame. A progress-dialog shows the bytes read, and its cancel-button stops the load.
+
+        - Records are collected in a headless model until it is large enough to be paged (see `ScenePager.suits()`).
+          From then on, chunks are adopted as they arrive (see `Canvas.page_model()`), and the items in view appear
+          while the rest of the file is read.
+        - The items of smaller schematics are created once the file has been read, within the same budget per frame
+          (see `Canvas.build_model()`), and grouped into one undoable transaction that is pushed when they are all
+          there.
+
+    Neither the file's text nor its decoded JSON-tree is held in memory as a whole, only the records.
+
+    Cancelling (or a read-error) removes the records that were adopted, leaving the canvas as it was (schematics are
+    only paged into an empty canvas).
+    """
+
+    # Signals:
+    sig_finished = pyqtSignal(bool)     # Emitted when the load ends, with False if it was cancelled or failed.
+
+    # Time (ms) spent adding records per frame:
+    BUDGET = 12
+    FRAME  = 16
+
+    # Resolution of the progress-bar:
+    STEPS = 1000
+
+    # Initializer:
+    def __init__(self, _canvas, _file: str):
+
+        # Initialize base-class:
+        super().__init__(_canvas)
+
+        self._canvas = _canvas
+        self._queue  = deque()          # Chunks waiting to be added.
+        self._model  = SchemaModel()    # Records collected until the schematic is paged (or the file has been read).
+        self._paged  = False
+        self._read   = False
+        self._closed = False
+        self._build  = None             # Creates the items of an un-paged schematic (see `Canvas.build_model()`),
+        self._batch  = None             # and collects their actions.
+
+        # Reader:
+        self._reader = SchemaReader(_file, self)
+        self._reader.sig_chunk.connect(self.on_chunk)
+        self._reader.sig_progress.connect(self.on_progress)
+        self._reader.sig_failed.connect(self.on_failed)
+        self._reader.finished.connect(self.on_read)
+
+        # Progress-dialog, shown if the load takes a while:
+        _views = _canvas.views()
+        self._dialog = QProgressDialog(f"Opening {Path(_file).name}", "Cancel", 0, self.STEPS, _views[0] if _views else None)
+        self._dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self._dialog.setMinimumDuration(500)
+        self._dialog.setAutoReset(False)
+        self._dialog.setAutoClose(False)
+        self._dialog.setValue(0)
+        self._dialog.canceled.connect(self.cancel)
+
+        # Single-shot timer for adding chunks:
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.apply)
+
+    @property
+    def active(self) -> bool:   return not self._closed
+
+    def start(self) -> None:
+        self._reader.start()
+
+    def cancel(self) -> None:
+        """
+        Stops the load, and removes the records that were added to the canvas.
+        """
+
+        if  self._closed:
+            return
+
+        logging.info("Open operation cancelled!")
+        self._reader.requestInterruption()
+        self.close(False)
+
+    def on_chunk(self, _records: list) -> None:
+
+        if  self._closed:
+            return
+
+        self._queue.append(_records)
+        if not self._timer.isActive():
+            self._timer.start(0)
+
+    def on_progress(self, _bytes: int) -> None:
+
+        if  not self._closed and self._reader.size:
+            self._dialog.setValue(min(self.STEPS - 1, self.STEPS * _bytes // self._reader.size))
+
+    def on_failed(self, _message: str) -> None:
+
+        logging.error(f"Unable to open {self._reader.file}: {_message}")
+        self.close(False)
+
+    def on_read(self) -> None:
+
+        self._read = True
+        if  not self._closed and not self._timer.isActive():
+            self._timer.start(0)
+
+    def apply(self) -> None:
+        """
+        Adds queued chunks to the canvas for at most `BUDGET` milliseconds, the rest are added in the next frame.
+        Finishes the load once the file has been read and the queue has been drained.
+        """
+
+        if  self._closed:
+            return
+
+        _deadline = time.perf_counter() + self.BUDGET / 1000.0
+        if  self._build is not None:
+            self.build(_deadline)
+            return
+
+        while self._queue and time.perf_counter() < _deadline:
+
+            _records = self._queue.popleft()
+            self._reader.slots.release()
+            _model   = self._model if not self._paged else SchemaModel()
+            for _record in _records:
+                if   isinstance(_record, NodeRecord):       _model.add_node(_record)
+                elif isinstance(_record, TerminalRecord):   _model.add_terminal(_record)
+                else:                                       _model.add_connector(_record)
+
+            if  self._paged:
+                self._canvas.page_model(_model)
+
+            elif self._canvas.pager.suits(self._model):
+                self._paged = True
+                self._canvas.page_model(self._model)
+
+        if  self._queue:
+            self._timer.start(self.FRAME)
+
+        elif self._read and self._paged:
+            self.close(True)
+
+        elif self._read:
+            self._build = self._canvas.build_model(self._model, dict())
+            self._batch = BatchActions([])
+            self._timer.start(self.FRAME)
+
+    def build(self, _deadline: float) -> None:
+        """
+        Creates the items of an un-paged schematic until the deadline, the rest are created once pending events (e.g.
+        repaints) have been processed. The batch is pushed to the undo-stack once all items have been created.
+        """
+
+        with self._canvas.bulk_create(self._batch):
+            _record = True
+            while _record is not None and time.perf_counter() < _deadline:
+                _record = next(self._build, None)
+
+        # Full collections scan every object and take longer the more items there are: the objects created so far are
+        # exempted until the load ends (see `close()`):
+        if  _record is not None:
+            gc.freeze()
+            self._timer.start(0)
+            return
+
+        # Push the items' actions as one undoable transaction:
+        with self._canvas.bulk_create() as _batch:
+            _batch.add_to_batch(self._batch.actions)
+
+        self._build = self._batch = None
+        self.close(True)
+
+    def close(self, _complete: bool) -> None:
+        """
+        Ends the load. Records of an incomplete load are removed from the canvas.
+        """
+
+        self._closed = True
+        self._timer.stop()
+        self._queue.clear()
+        self._dialog.canceled.disconnect(self.cancel)
+        self._dialog.close()
+
+        if  not _complete and self._paged:
+            self._canvas.wipe()
+
+        # Items of an un-paged schematic that were created before the load was cancelled:
+        if  self._batch is not None:
+            self._batch.undo()
+            self._batch.cleanup()
+            self._build = self._batch = None
+
+        gc.unfreeze()
+
+        self._model = None
+        self.sig_finished.emit(_complete)
+
+        # The reader must not be deleted while it runs:
+        if  self._reader.isFinished():  self.deleteLater()
+        else:                           self._reader.finished.connect(self.deleteLater)
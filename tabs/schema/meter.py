@@ -0,0 +1,89 @@
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+# Class FrameMeter: Measures the frame-rate of a widget:
+class FrameMeter(QObject):
+    """
+    Frame-rate meter for the schematic viewer. The viewer brackets each paint-event with `begin()` and `end()`; once
+    per interval the meter emits the number of frames painted per second and the average time spent painting a frame.
+
+    Attributes:
+        frames (int): Frames painted in the current interval.
+        busy (float): Seconds spent painting in the current interval.
+        fps (float): Frame-rate of the last interval.
+        cost (float): Average paint-time (in milliseconds) of the last interval.
+    """
+
+    # Signals:
+    sig_sampled = pyqtSignal(float, float)  # Emitted with the frame-rate and the average paint-time (ms).
+
+    # Initializer:
+    def __init__(self, parent: QObject | None = None, _interval: int = 1000):
+
+        # Initialize base-class:
+        super().__init__(parent)
+
+        # Counters:
+        self.frames = 0
+        self.busy   = 0.0
+        self.fps    = 0.0
+        self.cost   = 0.0
+
+        self._tic   = None      # Start of the paint-event being measured.
+        self._epoch = None      # Start of the current interval.
+
+        # Sampling-timer:
+        self._timer = QTimer(self)
+        self._timer.setInterval(_interval)
+        self._timer.timeout.connect(self.sample)
+
+    @property
+    def running(self) -> bool:  return self._timer.isActive()
+
+    def start(self) -> None:
+        """
+        Resets the counters and starts sampling.
+        """
+
+        self.frames = 0
+        self.busy   = 0.0
+        self._epoch = time.perf_counter()
+        self._timer.start()
+
+    def stop(self) -> None:
+        """
+        Stops sampling.
+        """
+
+        self._timer.stop()
+        self._tic = None
+
+    def begin(self) -> None:
+        if self.running:
+            self._tic = time.perf_counter()
+
+    def end(self) -> None:
+
+        if self._tic is None:
+            return
+
+        self.frames += 1
+        self.busy   += time.perf_counter() - self._tic
+        self._tic    = None
+
+    def sample(self) -> None:
+        """
+        Closes the current interval and emits its frame-rate and average paint-time.
+        """
+
+        _toc = time.perf_counter()
+        _elapsed = _toc - self._epoch if self._epoch is not None else 0.0
+
+        self.fps  = self.frames / _elapsed if _elapsed > 0.0 else 0.0
+        self.cost = 1000.0 * self.busy / self.frames if self.frames else 0.0
+        self.sig_sampled.emit(self.fps, self.cost)
+
+        self.frames = 0
+        self.busy   = 0.0
+        self._epoch = _toc
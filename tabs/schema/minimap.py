@@ -0,0 +1,448 @@
+import math
+
+from collections import OrderedDict
+
+from PyQt6.QtCore    import Qt, QPointF, QRectF, QLineF, pyqtSlot
+from PyQt6.QtGui     import QPainter, QPixmap, QColor, QPen, QAction
+from PyQt6.QtWidgets import QWidget, QMenu
+
+from model import NodeRecord, TerminalRecord, ConnectorRecord, SpatialIndex
+
+from .graph import ScenePager
+
+# Class Minimap: Overview of the schematic, docked in a corner of the viewer:
+class Minimap(QWidget):
+    """
+    Overview of the whole schematic, docked in a corner of the viewer (see `dock()`). The minimap is painted from the
+    records of the canvas' schema model, not from its graphics items, so it shows paged-out parts of the schematic (see
+    graph/pager.py) and never makes the scene render itself.
+
+    The records are drawn into a pyramid of `TILE`-sized tiles: level k is drawn at a scale of 2^-k pixels per scene-
+    unit, and the minimap paints the tiles of the finest level that is not coarser than its own scale. Tiles are kept
+    in a cache of at most `LIMIT` pixmaps (least recently used first out). When the canvas changes, the minimap fetches
+    the changes from the model's journal (see model/journal.py) and redraws only the tiles that the changed records
+    covered before or cover after the change.
+
+    Clicking or dragging in the minimap centers the viewer on that point.
+
+    Attributes:
+        drawn (int): Number of tiles drawn.
+        dropped (int): Number of cached tiles invalidated by changes.
+    """
+
+    # Tile-size (px), number of levels, and the maximum number of cached tiles:
+    TILE   = 256
+    LEVELS = 16
+    LIMIT  = 96
+
+    # Size of the minimap (px), and its distance from the viewer's edges:
+    SIZE   = (280, 180)
+    MARGIN = 8
+
+    # Colors:
+    BACKGROUND = QColor(0xefefef)
+    NODE_FILL  = QColor(0xffffff)
+    NODE_LINE  = QColor(0x8a8a8a)
+    CONNECTOR  = QColor(0xadadad)
+    FRAME      = QColor(0xf99c39)
+
+    # Initializer:
+    def __init__(self, _viewer):
+
+        # Initialize base-class:
+        super().__init__(_viewer)
+
+        self._viewer = _viewer
+        self._corner = Qt.Corner.BottomRightCorner
+        self._cursor = None             # Position in the model's change-journal, None until the first rebuild.
+        self._index  = SpatialIndex()   # Rectangles of the node-, terminal- and connector-records.
+        self._tiles  = OrderedDict()    # Maps (level, column, row) to the tile's pixmap.
+        self._world  = QRectF()         # Part of the scene shown by the minimap (kept while the user drags).
+        self._drag   = False
+
+        # Counters:
+        self.drawn   = 0
+        self.dropped = 0
+
+        self.setFixedSize(*self.SIZE)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.setToolTip("Click or drag to navigate, right-click to dock")
+
+        # Changes to the canvas are reported at most once per event-loop iteration:
+        _viewer.canvas.sig_canvas_state.connect(self.refresh)
+
+    @property
+    def corner(self) -> Qt.Corner:  return self._corner
+
+    def dock(self, _corner: Qt.Corner) -> None:
+        """
+        Docks the minimap in a corner of the viewer's viewport.
+        """
+
+        self._corner = _corner
+        self.place()
+
+    def place(self) -> None:
+        """
+        Moves the minimap into its corner (called when the viewer is resized).
+        """
+
+        _area   = self._viewer.viewport().geometry()
+        _left   = self._corner in (Qt.Corner.TopLeftCorner, Qt.Corner.BottomLeftCorner)
+        _top    = self._corner in (Qt.Corner.TopLeftCorner, Qt.Corner.TopRightCorner)
+
+        _x = _area.left() + self.MARGIN if _left else _area.right()  - self.width()  - self.MARGIN
+        _y = _area.top()  + self.MARGIN if _top  else _area.bottom() - self.height() - self.MARGIN
+        self.move(_x, _y)
+
+    # Records --------------------------------------------------------------------------------------------------------
+
+    @pyqtSlot()
+    def refresh(self) -> None:
+        """
+        Applies the changes of the canvas' model since the last refresh, and repaints the minimap if anything changed.
+        Changes are left in the journal while the minimap is hidden.
+        """
+
+        if not self.isVisible():
+            return
+
+        if  self._cursor is None:
+            self.rebuild()
+            return
+
+        if not self._cursor.pending():
+            return
+
+        _changes = self._cursor.fetch()
+        if  _changes is None:
+            self.rebuild()
+            return
+
+        # Rectangles that changed, before and after the change:
+        _dirty = list()
+        for _record in _changes.removed:
+            _dirty.extend(self.forget(_record))
+
+        for _record in _changes.added + _changes.modified:
+            _dirty.extend(self.file(_record))
+
+            # Connectors follow their nodes and terminals:
+            for _connector in self.connectors(_record):
+                _dirty.extend(self.file(_connector))
+
+        self.invalidate(_dirty)
+        self.update()
+
+    def rebuild(self) -> None:
+        """
+        Re-files every record of the canvas' model and drops all tiles.
+        """
+
+        _model = self._viewer.canvas.model
+        self._cursor = _model.journal.cursor()
+        self._index.clear()
+        self._tiles.clear()
+
+        for _record in list(_model.nodes.values()) + list(_model.terminals.values()):
+            self._index.insert(_record, ScenePager.extent(_record))
+
+        for _record in _model.connectors.values():
+            self._index.insert(_record, self.extent(_record))
+
+        self.update()
+
+    def file(self, _record) -> list:
+        """
+        Files a record under its current rectangle, and returns its previous and current rectangles.
+        """
+
+        _model = self._viewer.canvas.model
+        if  (
+            isinstance(_record, NodeRecord)      and _model.nodes.get(_record.uid) is not _record or
+            isinstance(_record, TerminalRecord)  and _model.terminals.get(_record.uid) is not _record or
+            isinstance(_record, ConnectorRecord) and _model.connectors.get(_record.symbol) is not _record
+        ):
+            return self.forget(_record)
+
+        _old  = self._index.rect(_record)
+        _new  = self.extent(_record) if isinstance(_record, ConnectorRecord) else ScenePager.extent(_record)
+        if  _old == _new:
+            return []
+
+        self._index.insert(_record, _new)
+        return [_rect for _rect in (_old, _new) if _rect is not None]
+
+    def forget(self, _record) -> list:
+        """
+        Removes a record from the index, and returns its previous rectangle.
+        """
+
+        _old = self._index.rect(_record)
+        self._index.remove(_record)
+        return [] if _old is None else [_old]
+
+    def connectors(self, _record) -> list:
+        """
+        Returns the connector-records attached to a node- or terminal-record.
+        """
+
+        _model = self._viewer.canvas.model
+        if   isinstance(_record, NodeRecord):       _entities = _record.variables
+        elif isinstance(_record, TerminalRecord):   _entities = [_record.socket]
+        else:                                       return []
+
+        return [_found for _found in map(_model.connector_of, _entities) if _found is not None]
+
+    @staticmethod
+    def anchor(_entity) -> tuple:
+        """
+        Returns the scene-position of a handle-record.
+        """
+
+        _owner = _entity.parent
+        if  isinstance(_owner, NodeRecord):
+            return _owner.x + (_entity.x or 0.0), _owner.y + (_entity.y or 0.0)
+
+        if  isinstance(_owner, TerminalRecord):
+            return _owner.x, _owner.y
+
+        return 0.0, 0.0
+
+    @staticmethod
+    def extent(_record: ConnectorRecord) -> tuple:
+        """
+        Returns the scene-rectangle (left, top, right, bottom) of a connector-record.
+        """
+
+        _x0, _y0 = Minimap.anchor(_record.origin)
+        _x1, _y1 = Minimap.anchor(_record.target)
+        return min(_x0, _x1), min(_y0, _y1), max(_x0, _x1), max(_y0, _y1)
+
+    # Tiles ----------------------------------------------------------------------------------------------------------
+
+    def invalidate(self, _rects: list) -> None:
+        """
+        Drops the cached tiles that overlap any of the given scene-rectangles.
+        """
+
+        if not _rects or not self._tiles:
+            return
+
+        for _key in list(self._tiles):
+            _l, _t, _r, _b = self.bounds(*_key)
+            for _x0, _y0, _x1, _y1 in _rects:
+                if  _x0 <= _r and _x1 >= _l and _y0 <= _b and _y1 >= _t:
+                    self._tiles.pop(_key)
+                    self.dropped += 1
+                    break
+
+    def bounds(self, _level: int, _column: int, _row: int) -> tuple:
+        """
+        Returns the scene-rectangle (left, top, right, bottom) covered by a tile.
+        """
+
+        _size = self.TILE * 2 ** _level
+        return _column * _size, _row * _size, (_column + 1) * _size, (_row + 1) * _size
+
+    def tile(self, _level: int, _column: int, _row: int) -> QPixmap:
+        """
+        Returns the pixmap of a tile, drawing it if it is not cached.
+        """
+
+        _key = (_level, _column, _row)
+        _pixmap = self._tiles.get(_key)
+        if  _pixmap is not None:
+            self._tiles.move_to_end(_key)
+            return _pixmap
+
+        _pixmap = self.draw(*_key)
+        self._tiles[_key] = _pixmap
+        while len(self._tiles) > self.LIMIT:
+            self._tiles.popitem(last=False)
+
+        return _pixmap
+
+    def draw(self, _level: int, _column: int, _row: int) -> QPixmap:
+        """
+        Draws the records that overlap a tile. Shapes are batched per kind (and connectors per stream-color), so that a
+        tile costs a handful of draw-calls regardless of the number of records.
+        """
+
+        _l, _t, _r, _b = self.bounds(_level, _column, _row)
+        _scale = 2.0 ** -_level
+
+        _pixmap = QPixmap(self.TILE, self.TILE)
+        _pixmap.fill(Qt.GlobalColor.transparent)
+
+        _lines = dict()
+        _rects = list()
+        for _record in self._index.query((_l, _t, _r, _b)):
+
+            if  isinstance(_record, ConnectorRecord):
+                _color = _record.origin.color or _record.target.color
+                _lines.setdefault(_color, []).append(QLineF(*self.anchor(_record.origin), *self.anchor(_record.target)))
+
+            else:
+                _x0, _y0, _x1, _y1 = self._index.rect(_record)
+                _rects.append(QRectF(_x0, _y0, _x1 - _x0, _y1 - _y0))
+
+        _painter = QPainter(_pixmap)
+        _painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        _painter.scale(_scale, _scale)
+        _painter.translate(-_l, -_t)
+
+        for _color, _batch in _lines.items():
+            _pen = QPen(QColor(_color) if _color else self.CONNECTOR, 1.0)
+            _pen.setCosmetic(True)
+            _painter.setPen(_pen)
+            _painter.drawLines(_batch)
+
+        _pen = QPen(self.NODE_LINE, 1.0)
+        _pen.setCosmetic(True)
+        _painter.setPen(_pen)
+        _painter.setBrush(self.NODE_FILL)
+        _painter.drawRects(_rects)
+        _painter.end()
+
+        self.drawn += 1
+        return _pixmap
+
+    # Geometry -------------------------------------------------------------------------------------------------------
+
+    def world(self) -> QRectF:
+        """
+        Returns the part of the scene shown by the minimap: the bounds of the schematic and of the viewer's view.
+        """
+
+        _view   = self.view()
+        _bounds = self._index.bounds()
+        if  _bounds is None:
+            _world = _view
+        else:
+            _world = QRectF(QPointF(_bounds[0], _bounds[1]), QPointF(_bounds[2], _bounds[3])).united(_view)
+
+        _pad = 0.05 * max(_world.width(), _world.height(), 1.0)
+        return _world.adjusted(-_pad, -_pad, _pad, _pad)
+
+    def view(self) -> QRectF:
+        """
+        Returns the visible part of the scene.
+        """
+        return self._viewer.mapToScene(self._viewer.viewport().rect()).boundingRect()
+
+    def scale(self) -> float:
+        """
+        Returns the scale (pixels per scene-unit) at which the minimap shows `world()`.
+        """
+        return min(self.width() / max(self._world.width(), 1.0), self.height() / max(self._world.height(), 1.0))
+
+    def to_scene(self, _point: QPointF) -> QPointF:
+        """
+        Maps a point in the minimap to the scene.
+        """
+
+        _scale  = self.scale()
+        _offset = self.offset(_scale)
+        return QPointF(
+            self._world.left() + (_point.x() - _offset.x()) / _scale,
+            self._world.top()  + (_point.y() - _offset.y()) / _scale
+        )
+
+    def offset(self, _scale: float) -> QPointF:
+        """
+        Returns the position of `world()`'s top-left corner in the minimap (the world is centered).
+        """
+        return QPointF(
+            (self.width()  - self._world.width()  * _scale) / 2.0,
+            (self.height() - self._world.height() * _scale) / 2.0
+        )
+
+    # Event-handlers -------------------------------------------------------------------------------------------------
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.place()
+        self.refresh()
+
+    def paintEvent(self, event):
+
+        if not self._drag or self._world.isEmpty():
+            self._world = self.world()
+
+        _scale  = self.scale()
+        _offset = self.offset(_scale)
+
+        # Finest level that is not coarser than the minimap's scale:
+        _level = min(max(0, math.floor(-math.log2(_scale))), self.LEVELS - 1)
+        _size  = self.TILE * 2 ** _level
+
+        _painter = QPainter(self)
+        _painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        _painter.fillRect(self.rect(), self.BACKGROUND)
+        _painter.translate(_offset)
+        _painter.scale(_scale, _scale)
+        _painter.translate(-self._world.left(), -self._world.top())
+
+        for _column in range(math.floor(self._world.left() / _size), math.floor(self._world.right() / _size) + 1):
+            for _row in range(math.floor(self._world.top() / _size), math.floor(self._world.bottom() / _size) + 1):
+                _painter.drawPixmap(QRectF(_column * _size, _row * _size, _size, _size),
+                                    self.tile(_level, _column, _row),
+                                    QRectF(0, 0, self.TILE, self.TILE))
+
+        # Outline of the viewer's view:
+        _pen = QPen(self.FRAME, 2.0)
+        _pen.setCosmetic(True)
+        _painter.setPen(_pen)
+        _painter.setBrush(Qt.BrushStyle.NoBrush)
+        _painter.drawRect(self.view())
+
+        _painter.resetTransform()
+        _painter.setPen(self.NODE_LINE)
+        _painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+        _painter.end()
+
+    def mousePressEvent(self, event):
+
+        if  event.button() == Qt.MouseButton.LeftButton:
+            self._drag = True
+            self._viewer.centerOn(self.to_scene(event.position()))
+            event.accept()
+            return
+
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+
+        if  event.button() == Qt.MouseButton.LeftButton:
+            self._drag = False
+            self.update()
+
+        super().mouseReleaseEvent(event)
+
+    def mouseMoveEvent(self, event):
+
+        if  event.buttons() & Qt.MouseButton.LeftButton:
+            self._viewer.centerOn(self.to_scene(event.position()))
+            event.accept()
+            return
+
+        super().mouseMoveEvent(event)
+
+    def contextMenuEvent(self, event):
+
+        _menu = QMenu(self)
+        for _label, _corner in (
+            ("Dock top-left",     Qt.Corner.TopLeftCorner),
+            ("Dock top-right",    Qt.Corner.TopRightCorner),
+            ("Dock bottom-left",  Qt.Corner.BottomLeftCorner),
+            ("Dock bottom-right", Qt.Corner.BottomRightCorner),
+        ):
+            _action = QAction(_label, _menu)
+            _action.setCheckable(True)
+            _action.setChecked(_corner == self._corner)
+            _action.triggered.connect(lambda _, _corner=_corner: self.dock(_corner))
+            _menu.addAction(_action)
+
+        _menu.exec(event.globalPos())
+        event.accept()
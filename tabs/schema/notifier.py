@@ -0,0 +1,65 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+# Class Notifier: Coalesces notifications per event-loop iteration:
+class Notifier(QObject):
+    """
+    Notification hub that folds every notification posted during one event-loop iteration into a single dispatch of
+    the most recent value. Used by the canvas for its save-state, so that drags, undo/redo bursts and bulk imports
+    update the tab-indicator once instead of once per change.
+
+    Attributes:
+        posted (int): Number of notifications posted.
+        dispatched (int): Number of dispatches.
+    """
+
+    # Signals:
+    sig_dispatch = pyqtSignal(object)   # Emitted with the most recently posted value.
+
+    # Initializer:
+    def __init__(self, parent: QObject | None = None):
+
+        # Initialize base-class:
+        super().__init__(parent)
+
+        # Pending value, None if there is nothing to dispatch:
+        self._value = None
+
+        # Counters:
+        self.posted     = 0
+        self.dispatched = 0
+
+        # Zero-interval timer, fires once control returns to the event-loop:
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def folded(self) -> int:    return self.posted - self.dispatched - self.pending
+
+    @property
+    def pending(self) -> int:   return int(self._value is not None)
+
+    def post(self, _value) -> None:
+        """
+        Schedules a dispatch of `_value`, replacing any value posted earlier in the same iteration.
+        """
+
+        self.posted += 1
+        self._value  = _value
+
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self) -> None:
+        """
+        Dispatches the pending value immediately (does nothing if there is none).
+        """
+
+        self._timer.stop()
+        if self._value is None:
+            return
+
+        _value, self._value = self._value, None
+        self.dispatched += 1
+        self.sig_dispatch.emit(_value)
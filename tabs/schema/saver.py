@@ -0,0 +1,381 @@
+import json
+import logging
+import os
+import uuid
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from model   import *
+from .jsonlib import JsonLib
+
+# Class SchemaCompactor: Merges a schematic's delta-log into a fresh snapshot on a worker-thread:
+class SchemaCompactor(QRunnable):
+    """
+    Writes a new snapshot of a schematic's JSON-file with the changes of its delta-log (see `JsonLib.read_log`) merged
+    in, next to the file (see `target`), on a thread of the global thread-pool. The snapshot's elements are streamed
+    from the old one (see `JsonLib.stream_json`), so neither file is held in memory as a whole, and the GUI-thread is
+    not held up by one long parse. The files themselves are swapped by the saver (see `SchemaSaver.on_compacted()`).
+    """
+
+    # Class Signals: QRunnable is not a QObject, signals are emitted by a helper:
+    class Signals(QObject):
+        sig_compacted = pyqtSignal(str, int)    # Emitted with the new snapshot's identity and the log-bytes merged.
+        sig_finished  = pyqtSignal(str)         # Emitted with the path of the new snapshot when the task ends.
+
+    # Initializer:
+    def __init__(self, _file: str, _snapshot: str):
+
+        # Initialize base-class:
+        super().__init__()
+
+        self.signals  = self.Signals()
+        self.stopped  = False                   # Set to abandon the task (see `SchemaSaver.discard()`).
+        self.file     = _file
+        self.snapshot = _snapshot           # Identity of the snapshot that is compacted.
+        self.result   = uuid.uuid4().hex    # Identity of the new snapshot.
+        self.target   = f"{_file}.{self.result}"
+
+    def run(self):
+
+        try:
+            self.compact()
+
+        except (OSError, ValueError) as exception:
+            logging.error(f"Unable to compact {self.file}: {exception}")
+
+        self.signals.sig_finished.emit(self.target)
+
+    def compact(self):
+
+        _log = JsonLib.read_log(self.file)
+        if  _log is None or _log[0] != self.snapshot:
+            return
+
+        with open(self.file, "rb") as _source, open(self.target, "w") as _target:
+            if not self.merge(_source, _target, self.result, _log[1]):
+                return
+
+            _target.flush()
+            os.fsync(_target.fileno())
+
+        self.signals.sig_compacted.emit(self.result, _log[2])
+
+    def merge(self, _source, _target, _snapshot: str, _changes: dict) -> bool:
+
+        _sections = ("nodes", "terminals", "connectors")
+        _streams  = dict()
+        _current  = -1      # Index of the array that is being written.
+        _first    = True    # Whether the array is empty so far.
+
+        def write(_element) -> None:
+            nonlocal _first
+            _target.write(("" if _first else ",") + json.dumps(_element, separators=(",", ":")))
+            _first = False
+
+        # Opens the arrays up to the given one, writing the elements that were added or changed since the snapshot to
+        # the end of each array that is closed:
+        def advance(_index: int) -> None:
+            nonlocal _current, _first
+
+            if  _current < 0 and _index >= 0:
+                _target.write(f',"streams":{json.dumps(_streams, separators=(",", ":"))}')
+
+            while _current < _index:
+
+                if  _current >= 0:
+                    for _element in _changes[_sections[_current]].values():
+                        if _element is not None:
+                            write(_element)
+
+                    _target.write("]")
+
+                _current += 1
+                if  _current < len(_sections):
+                    _target.write(f',"{_sections[_current]}":[')
+                    _first = True
+
+        _target.write(f'{{"version":{JsonLib.VERSION},"snapshot":"{_snapshot}"')
+        for _section, _element, _ in JsonLib.stream_json(_source, _sections):
+
+            if  self.stopped:
+                return False
+
+            if  _section == "streams":
+                _streams = {**_element, **{_strid: _color for _strid, _color in _changes["streams"].items() if _strid not in _element}}
+
+            elif _section in _sections:
+                advance(_sections.index(_section))
+                if  JsonLib.element_key(_section, _element) not in _changes[_section]:
+                    write(_element)
+
+        advance(len(_sections))
+        _target.write("}")
+        return True
+
+# Class SchemaSaver: Saves a canvas' schematic incrementally:
+class SchemaSaver(QObject):
+    """
+    Saves a canvas' schematic to a JSON-file in time proportional to the edit rather than to the schematic. The first
+    save to a file writes the whole schematic as a snapshot. Later saves to the same file append the records that were
+    added, modified or removed since the previous save (read from the model's journal, see model/journal.py) as one
+    line to the file's delta-log (see `JsonLib.read_log`). Schematics are read from the snapshot and its log (see
+    tabs/schema/loader.py).
+
+    Once the log outgrows `THRESHOLD` bytes (or the snapshot), it is merged into a fresh snapshot on a worker-thread
+    (see `SchemaCompactor`), and the files are swapped when the merge is done.
+
+    A full snapshot is written instead if the file is saved for the first time, if it was changed by someone else
+    since the last save, or if the journal no longer covers the changes since then.
+    """
+
+    # Log-size (bytes) above which the log is compacted:
+    THRESHOLD = 1 << 20
+
+    # Initializer:
+    def __init__(self, _canvas):
+
+        # Initialize base-class:
+        super().__init__(_canvas)
+
+        self._canvas    = _canvas
+        self._file      = None      # Absolute path of the file that the last snapshot was written to.
+        self._snapshot  = None      # Identity of that snapshot.
+        self._stats     = None      # (size, mtime) of the file and of its log after the last save.
+        self._journal   = None      # The model's journal, and
+        self._cursor    = None      # its revision at the last save.
+        self._keys      = dict()    # Key (see `JsonLib.element_key`) under which each record was saved.
+        self._streams   = dict()    # Stream-table of the snapshot and the log.
+        self._compactor = None
+
+    @property
+    def file(self) -> str | None:   return self._file
+
+    def save(self, _file: str) -> None:
+        """
+        Saves the canvas' schematic to a JSON-file, appending to the file's delta-log if the file holds the
+        schematic as it was last saved, and writing a snapshot otherwise.
+
+        Parameters:
+            _file (str): The path of the JSON-file.
+
+        Raises:
+            OSError: If the file (or its log) cannot be written.
+        """
+
+        _file  = os.path.abspath(_file)
+        _model = self._canvas.model
+        if  (
+            _file != self._file or
+            self._journal is not _model.journal or
+            self.stats() != self._stats
+        ):
+            self.write(_file)
+            return
+
+        _changes = self._cursor.fetch()
+        if  _changes is None:
+            self.write(_file)
+            return
+
+        if  _changes:
+            try:
+                self.append(_model, _changes)
+
+            # The changes have been fetched, the next save writes a snapshot:
+            except OSError:
+                self._journal = None
+                raise
+
+        # Compact the log once it has grown large:
+        _base, _log = self._stats
+        if  self._compactor is None and _log[0] > min(self.THRESHOLD, _base[0]):
+            self.compact()
+
+    def write(self, _file: str) -> None:
+        """
+        Writes the whole schematic as a new snapshot, and starts an empty delta-log for it.
+        """
+
+        self.discard()
+
+        _model    = self._canvas.model
+        _snapshot = uuid.uuid4().hex
+        _root     = JsonLib.model_to_json(_model, _snapshot)
+
+        # The log is started before the file is replaced, a log that does not match its file is ignored:
+        with open(f"{_file}.tmp", "w") as _stream:
+            _stream.write(json.dumps(_root, separators=(",", ":")))
+
+        with open(JsonLib.log_path(_file), "w") as _stream:
+            _stream.write(json.dumps({"snapshot": _snapshot}) + "\n")
+
+        os.replace(f"{_file}.tmp", _file)
+
+        self._file     = _file
+        self._snapshot = _snapshot
+        self._journal  = _model.journal
+        self._cursor   = _model.journal.cursor()
+        self._streams  = dict(_root["streams"])
+        self._keys     = dict()
+        for _section, _records in [
+            ("nodes"     , _model.nodes.values()),
+            ("terminals" , _model.terminals.values()),
+            ("connectors", _model.connectors.values())
+        ]:
+            for _record in _records:
+                self._keys[_record] = self.key(_section, _record)
+
+        self._stats = self.stats()
+
+    def append(self, _model: SchemaModel, _changes: ChangeSet) -> None:
+        """
+        Appends the records that were added, modified or removed since the last save to the delta-log.
+        """
+
+        _delta   = {"streams": {}, "nodes": [], "terminals": [], "connectors": [], "removed": {}}
+        _streams = dict(self._streams)
+        _links   = dict()   # Connectors to save, their keys change with their endpoints' UIDs and indices.
+
+        def remove(_section: str, _record) -> None:
+            _key = self._keys.pop(_record, None)
+            if  _key is not None:
+                _delta["removed"].setdefault(_section, []).append(_key)
+
+        for _record in _changes.removed:
+            remove(self.section(_record), _record)
+
+        for _record in _changes.added + _changes.modified:
+
+            _section = self.section(_record)
+            if  not self.registered(_model, _record):
+                remove(_section, _record)
+                continue
+
+            if  _section == "connectors":
+                _links[_record] = None
+                continue
+
+            # Records whose UID has changed are removed under their old UID:
+            _key = self.key(_section, _record)
+            if  self._keys.get(_record, _key) != _key:
+                remove(_section, _record)
+
+            self._keys[_record] = _key
+            _delta[_section].append(
+                JsonLib.node_to_json(_record, _streams) if _section == "nodes" else
+                JsonLib.terminal_to_json(_record, _streams)
+            )
+
+            for _handle in _record.variables if _section == "nodes" else [_record.socket]:
+                _conn = _model.connector_of(_handle)
+                if  _conn is not None:
+                    _links[_conn] = None
+
+        for _conn in _links:
+
+            _key = self.key("connectors", _conn)
+            if  self._keys.get(_conn) == _key or not self.registered(_model, _conn):
+                continue
+
+            remove("connectors", _conn)
+            self._keys[_conn] = _key
+            _delta["connectors"].append(list(_key))
+
+        _delta["streams"] = {_strid: _color for _strid, _color in _streams.items() if _strid not in self._streams}
+        self._streams     = _streams
+
+        # Empty entries are left out:
+        _delta = {_name: _value for _name, _value in _delta.items() if _value}
+        if  _delta:
+            with open(JsonLib.log_path(self._file), "a") as _stream:
+                _stream.write(json.dumps(_delta, separators=(",", ":")) + "\n")
+
+        self._stats = self.stats()
+
+    def compact(self) -> None:
+        """
+        Merges the delta-log into a fresh snapshot on a worker-thread.
+        """
+
+        self._compactor = SchemaCompactor(self._file, self._snapshot)
+        self._compactor.signals.sig_compacted.connect(self.on_compacted)
+        self._compactor.signals.sig_finished.connect(self.on_compactor_finished)
+        QThreadPool.globalInstance().start(self._compactor)
+
+    def on_compacted(self, _snapshot: str, _offset: int) -> None:
+        """
+        Swaps the compacted snapshot in. Changes that were appended to the log while it was being compacted are kept in
+        a new log for the new snapshot.
+        """
+
+        _compactor = self._compactor
+        if  _compactor is None or self.sender() is not _compactor.signals or self.stats()[0] != self._stats[0]:
+            return
+
+        _file = self._file
+        _log  = JsonLib.log_path(_file)
+        with open(_log, "rb") as _stream:
+            _stream.seek(_offset)
+            _rest = _stream.read()
+
+        with open(f"{_log}.tmp", "wb") as _stream:
+            _stream.write(json.dumps({"snapshot": _snapshot}).encode() + b"\n" + _rest)
+
+        os.replace(_compactor.target, _file)
+        os.replace(f"{_log}.tmp", _log)
+
+        self._snapshot = _snapshot
+        self._stats    = self.stats()
+        logging.info(f"Compacted {_file}")
+
+    def on_compactor_finished(self, _target: str) -> None:
+
+        # Snapshots that were not swapped in:
+        if  os.path.exists(_target):
+            os.remove(_target)
+
+        if  self._compactor is not None and self.sender() is self._compactor.signals:
+            self._compactor = None
+
+    def discard(self) -> None:
+        """
+        Abandons a compaction in progress, e.g. because a new snapshot is written.
+        """
+
+        if  self._compactor is not None:
+            self._compactor.stopped = True
+            self._compactor = None
+
+    def stats(self):
+        """
+        Returns the (size, modification-time) of the file and of its log, to tell whether they were changed by someone
+        else since the last save.
+        """
+
+        _stats = list()
+        for _path in [self._file, JsonLib.log_path(self._file)]:
+            try:
+                _stat = os.stat(_path)
+                _stats.append((_stat.st_size, _stat.st_mtime_ns))
+
+            except (OSError, TypeError):
+                _stats.append(None)
+
+        return tuple(_stats)
+
+    @staticmethod
+    def section(_record) -> str:
+        if isinstance(_record, NodeRecord):     return "nodes"
+        if isinstance(_record, TerminalRecord): return "terminals"
+        return "connectors"
+
+    @staticmethod
+    def key(_section: str, _record):
+        if _section == "connectors":    return JsonLib.element_key(_section, JsonLib.connector_to_json(_record))
+        return _record.uid
+
+    @staticmethod
+    def registered(_model: SchemaModel, _record) -> bool:
+        if isinstance(_record, NodeRecord):     return _model.nodes.get(_record.uid) is _record
+        if isinstance(_record, TerminalRecord): return _model.terminals.get(_record.uid) is _record
+        return _model.connectors.get(_record.symbol) is _record
@@ -0,0 +1,112 @@
+from PyQt6         import sip
+from PyQt6.QtCore    import Qt, QObject
+from PyQt6.QtGui     import QPainter, QPixmap
+
+# Class DragSnapshot: Paints the static part of the viewport from a snapshot while items are dragged:
+class DragSnapshot(QObject):
+    """
+    Static background of the viewer while the user drags a selection. When a drag starts (see `freeze()`), the items
+    in view that are not being dragged are rendered once into a pixmap of the viewport, and made transparent (Qt skips
+    transparent items without painting them). Until the drag ends (see `thaw()`), the viewer paints the pixmap as its
+    background (see `Viewer.drawBackground`), so each frame paints the dragged items and their connectors over a
+    single blit, instead of every item that overlaps them. The dragged items keep their caches.
+
+    The snapshot shows the scene as it was when the drag started: changes to other items are not painted until the
+    drag ends, and the dragged items are painted over all others. Scrolling, zooming or resizing the viewer drops the snapshot, the next mouse-move takes a new one.
+
+    Attributes:
+        enabled (bool): Whether drags take snapshots.
+        taken (int): Number of snapshots taken.
+        hidden (int): Number of items made transparent by the last snapshot.
+    """
+
+    # Items are looked up by their bounding-rectangles (their shapes are not needed):
+    MODE = Qt.ItemSelectionMode.IntersectsItemBoundingRect
+
+    # Initializer:
+    def __init__(self, _viewer):
+
+        # Initialize base-class:
+        super().__init__(_viewer)
+
+        self._viewer = _viewer
+        self._pixmap = None     # Snapshot of the items that are not dragged.
+        self._hidden = dict()   # Maps the items made transparent to their opacities.
+        self.enabled = True
+
+        # Counters:
+        self.taken  = 0
+        self.hidden = 0
+
+    @property
+    def active(self) -> bool:   return self._pixmap is not None
+
+    def freeze(self, _items: list) -> None:
+        """
+        Takes a snapshot of the viewport without `_items` (top-level items, e.g. the dragged nodes and terminals and
+        the connectors attached to them), and makes the other items in view transparent until `thaw()` is called.
+        """
+
+        if not self.enabled:
+            return
+
+        _viewer = self._viewer
+        _canvas = _viewer.canvas
+        _size   = _viewer.viewport().size()
+        _ratio  = _viewer.viewport().devicePixelRatioF()
+        _view   = _viewer.mapToScene(_viewer.viewport().rect()).boundingRect()
+
+        # Render the scene without the dragged items (unlike hiding them, this keeps the mouse-grab of the dragged
+        # item):
+        _moving = {_item: _item.opacity() for _item in _items}
+        for _item in _moving:
+            _item.setOpacity(0.0)
+
+        _pixmap = QPixmap(round(_size.width() * _ratio), round(_size.height() * _ratio))
+        _pixmap.setDevicePixelRatio(_ratio)
+
+        _painter = QPainter(_pixmap)
+        _painter.setRenderHints(_viewer.renderHints())
+        _painter.setTransform(_viewer.viewportTransform())
+        _canvas.render(_painter, _view, _view)
+        _painter.end()
+
+        for _item, _opacity in _moving.items():
+            _item.setOpacity(_opacity)
+
+        # The other items in view are painted by the snapshot:
+        _shown = {_found.topLevelItem() for _found in _canvas.items(_view, self.MODE)}
+        for _item in _shown:
+            if  _item not in _moving and _item.isVisible():
+                self._hidden[_item] = _item.opacity()
+                _item.setOpacity(0.0)
+
+        self._pixmap = _pixmap
+        self.hidden  = len(self._hidden)
+        self.taken  += 1
+
+    def thaw(self) -> None:
+        """
+        Drops the snapshot, restores the opacity of the items that it painted, and repaints the viewport.
+        """
+
+        if  self._pixmap is None:
+            return
+
+        for _item, _opacity in self._hidden.items():
+            if not sip.isdeleted(_item):
+                _item.setOpacity(_opacity)
+
+        self._pixmap = None
+        self._hidden.clear()
+        self._viewer.viewport().update()
+
+    def paint(self, _painter: QPainter) -> None:
+        """
+        Paints the snapshot with a painter of the viewer's viewport (clipped to the exposed region).
+        """
+
+        _painter.save()
+        _painter.resetTransform()
+        _painter.drawPixmap(0, 0, self._pixmap)
+        _painter.restore()
@@ -18,6 +18,7 @@ from PyQt6.QtCore import (
     pyqtSlot, 
     pyqtSignal, 
     QtMsgType, 
+    QTimer,
     QEvent
 )
 
@@ -26,13 +27,17 @@ from PyQt6.QtWidgets import (
     QWidget,
     QGraphicsView, 
     QVBoxLayout,
-    QMessageBox
+    QMessageBox,
+    QLabel
 )
 
 from dataclasses    import dataclass
 
 from custom.dialog import Dialog
 from .canvas       import Canvas, SaveState
+from .meter        import FrameMeter
+from .minimap      import Minimap
+from .snapshot     import DragSnapshot
 from util          import *
 from tabs.gemini   import widget
 
@@ -50,6 +55,8 @@ class Viewer(QGraphicsView):
             self.val = 1.0
             self.max = 4.0
             self.min = 0.2
+            self.acc = 0.0      # Wheel-delta accumulated since the last applied zoom-step.
+            self.tick = 16      # Interval (ms) at which accumulated wheel-deltas are applied (about one frame).
 
     # Initializer:
     def __init__(self, _parent: QWidget | None, **kwargs):
@@ -69,27 +76,40 @@ class Viewer(QGraphicsView):
         min_zoom = kwargs.get("min_zoom") if "min_zoom" in kwargs else 0.2
         x_bounds = kwargs.get("x_bounds") if isinstance(kwargs.get("x_bounds"), float) else 25000.0
         y_bounds = kwargs.get("y_bounds") if isinstance(kwargs.get("y_bounds"), float) else 25000.0
+        show_fps = kwargs.get("show_fps") is True
+        show_map = kwargs.get("show_map") is True
+        cache_mb = kwargs.get("cache_budget") if isinstance(kwargs.get("cache_budget"), (int, float)) else None
 
         # Viewport behaviour:
         self.setObjectName(random_id(length=4, prefix='V'))                                 # Schematic Viewer UID
         self.setRenderHint(QPainter.RenderHint.Antialiasing)                                # Prevents pixelation (do not remove)
         self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)                             # Enables click-and-drag panning
-        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)     # Prevents artifacts (do not remove)
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.SmartViewportUpdate)    # Repaints only the dirty region(s)
         logging.info("Anti-aliasing enabled.")
         logging.info("Click-and-drag enabled.")
-        logging.info("Full-viewport update enabled.")
+        logging.info("Smart-viewport update enabled.")
 
         # Default zoom-attribute(s):
         self._zoom = self.Zoom()
         self._zoom.min = min_zoom if isinstance(min_zoom, float) else self._zoom.min
         self._zoom.max = max_zoom if isinstance(max_zoom, float) else self._zoom.max
 
+        # Wheel-events are accumulated and applied once per frame:
+        self._zoom_timer = QTimer(self)
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.setInterval(self._zoom.tick)
+        self._zoom_timer.timeout.connect(self.apply_zoom)
+
         # Initialize Canvas (QGraphicsScene derivative)
         self.closed = False
         self.state  = SaveState.UNSAVED
         self.canvas = Canvas(QRectF(0, 0, x_bounds, y_bounds), self)
         self.setScene(self.canvas)
 
+        # Pixmap-budget (in MB) of the canvas' item-caches:
+        if  cache_mb is not None:
+            self.canvas.caches.budget = int(cache_mb * 1024 * 1024)
+
         self.canvas.sig_canvas_state.connect(self.update_state)
         self.canvas.sig_schema_setup .connect(self.sig_json_loaded)
         logging.info(f"Canvas [UID = {self.canvas.uid}] initialized.")
@@ -108,6 +128,27 @@ class Viewer(QGraphicsView):
         _layout.addWidget(self._gemini, 1, Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignHCenter)
         _layout.insertStretch(0, 10)
 
+        # Frame-rate meter (toggled with Ctrl+Shift+F), displays its readings in the top-left corner:
+        self.meter = FrameMeter(self)
+        self._fps = QLabel(self)
+        self._fps.setStyleSheet("QLabel {background: rgba(0, 0, 0, 160); color: white; padding: 2px 6px;}")
+        self._fps.hide()
+        self.meter.sig_sampled.connect(self.on_frames_sampled)
+        _layout.insertWidget(0, self._fps, 0, Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
+
+        if show_fps:
+            self.toggle_fps()
+
+        # Minimap (toggled with Ctrl+Shift+M), docked in the bottom-right corner by default:
+        self.minimap = Minimap(self)
+        self.minimap.hide()
+
+        if show_map:
+            self.toggle_map()
+
+        # While the user drags a selection, the other items are painted from a snapshot (see `mouseMoveEvent`):
+        self.snapshot = DragSnapshot(self)
+
         # Define shortcuts:
         shortcut_ctrl_a = QShortcut(QKeySequence.StandardKey.SelectAll, self)
         shortcut_ctrl_v = QShortcut(QKeySequence.StandardKey.Paste, self)
@@ -115,16 +156,20 @@ class Viewer(QGraphicsView):
         shortcut_ctrl_z = QShortcut(QKeySequence.StandardKey.Undo, self)
         shortcut_ctrl_r = QShortcut(QKeySequence.StandardKey.Redo, self)
         shortcut_delete = QShortcut(QKeySequence.StandardKey.Delete, self)
+        shortcut_meter  = QShortcut(QKeySequence("Ctrl+Shift+F"), self)
+        shortcut_map    = QShortcut(QKeySequence("Ctrl+Shift+M"), self)
 
         # Activate shortcuts:
         shortcut_ctrl_z.activated.connect(self.canvas.manager.undo)
         shortcut_ctrl_r.activated.connect(self.canvas.manager.redo)
         shortcut_ctrl_c.activated.connect(self.canvas.copy_selection)
         shortcut_ctrl_v.activated.connect(self.canvas.paste_selection)
-        shortcut_ctrl_z.activated.connect(lambda: self.canvas.sig_canvas_state.emit(SaveState.UNSAVED))
-        shortcut_ctrl_r.activated.connect(lambda: self.canvas.sig_canvas_state.emit(SaveState.UNSAVED))
+        shortcut_ctrl_z.activated.connect(lambda: self.canvas.notify(SaveState.UNSAVED))
+        shortcut_ctrl_r.activated.connect(lambda: self.canvas.notify(SaveState.UNSAVED))
         shortcut_ctrl_a.activated.connect(lambda: self.canvas.select_items(self.canvas.node_db | self.canvas.term_db))
         shortcut_delete.activated.connect(lambda: self.canvas.delete_items(set(self.canvas.selectedItems())))
+        shortcut_meter .activated.connect(self.toggle_fps)
+        shortcut_map   .activated.connect(self.toggle_map)
 
         logging.info(f"Viewer [UID = {self.objectName()}] initialized.")
 
@@ -136,9 +181,89 @@ class Viewer(QGraphicsView):
 
     # Handle user-driven zooming:
     def zoom(self, delta: int | float | None):
-        factor = 1.0 / self._zoom.val if delta is None else self._zoom.exp ** (delta / 100.0)
-        self._zoom.val *= factor
+
+        # Reset to 100% if `delta` is None, otherwise clamp the new zoom-level to the allowed range:
+        target = 1.0 if delta is None else self._zoom.val * self._zoom.exp ** (delta / 100.0)
+        target = min(max(target, self._zoom.min), self._zoom.max)
+        if  target == self._zoom.val:
+            return
+
+        factor = target / self._zoom.val
+        self._zoom.val = target
         self.scale(factor, factor)
+        self.update_caches()
+        self.update_pages()
+
+    # Adapt the canvas' item-caches to the zoom-level and the visible part of the canvas:
+    def update_caches(self):
+        self.canvas.caches.rescale(self._zoom.val, self.mapToScene(self.viewport().rect()).boundingRect())
+
+    # Page the canvas' items in and out of the scene for the visible part of the canvas (see `Canvas.page_model()`),
+    # move the minimap's outline of the view, and drop the drag-snapshot (which no longer matches the view):
+    def update_pages(self):
+        self.canvas.pager.post(self.mapToScene(self.viewport().rect()).boundingRect())
+        self.minimap.update()
+        self.snapshot.thaw()
+
+    # Apply the wheel-delta accumulated since the last zoom-step:
+    def apply_zoom(self):
+
+        delta, self._zoom.acc = self._zoom.acc, 0.0
+        if  delta:
+            self.zoom(delta)
+
+    # Toggles the frame-rate meter:
+    def toggle_fps(self):
+
+        if  self.meter.running:
+            self.meter.stop()
+            self._fps.hide()
+            logging.info(f"Viewer [UID = {self.objectName()}]: Frame-rate meter disabled.")
+
+        else:
+            self.meter.start()
+            self.canvas.caches.reset()
+            self._fps.setText("-- fps")
+            self._fps.show()
+            logging.info(f"Viewer [UID = {self.objectName()}]: Frame-rate meter enabled.")
+
+    # Toggles the minimap:
+    def toggle_map(self):
+        self.minimap.setVisible(not self.minimap.isVisible())
+        logging.info(f"Viewer [UID = {self.objectName()}]: Minimap {'enabled' if self.minimap.isVisible() else 'disabled'}.")
+
+    # Display the frame-rate meter's readings:
+    def on_frames_sampled(self, fps: float, cost: float):
+        hits = self.canvas.caches.hit_rate
+        self._fps.setText(f"{fps:.1f} fps | {cost:.2f} ms/frame | zoom {self._zoom.val:.2f} | cache {hits:.0%}")
+        logging.info(f"Viewer [UID = {self.objectName()}]: {fps:.1f} fps, {cost:.2f} ms/frame, {hits:.0%} cache-hits")
+
+    # Measure paint-events (and count the cached items they expose) when the frame-rate meter is enabled:
+    def paintEvent(self, event):
+
+        if  self.meter.running:
+            self.canvas.caches.expose(self.mapToScene(event.rect()).boundingRect())
+
+        self.meter.begin()
+        super().paintEvent(event)
+        self.meter.end()
+
+    # While a selection is dragged, the items that are not dragged are painted from a snapshot (see `DragSnapshot`):
+    def drawBackground(self, painter, rect):
+        if  self.snapshot.active:   self.snapshot.paint(painter)
+        else:                       super().drawBackground(painter, rect)
+
+    # The item-caches' budget covers the visible part of the canvas:
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_caches()
+        self.update_pages()
+        self.minimap.place()
+
+    # Panning changes the visible part of the canvas:
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        self.update_pages()
 
     # Toggles visibility of AI-assistant:
     def toggle_assistant(self):
@@ -174,10 +299,32 @@ class Viewer(QGraphicsView):
         self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
         self.unsetCursor()
 
-    # Handle scroll-events:
+    # Handle mouse-move events (once a drag of the selection has started, the other items are painted from a snapshot):
+    def mouseMoveEvent(self, event):
+
+        # Call super-class implementation first (moves the dragged items):
+        super().mouseMoveEvent(event)
+
+        if  (
+            event.buttons() & Qt.MouseButton.LeftButton and
+            not self.snapshot.active
+        ):
+            _items = self.canvas.dragged()
+            if  _items:
+                self.snapshot.freeze(_items)
+
+    # Handle mouse-release events (a drag ends, the items are painted live again):
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        self.snapshot.thaw()
+
+    # Handle scroll-events (the deltas of all wheel-events within a frame are applied as one zoom-step):
     def wheelEvent(self, event):
-        delta = event.angleDelta().y()
-        self.zoom(float(delta))         # Zoom by desired amount
+        self._zoom.acc += float(event.angleDelta().y())
+        if not self._zoom_timer.isActive():
+            self._zoom_timer.start()
+
+        event.accept()
 
     # Handle close-events:
     @pyqtSlot(QEvent)
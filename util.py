@@ -1,11 +1,149 @@
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui  import QColor
+from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtGui  import QColor, QIcon, QPainter, QPixmap, QPixmapCache
 from enum         import Enum
 
+import math
 import string
 import random
 
+from PyQt6.QtSvg        import QSvgRenderer
 from PyQt6.QtSvgWidgets import QGraphicsSvgItem
+from PyQt6.QtWidgets    import QGraphicsItem, QStyleOptionGraphicsItem
+
+# Level-of-detail thresholds, compared against `level_of_detail()` (1.0 at 100% zoom):
+class LevelOfDetail:
+    DETAIL = 0.5    # Below this, text, icons, anchors and handles are not painted.
+    SHAPES = 0.3    # Below this, nodes are painted as plain rectangles and connectors as thin polylines.
+
+# Level-of-detail of a painter:
+def level_of_detail(painter, _item: QGraphicsItem | None = None) -> float:
+    """
+    Returns the level-of-detail of the painter's world-transform, i.e. the scale at which items are being painted. The
+    world-transform includes the scale of the item that is being painted (and of its parents), e.g. 0.05 for buttons.
+    If the item is given, its scale is divided out, so the level-of-detail is the zoom-level.
+
+    :param painter: The painter passed to `paint()`.
+    :param _item: The item being painted.
+    :return: The level-of-detail (1.0 at 100% zoom, 0.2 at the viewer's minimum zoom).
+    """
+
+    _lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+    if  _item is not None:
+        _lod /= QStyleOptionGraphicsItem.levelOfDetailFromTransform(_item.sceneTransform()) or 1.0
+
+    return _lod
+
+# Count cache-misses:
+def cache_miss(_item, widget) -> None:
+    """
+    Reports a cache-miss to the cache-policy of the item's scene (see tabs/schema/graph/cache.py) if a cached item is
+    being painted into its pixmap (Qt paints cache-pixmaps without a widget, views pass their viewport).
+
+    :param _item: The item being painted.
+    :param widget: The widget passed to `paint()`.
+    """
+
+    if  widget is None and _item.cacheMode() != QGraphicsItem.CacheMode.NoCache:
+        _policy = getattr(_item.scene(), "caches", None)
+        if  _policy is not None:
+            _policy.misses += 1
+
+# Process-wide caches of SVG-renderers and icons (pixmaps are kept in `QPixmapCache`):
+_svg_renderers = dict()
+_icons = dict()
+
+# Shared renderer of an SVG-file:
+def svg_renderer(_file: str) -> QSvgRenderer:
+    """
+    Returns the process-wide renderer of an SVG-file. The file is read and parsed on first use only.
+
+    :param _file: Path to the SVG-file.
+    :return: The shared `QSvgRenderer`.
+    """
+
+    _renderer = _svg_renderers.get(_file)
+    if _renderer is None:
+        _renderer = _svg_renderers[_file] = QSvgRenderer(_file)
+
+    return _renderer
+
+# Rasterized SVG-file:
+def svg_pixmap(_file: str, _width: int, _ratio: float = 1.0) -> QPixmap:
+    """
+    Returns an SVG-file rasterized to a width of `_width` (device-independent) pixels at the device-pixel-ratio
+    `_ratio`. Pixmaps are cached in `QPixmapCache`, keyed by (path, width, ratio).
+
+    :param _file: Path to the SVG-file.
+    :param _width: Width of the pixmap in device-independent pixels.
+    :param _ratio: Device-pixel-ratio of the target device.
+    :return: The pixmap.
+    """
+
+    _key = f"svg:{_file}:{_width}:{_ratio:g}"
+    _pixmap = QPixmapCache.find(_key)
+    if _pixmap is not None:
+        return _pixmap
+
+    # Rasterize at the device's resolution, preserving the aspect-ratio:
+    _renderer = svg_renderer(_file)
+    _default  = _renderer.defaultSize()
+    _pwidth   = max(1, math.ceil(_width * _ratio))
+    _pheight  = max(1, math.ceil(_pwidth * _default.height() / max(_default.width(), 1)))
+
+    _pixmap = QPixmap(_pwidth, _pheight)
+    _pixmap.fill(Qt.GlobalColor.transparent)
+
+    _painter = QPainter(_pixmap)
+    _painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    _renderer.render(_painter)
+    _painter.end()
+
+    _pixmap.setDevicePixelRatio(_ratio)
+    QPixmapCache.insert(_key, _pixmap)
+    return _pixmap
+
+# Shared icon:
+def load_icon(_file: str) -> QIcon:
+    """
+    Returns the process-wide icon for an image-file, so that widgets that show the same icon on every row (e.g. trees
+    and tables) do not load the file once per row.
+
+    :param _file: Path to the image-file.
+    :return: The shared `QIcon`.
+    """
+
+    _icon = _icons.get(_file)
+    if _icon is None:
+        _icon = _icons[_file] = QIcon(_file)
+
+    return _icon
+
+# Class SvgIcon: SVG-item that shares its renderer and paints cached pixmaps:
+class SvgIcon(QGraphicsSvgItem):
+    """
+    SVG-item that uses the process-wide renderer of its file (see `svg_renderer()`) and paints a cached pixmap of its
+    on-screen size (see `svg_pixmap()`), so creating an icon neither reads nor parses the file again. Icons are not
+    painted at low levels-of-detail.
+    """
+
+    # Initializer:
+    def __init__(self, _file: str, _parent = None):
+
+        # Initialize base-class:
+        super().__init__(_parent)
+
+        self._file = _file
+        self.setSharedRenderer(svg_renderer(_file))
+
+    def paint(self, painter, option, widget = None):
+
+        # Icons are culled by zoom-level, their pixmaps are rasterized at the scale they are painted at:
+        if level_of_detail(painter, self) < LevelOfDetail.DETAIL:
+            return
+
+        _rect   = self.boundingRect()
+        _pixmap = svg_pixmap(self._file, max(1, math.ceil(_rect.width() * level_of_detail(painter))), painter.device().devicePixelRatioF())
+        painter.drawPixmap(_rect, _pixmap, QRectF(_pixmap.rect()))
 
 # Parse a qss-stylesheet:
 def read_qss(filename: str) -> str:
@@ -101,14 +239,14 @@ def str_to_float(arg: str):
 # Scale an SVG to a specific width:
 def load_svg(_file: str, _width: int):
     """
-    Loads an SVG-icon and rescales it to a specific width.
+    Creates an SVG-icon (sharing the file's cached renderer, see `svg_renderer()`) and rescales it to a specific width.
 
     Args:
         _file (str): The path to the SVG-icon.
         _width (int): The width to rescale the SVG to.
 
     Returns:
-        QGraphicsSvgItem: The rescaled SVG-icon.
+        SvgIcon: The rescaled SVG-icon.
     """
 
     # Validate argument(s):
@@ -119,7 +257,7 @@ def load_svg(_file: str, _width: int):
         return
 
     # Load SVG-icon and rescale:
-    _svg = QGraphicsSvgItem(_file)
+    _svg = SvgIcon(_file)
     _svg.setScale(float(_width / _svg.boundingRect().width()))  # Rescale the SVG
 
     return _svg